@@ -0,0 +1,3 @@
+"""
+Benchmarks of the extraction pipeline against a local fake stats server and an S3 stand-in
+"""
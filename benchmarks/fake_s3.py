@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+import hashlib
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Set
+
+from minio.helpers import MIN_PART_SIZE
+
+
+@dataclass
+class StoredObject:
+
+    object_name: str
+    size: int
+    content_type: str
+    metadata: Optional[Dict[str, str]] = None
+    data: Optional[bytes] = None
+    etag: Optional[str] = None
+
+
+class StoredResponse:
+    """
+    The part of urllib3.BaseHTTPResponse read by S3MixIn.load_object
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self._data: bytes = data
+
+    def read(self, decode_content: bool = True) -> bytes:
+        return self._data
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        pass
+
+
+class InMemoryS3Client:
+    """
+    Stand-in of the Minio client keeping objects in memory,
+    to be set as the S3 client of an extractor, see S3MixIn.s3_client.
+
+    Uploads are read in full, as Minio does, and may take a fixed latency
+    in the calling thread to model a remote store.
+    Only the sizes are kept unless keep_data is set,
+    so the stand-in does not weigh on the memory of a benchmark.
+    """
+
+    def __init__(self, latency: float = 0.0, keep_data: bool = False) -> None:
+        """
+        :param latency: seconds each upload or download blocks its thread
+        :type latency: float
+        :param keep_data: keep the content of objects, required by get_object
+        :type keep_data: bool
+        """
+        self._latency: float = latency
+        self._keep_data: bool = keep_data
+        self._lock: threading.Lock = threading.Lock()
+        self._buckets: Dict[str, Dict[str, StoredObject]] = {}
+        self._uploads: int = 0
+
+    @property
+    def uploads(self) -> int:
+        return self._uploads
+
+    @property
+    def bytes_stored(self) -> int:
+        with self._lock:
+            return sum(obj.size for objects in self._buckets.values() for obj in objects.values())
+
+    def bucket_exists(self, bucket_name: str) -> bool:
+        with self._lock:
+            return bucket_name in self._buckets
+
+    def make_bucket(self, bucket_name: str) -> None:
+        with self._lock:
+            self._buckets.setdefault(bucket_name, {})
+
+    def put_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        content_type: str = 'application/octet-stream',
+        metadata: Optional[Dict[str, str]] = None,
+        part_size: int = MIN_PART_SIZE,
+        **kwargs: Any,
+    ) -> StoredObject:
+        if length >= 0:
+            content = data.read(length)
+            etag = hashlib.md5(content).hexdigest()
+        else:
+            # unknown length, read part by part like a multipart upload
+            parts = []
+            while True:
+                part = data.read(part_size)
+                if not part:
+                    break
+                parts.append(part)
+            content = b''.join(parts)
+            # ETag of a multipart upload, the MD5 of the part MD5s
+            digests = b''.join(hashlib.md5(part).digest() for part in parts)
+            etag = f'{hashlib.md5(digests).hexdigest()}-{len(parts)}'
+        if self._latency:
+            time.sleep(self._latency)
+        stored = StoredObject(
+            object_name=object_name,
+            size=len(content),
+            content_type=content_type,
+            metadata=metadata,
+            data=content if self._keep_data else None,
+            etag=etag,
+        )
+        with self._lock:
+            self._buckets.setdefault(bucket_name, {})[object_name] = stored
+            self._uploads += 1
+        return stored
+
+    def get_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        offset: int = 0,
+        length: int = 0,
+    ) -> StoredResponse:
+        with self._lock:
+            stored = self._buckets.get(bucket_name, {}).get(object_name)
+        if stored is None or stored.data is None:
+            raise KeyError(f"{bucket_name}/{object_name} is not stored with its content")
+        if self._latency:
+            time.sleep(self._latency)
+        # ranged GET as Minio does, a length of 0 reads to the end
+        end = offset + length if length else None
+        return StoredResponse(stored.data[offset:end])
+
+    def stat_object(self, bucket_name: str, object_name: str) -> StoredObject:
+        with self._lock:
+            stored = self._buckets.get(bucket_name, {}).get(object_name)
+        if stored is None:
+            raise KeyError(f"{bucket_name}/{object_name} is not stored")
+        return stored
+
+    def list_objects(self, bucket_name: str, prefix: str = '', recursive: bool = False) -> Iterator[StoredObject]:
+        with self._lock:
+            objects = list(self._buckets.get(bucket_name, {}).values())
+        for obj in objects:
+            if obj.object_name.startswith(prefix):
+                yield obj
+
+    def object_names(self, bucket_name: str) -> Set[str]:
+        with self._lock:
+            return set(self._buckets.get(bucket_name, {}))
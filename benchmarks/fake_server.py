@@ -0,0 +1,188 @@
+import asyncio
+from dataclasses import dataclass
+import datetime
+import json
+import logging
+import multiprocessing
+import random
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from court_pipeline.runners.scoreboard import season_year_of
+
+
+logger = logging.getLogger(__name__)
+
+
+STARTUP_TIMEOUT = 10.0
+REASONS = {200: 'OK', 404: 'Not Found', 503: 'Service Unavailable'}
+
+
+@dataclass
+class ServerConfig:
+    """
+    :param latency: seconds before each response
+    :param jitter: extra seconds drawn uniformly up to this value
+    :param error_rate: share of requests answered with 503
+    :param payload_size: approximate bytes of each response body
+    :param games_per_date: games listed by each scoreboard
+    :param seed: seed of the random draws, so runs are comparable
+    """
+
+    latency: float = 0.05
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    payload_size: int = 20_000
+    games_per_date: int = 10
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.latency < 0 or self.jitter < 0:
+            raise ValueError("latency and jitter should not be negative")
+        if not 0 <= self.error_rate <= 1:
+            raise ValueError("error_rate should be between 0 and 1")
+
+
+def scoreboard_game_ids(game_date: datetime.date, games_per_date: int) -> List[str]:
+    """
+    Identifiers of the games the fake server lists for the date,
+    unique per date within a season
+    """
+    season_year = season_year_of(game_date)
+    day = (game_date - datetime.date(season_year, 7, 1)).days
+    return [
+        f'002{season_year % 100:02d}{day * games_per_date + index + 1:05d}'
+        for index in range(games_per_date)
+    ]
+
+
+class FakeStatsServer:
+    """
+    HTTP/1.1 server answering scoreboardv3 and boxscoresummaryv3 requests like stats.nba.com,
+    with keep-alive connections, a configurable latency, error rate and payload size
+    """
+
+    def __init__(self, config: Optional[ServerConfig] = None) -> None:
+        self._config: ServerConfig = config if config is not None else ServerConfig()
+        self._rng: random.Random = random.Random(self._config.seed)
+        # bodies are padded to the payload size with a blob built once
+        self._padding: str = 'x' * self._config.payload_size
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._requests: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self._requests
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("server is not started")
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f'http://{host}:{port}/stats/'
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self.url
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeStatsServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    def _body(self, payload: Dict[str, object]) -> bytes:
+        payload['padding'] = self._padding[:max(self._config.payload_size - 200, 0)]
+        return json.dumps(payload).encode('utf-8')
+
+    def respond(self, path: str, params: Dict[str, str]) -> Tuple[int, bytes]:
+        """
+        Status and body of a request, without the latency
+        """
+        config = self._config
+        if config.error_rate and self._rng.random() < config.error_rate:
+            return 503, b'{"message": "service unavailable"}'
+        endpoint = path.rstrip('/').rsplit('/', 1)[-1]
+        if endpoint == 'scoreboardv3':
+            try:
+                game_date = datetime.date.fromisoformat(params['GameDate'])
+            except (KeyError, ValueError):
+                return 404, b'{"message": "invalid GameDate"}'
+            games = [
+                {'gameId': game_id, 'gameStatus': 3}
+                for game_id in scoreboard_game_ids(game_date, config.games_per_date)
+            ]
+            return 200, self._body({'scoreboard': {'gameDate': params['GameDate'], 'games': games}})
+        if endpoint == 'boxscoresummaryv3':
+            game_id = params.get('GameID', '')
+            return 200, self._body({'boxScoreSummary': {'gameId': game_id, 'gameStatus': 3}})
+        return 404, b'{"message": "unknown endpoint"}'
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                _, target, _ = request_line.split(' ', 2)
+                keep_alive = not any(line.lower() == 'connection: close' for line in header_lines)
+                url = urlsplit(target)
+                params = {name: values[0] for name, values in parse_qs(url.query).items()}
+
+                self._requests += 1
+                delay = self._config.latency
+                if self._config.jitter:
+                    delay += self._rng.uniform(0, self._config.jitter)
+                if delay:
+                    await asyncio.sleep(delay)
+                status, body = self.respond(url.path, params)
+                writer.write(
+                    f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                    f'content-type: application/json; charset=utf-8\r\n'
+                    f'content-length: {len(body)}\r\n'
+                    f'connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode('latin-1')
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _serve(config: ServerConfig, urls: "multiprocessing.Queue[str]") -> None:
+
+    async def serve() -> None:
+        server = FakeStatsServer(config)
+        urls.put(await server.start())
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+@contextmanager
+def serve_in_process(config: ServerConfig) -> Iterator[str]:
+    """
+    Run the fake server in its own process, so its CPU and memory
+    do not count against the benchmarked process, and yield its URL
+    """
+    context = multiprocessing.get_context('spawn')
+    urls = context.Queue()
+    process = context.Process(target=_serve, args=(config, urls), daemon=True)
+    process.start()
+    try:
+        url = urls.get(timeout=STARTUP_TIMEOUT)
+        logger.info("fake stats server listening on %s", url)
+        yield url
+    finally:
+        process.terminate()
+        process.join()
@@ -0,0 +1,376 @@
+"""
+Measure the extraction pipeline against a local fake stats server and an S3 stand-in, e.g.
+
+    python -m benchmarks.run boxscore --tasks 1000 --concurrency 1,8,32 --latency 0.05
+    python -m benchmarks.run scoreboard --error-rate 0.02 --payload-size 100000 --codec gzip
+    python -m benchmarks.run boxscore --baseline benchmarks/results/boxscore-baseline.json
+
+Each concurrency level runs in a fresh process, so its peak RSS and CPU time are its own,
+and the fake server runs in another one. Results are written as JSON,
+and compared against a baseline when given, the exit code is 1 on a regression.
+"""
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+import datetime
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from court_pipeline.metrics.registry import Metrics
+from court_pipeline.proxy.pool import ClientPool
+from court_pipeline.runners.boxscore_summary import REGULAR_SEASON_GAME_TYPE_ID, BoxscoreSummaryRunner
+from court_pipeline.runners.scoreboard import ScoreboardRunner
+from court_pipeline.s3.codecs import CODECS
+
+from .fake_s3 import InMemoryS3Client
+from .fake_server import ServerConfig, serve_in_process
+
+
+logger = logging.getLogger(__name__)
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+DEFAULT_CONCURRENCY_LEVELS = [1, 8, 32]
+DEFAULT_TOLERANCE = 0.1
+FIRST_GAME_DATE = datetime.date(2024, 10, 22)
+SEASON_YEAR = 2024
+# timers of court_pipeline.metrics reported per level
+TIMERS = (
+    'http.request.seconds',
+    'http.ttfb.seconds',
+    'http.connect.seconds',
+    'validate.seconds',
+    's3.upload.seconds',
+    's3.upload_wait.seconds',
+)
+
+
+@dataclass
+class BenchmarkConfig:
+    """
+    :param job: 'scoreboard' or 'boxscore'
+    :param tasks: tasks run at each concurrency level
+    :param concurrency_levels: concurrency of each level, in run order
+    :param storage: 'memory' for the in-process stand-in,
+        'minio' for the S3 endpoint of the S3_* environment variables, e.g. the MinIO of docker-compose.yml
+    :param storage_latency: seconds each upload blocks its thread with the in-process stand-in
+    :param codec: compression of stored objects
+    :param streaming: pipe responses to storage in chunks
+    :param server: behavior of the fake stats server
+    """
+
+    job: str = 'boxscore'
+    tasks: int = 500
+    concurrency_levels: List[int] = field(default_factory=lambda: list(DEFAULT_CONCURRENCY_LEVELS))
+    storage: str = 'memory'
+    storage_latency: float = 0.0
+    codec: Optional[str] = None
+    streaming: bool = False
+    server: ServerConfig = field(default_factory=ServerConfig)
+
+
+class RedirectingPool(ClientPool):
+    """
+    Client pool sending the requests of every base URL to one server, the fake one
+    """
+
+    def __init__(self, url: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._url: str = url
+
+    def get_client(self, base_url: str) -> Any:
+        return super().get_client(self._url)
+
+
+class StandInStorageMixIn:
+    """
+    Bind the extractors of a runner to the S3 stand-in rather than a Minio client
+    """
+
+    s3_client: Optional[InMemoryS3Client] = None
+
+    def create_extractor(self) -> Any:
+        extractor = super().create_extractor()
+        if self.s3_client is not None:
+            setattr(extractor, '_s3_client', self.s3_client)
+        return extractor
+
+
+class BenchmarkScoreboardRunner(StandInStorageMixIn, ScoreboardRunner):
+    pass
+
+
+class BenchmarkBoxscoreSummaryRunner(StandInStorageMixIn, BoxscoreSummaryRunner):
+    pass
+
+
+RUNNERS = {
+    'scoreboard': BenchmarkScoreboardRunner,
+    'boxscore': BenchmarkBoxscoreSummaryRunner,
+}
+
+
+def iter_tasks(config: BenchmarkConfig) -> Iterator[Dict[str, Any]]:
+    if config.job == 'scoreboard':
+        return ScoreboardRunner.iter_tasks(
+            FIRST_GAME_DATE,
+            FIRST_GAME_DATE + datetime.timedelta(days=config.tasks - 1),
+        )
+    return BoxscoreSummaryRunner.iter_tasks(
+        "00",
+        [SEASON_YEAR],
+        [REGULAR_SEASON_GAME_TYPE_ID],
+        max_game_seq_id=config.tasks,
+    )
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile, q between 0 and 1
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss_megabytes() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def create_buckets(config: BenchmarkConfig) -> None:
+    runner = RUNNERS[config.job]()
+    extractor = runner.create_extractor()
+    try:
+        await extractor.create_bucket()
+    finally:
+        await asyncio.to_thread(extractor.close_storage)
+
+
+async def run_level(config: BenchmarkConfig, url: str, concurrency: int) -> Dict[str, Any]:
+    """
+    Run the tasks once at the concurrency and measure the run
+    """
+    runner_cls = RUNNERS[config.job]
+    s3_client = InMemoryS3Client(latency=config.storage_latency) if config.storage == 'memory' else None
+    metrics = Metrics()
+    pool = RedirectingPool(url, max_connections=concurrency, max_keepalive_connections=concurrency)
+    runner = runner_cls(
+        concurrency=concurrency,
+        pool=pool,
+        codec=config.codec,
+        streaming=config.streaming,
+        metrics=metrics,
+    )
+    runner.s3_client = s3_client
+    if s3_client is None:
+        await create_buckets(config)
+
+    cpu_started = cpu_seconds()
+    async with pool:
+        report = await runner.run(iter_tasks(config))
+    cpu = cpu_seconds() - cpu_started
+
+    latencies = [result.elapsed for result in report.fetched]
+    snapshot = metrics.snapshot()
+    timings = {}
+    for (name, labels), stats in sorted(snapshot.timers.items()):
+        if name in TIMERS and stats.count:
+            label = ','.join(value for _, value in labels)
+            timings[f'{name}[{label}]' if label else name] = {
+                'count': stats.count,
+                'mean_ms': stats.mean * 1000,
+                'p50_ms': stats.quantile(0.5) * 1000,
+                'p99_ms': stats.quantile(0.99) * 1000,
+            }
+    retries = sum(value for (name, _), value in snapshot.counters.items() if name == 'http.retries')
+    return {
+        'concurrency': concurrency,
+        'tasks': len(report.results),
+        'failed': len(report.failed),
+        'retries': retries,
+        'elapsed': report.elapsed,
+        'tasks_per_second': report.tasks_per_second,
+        'requests': report.requests,
+        'requests_per_second': report.requests_per_second,
+        'megabytes_per_second': report.megabytes_per_second,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'cpu_seconds': cpu,
+        'cpu_percent': cpu / report.elapsed * 100 if report.elapsed else 0.0,
+        'peak_rss_mb': peak_rss_megabytes(),
+        'timings': timings,
+    }
+
+
+def _measure_level(config: BenchmarkConfig, url: str, concurrency: int) -> Dict[str, Any]:
+    return asyncio.run(run_level(config, url, concurrency))
+
+
+def run_benchmark(config: BenchmarkConfig) -> Dict[str, Any]:
+    """
+    Run every concurrency level, each in a fresh process, against one fake server
+    """
+    levels = []
+    context = multiprocessing.get_context('spawn')
+    with serve_in_process(config.server) as url:
+        for concurrency in config.concurrency_levels:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                level = executor.submit(_measure_level, config, url, concurrency).result()
+            logger.info(
+                "concurrency %d: %.1f tasks/s, %.1f requests/s, p50 %.1fms, p99 %.1fms, %.0f%% CPU, %.1f MB peak RSS",
+                concurrency,
+                level['tasks_per_second'],
+                level['requests_per_second'],
+                level['p50_ms'],
+                level['p99_ms'],
+                level['cpu_percent'],
+                level['peak_rss_mb'],
+            )
+            levels.append(level)
+    return {
+        'benchmark': config.job,
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'config': asdict(config),
+        'levels': levels,
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Regressions of the result against the baseline at the concurrency levels both ran:
+    task or request throughput lower, or p99 latency higher, by more than the tolerance.
+    Request throughput is only compared with baselines recording it
+    """
+    baseline_levels = {level['concurrency']: level for level in baseline['levels']}
+    regressions = []
+    for level in result['levels']:
+        before = baseline_levels.get(level['concurrency'])
+        if before is None:
+            continue
+        for key, unit in (('tasks_per_second', 'tasks/s'), ('requests_per_second', 'requests/s')):
+            if key in level and key in before and level[key] < before[key] * (1 - tolerance):
+                regressions.append(
+                    f"concurrency {level['concurrency']}: {level[key]:.1f} {unit}, baseline {before[key]:.1f}"
+                )
+        if level['p99_ms'] > before['p99_ms'] * (1 + tolerance):
+            regressions.append(
+                f"concurrency {level['concurrency']}: p99 {level['p99_ms']:.1f}ms, "
+                f"baseline {before['p99_ms']:.1f}ms"
+            )
+    return regressions
+
+
+def parse_int_list(value: str) -> List[int]:
+    try:
+        levels = [int(item) for item in value.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid list {value!r}, expected comma-separated integers")
+    if any(level < 1 for level in levels):
+        raise argparse.ArgumentTypeError("concurrency levels should be positive integers")
+    return levels
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description=__doc__.split('\n\n')[0])
+    parser.add_argument('job', choices=sorted(RUNNERS))
+    parser.add_argument('--tasks', type=int, default=500, help="tasks run at each concurrency level")
+    parser.add_argument('--concurrency', type=parse_int_list, default=DEFAULT_CONCURRENCY_LEVELS,
+                        help="comma-separated concurrency levels")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds the fake server takes per response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="random extra seconds per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of 503 responses")
+    parser.add_argument('--payload-size', type=int, default=20_000, help="bytes per response body")
+    parser.add_argument('--storage', choices=['memory', 'minio'], default='memory',
+                        help="in-process S3 stand-in or the S3 endpoint of S3_* environment variables")
+    parser.add_argument('--storage-latency', type=float, default=0.0,
+                        help="seconds per upload of the in-process stand-in")
+    parser.add_argument('--codec', choices=sorted(CODECS), default=None)
+    parser.add_argument('--streaming', action='store_true')
+    parser.add_argument('--output', default=None, help="JSON file of the results, default is under benchmarks/results")
+    parser.add_argument('--baseline', default=None, help="JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="relative change tolerated against the baseline")
+    parser.add_argument('--log-level', default='INFO')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.tasks < 1:
+        parser.error("--tasks should be a positive integer")
+    logging.basicConfig(level=args.log_level.upper(), format='%(asctime)s %(levelname)s %(name)s %(message)s')
+    # per-task logs of the runners would dominate the measured CPU
+    logging.getLogger('court_pipeline').setLevel(logging.WARNING)
+
+    config = BenchmarkConfig(
+        job=args.job,
+        tasks=args.tasks,
+        concurrency_levels=args.concurrency,
+        storage=args.storage,
+        storage_latency=args.storage_latency,
+        codec=args.codec,
+        streaming=args.streaming,
+        server=ServerConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            payload_size=args.payload_size,
+        ),
+    )
+    result = run_benchmark(config)
+
+    output = args.output
+    if output is None:
+        output = os.path.join(RESULTS_DIR, f"{args.job}-{time.strftime('%Y%m%dT%H%M%S')}.json")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    print(f"results written to {output}")
+
+    for level in result['levels']:
+        print(
+            f"concurrency {level['concurrency']:>4}: {level['tasks_per_second']:8.1f} tasks/s, "
+            f"{level['requests_per_second']:8.1f} requests/s, "
+            f"p50 {level['p50_ms']:7.1f}ms, p99 {level['p99_ms']:7.1f}ms, "
+            f"CPU {level['cpu_percent']:5.1f}%, peak RSS {level['peak_rss_mb']:.1f} MB, "
+            f"failed {level['failed']}"
+        )
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"regression {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
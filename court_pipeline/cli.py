@@ -0,0 +1,408 @@
+"""
+Command-line entry point of extraction jobs, e.g.
+
+    court-pipeline scoreboard --start-date 2024-10-22 --end-date 2025-04-13 --rate 8
+    court-pipeline boxscore --seasons 2019-2024 --game-types 2,4 --incremental
+    court-pipeline discover --start-date 2024-10-22 --end-date 2025-04-13 --processes 4
+    SHARD_INDEX=0 SHARD_COUNT=3 court-pipeline boxscore --seasons 2000-2024 --partition season
+    court-pipeline replay boxscore --dead-letters var/dead_letters/boxscore.jsonl
+    court-pipeline materialize --seasons 2019-2024 --concurrency 2
+    court-pipeline scoreboard --start-date 2024-10-22 --end-date 2024-10-31 --metrics-textfile var/metrics/scoreboard.prom
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from .metrics.registry import Metrics
+from .metrics.sinks import PrometheusTextfileSink, Sink, StatsdSink, SummarySink
+from .proxy.cache import ResponseCache
+from .proxy.rate_limiter import AdaptiveRateLimiter
+from .proxy.validators import ValidatorStore
+from .runners.base import BaseRunner
+from .materializers.base import DEFAULT_BATCH_SIZE, DEFAULT_LOOKAHEAD
+from .runners.boxscore_summary import (
+    DISCOVERY_LOOKAHEAD,
+    MAX_GAME_SEQ_ID,
+    REGULAR_SEASON_GAME_TYPE_ID,
+    BoxscoreSummaryRunner,
+)
+from .runners.boxscore_summary_parquet import BoxscoreSummaryParquetRunner
+from .runners.dead_letter import DeadLetterStore
+from .runners.journal import Journal
+from .runners.live import IDLE_POLL_INTERVAL, LIVE_POLL_INTERVAL, LiveBoxscoreSummaryRunner
+from .runners.report import RunReport
+from .runners.scoreboard import ScoreboardRunner
+from .runners.shard import HASH, PARTITIONS, Shard, run_shards
+from .s3.codecs import CODECS
+from .utils.scoreboard import game_date_today
+
+
+logger = logging.getLogger(__name__)
+
+
+RUNNERS = {
+    'scoreboard': ScoreboardRunner,
+    'boxscore': BoxscoreSummaryRunner,
+    'discover': BoxscoreSummaryRunner,
+    'materialize': BoxscoreSummaryParquetRunner,
+    'live': LiveBoxscoreSummaryRunner,
+}
+
+
+def parse_date(value: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, expected YYYY-MM-DD")
+
+
+def parse_seasons(value: str) -> List[int]:
+    """
+    '2024' or an inclusive range such as '2019-2024'
+    """
+    try:
+        first, _, last = value.partition('-')
+        seasons = list(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid seasons {value!r}, expected YYYY or YYYY-YYYY")
+    if not seasons:
+        raise argparse.ArgumentTypeError(f"empty season range {value!r}")
+    return seasons
+
+
+def parse_int_list(value: str) -> List[int]:
+    try:
+        return [int(item) for item in value.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid list {value!r}, expected comma-separated integers")
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    host, _, port = value.rpartition(':')
+    try:
+        return host or '127.0.0.1', int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid address {value!r}, expected HOST:PORT")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--concurrency', type=int, default=16, help="tasks running at once per process")
+    common.add_argument('--rate', type=float, default=None,
+                        help="requests per second across the processes of this node, unlimited when omitted")
+    common.add_argument('--incremental', action='store_true', help="skip tasks whose objects are stored")
+    common.add_argument('--refresh-days', type=int, default=None,
+                        help="in incremental mode, still extract tasks of the last days")
+    common.add_argument('--dry-run', action='store_true', help="list the tasks without running them")
+    common.add_argument('--processes', type=int, default=1, help="processes splitting the tasks of this node")
+    node = Shard.from_env()
+    common.add_argument('--shard-index', type=int, default=node.index,
+                        help="shard of this node, default is SHARD_INDEX environment variable or 0")
+    common.add_argument('--shard-count', type=int, default=node.count,
+                        help="nodes sharing the job, default is SHARD_COUNT environment variable or 1")
+    common.add_argument('--partition', choices=PARTITIONS, default=HASH,
+                        help="how tasks are split between shards, dates of discover are always split in turn")
+    common.add_argument('--codec', choices=sorted(CODECS), default=None, help="compression of stored objects")
+    common.add_argument('--streaming', action='store_true', help="pipe responses to storage in chunks")
+    common.add_argument('--packed', action='store_true',
+                        help="pack objects into season or month archives with an offset index")
+    common.add_argument('--dedup', action='store_true',
+                        help="skip uploads of objects stored with the same content")
+    common.add_argument('--prioritized', action='store_true',
+                        help="run queued tasks of recent seasons and dates first, only reorders the "
+                             "--concurrency tasks queued at once, mostly useful with live --backfill-seasons")
+    common.add_argument('--journal', default=None, help="SQLite file recording task outcomes, to resume runs")
+    common.add_argument('--dead-letters', default=None, help="file of permanently failing tasks")
+    common.add_argument('--cache', default=None, help="SQLite file caching responses")
+    common.add_argument('--validators', default=None,
+                        help="SQLite file of response validators, to skip payloads not modified since stored")
+    common.add_argument('--progress-interval', type=float, default=10.0,
+                        help="seconds between progress logs and metrics flushes")
+    common.add_argument('--metrics', action='store_true', help="log a summary of request and storage timings")
+    common.add_argument('--metrics-textfile', default=None,
+                        help="Prometheus text file of the metrics, one per shard when sharded")
+    common.add_argument('--statsd', type=parse_address, default=None, metavar='HOST:PORT',
+                        help="send the metrics to a StatsD daemon")
+    common.add_argument('--log-level', default='INFO')
+
+    parser = argparse.ArgumentParser(prog='court-pipeline', description="Extract basketball statistics to S3")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scoreboard = commands.add_parser('scoreboard', parents=[common], help="scoreboards of a date range")
+    scoreboard.add_argument('--start-date', type=parse_date, required=True)
+    scoreboard.add_argument('--end-date', type=parse_date, required=True)
+    scoreboard.add_argument('--league-id', default="00")
+
+    boxscore = commands.add_parser('boxscore', parents=[common], help="boxscore summaries of seasons")
+    boxscore.add_argument('--seasons', type=parse_seasons, required=True, help="e.g. 2024 or 2019-2024")
+    boxscore.add_argument('--league-id', default="00")
+    boxscore.add_argument('--game-types', type=parse_int_list, default=[REGULAR_SEASON_GAME_TYPE_ID],
+                          help="comma-separated game type IDs, default is regular season")
+    boxscore.add_argument('--max-game-seq-id', type=int, default=MAX_GAME_SEQ_ID)
+
+    discover = commands.add_parser('discover', parents=[common],
+                                   help="boxscore summaries of the games listed by scoreboards of a date range")
+    discover.add_argument('--start-date', type=parse_date, required=True)
+    discover.add_argument('--end-date', type=parse_date, required=True)
+    discover.add_argument('--league-id', default="00")
+    discover.add_argument('--use-stored-scoreboards', action='store_true')
+    discover.add_argument('--lookahead', type=int, default=DISCOVERY_LOOKAHEAD)
+
+    materialize = commands.add_parser('materialize', parents=[common],
+                                      help="Parquet tables of the stored boxscore summaries of seasons")
+    materialize.add_argument('--seasons', type=parse_seasons, required=True, help="e.g. 2024 or 2019-2024")
+    materialize.add_argument('--league-id', default="00")
+    materialize.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="games per row group")
+    materialize.add_argument('--lookahead', type=int, default=DEFAULT_LOOKAHEAD,
+                             help="summaries loaded ahead per season")
+    materialize.add_argument('--compression', default=None, help="Parquet compression, default is zstd")
+
+    live = commands.add_parser('live', parents=[common],
+                               help="boxscore summaries of the games of a date as they are played")
+    live.add_argument('--game-date', type=parse_date, default=None, help="default is today in US Eastern time")
+    live.add_argument('--league-id', default="00")
+    live.add_argument('--live-interval', type=float, default=LIVE_POLL_INTERVAL,
+                      help="seconds between scoreboard polls while games are live")
+    live.add_argument('--idle-interval', type=float, default=IDLE_POLL_INTERVAL,
+                      help="longest wait between scoreboard polls while no game is live")
+    live.add_argument('--max-polls', type=int, default=None, help="stop after that many polls")
+    live.add_argument('--backfill-seasons', type=parse_seasons, default=None,
+                      help="regular seasons backfilled behind the live games, e.g. 1946-2024")
+
+    replay = commands.add_parser('replay', parents=[common], help="run dead-lettered tasks again")
+    replay.add_argument('job', choices=['scoreboard', 'boxscore'])
+    return parser
+
+
+def build_metrics(args: argparse.Namespace, shard: Shard) -> Optional[Metrics]:
+    """
+    Metrics of one process, None unless a sink is asked for
+    """
+    if not (args.metrics or args.metrics_textfile or args.statsd):
+        return None
+    sinks: List[Sink] = [SummarySink()]
+    if args.metrics_textfile:
+        path, labels = args.metrics_textfile, None
+        if shard.count > 1:
+            root, ext = os.path.splitext(path)
+            path, labels = f'{root}-{shard.index}{ext}', {'shard': str(shard.index)}
+        sinks.append(PrometheusTextfileSink(path, labels=labels))
+    if args.statsd:
+        host, port = args.statsd
+        sinks.append(StatsdSink(host, port))
+    return Metrics(sinks)
+
+
+def runner_class(args: argparse.Namespace) -> Type[BaseRunner]:
+    return RUNNERS[args.job if args.command == 'replay' else args.command]
+
+
+def process_count(args: argparse.Namespace) -> int:
+    # dead letters are few and replayed as a whole, a live date is followed by one poller
+    return 1 if args.command in ('replay', 'live') else args.processes
+
+
+def build_runner(args: argparse.Namespace, metrics: Optional[Metrics] = None) -> BaseRunner:
+    """
+    Runner of one process, the rate is split evenly between processes
+    and never ramps up above the share of the process
+    """
+    runner_cls = runner_class(args)
+    rate_limiter = None
+    if args.rate is not None:
+        rate = args.rate / process_count(args)
+        rate_limiter = AdaptiveRateLimiter(rate=rate, min_rate=min(rate, 0.5), max_rate=rate)
+    refresh_window = None
+    if args.refresh_days is not None:
+        refresh_window = datetime.timedelta(days=args.refresh_days)
+    options: Dict[str, Any] = {}
+    prioritized = args.prioritized
+    if args.command == 'materialize':
+        options = {'batch_size': args.batch_size, 'lookahead': args.lookahead, 'compression': args.compression}
+    elif args.command == 'live':
+        options = {'live_interval': args.live_interval, 'idle_interval': args.idle_interval}
+        # the backfill is not to hold back the live games
+        prioritized = prioritized or args.backfill_seasons is not None
+    return runner_cls(
+        concurrency=args.concurrency,
+        rate_limiter=rate_limiter,
+        incremental=args.incremental,
+        refresh_window=refresh_window,
+        codec=args.codec,
+        streaming=args.streaming,
+        packed=args.packed,
+        dedup=args.dedup,
+        cache=ResponseCache(args.cache) if args.cache else None,
+        validators=ValidatorStore(args.validators) if args.validators else None,
+        prioritized=prioritized,
+        journal=Journal(args.journal, job=runner_cls.__name__) if args.journal else None,
+        dead_letters=DeadLetterStore(args.dead_letters) if args.dead_letters else None,
+        metrics=metrics,
+        **options,
+    )
+
+
+def iter_tasks(args: argparse.Namespace) -> Iterator[Dict[str, Any]]:
+    if args.command == 'scoreboard':
+        return ScoreboardRunner.iter_tasks(args.start_date, args.end_date, args.league_id)
+    if args.command == 'materialize':
+        return BoxscoreSummaryParquetRunner.iter_tasks(args.league_id, args.seasons)
+    return BoxscoreSummaryRunner.iter_tasks(
+        args.league_id,
+        args.seasons,
+        args.game_types,
+        args.max_game_seq_id,
+    )
+
+
+async def report_progress(runner: BaseRunner, interval: float, label: str) -> None:
+    started = time.perf_counter()
+    while True:
+        await asyncio.sleep(interval)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "%sprogress: %d tasks done, %.1f tasks/s",
+            label,
+            runner.completed,
+            runner.completed / elapsed,
+        )
+        runner.metrics.flush()
+
+
+async def run_job(args: argparse.Namespace, shard: Shard) -> RunReport:
+    """
+    Run the share of the job of one process
+    """
+    runner = build_runner(args, build_metrics(args, shard))
+    label = f'[{shard.label}] ' if shard.count > 1 else ''
+    progress = asyncio.create_task(report_progress(runner, args.progress_interval, label))
+    try:
+        if args.command == 'replay':
+            return await runner.replay()
+        if args.command == 'discover':
+            return await runner.discover(
+                args.start_date,
+                args.end_date,
+                args.league_id,
+                use_stored_scoreboards=args.use_stored_scoreboards,
+                lookahead=args.lookahead,
+                shard=shard,
+            )
+        if args.command == 'live':
+            backfill = None
+            if args.backfill_seasons is not None:
+                backfill = BoxscoreSummaryRunner.iter_tasks(args.league_id, args.backfill_seasons)
+            return await runner.poll(args.game_date, args.league_id, max_polls=args.max_polls, backfill=backfill)
+        return await runner.run(runner.shard_tasks(iter_tasks(args), shard, args.partition))
+    finally:
+        progress.cancel()
+        # the reporter is done before the summary, rather than left pending
+        await asyncio.gather(progress, return_exceptions=True)
+        if runner.journal is not None:
+            runner.journal.close()
+        if runner.cache is not None:
+            runner.cache.close()
+        if runner.validators is not None:
+            runner.validators.close()
+        runner.metrics.close()
+
+
+def configure_logging(args: argparse.Namespace) -> None:
+    logging.basicConfig(level=args.log_level.upper(), format='%(asctime)s %(levelname)s %(name)s %(message)s')
+
+
+def run_processes(args: argparse.Namespace) -> RunReport:
+    """
+    Split the shard of this node between processes, each with its own clients and event loop
+    """
+    node = Shard(args.shard_index, args.shard_count)
+    return run_shards(run_job, args, node.split(process_count(args)), initializer=configure_logging)
+
+
+def dry_run(args: argparse.Namespace) -> int:
+    """
+    Print the keys of the tasks the job would run
+    """
+    if args.command == 'replay':
+        letters = DeadLetterStore(args.dead_letters).load() if args.dead_letters else {}
+        keys: Iterable[str] = list(letters)
+    elif args.command == 'discover':
+        # games are only known once their scoreboards are fetched
+        game_dates = Shard(args.shard_index, args.shard_count).take_every(
+            args.start_date + datetime.timedelta(days=offset)
+            for offset in range((args.end_date - args.start_date).days + 1)
+        )
+        keys = (f'scoreboard/{args.league_id}/{game_date.isoformat()}' for game_date in game_dates)
+    elif args.command == 'live':
+        game_date = args.game_date or game_date_today()
+        keys = [f'scoreboard/{args.league_id}/{game_date.isoformat()}']
+    else:
+        # no journal, cache nor validators to open just to list the tasks
+        runner = runner_class(args)(concurrency=args.concurrency)
+        tasks = runner.shard_tasks(iter_tasks(args), Shard(args.shard_index, args.shard_count), args.partition)
+        keys = (runner.task_key(**params) for params in tasks)
+
+    total = 0
+    for key in keys:
+        print(key)
+        total += 1
+    print(f"{total} tasks", file=sys.stderr)
+    return 0
+
+
+def print_summary(report: RunReport) -> None:
+    print(
+        f"tasks: {len(report.results)}, succeeded: {len(report.succeeded)} "
+        f"(skipped: {len(report.skipped)}), failed: {len(report.failed)}"
+    )
+    print(
+        f"elapsed: {report.elapsed:.2f}s, {report.tasks_per_second:.1f} tasks/s, "
+        f"{report.requests_per_second:.1f} requests/s ({report.requests} requests), "
+        f"{report.megabytes_per_second:.2f} MB/s ({report.bytes_fetched / 1024 / 1024:.1f} MB)"
+    )
+    if report.objects_unchanged:
+        print(f"objects: {report.objects_changed} changed, {report.objects_unchanged} unchanged")
+    for result in report.failed[:20]:
+        print(f"failed {result.key}: {result.error}")
+    if len(report.failed) > 20:
+        print(f"... and {len(report.failed) - 20} more failures")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency should be a positive integer")
+    if args.processes < 1:
+        parser.error("--processes should be a positive integer")
+    if not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index should be between 0 and --shard-count - 1")
+    if args.command in ('scoreboard', 'discover') and args.end_date < args.start_date:
+        parser.error("--end-date should not be before --start-date")
+    if args.command == 'replay' and not args.dead_letters:
+        parser.error("replay requires --dead-letters")
+    if args.command == 'live':
+        if args.cache:
+            parser.error("live cannot use --cache, pass --validators to make polls conditional")
+        if args.journal or args.dead_letters or args.incremental:
+            parser.error("live cannot use --journal, --dead-letters or --incremental, games are refreshed as played")
+        if args.shard_count > 1:
+            parser.error("live follows a date from a single shard")
+        if not 0 < args.live_interval <= args.idle_interval:
+            parser.error("--live-interval should be positive and not above --idle-interval")
+    configure_logging(args)
+
+    if args.dry_run:
+        return dry_run(args)
+    report = run_processes(args)
+    print_summary(report)
+    return 1 if report.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,16 @@
 import asyncio
+import datetime
+import functools
 import httpx
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence
+from typing import Any, AsyncContextManager, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Protocol, Sequence
 
+from ..proxy.exceptions import NotModifiedError
 from ..s3.base import S3MixIn
+from ..s3.dedup import UNCHANGED
+from ..utils.scoreboard import game_date_today
 
 
 logger = logging.getLogger(__name__)
@@ -15,13 +20,104 @@ class ExtractorProtocol(Protocol):
 
     async def fetch(self, *args: Any, **kwargs: Any) -> httpx.Response: ...
 
-    async def store_object(self, data: bytes, content_type: str) -> None: ...
+    def stream(self, *args: Any, **kwargs: Any) -> AsyncContextManager[httpx.Response]: ...
+
+    def object_name(self, *args: Any, **kwargs: Any) -> str: ...
+
+    def reference_date(self, *args: Any, **kwargs: Any) -> datetime.date: ...
+
+    async def remember_validators(self, response: httpx.Response, *args: Any, **kwargs: Any) -> None: ...
+
+    async def remember_validators_once_stored(self, response: httpx.Response, *args: Any, **kwargs: Any) -> None: ...
+
+    def on_archived(self, object_name: str, callback: Callable[[], Awaitable[None]]) -> bool: ...
+
+    def count_store(self, outcome: str) -> None: ...
+
+    async def store_object(self, data: bytes, content_type: str, object_name: str) -> None: ...
+
+    async def store_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        content_type: str,
+        object_name: str,
+    ) -> None: ...
 
 
 class BaseExtractorMixIn:
+    """
+    Fetch a payload and store it under the object name of the same request.
+    Request parameters are passed through explicitly rather than kept on the instance,
+    so one extractor can serve many concurrent extract calls.
+    """
 
-    async def extract(self: ExtractorProtocol, *args: Any, **kwargs: Any) -> None:
-        response = await self.fetch(*args, **kwargs)
+    async def extract(self: ExtractorProtocol, *args: Any, **kwargs: Any) -> int:
+        """
+        Fetch and store the payload, return its size in bytes.
+        A payload not modified since it was stored is left as is, its size is 0.
+        """
+        try:
+            response = await self.fetch(*args, **kwargs)
+        except NotModifiedError:
+            self.count_store(UNCHANGED)
+            return 0
         content_type = "application/json"
         content = response.content
-        await self.store_object(content, content_type)
+        object_name = self.object_name(*args, **kwargs)
+        await self.store_object(content, content_type, object_name)
+        await self.remember_validators_once_stored(response, *args, **kwargs)
+        return len(content)
+
+    async def extract_streaming(self: ExtractorProtocol, *args: Any, **kwargs: Any) -> int:
+        """
+        Like extract, but pipe the response body to storage chunk by chunk
+        instead of holding the whole payload in memory
+        """
+        content_type = "application/json"
+        object_name = self.object_name(*args, **kwargs)
+        size = 0
+
+        async def counted(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+            nonlocal size
+            async for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+
+        try:
+            async with self.stream(*args, **kwargs) as response:
+                await self.store_stream(counted(response.aiter_bytes()), content_type, object_name)
+        except NotModifiedError:
+            self.count_store(UNCHANGED)
+            return 0
+        await self.remember_validators_once_stored(response, *args, **kwargs)
+        return size
+
+    async def remember_validators_once_stored(
+        self: ExtractorProtocol,
+        response: httpx.Response,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Remember the validators of the response once its stored payload is readable,
+        in packed mode once its archive part is uploaded,
+        so a 304 Not Modified never stands for a payload lost with its part
+        """
+        remember = functools.partial(self.remember_validators, response, *args, **kwargs)
+        if not self.on_archived(self.object_name(*args, **kwargs), remember):
+            await remember()
+
+    def is_recent(
+        self: ExtractorProtocol,
+        refresh_window: datetime.timedelta,
+        *args: Any,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        Whether the payload of the request may still change,
+        i.e. its reference date falls within the refresh window before today, the game date of today
+
+        :param refresh_window: how far back stored payloads are considered stale
+        :type refresh_window: datetime.timedelta
+        """
+        return self.reference_date(*args, **kwargs) >= game_date_today() - refresh_window
@@ -1,8 +1,10 @@
+import datetime
 import logging
 
 from .base import BaseExtractorMixIn
 from ..proxy.boxscore_summary import BoxscoreSummaryProxy
 from ..s3.boxscore_summary import BoxscoreSummaryS3MixIn
+from ..utils.game_id import GameId
 
 
 logger = logging.getLogger(__name__)
@@ -13,9 +15,26 @@ class BoxscoreSummaryExtractor(
     BoxscoreSummaryS3MixIn,
     BaseExtractorMixIn
 ):
-    async def extract(self, game_id: str) -> None:
+    async def extract(self, game_id: str) -> int:
         """
         :param game_id: Identifier of game
         :type game_id: str
         """
-        await super().extract(game_id=game_id)
+        return await super().extract(game_id=game_id)
+
+    async def extract_streaming(self, game_id: str) -> int:
+        """
+        :param game_id: Identifier of game
+        :type game_id: str
+        """
+        return await super().extract_streaming(game_id=game_id)
+
+    def reference_date(self, game_id: str) -> datetime.date:
+        """
+        Game date is unknown from the identifier, use the end of its season instead,
+        so every game of the ongoing season is considered recent
+
+        :param game_id: Identifier of game
+        :type game_id: str
+        """
+        return datetime.date(GameId(game_id).season_year + 1, 6, 30)
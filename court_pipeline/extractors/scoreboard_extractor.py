@@ -1,9 +1,15 @@
 import datetime
 import logging
+from typing import List, Optional
+
+import httpx
 
 from .base import BaseExtractorMixIn
+from ..proxy.exceptions import NotModifiedError
 from ..proxy.scoreboard import ScoreboardProxy
+from ..s3.dedup import UNCHANGED
 from ..s3.scoreboard import ScoreboardS3MixIn
+from ..utils.scoreboard import parse_game_ids
 
 
 logger = logging.getLogger(__name__)
@@ -18,11 +24,118 @@ class ScoreboardExtractor(
         self,
         game_date: datetime.date,
         league_id: str = "00",
-    ) -> None:
+    ) -> int:
+        """
+        :param game_date: game date in format YYYY-MM-DD
+        :type game_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        """
+        return await super().extract(game_date=game_date, league_id=league_id)
+
+    async def extract_streaming(
+        self,
+        game_date: datetime.date,
+        league_id: str = "00",
+    ) -> int:
+        """
+        :param game_date: game date in format YYYY-MM-DD
+        :type game_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        """
+        return await super().extract_streaming(game_date=game_date, league_id=league_id)
+
+    async def discover_game_ids(
+        self,
+        game_date: datetime.date,
+        league_id: str = "00",
+        use_stored: bool = False,
+    ) -> List[str]:
+        """
+        Identifiers of the games on the date.
+        The scoreboard is fetched and stored as by extract,
+        or read back from storage when it is already there and use_stored is set.
+
+        :param game_date: game date in format YYYY-MM-DD
+        :type game_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        :param use_stored: read the stored scoreboard rather than fetching it again
+        :type use_stored: bool
+        """
+        if use_stored and await self.is_stored(game_date, league_id):
+            content = await self.load_object(self.object_name(game_date, league_id))
+            return parse_game_ids(content)
+        content = await self.refresh(game_date, league_id)
+        if content is None:
+            content = await self.load_not_modified(game_date, league_id)
+        return parse_game_ids(content)
+
+    async def refresh(
+        self,
+        game_date: datetime.date,
+        league_id: str = "00",
+    ) -> Optional[bytes]:
+        """
+        Fetch and store the scoreboard as by extract, and return its payload,
+        None if it is not modified since stored, see BaseProxy.remember_validators
+
+        :param game_date: game date in format YYYY-MM-DD
+        :type game_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        """
+        try:
+            response = await self.fetch(game_date=game_date, league_id=league_id)
+        except NotModifiedError:
+            self.count_store(UNCHANGED)
+            return None
+        return await self._store_scoreboard(response, game_date, league_id)
+
+    async def load_not_modified(
+        self,
+        game_date: datetime.date,
+        league_id: str = "00",
+    ) -> bytes:
+        """
+        Payload of a scoreboard refreshed as not modified, i.e. the stored one.
+        If it is not stored any more, e.g. deleted or stored with another codec,
+        its validators are forgotten and the scoreboard is fetched and stored again
+
+        :param game_date: game date in format YYYY-MM-DD
+        :type game_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        """
+        if await self.is_stored(game_date, league_id):
+            return await self.load_object(self.object_name(game_date, league_id))
+        logger.warning("scoreboard of %s not modified but not stored, fetching it again", game_date)
+        await self.forget_validators(game_date=game_date, league_id=league_id)
+        # unconditional now, so never answered with 304 Not Modified
+        response = await self.fetch(game_date=game_date, league_id=league_id)
+        return await self._store_scoreboard(response, game_date, league_id)
+
+    async def _store_scoreboard(
+        self,
+        response: httpx.Response,
+        game_date: datetime.date,
+        league_id: str,
+    ) -> bytes:
+        content = response.content
+        await self.store_object(content, "application/json", self.object_name(game_date, league_id))
+        await self.remember_validators_once_stored(response, game_date=game_date, league_id=league_id)
+        return content
+
+    def reference_date(
+        self,
+        game_date: datetime.date,
+        league_id: str = "00",
+    ) -> datetime.date:
         """
         :param game_date: game date in format YYYY-MM-DD
         :type game_date: datetime.date
         :param league_id: Identifier of league, default is '00' for National Basketball Association
         :type league_id: str
         """
-        await super().extract(game_date=game_date, league_id=league_id)
+        return game_date
@@ -0,0 +1,3 @@
+"""
+Materializer module rewriting stored payloads as columnar files
+"""
@@ -0,0 +1,209 @@
+from abc import abstractmethod
+import asyncio
+import collections
+from dataclasses import dataclass, field
+import logging
+import os
+import tempfile
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from ..s3.base import S3MixIn
+
+
+logger = logging.getLogger(__name__)
+
+
+PARQUET_CONTENT_TYPE = 'application/vnd.apache.parquet'
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_LOOKAHEAD = 8
+FILE_CHUNK_SIZE = 1024 * 1024
+
+# column types of the table declarations, see ParquetMaterializerMixIn.tables
+COLUMN_TYPES = ('string', 'int64', 'float64', 'bool', 'timestamp')
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Parquet materialization requires the 'pyarrow' package")
+
+
+def build_schema(columns: Iterable[Tuple[str, str]]) -> Any:
+    """
+    pyarrow schema of (name, type) column declarations, types being one of COLUMN_TYPES
+    """
+    require_pyarrow()
+    types = {
+        'string': pa.string(),
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'bool': pa.bool_(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+@dataclass
+class MaterializeResult:
+
+    objects: int = 0
+    skipped: int = 0
+    rows: Dict[str, int] = field(default_factory=dict)
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+
+class ParquetMaterializerMixIn(S3MixIn):
+    """
+    Rewrite the JSON objects stored under a prefix as one Parquet file per table,
+    stored with this storage.
+
+    Memory is bounded whatever the number of objects:
+    at most lookahead objects are loaded ahead, rows are written out
+    as a row group every batch_size objects to local files, which are then streamed to storage.
+
+    implement the following for subclasses:
+      - source: storage of the JSON objects
+      - tables: column declarations of each table
+      - flatten: rows of each table of one object
+    """
+
+    batch_size: int = DEFAULT_BATCH_SIZE
+    lookahead: int = DEFAULT_LOOKAHEAD
+    compression: str = 'zstd'
+
+    @property
+    @abstractmethod
+    def source(self) -> S3MixIn:
+        """
+        Storage of the JSON objects
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def tables(self) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        (name, type) column declarations of each table, types being one of COLUMN_TYPES
+        """
+        pass
+
+    @abstractmethod
+    def flatten(self, content: bytes) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Rows of each table of one JSON object, raise ValueError or TypeError to skip the object
+        """
+        pass
+
+    @property
+    def schemas(self) -> Dict[str, Any]:
+        _schemas = getattr(self, '_schemas', None)
+        if _schemas is None:
+            _schemas = {table: build_schema(columns) for table, columns in self.tables.items()}
+            setattr(self, '_schemas', _schemas)
+        return _schemas
+
+    async def _load_objects(self, object_names: List[str]) -> AsyncIterator[Tuple[str, bytes]]:
+        """
+        Contents of the objects in order, with up to lookahead loads running ahead
+        """
+        source = self.source
+        pending: Deque[Tuple[str, asyncio.Future]] = collections.deque()
+        try:
+            for object_name in object_names:
+                pending.append((object_name, asyncio.ensure_future(source.load_object(object_name))))
+                if len(pending) >= self.lookahead:
+                    object_name, future = pending.popleft()
+                    yield object_name, await future
+            while pending:
+                object_name, future = pending.popleft()
+                yield object_name, await future
+        finally:
+            for _, future in pending:
+                future.cancel()
+            # wait for the cancelled loads, so none outlives the iteration
+            await asyncio.gather(*(future for _, future in pending), return_exceptions=True)
+
+    def _write_batch(self, writers: Dict[str, Any], batch: Dict[str, List[Dict[str, Any]]]) -> None:
+        for table, rows in batch.items():
+            if rows:
+                writers[table].write_table(pa.Table.from_pylist(rows, schema=self.schemas[table]))
+
+    @staticmethod
+    async def _read_file(path: str) -> AsyncIterator[bytes]:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, FILE_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    async def materialize(self, prefix: str, object_names: Dict[str, str]) -> MaterializeResult:
+        """
+        Flatten the JSON objects under the prefix and store one Parquet file per table.
+        Objects which cannot be flattened are logged and skipped,
+        every table is stored, empty ones included, so readers find the whole partition.
+
+        :param prefix: prefix of the JSON objects in the source storage
+        :type prefix: str
+        :param object_names: name of the Parquet object of each table
+        :type object_names: Dict[str, str]
+        """
+        require_pyarrow()
+        schemas = self.schemas
+        metrics = self.metrics
+        names = sorted(await self.source.list_object_names(prefix))
+        result = MaterializeResult(rows={table: 0 for table in schemas})
+
+        with tempfile.TemporaryDirectory(prefix='materialize-') as directory:
+            paths = {table: os.path.join(directory, f'{table}.parquet') for table in schemas}
+            writers = {
+                table: pq.ParquetWriter(paths[table], schema, compression=self.compression)
+                for table, schema in schemas.items()
+            }
+            batch: Dict[str, List[Dict[str, Any]]] = {table: [] for table in schemas}
+            batched = 0
+            try:
+                async for object_name, content in self._load_objects(names):
+                    result.bytes_read += len(content)
+                    try:
+                        rows = self.flatten(content)
+                    except (ValueError, TypeError) as e:
+                        logger.warning("skip %s which cannot be flattened: %r", object_name, e)
+                        result.skipped += 1
+                        continue
+                    for table, table_rows in rows.items():
+                        batch[table].extend(table_rows)
+                        result.rows[table] += len(table_rows)
+                    result.objects += 1
+                    batched += 1
+                    if batched >= self.batch_size:
+                        # pyarrow releases the GIL, loads ahead carry on meanwhile
+                        await asyncio.to_thread(self._write_batch, writers, batch)
+                        batch = {table: [] for table in schemas}
+                        batched = 0
+                await asyncio.to_thread(self._write_batch, writers, batch)
+            finally:
+                for writer in writers.values():
+                    writer.close()
+
+            for table, path in paths.items():
+                await self.store_stream(self._read_file(path), PARQUET_CONTENT_TYPE, object_names[table])
+                result.bytes_written += os.path.getsize(path)
+                metrics.increment('materialize.rows', result.rows[table], table=table)
+
+        metrics.increment('materialize.objects', result.objects)
+        logger.info(
+            "materialized %d objects of %s (%d skipped) into %s",
+            result.objects,
+            prefix,
+            result.skipped,
+            ', '.join(f'{table} {count} rows' for table, count in result.rows.items()),
+        )
+        return result
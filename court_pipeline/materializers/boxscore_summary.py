@@ -0,0 +1,160 @@
+import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .base import MaterializeResult, ParquetMaterializerMixIn
+from ..metrics.registry import Metrics
+from ..s3.base import S3MixIn
+from ..s3.boxscore_summary import BoxscoreSummaryParquetS3MixIn, BoxscoreSummaryS3MixIn
+from ..s3.codecs import Codec
+from ..utils.boxscore_summary import TEAM_STATISTICS, flatten_boxscore_summary, snake_case
+from ..utils.scoreboard import game_date_today
+
+
+KEY_COLUMNS = [
+    ('game_id', 'string'),
+    ('league_id', 'string'),
+    ('season_year', 'int64'),
+]
+
+TABLES = {
+    'games': KEY_COLUMNS + [
+        ('game_type_id', 'int64'),
+        ('game_code', 'string'),
+        ('game_status', 'int64'),
+        ('game_status_text', 'string'),
+        ('period', 'int64'),
+        ('game_time_utc', 'timestamp'),
+        ('game_et', 'string'),
+        ('duration', 'string'),
+        ('attendance', 'int64'),
+        ('sellout', 'bool'),
+        ('home_team_id', 'int64'),
+        ('away_team_id', 'int64'),
+        ('home_score', 'int64'),
+        ('away_score', 'int64'),
+        ('arena_id', 'int64'),
+        ('arena_name', 'string'),
+        ('arena_city', 'string'),
+        ('arena_state', 'string'),
+        ('arena_country', 'string'),
+        ('game_label', 'string'),
+        ('game_sub_label', 'string'),
+        ('game_subtype', 'string'),
+        ('series_text', 'string'),
+        ('is_neutral', 'bool'),
+        ('if_necessary', 'bool'),
+    ],
+    'teams': KEY_COLUMNS + [
+        ('team_id', 'int64'),
+        ('is_home', 'bool'),
+        ('team_name', 'string'),
+        ('team_city', 'string'),
+        ('team_tricode', 'string'),
+        ('team_wins', 'int64'),
+        ('team_losses', 'int64'),
+        ('score', 'int64'),
+    ] + [(snake_case(name), 'float64') for name in TEAM_STATISTICS],
+    'line_scores': KEY_COLUMNS + [
+        ('team_id', 'int64'),
+        ('period', 'int64'),
+        ('period_type', 'string'),
+        ('score', 'int64'),
+    ],
+    'officials': KEY_COLUMNS + [
+        ('person_id', 'int64'),
+        ('name', 'string'),
+        ('first_name', 'string'),
+        ('family_name', 'string'),
+        ('jersey_num', 'string'),
+        ('assignment', 'string'),
+    ],
+}
+
+
+class BoxscoreSummaryMaterializer(BoxscoreSummaryParquetS3MixIn, ParquetMaterializerMixIn):
+    """
+    Flatten the boxscore summaries of a season into its Parquet partition
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        lookahead: Optional[int] = None,
+        compression: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        """
+        :param batch_size: games flattened per row group
+        :type batch_size: Optional[int]
+        :param lookahead: summaries loaded ahead of the one being flattened
+        :type lookahead: Optional[int]
+        :param compression: Parquet compression, e.g. 'zstd', 'snappy' or 'none'
+        :type compression: Optional[str]
+        :param metrics: records loads, uploads and materialized rows
+        :type metrics: Optional[Metrics]
+        """
+        if batch_size is not None:
+            if batch_size < 1:
+                raise ValueError("batch_size should be a positive integer")
+            self.batch_size = batch_size
+        if lookahead is not None:
+            if lookahead < 1:
+                raise ValueError("lookahead should be a positive integer")
+            self.lookahead = lookahead
+        if compression is not None:
+            self.compression = compression
+        self._source: BoxscoreSummaryS3MixIn = BoxscoreSummaryS3MixIn()
+        self.configure_storage(metrics=metrics)
+
+    @property
+    def source(self) -> S3MixIn:
+        return self._source
+
+    @property
+    def tables(self) -> Dict[str, List[Tuple[str, str]]]:
+        return TABLES
+
+    def flatten(self, content: bytes) -> Dict[str, List[Dict[str, Any]]]:
+        return flatten_boxscore_summary(content)
+
+    def configure_storage(
+        self,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        codec: Optional[Union[str, Codec]] = None,
+        metrics: Optional[Metrics] = None,
+        packed: Optional[bool] = None,
+        archive_part_size: Optional[int] = None,
+        dedup: Optional[bool] = None,
+    ) -> None:
+        """
+        Configure the storage of both the summaries and the Parquet files.
+        Codec and packing only apply to summaries, whose names and listings tell them anyway when they are loaded,
+        Parquet files are large and compressed already.
+        """
+        self._source.configure_storage(max_workers, max_in_flight, codec, metrics, packed, archive_part_size, dedup)
+        super().configure_storage(max_workers, max_in_flight, metrics=metrics, dedup=dedup)
+
+    def close_storage(self) -> None:
+        self._source.close_storage()
+        super().close_storage()
+
+    async def materialize_season(self, league_id: str, season_year: int) -> MaterializeResult:
+        """
+        :param league_id: Identifier of league
+        :type league_id: str
+        :param season_year: starting year of the season
+        :type season_year: int
+        """
+        return await self.materialize(
+            f'/{league_id}/{season_year:04d}/',
+            {table: self.object_name(league_id, season_year, table) for table in self.tables},
+        )
+
+    def is_recent(self, refresh_window: datetime.timedelta, league_id: str, season_year: int) -> bool:
+        """
+        Whether the season ended within the refresh window, its partition may still change.
+        Seasons are taken to end by the end of June of their second year.
+        """
+        season_end = datetime.date(season_year + 1, 6, 30)
+        return season_end >= game_date_today() - refresh_window
@@ -0,0 +1,3 @@
+"""
+Metrics module for timers and counters of runs, exported through sinks
+"""
@@ -0,0 +1,188 @@
+import bisect
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any, ContextManager, Dict, Iterator, List, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# upper bounds in seconds of the timer buckets, the last bucket is unbounded
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# metric name and sorted label pairs
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+TIMER = 'timer'
+
+
+def build_key(name: str, labels: Dict[str, Any]) -> Key:
+    if not labels:
+        return name, ()
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+@dataclass
+class TimerStats:
+    """
+    Observations of a timer, bucketed so quantiles are estimated in constant memory
+    """
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the q-quantile, the maximum for the last bucket
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def copy(self) -> "TimerStats":
+        return TimerStats(count=self.count, total=self.total, max=self.max, buckets=list(self.buckets))
+
+
+@dataclass
+class Snapshot:
+    """
+    Values of every metric at one point of a run, counters and timers since it started
+    """
+
+    counters: Dict[Key, float] = field(default_factory=dict)
+    gauges: Dict[Key, float] = field(default_factory=dict)
+    timers: Dict[Key, TimerStats] = field(default_factory=dict)
+
+
+class Metrics:
+    """
+    Counters, gauges and timers of a run, aggregated in process
+    and handed to sinks on flush.
+
+    Recording is a dictionary update, so it is cheap enough for the hot path.
+    Sinks only do I/O on flush, except those receiving every event, see Sink.per_event.
+    Not thread-safe, record from the event loop, e.g. time an executor call around its await.
+    """
+
+    enabled = True
+
+    def __init__(self, sinks: Sequence[Any] = ()) -> None:
+        """
+        :param sinks: where flush() exports the metrics, see court_pipeline.metrics.sinks
+        :type sinks: Sequence[Sink]
+        """
+        self._sinks: List[Any] = list(sinks)
+        self._event_sinks: List[Any] = [sink for sink in self._sinks if sink.per_event]
+        self._counters: Dict[Key, float] = {}
+        self._gauges: Dict[Key, float] = {}
+        self._timers: Dict[Key, TimerStats] = {}
+
+    @property
+    def sinks(self) -> List[Any]:
+        return self._sinks
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = build_key(name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+        for sink in self._event_sinks:
+            sink.record(COUNTER, key, value)
+
+    def gauge(self, name: str, value: float, **labels: Any) -> None:
+        key = build_key(name, labels)
+        self._gauges[key] = value
+        for sink in self._event_sinks:
+            sink.record(GAUGE, key, value)
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        key = build_key(name, labels)
+        stats = self._timers.get(key)
+        if stats is None:
+            stats = self._timers[key] = TimerStats()
+        stats.add(seconds)
+        for sink in self._event_sinks:
+            sink.record(TIMER, key, seconds)
+
+    @contextmanager
+    def _timer(self, name: str, labels: Dict[str, Any]) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timer(self, name: str, **labels: Any) -> ContextManager[None]:
+        """
+        Observe the seconds spent in the block, failed or not
+        """
+        return self._timer(name, labels)
+
+    def snapshot(self) -> Snapshot:
+        return Snapshot(
+            counters=dict(self._counters),
+            gauges=dict(self._gauges),
+            timers={key: stats.copy() for key, stats in self._timers.items()},
+        )
+
+    def flush(self) -> None:
+        """
+        Export the current values to every sink, a failing sink does not stop the others
+        """
+        if not self._sinks:
+            return
+        snapshot = self.snapshot()
+        for sink in self._sinks:
+            try:
+                sink.emit(snapshot)
+            except Exception as e:
+                logger.warning("metrics sink %s failed: %r", type(sink).__name__, e)
+
+    def close(self) -> None:
+        self.flush()
+        for sink in self._sinks:
+            sink.close()
+
+
+class NullMetrics(Metrics):
+    """
+    Metrics recording nothing, the default of proxies, storage and runners
+    """
+
+    enabled = False
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        pass
+
+    def gauge(self, name: str, value: float, **labels: Any) -> None:
+        pass
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        pass
+
+    def timer(self, name: str, **labels: Any) -> ContextManager[None]:
+        return nullcontext()
+
+
+NULL_METRICS = NullMetrics()
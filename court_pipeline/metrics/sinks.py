@@ -0,0 +1,282 @@
+from abc import ABC, abstractmethod
+import logging
+import os
+import socket
+from typing import Dict, List, Optional, Tuple
+
+from .registry import BUCKETS, COUNTER, GAUGE, Key, Snapshot
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_NAMESPACE = 'court_pipeline'
+# fits the payload of one UDP datagram on an Ethernet MTU
+STATSD_MAX_PACKET_SIZE = 1432
+
+
+class Sink(ABC):
+    """
+    Destination of metrics.
+    Sinks receive a snapshot of every metric on each flush of Metrics,
+    those with per_event set also receive every single event as it is recorded.
+    """
+
+    per_event = False
+
+    def record(self, kind: str, key: Key, value: float) -> None:
+        """
+        One event of a counter, gauge or timer, only called when per_event is set
+        """
+        pass
+
+    @abstractmethod
+    def emit(self, snapshot: Snapshot) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def describe(key: Key) -> str:
+    """
+    Readable form of a metric, e.g. 'http.requests endpoint=scoreboardv3 status=200'
+    """
+    name, labels = key
+    return ' '.join([name] + [f'{label}={value}' for label, value in labels])
+
+
+class SummarySink(Sink):
+    """
+    Keep the last snapshot in process, logged as a summary when closed
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: Snapshot = Snapshot()
+
+    @property
+    def snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    def emit(self, snapshot: Snapshot) -> None:
+        self._snapshot = snapshot
+
+    def lines(self) -> List[str]:
+        """
+        One line per metric, timers with their mean and estimated quantiles
+        """
+        snapshot = self._snapshot
+        lines = []
+        for key, value in sorted(snapshot.counters.items()):
+            lines.append(f'{describe(key)}: {value:g}')
+        for key, value in sorted(snapshot.gauges.items()):
+            lines.append(f'{describe(key)}: {value:g}')
+        for key, stats in sorted(snapshot.timers.items()):
+            lines.append(
+                f'{describe(key)}: count {stats.count}, mean {stats.mean * 1000:.1f}ms, '
+                f'p50 {stats.quantile(0.5) * 1000:.1f}ms, p99 {stats.quantile(0.99) * 1000:.1f}ms, '
+                f'max {stats.max * 1000:.1f}ms'
+            )
+        return lines
+
+    def close(self) -> None:
+        lines = self.lines()
+        if lines:
+            logger.info("metrics summary:\n  %s", '\n  '.join(lines))
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class PrometheusTextfileSink(Sink):
+    """
+    Write every metric in the Prometheus text format to a file,
+    e.g. for the textfile collector of node_exporter.
+    The file is replaced atomically so a scrape never reads it half written.
+    Timers are exported as histograms.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str = DEFAULT_NAMESPACE,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        :param path: file to write, conventionally with the .prom suffix
+        :type path: str
+        :param namespace: prefix of the metric names
+        :type namespace: str
+        :param labels: added to every metric, e.g. the shard,
+            so the files of several processes do not clash
+        :type labels: Optional[Dict[str, str]]
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._path: str = path
+        self._namespace: str = namespace
+        self._labels: Tuple[Tuple[str, str], ...] = tuple(sorted((labels or {}).items()))
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _name(self, name: str) -> str:
+        return f'{self._namespace}_{name}'.replace('.', '_').replace('-', '_')
+
+    def _labels_text(self, labels: Tuple[Tuple[str, str], ...], *extra: Tuple[str, str]) -> str:
+        pairs = self._labels + labels + extra
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{label}="{escape_label_value(value)}"' for label, value in pairs) + '}'
+
+    def render(self, snapshot: Snapshot) -> str:
+        lines: List[str] = []
+        typed = set()
+
+        def declare(name: str, kind: str) -> None:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {name} {kind}')
+
+        for (name, labels), value in sorted(snapshot.counters.items()):
+            metric = self._name(name) + '_total'
+            declare(metric, COUNTER)
+            lines.append(f'{metric}{self._labels_text(labels)} {value:g}')
+        for (name, labels), value in sorted(snapshot.gauges.items()):
+            metric = self._name(name)
+            declare(metric, GAUGE)
+            lines.append(f'{metric}{self._labels_text(labels)} {value:g}')
+        for (name, labels), stats in sorted(snapshot.timers.items()):
+            metric = self._name(name)
+            declare(metric, 'histogram')
+            cumulative = 0
+            for bound, count in zip(BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f'{metric}_bucket{self._labels_text(labels, ("le", f"{bound:g}"))} {cumulative}')
+            lines.append(f'{metric}_bucket{self._labels_text(labels, ("le", "+Inf"))} {stats.count}')
+            lines.append(f'{metric}_sum{self._labels_text(labels)} {stats.total:.6f}')
+            lines.append(f'{metric}_count{self._labels_text(labels)} {stats.count}')
+        return '\n'.join(lines) + '\n'
+
+    def emit(self, snapshot: Snapshot) -> None:
+        tmp_path = f'{self._path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render(snapshot))
+        os.replace(tmp_path, self._path)
+
+
+class StatsdSink(Sink):
+    """
+    Send every event to a StatsD-compatible daemon over UDP,
+    which aggregates them, quantiles of timers included.
+
+    Events are buffered into datagrams of at most max_packet_size bytes,
+    sent once full and on each flush, so recording rarely costs a system call.
+    Delivery is best effort, a datagram failing to send is dropped.
+    """
+
+    per_event = True
+
+    TYPES = {COUNTER: 'c', GAUGE: 'g'}
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 8125,
+        namespace: str = DEFAULT_NAMESPACE,
+        tags: bool = True,
+        max_packet_size: int = STATSD_MAX_PACKET_SIZE,
+    ) -> None:
+        """
+        :param host: host of the daemon
+        :type host: str
+        :param port: UDP port of the daemon
+        :type port: int
+        :param namespace: prefix of the metric names
+        :type namespace: str
+        :param tags: send labels as DogStatsD tags, e.g. '|#stage:fetch',
+            otherwise append label values to the metric name for plain StatsD
+        :type tags: bool
+        :param max_packet_size: bytes per datagram
+        :type max_packet_size: int
+        """
+        self._address: Tuple[str, int] = (host, port)
+        self._namespace: str = namespace
+        self._tags: bool = tags
+        self._max_packet_size: int = max_packet_size
+        self._socket: Optional[socket.socket] = None
+        self._buffer: List[bytes] = []
+        self._buffered: int = 0
+        # formatted name and tags of each key, built once
+        self._formats: Dict[Key, Tuple[str, str]] = {}
+        self._connect()
+
+    def _connect(self) -> None:
+        """
+        Connect the UDP socket to the daemon, so its host is resolved once rather than on every datagram
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.connect(self._address)
+        except OSError as e:
+            # e.g. the host does not resolve yet, tried again on the next send
+            logger.warning("could not connect to statsd at %s:%d: %r", *self._address, e)
+            sock.close()
+            return
+        sock.setblocking(False)
+        self._socket = sock
+
+    def _format(self, key: Key) -> Tuple[str, str]:
+        formatted = self._formats.get(key)
+        if formatted is None:
+            name, labels = key
+            name = f'{self._namespace}.{name}'
+            suffix = ''
+            if self._tags:
+                if labels:
+                    suffix = '|#' + ','.join(f'{label}:{value}' for label, value in labels)
+            else:
+                name = '.'.join([name] + [value.replace('.', '_') for _, value in labels])
+            formatted = self._formats[key] = (name, suffix)
+        return formatted
+
+    def record(self, kind: str, key: Key, value: float) -> None:
+        name, suffix = self._format(key)
+        if kind in self.TYPES:
+            line = f'{name}:{value:g}|{self.TYPES[kind]}{suffix}'
+        else:
+            line = f'{name}:{value * 1000:.3f}|ms{suffix}'
+        data = line.encode('utf-8')
+        if self._buffered + len(data) + 1 > self._max_packet_size:
+            self._send()
+        self._buffer.append(data)
+        self._buffered += len(data) + 1
+
+    def _send(self) -> None:
+        if not self._buffer:
+            return
+        packet = b'\n'.join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+        if self._socket is None:
+            self._connect()
+            if self._socket is None:
+                logger.debug("dropped statsd datagram, not connected")
+                return
+        try:
+            self._socket.send(packet)
+        except OSError as e:
+            logger.debug("dropped statsd datagram: %r", e)
+
+    def emit(self, snapshot: Snapshot) -> None:
+        # the daemon aggregates the events, only the buffered ones are left to send
+        self._send()
+
+    def close(self) -> None:
+        self._send()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
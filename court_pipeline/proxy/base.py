@@ -1,31 +1,95 @@
 from abc import ABC, abstractmethod
+import asyncio
 from contextlib import asynccontextmanager
+import json
 import logging
-from typing import Any, Dict, AsyncContextManager
+import time
+from typing import Any, Dict, AsyncContextManager, Optional
 
 import httpx
 
+from .cache import ResponseCache
 from .constants import BASE_URL, HEADERS
+from .exceptions import InvalidResponseError, NotModifiedError
+from .pool import ClientPool
+from .rate_limiter import AdaptiveRateLimiter, is_throttled
+from .retry import RetryPolicy
+from .trace import RequestTrace
+from .validators import ValidatorStore, Validators
+from ..metrics.registry import NULL_METRICS, Metrics
 
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_CACHE_TTL = 3600.0
+
+
 class BaseProxy(ABC):
 
-    def __init__(self, base_url: str, timeout: float = 30.0) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30.0,
+        pool: Optional[ClientPool] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        metrics: Optional[Metrics] = None,
+        validators: Optional[ValidatorStore] = None,
+    ) -> None:
         self._base_url: str = base_url.rstrip('/')
         self._timeout: float = timeout
+        self._pool: Optional[ClientPool] = pool
+        self._rate_limiter: Optional[AdaptiveRateLimiter] = rate_limiter
+        self._retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._cache: Optional[ResponseCache] = cache
+        self._metrics: Metrics = metrics if metrics is not None else NULL_METRICS
+        self._validators: Optional[ValidatorStore] = validators
         self.session_headers: Dict[str, str] = {}
 
+    @property
+    def pool(self) -> Optional[ClientPool]:
+        return self._pool
+
+    @property
+    def rate_limiter(self) -> Optional[AdaptiveRateLimiter]:
+        return self._rate_limiter
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self._cache
+
+    @property
+    def metrics(self) -> Metrics:
+        return self._metrics
+
+    @property
+    def validators(self) -> Optional[ValidatorStore]:
+        return self._validators
+
+    def build_headers(self) -> Dict[str, str]:
+        req_headers = dict(self.get_default_headers())
+        req_headers.update(self.session_headers)
+        return req_headers
+
     @asynccontextmanager
     async def client(self) -> AsyncContextManager[httpx.AsyncClient]:
-        req_headers = self.get_default_headers()
-        req_headers.update(self.session_headers)
+        """
+        Yield the pooled client when the proxy is attached to a pool,
+        otherwise a short-lived client closed on exit
+        """
+        if self._pool is not None:
+            yield self._pool.get_client(self._base_url)
+            return
 
         async with httpx.AsyncClient(
             base_url=self._base_url,
-            headers=req_headers,
+            headers=self.build_headers(),
             timeout=self._timeout
         ) as client:
             yield client
@@ -55,10 +119,241 @@ class BaseProxy(ABC):
         """
         pass
 
+    def cache_ttl(self, response: httpx.Response, *args: Any, **kwargs: Any) -> Optional[float]:
+        """
+        Seconds the validated response stays cached, None for ever and 0 for not at all.
+        Overwrite it in subclasses whose payloads become immutable at some point.
+        """
+        return DEFAULT_CACHE_TTL
+
+    def check_status(self, response: httpx.Response) -> None:
+        """
+        Raise InvalidResponseError unless the response has a 2xx status
+        """
+        if not response.is_success:
+            raise InvalidResponseError(
+                f'unexpected status {response.status_code} from {self.path}',
+                response,
+            )
+
+    def validate_response(self, response: httpx.Response) -> None:
+        """
+        Raise InvalidResponseError unless the response is a 2xx JSON response
+        """
+        self.check_status(response)
+        try:
+            json.loads(response.content)
+        except ValueError as e:
+            raise InvalidResponseError(
+                f'malformed JSON body from {self.path}: {e}',
+                response,
+            ) from e
+
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        params: Dict[str, Any],
+        stream: bool = False,
+        conditional_headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        limiter = self._rate_limiter
+        if limiter is not None:
+            await limiter.acquire()
+
+        metrics = self._metrics
+        # the trace extension is only set when recorded, it costs a callback per request phase
+        request_options: Dict[str, Any] = {}
+        if metrics.enabled:
+            request_options['extensions'] = {'trace': RequestTrace(metrics, self.path)}
+        # headers and timeout are per request since a pooled client is shared
+        headers = self.build_headers()
+        if conditional_headers:
+            headers.update(conditional_headers)
+        started = time.perf_counter()
+        try:
+            if stream:
+                request = client.build_request(
+                    'GET',
+                    self.path,
+                    params=params,
+                    headers=headers,
+                    timeout=self._timeout,
+                    **request_options,
+                )
+                response = await client.send(request, stream=True)
+            else:
+                response = await client.get(
+                    self.path,
+                    params=params,
+                    headers=headers,
+                    timeout=self._timeout,
+                    **request_options,
+                )
+        except Exception as e:
+            metrics.increment('http.requests', endpoint=self.path, status=type(e).__name__)
+            if limiter is not None and isinstance(e, httpx.TimeoutException):
+                self._report_to_limiter(limiter, throttled=True)
+            raise
+        metrics.observe('http.request.seconds', time.perf_counter() - started, endpoint=self.path)
+        metrics.increment('http.requests', endpoint=self.path, status=response.status_code)
+
+        if limiter is not None:
+            self._report_to_limiter(limiter, throttled=is_throttled(response.status_code))
+        return response
+
+    def _report_to_limiter(self, limiter: AdaptiveRateLimiter, throttled: bool) -> None:
+        """
+        Feed the outcome of a request back to the limiter, and record its rate and back-offs
+        """
+        if throttled:
+            # the limiter backs off at most once per cooldown
+            if limiter.on_throttle():
+                self._metrics.increment('http.rate_limit.backoffs')
+        else:
+            limiter.on_success()
+        self._metrics.gauge('http.rate_limit', limiter.rate)
+
+    async def _send_with_retry(
+        self,
+        client: httpx.AsyncClient,
+        params: Dict[str, Any],
+        stream: bool = False,
+        conditional_headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """
+        Send the request, retrying transient failures per the retry policy
+        """
+        policy = self._retry_policy
+        policy.record_request()
+        attempt = 0
+        while True:
+            attempt += 1
+            response: Optional[httpx.Response] = None
+            try:
+                response = await self._send(client, params, stream, conditional_headers)
+            except Exception as e:
+                if not policy.is_retryable_exception(e) or not policy.can_retry(attempt):
+                    raise
+                reason = repr(e)
+            else:
+                if not policy.is_retryable_response(response) or not policy.can_retry(attempt):
+                    return response
+                reason = f'status {response.status_code}'
+                if stream:
+                    await response.aclose()
+
+            delay = policy.backoff(attempt, response)
+            self._metrics.increment('http.retries', endpoint=self.path)
+            logger.info(
+                "retry %s %s in %.2fs after attempt %d: %s",
+                self.path, params, delay, attempt, reason,
+            )
+            await asyncio.sleep(delay)
+
+    async def _conditional_headers(self, params: Dict[str, Any]) -> Dict[str, str]:
+        """
+        If-None-Match and If-Modified-Since headers of the validators recorded for the request
+        """
+        if self._validators is None:
+            return {}
+        validators = await self._validators.get(self._validators.build_key(self.path, params))
+        return validators.request_headers() if validators is not None else {}
+
+    def _check_modified(self, response: httpx.Response, conditional_headers: Dict[str, str]) -> None:
+        if response.status_code == 304 and conditional_headers:
+            self._metrics.increment('http.not_modified', endpoint=self.path)
+            raise NotModifiedError(f'{self.path} not modified', response)
+
+    async def remember_validators(self, response: httpx.Response, *args: Any, **kwargs: Any) -> None:
+        """
+        Record the validators of the response, so the next fetch of the same request is conditional.
+        Must only be called once the payload of the response is stored,
+        a 304 Not Modified then stands for the stored payload.
+        """
+        if self._validators is None:
+            return
+        key = self._validators.build_key(self.path, self.build_http_params(*args, **kwargs))
+        validators = Validators.from_response(response)
+        if validators is None:
+            await self._validators.delete(key)
+        else:
+            await self._validators.set(key, validators)
+
+    async def forget_validators(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Drop the validators recorded for the request, so its next fetch is unconditional,
+        e.g. once the stored payload a 304 Not Modified would stand for is gone
+        """
+        if self._validators is None:
+            return
+        await self._validators.delete(self._validators.build_key(self.path, self.build_http_params(*args, **kwargs)))
+
     async def fetch(self, *args: Any, **kwargs: Any) -> httpx.Response:
+        """
+        Request the endpoint, retrying transient failures per the retry policy,
+        and return the response once validated.
+        With a cache, a fresh cached response is returned without any request,
+        marked with the 'from_cache' response extension.
+        With validators, the request is conditional on those recorded for it, see remember_validators(),
+        and NotModifiedError is raised on 304 Not Modified.
+        """
+        params = self.build_http_params(*args, **kwargs)
+        metrics = self._metrics
+        cache = self._cache
+        if cache is not None:
+            cache_key = cache.build_key(self.path, params)
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                metrics.increment('cache.hits', endpoint=self.path)
+                return cached
+            metrics.increment('cache.misses', endpoint=self.path)
+
+        conditional_headers = await self._conditional_headers(params)
+        async with self.client() as client:
+            response = await self._send_with_retry(client, params, conditional_headers=conditional_headers)
+        metrics.increment('http.bytes_in', len(response.content), endpoint=self.path)
+        self._check_modified(response, conditional_headers)
+        with metrics.timer('validate.seconds', endpoint=self.path):
+            self.validate_response(response)
+
+        if cache is not None:
+            ttl = self.cache_ttl(response, *args, **kwargs)
+            if ttl is None or ttl > 0:
+                await cache.set(cache_key, response, ttl)
+        return response
+
+    @asynccontextmanager
+    async def stream(self, *args: Any, **kwargs: Any) -> AsyncContextManager[httpx.Response]:
+        """
+        Request the endpoint like fetch, but yield the response before its body is read,
+        so the body can be consumed in chunks with bounded memory.
+        The body cannot be parsed up front, only the status and content type are validated.
+        Streamed responses bypass the cache, not the validators.
+        """
         params = self.build_http_params(*args, **kwargs)
+        conditional_headers = await self._conditional_headers(params)
         async with self.client() as client:
-            return await client.get(self.path, params=params)
+            response = await self._send_with_retry(
+                client,
+                params,
+                stream=True,
+                conditional_headers=conditional_headers,
+            )
+            try:
+                self._check_modified(response, conditional_headers)
+                if not response.is_success:
+                    await response.aread()
+                self.check_status(response)
+                content_type = response.headers.get('content-type', '')
+                if 'json' not in content_type:
+                    raise InvalidResponseError(
+                        f'unexpected content type {content_type!r} from {self.path}',
+                        response,
+                    )
+                yield response
+            finally:
+                await response.aclose()
+                self._metrics.increment('http.bytes_in', response.num_bytes_downloaded, endpoint=self.path)
 
 
 class NBAProxy(BaseProxy, ABC):
@@ -69,10 +364,20 @@ class NBAProxy(BaseProxy, ABC):
       - path: define the path of API endpoint
       - build_http_params: build HTTP parameters for the API request
       - fetch: only overwrite the docstring and arguments
+      - cache_ttl: optional, how long responses stay cached
     """
 
-    def __init__(self, timeout: float = 30.0) -> None:
-        super().__init__(BASE_URL, timeout)
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        pool: Optional[ClientPool] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        metrics: Optional[Metrics] = None,
+        validators: Optional[ValidatorStore] = None,
+    ) -> None:
+        super().__init__(BASE_URL, timeout, pool, rate_limiter, retry_policy, cache, metrics, validators)
 
     def get_default_headers(self) -> Dict[str, str]:
         return HEADERS
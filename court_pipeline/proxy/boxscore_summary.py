@@ -3,14 +3,11 @@ from typing import Any, Dict, Optional
 import httpx
 
 from .base import NBAProxy
+from .constants import GAME_STATUS_FINAL, LIVE_CACHE_TTL
 
 
 class BoxscoreSummaryProxy(NBAProxy):
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
-        self._game_id: Optional[str] = None
-
     @property
     def path(self) -> str:
         return 'boxscoresummaryv3'
@@ -24,10 +21,23 @@ class BoxscoreSummaryProxy(NBAProxy):
             'GameID': game_id,
         }
 
+    def cache_ttl(self, response: httpx.Response, game_id: str) -> Optional[float]:
+        """
+        Summary of a final game never changes
+
+        :param game_id: Identifier of game
+        :type game_id: str
+        """
+        payload = response.json()
+        # valid JSON of another shape is cached briefly rather than failing the fetch
+        summary = payload.get('boxScoreSummary') if isinstance(payload, dict) else None
+        if isinstance(summary, dict) and summary.get('gameStatus') == GAME_STATUS_FINAL:
+            return None
+        return LIVE_CACHE_TTL
+
     async def fetch(self, game_id: str) -> httpx.Response:
         """
         :param game_id: Identifier of game
         :type game_id: str
         """
-        self._game_id = game_id
         return await super().fetch(game_id=game_id)
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# content is cached decoded, headers describing the wire encoding no longer apply
+DROPPED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding'})
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    content BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of validated responses, shared by proxies.
+
+    Entries expire after the TTL given when stored, ``None`` meaning never.
+    When the content exceeds ``max_bytes`` in total,
+    expired and then least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        :param path: file of the SQLite database, created if missing
+        :type path: str
+        :param max_bytes: upper bound of the cached content size
+        :type max_bytes: int
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._max_bytes: int = max_bytes
+        self._clock: Callable[[], float] = clock
+        self._lock: threading.Lock = threading.Lock()
+        self._conn: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def build_key(path: str, params: Dict[str, Any]) -> str:
+        """
+        Key of a request, independent of the order of its parameters
+        """
+        canonical = json.dumps(
+            {'path': path, 'params': params},
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _get(self, key: str) -> Optional[httpx.Response]:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status_code, headers, content, expires_at FROM responses WHERE key = ?',
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            status_code, headers, content, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+        return httpx.Response(
+            status_code,
+            headers=json.loads(headers),
+            content=content,
+            extensions={'from_cache': True},
+        )
+
+    def _set(self, key: str, response: httpx.Response, ttl: Optional[float]) -> None:
+        now = self._clock()
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in DROPPED_HEADERS
+        }
+        content = response.content
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, status_code, headers, content, size, expires_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (
+                    key,
+                    response.status_code,
+                    json.dumps(headers),
+                    content,
+                    len(content),
+                    None if ttl is None else now + ttl,
+                    now,
+                ),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self._max_bytes:
+            return
+
+        evicted = []
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+            evicted.append((key,))
+            total -= size
+            if total <= self._max_bytes:
+                break
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', evicted)
+        logger.debug("evicted %d cached responses", len(evicted))
+
+    async def get(self, key: str) -> Optional[httpx.Response]:
+        """
+        Cached response of the key, None if missing or expired
+        """
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, response: httpx.Response, ttl: Optional[float]) -> None:
+        """
+        :param key: see build_key()
+        :type key: str
+        :param response: response with its content read
+        :type response: httpx.Response
+        :param ttl: seconds before the entry expires, None for never
+        :type ttl: Optional[float]
+        """
+        await asyncio.to_thread(self._set, key, response, ttl)
+
+    @property
+    def size(self) -> int:
+        """
+        Total size of the cached content in bytes
+        """
+        with self._lock:
+            return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
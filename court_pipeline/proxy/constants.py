@@ -19,3 +19,9 @@ HEADERS: Dict[str, str] = {
     'x-nba-stats-origin': 'stats',
     'x-nba-stats-token': 'true',
 }
+
+GAME_STATUS_SCHEDULED: int = 1
+GAME_STATUS_LIVE: int = 2
+GAME_STATUS_FINAL: int = 3
+# payloads of games not final yet keep changing
+LIVE_CACHE_TTL: float = 60.0
@@ -0,0 +1,31 @@
+import httpx
+
+
+class ProxyError(Exception):
+    """
+    Base exception of remote data source API requests
+    """
+
+
+class InvalidResponseError(ProxyError):
+    """
+    Response that must not be stored, e.g. non-2xx status or malformed JSON body
+    """
+
+    def __init__(self, message: str, response: httpx.Response) -> None:
+        super().__init__(message)
+        self.response: httpx.Response = response
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+
+class NotModifiedError(ProxyError):
+    """
+    304 Not Modified to a conditional request, the payload stored last time is still current
+    """
+
+    def __init__(self, message: str, response: httpx.Response) -> None:
+        super().__init__(message)
+        self.response: httpx.Response = response
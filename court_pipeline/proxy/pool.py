@@ -0,0 +1,114 @@
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+class ClientPool:
+    """
+    Long-lived pool of HTTP connections shared by proxies.
+
+    One ``httpx.AsyncClient`` is kept per base URL, so every proxy
+    attached to the pool reuses warm TCP/TLS connections instead of
+    opening a new client on each fetch.
+    The pool must be opened before use and closed when done,
+    either explicitly or as an async context manager.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        timeout: float = 30.0,
+    ) -> None:
+        """
+        :param max_connections: maximum number of concurrent connections per base URL
+        :type max_connections: Optional[int]
+        :param max_keepalive_connections: maximum number of idle connections kept alive
+        :type max_keepalive_connections: Optional[int]
+        :param keepalive_expiry: seconds an idle connection is kept alive
+        :type keepalive_expiry: Optional[float]
+        :param http2: whether to negotiate HTTP/2, requires the ``h2`` package
+        :type http2: bool
+        :param timeout: default timeout in seconds, proxies may override it per request
+        :type timeout: float
+        """
+        self._limits: httpx.Limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2: bool = http2
+        self._timeout: float = timeout
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._is_open: bool = False
+        self._requests: int = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._is_open
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return self._limits
+
+    @property
+    def requests(self) -> int:
+        """
+        Requests sent by the pooled clients so far, retries included and cache hits left out
+        """
+        return self._requests
+
+    async def _count_request(self, request: httpx.Request) -> None:
+        self._requests += 1
+
+    async def open(self) -> None:
+        if self._is_open:
+            return
+        if self._http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    "HTTP/2 support requires the 'h2' package, "
+                    "install it with 'pip install httpx[http2]'"
+                ) from e
+        self._is_open = True
+
+    async def close(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._is_open = False
+        for client in clients:
+            await client.aclose()
+
+    def get_client(self, base_url: str) -> httpx.AsyncClient:
+        """
+        Return the pooled client for the base URL, creating it on first use
+        """
+        if not self._is_open:
+            raise RuntimeError("ClientPool is not open")
+        client = self._clients.get(base_url)
+        if client is None:
+            logger.debug("open pooled client for %s", base_url)
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                timeout=self._timeout,
+                limits=self._limits,
+                http2=self._http2,
+                event_hooks={'request': [self._count_request]},
+            )
+            self._clients[base_url] = client
+        return client
+
+    async def __aenter__(self) -> "ClientPool":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
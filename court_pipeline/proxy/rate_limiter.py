@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+THROTTLE_STATUS_CODES = frozenset({429})
+
+
+def is_throttled(status_code: int) -> bool:
+    """
+    Whether the upstream signals overload with the status code
+    """
+    return status_code in THROTTLE_STATUS_CODES or status_code >= 500
+
+
+class AdaptiveRateLimiter:
+    """
+    Async token bucket whose refill rate adapts to upstream feedback (AIMD).
+
+    Every request takes one token, the bucket holds at most ``burst`` tokens.
+    Successful responses increase the rate additively by ``increase`` requests/sec
+    per second of traffic, throttling (429, 5xx, timeouts) multiplies it by
+    ``decrease_factor``, at most once per ``cooldown`` seconds so a wave of
+    concurrent failures only backs off once.
+    A limiter is meant to be shared by every proxy hitting the same upstream.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 5,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        increase: float = 0.5,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param rate: initial requests per second
+        :type rate: float
+        :param burst: capacity of the bucket
+        :type burst: int
+        :param min_rate: floor of the rate when backing off
+        :type min_rate: float
+        :param max_rate: ceiling of the rate when ramping up, default is twice the initial rate
+        :type max_rate: Optional[float]
+        :param increase: requests per second added per second of successful traffic
+        :type increase: float
+        :param decrease_factor: multiplier applied to the rate on throttling
+        :type decrease_factor: float
+        :param cooldown: minimum seconds between two consecutive back-offs
+        :type cooldown: float
+        """
+        if rate <= 0 or min_rate <= 0:
+            raise ValueError("rate and min_rate should be positive")
+        if burst < 1:
+            raise ValueError("burst should be a positive integer")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor should be between 0 and 1")
+        self._min_rate: float = min_rate
+        self._max_rate: float = max_rate if max_rate is not None else rate * 2
+        self._rate: float = min(max(rate, min_rate), self._max_rate)
+        self._burst: int = burst
+        self._increase: float = increase
+        self._decrease_factor: float = decrease_factor
+        self._cooldown: float = cooldown
+        self._clock: Callable[[], float] = clock
+        self._tokens: float = float(burst)
+        self._updated_at: float = clock()
+        self._backed_off_at: Optional[float] = None
+        self._throttle_count: int = 0
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        """
+        Current refill rate in requests per second
+        """
+        return self._rate
+
+    @property
+    def max_rate(self) -> float:
+        return self._max_rate
+
+    @property
+    def burst(self) -> int:
+        return self._burst
+
+    @property
+    def throttle_count(self) -> int:
+        """
+        Number of back-offs applied so far
+        """
+        return self._throttle_count
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+
+    async def acquire(self) -> None:
+        """
+        Wait until a token is available and take it, waiters are served in order
+        """
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def on_success(self) -> None:
+        self._rate = min(self._max_rate, self._rate + self._increase / self._rate)
+
+    def on_throttle(self) -> bool:
+        """
+        Back off, return whether it did, i.e. it is not within the cooldown of the last back-off
+        """
+        now = self._clock()
+        if self._backed_off_at is not None and now - self._backed_off_at < self._cooldown:
+            return False
+        self._refill()
+        self._backed_off_at = now
+        self._throttle_count += 1
+        self._rate = max(self._min_rate, self._rate * self._decrease_factor)
+        self._tokens = min(self._tokens, 1.0)
+        logger.info("upstream throttled, rate lowered to %.2f req/s", self._rate)
+        return True
@@ -0,0 +1,144 @@
+import logging
+import random
+from typing import Callable, FrozenSet, Optional, Tuple, Type
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+RETRYABLE_STATUS_CODES: FrozenSet[int] = frozenset({408, 429, 500, 502, 503, 504})
+RETRYABLE_EXCEPTIONS: Tuple[Type[Exception], ...] = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+
+
+class RetryBudget:
+    """
+    Cap retries to a ratio of the requests made, so a failing upstream
+    does not get hammered by a retry storm.
+    Share one budget across proxies to cap the retries of a whole run.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10) -> None:
+        """
+        :param ratio: retries allowed per first attempt
+        :type ratio: float
+        :param min_retries: retries always allowed, so that small runs can retry
+        :type min_retries: int
+        """
+        self._ratio: float = ratio
+        self._min_retries: int = min_retries
+        self._requests: int = 0
+        self._retries: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self._requests
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    def record_request(self) -> None:
+        self._requests += 1
+
+    def try_withdraw(self) -> bool:
+        """
+        Spend one retry, return False if the budget is exhausted
+        """
+        if self._retries >= self._min_retries + self._ratio * self._requests:
+            return False
+        self._retries += 1
+        return True
+
+
+class RetryPolicy:
+    """
+    Decide whether and when a request is retried:
+    exponential backoff with full jitter, capped by ``max_delay``,
+    limited by ``max_attempts`` and an optional retry budget.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        budget: Optional[RetryBudget] = None,
+        retryable_status_codes: FrozenSet[int] = RETRYABLE_STATUS_CODES,
+        retryable_exceptions: Tuple[Type[Exception], ...] = RETRYABLE_EXCEPTIONS,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        """
+        :param max_attempts: attempts per request including the first one
+        :type max_attempts: int
+        :param base_delay: seconds of the first backoff ceiling
+        :type base_delay: float
+        :param max_delay: upper bound of any backoff in seconds
+        :type max_delay: float
+        :param budget: retry budget, unlimited when omitted
+        :type budget: Optional[RetryBudget]
+        :param retryable_status_codes: status codes worth retrying
+        :type retryable_status_codes: FrozenSet[int]
+        :param retryable_exceptions: transport exceptions worth retrying
+        :type retryable_exceptions: Tuple[Type[Exception], ...]
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts should be a positive integer")
+        self._max_attempts: int = max_attempts
+        self._base_delay: float = base_delay
+        self._max_delay: float = max_delay
+        self._budget: Optional[RetryBudget] = budget
+        self._retryable_status_codes: FrozenSet[int] = retryable_status_codes
+        self._retryable_exceptions: Tuple[Type[Exception], ...] = retryable_exceptions
+        self._rng: Callable[[], float] = rng
+
+    @property
+    def max_attempts(self) -> int:
+        return self._max_attempts
+
+    @property
+    def budget(self) -> Optional[RetryBudget]:
+        return self._budget
+
+    def is_retryable_response(self, response: httpx.Response) -> bool:
+        return response.status_code in self._retryable_status_codes
+
+    def is_retryable_exception(self, exc: Exception) -> bool:
+        return isinstance(exc, self._retryable_exceptions)
+
+    def record_request(self) -> None:
+        if self._budget is not None:
+            self._budget.record_request()
+
+    def can_retry(self, attempt: int) -> bool:
+        """
+        :param attempt: number of attempts made so far
+        :type attempt: int
+        """
+        if attempt >= self._max_attempts:
+            return False
+        if self._budget is not None and not self._budget.try_withdraw():
+            logger.warning("retry budget exhausted")
+            return False
+        return True
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """
+        Seconds to wait before the next attempt,
+        honoring a numeric Retry-After header of the response
+
+        :param attempt: number of attempts made so far
+        :type attempt: int
+        """
+        ceiling = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        delay = self._rng() * ceiling
+        if response is not None:
+            retry_after = response.headers.get('retry-after', '')
+            if retry_after.isdigit():
+                delay = max(delay, min(self._max_delay, float(retry_after)))
+        return delay
@@ -4,15 +4,12 @@ from typing import Any, Dict, Optional
 import httpx
 
 from .base import NBAProxy
+from .constants import GAME_STATUS_FINAL, LIVE_CACHE_TTL
+from ..utils.scoreboard import game_date_today
 
 
 class ScoreboardProxy(NBAProxy):
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
-        self._game_date: Optional[datetime.date] = None
-        self._league_id: Optional[str] = None
-
     @property
     def path(self) -> str:
         return 'scoreboardv3'
@@ -33,6 +30,34 @@ class ScoreboardProxy(NBAProxy):
             'LeagueID': league_id,
         }
 
+    def cache_ttl(
+        self,
+        response: httpx.Response,
+        game_date: datetime.date,
+        league_id: str = "00",
+    ) -> Optional[float]:
+        """
+        Scoreboard of a past date whose games are all final never changes,
+        dates being past in US Eastern time as scoreboards are dated
+
+        :param game_date: game date in format YYYY-MM-DD
+        :type game_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        """
+        payload = response.json()
+        # valid JSON of another shape is cached briefly rather than failing the fetch
+        scoreboard = payload.get('scoreboard') if isinstance(payload, dict) else None
+        if not isinstance(scoreboard, dict):
+            return LIVE_CACHE_TTL
+        games = scoreboard.get('games') or []
+        is_final = isinstance(games, list) and all(
+            isinstance(game, dict) and game.get('gameStatus') == GAME_STATUS_FINAL for game in games
+        )
+        if game_date < game_date_today() and is_final:
+            return None
+        return LIVE_CACHE_TTL
+
     async def fetch(
         self,
         game_date: datetime.date,
@@ -44,8 +69,6 @@ class ScoreboardProxy(NBAProxy):
         :param league_id: Identifier of league, default is '00' for National Basketball Association
         :type league_id: str
         """
-        self._game_date = game_date
-        self._league_id = league_id
         return await super().fetch(
             game_date=game_date,
             league_id=league_id,
@@ -0,0 +1,49 @@
+import time
+from typing import Any, Dict
+
+from ..metrics.registry import Metrics
+
+
+# httpcore trace steps timed on their own
+STEP_METRICS = {
+    'connect_tcp': 'http.connect.seconds',
+    'start_tls': 'http.tls.seconds',
+    'receive_response_body': 'http.download.seconds',
+}
+
+
+class RequestTrace:
+    """
+    Callback of the httpx 'trace' request extension timing the phases of one request:
+    connect, which includes DNS resolution as httpcore does not report it apart,
+    TLS handshake, time to first byte from sending the headers to receiving the response headers,
+    and download of the body.
+    Requests on a reused connection skip connect and TLS.
+    """
+
+    __slots__ = ('_metrics', '_endpoint', '_started')
+
+    def __init__(self, metrics: Metrics, endpoint: str) -> None:
+        self._metrics: Metrics = metrics
+        self._endpoint: str = endpoint
+        self._started: Dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        # e.g. 'connection.connect_tcp.started' or 'http11.receive_response_body.complete'
+        step, _, phase = event_name.rpartition('.')
+        step = step.rpartition('.')[2]
+        if phase == 'started':
+            self._started[step] = time.perf_counter()
+            return
+        if phase != 'complete':
+            return
+        now = time.perf_counter()
+        if step == 'receive_response_headers':
+            started = self._started.get('send_request_headers')
+            if started is not None:
+                self._metrics.observe('http.ttfb.seconds', now - started, endpoint=self._endpoint)
+            return
+        name = STEP_METRICS.get(step)
+        started = self._started.get(step)
+        if name is not None and started is not None:
+            self._metrics.observe(name, now - started, endpoint=self._endpoint)
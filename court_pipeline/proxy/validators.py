@@ -0,0 +1,132 @@
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from .cache import ResponseCache
+
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS validators (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class Validators:
+    """
+    Cache validators of a response, which make the next request of the same resource conditional
+    """
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> Optional["Validators"]:
+        """
+        Validators of the response, None if it has neither ETag nor Last-Modified
+        """
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        if etag is None and last_modified is None:
+            return None
+        return cls(etag=etag, last_modified=last_modified)
+
+    def request_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ValidatorStore:
+    """
+    SQLite-backed validators of the responses stored so far, shared by proxies,
+    keyed by request like ResponseCache.
+
+    Validators are to be recorded once the payload of their response is stored,
+    a 304 Not Modified then tells the stored payload is still current.
+    """
+
+    build_key = staticmethod(ResponseCache.build_key)
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time) -> None:
+        """
+        :param path: file of the SQLite database, created if missing
+        :type path: str
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._clock: Callable[[], float] = clock
+        self._lock: threading.Lock = threading.Lock()
+        self._conn: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def _get(self, key: str) -> Optional[Validators]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified FROM validators WHERE key = ?',
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return Validators(etag=row[0], last_modified=row[1])
+
+    def _set(self, key: str, validators: Validators) -> None:
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO validators (key, etag, last_modified, updated_at) VALUES (?, ?, ?, ?)',
+                (key, validators.etag, validators.last_modified, self._clock()),
+            )
+            self._conn.commit()
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM validators WHERE key = ?', (key,))
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[Validators]:
+        """
+        Validators of the key, None if unknown
+        """
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, validators: Validators) -> None:
+        """
+        :param key: see build_key()
+        :type key: str
+        :param validators: validators of the stored response
+        :type validators: Validators
+        """
+        await asyncio.to_thread(self._set, key, validators)
+
+    async def delete(self, key: str) -> None:
+        """
+        Forget the validators of the key, its next request is unconditional
+        """
+        await asyncio.to_thread(self._delete, key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM validators').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
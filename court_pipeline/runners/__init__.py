@@ -0,0 +1,3 @@
+"""
+Runner module for batch extraction with bounded concurrency
+"""
@@ -0,0 +1,743 @@
+import asyncio
+import collections
+import datetime
+import functools
+import itertools
+import logging
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import httpx
+
+from .dead_letter import DeadLetterStore
+from .journal import Journal
+from .pipeline import SKIPPED, Pipeline, Stage, StageConfig
+from .shard import HASH, PARTITIONS, ROUND_ROBIN, Shard
+from .report import RunReport, StageStats, TaskResult  # noqa: F401
+from ..metrics.registry import NULL_METRICS, Metrics
+from ..proxy.cache import ResponseCache
+from ..proxy.exceptions import InvalidResponseError, NotModifiedError
+from ..proxy.pool import ClientPool
+from ..proxy.rate_limiter import AdaptiveRateLimiter
+from ..proxy.retry import RetryPolicy
+from ..proxy.validators import ValidatorStore
+from ..s3.dedup import CHANGED, UNCHANGED
+from ..utils.scoreboard import game_date_today
+
+
+logger = logging.getLogger(__name__)
+
+
+PIPELINE_STAGES = ('fetch', 'transform', 'store')
+
+
+class BaseRunner(ABC):
+    """
+    Run extraction tasks with bounded concurrency
+
+    implement the following methods for subclasses:
+      - create_extractor: build the extractor shared by all tasks of a run
+      - task_key: identify a task in the run report
+      - run_task: extract a single task with the extractor
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 16,
+        pool: Optional[ClientPool] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        incremental: bool = False,
+        refresh_window: Optional[datetime.timedelta] = None,
+        codec: Optional[str] = None,
+        streaming: bool = False,
+        cache: Optional[ResponseCache] = None,
+        stages: Optional[Dict[str, StageConfig]] = None,
+        journal: Optional[Journal] = None,
+        dead_letters: Optional[DeadLetterStore] = None,
+        metrics: Optional[Metrics] = None,
+        packed: bool = False,
+        dedup: bool = False,
+        validators: Optional[ValidatorStore] = None,
+        prioritized: bool = False,
+    ) -> None:
+        """
+        :param concurrency: maximum number of tasks running at once
+        :type concurrency: int
+        :param pool: shared client pool, a pool sized to the concurrency
+            is opened for the run when omitted
+        :type pool: Optional[ClientPool]
+        :param rate_limiter: limiter shared by every request of the run, unlimited when omitted
+        :type rate_limiter: Optional[AdaptiveRateLimiter]
+        :param retry_policy: retry policy shared by every request of the run,
+            so its retry budget caps the retries of the whole run
+        :type retry_policy: Optional[RetryPolicy]
+        :param incremental: skip tasks whose objects are already stored
+        :type incremental: bool
+        :param refresh_window: in incremental mode, still extract tasks
+            whose reference date falls within this window before today
+        :type refresh_window: Optional[datetime.timedelta]
+        :param codec: compression of stored objects, see S3MixIn.configure_storage
+        :type codec: Optional[str]
+        :param streaming: pipe responses to storage in chunks rather than buffering them
+        :type streaming: bool
+        :param cache: response cache shared by every request of the run
+        :type cache: Optional[ResponseCache]
+        :param stages: run tasks through separate 'fetch', 'transform' and 'store' stages,
+            each with its own workers and queue, rather than one worker per task.
+            Stages left out get concurrency workers and queue slots.
+        :type stages: Optional[Dict[str, StageConfig]]
+        :param journal: record the outcome of every task, and skip tasks
+            the journal already records as succeeded, so a rerun resumes an interrupted one
+        :type journal: Optional[Journal]
+        :param dead_letters: record tasks failing permanently, e.g. 404 or malformed JSON,
+            and leave them out of later runs until they are replayed
+        :type dead_letters: Optional[DeadLetterStore]
+        :param metrics: timers and counters of requests, storage calls, stages and tasks,
+            flushed to its sinks at the end of each run
+        :type metrics: Optional[Metrics]
+        :param packed: pack stored objects into archive parts per prefix, see S3MixIn.configure_storage
+        :type packed: bool
+        :param dedup: skip uploads of objects stored with the same content, counted in the run report
+        :type dedup: bool
+        :param validators: make requests conditional on the validators of the responses stored so far,
+            payloads answered with 304 Not Modified are counted as unchanged in the run report
+        :type validators: Optional[ValidatorStore]
+        :param prioritized: run queued tasks by task_priority() rather than in order,
+            so urgent tasks of one source overtake those of a slower one, see run().
+            Only the tasks queued at once, up to concurrency, are reordered
+        :type prioritized: bool
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency should be a positive integer")
+        if stages is not None:
+            unknown = set(stages) - set(PIPELINE_STAGES)
+            if unknown:
+                raise ValueError(f"unknown stages {sorted(unknown)}, expected {list(PIPELINE_STAGES)}")
+            if streaming:
+                raise ValueError("streaming pipes fetch into store and cannot be split into stages")
+            if prioritized:
+                raise ValueError("stages have queues of their own, only workers can run tasks by priority")
+        self._concurrency: int = concurrency
+        self._pool: Optional[ClientPool] = pool
+        self._rate_limiter: Optional[AdaptiveRateLimiter] = rate_limiter
+        self._retry_policy: Optional[RetryPolicy] = retry_policy
+        self._incremental: bool = incremental
+        self._refresh_window: Optional[datetime.timedelta] = refresh_window
+        self._codec: Optional[str] = codec
+        self._streaming: bool = streaming
+        self._cache: Optional[ResponseCache] = cache
+        self._stages: Optional[Dict[str, StageConfig]] = stages
+        self._journal: Optional[Journal] = journal
+        self._dead_letters: Optional[DeadLetterStore] = dead_letters
+        self._metrics: Metrics = metrics if metrics is not None else NULL_METRICS
+        self._packed: bool = packed
+        self._dedup: bool = dedup
+        self._validators: Optional[ValidatorStore] = validators
+        self._prioritized: bool = prioritized
+        self._store_outcomes: collections.Counter = collections.Counter()
+        # packed tasks by key, whose result waits for the upload of their archive part
+        self._unarchived: Dict[str, Optional[TaskResult]] = {}
+        self._extractor: Optional[Any] = None
+        self._completed: int = 0
+        self._bytes_fetched: int = 0
+        self._requests: int = 0
+        self._run_date: datetime.date = game_date_today()
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    @property
+    def pool(self) -> Optional[ClientPool]:
+        return self._pool
+
+    @property
+    def rate_limiter(self) -> Optional[AdaptiveRateLimiter]:
+        return self._rate_limiter
+
+    @property
+    def retry_policy(self) -> Optional[RetryPolicy]:
+        return self._retry_policy
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self._cache
+
+    @property
+    def validators(self) -> Optional[ValidatorStore]:
+        return self._validators
+
+    @property
+    def journal(self) -> Optional[Journal]:
+        return self._journal
+
+    @property
+    def dead_letters(self) -> Optional[DeadLetterStore]:
+        return self._dead_letters
+
+    @property
+    def metrics(self) -> Metrics:
+        return self._metrics
+
+    @property
+    def prioritized(self) -> bool:
+        return self._prioritized
+
+    @property
+    def run_date(self) -> datetime.date:
+        """
+        Game date the current or last run started on, task priorities are relative to it
+        """
+        return self._run_date
+
+    @property
+    def incremental(self) -> bool:
+        return self._incremental
+
+    @property
+    def completed(self) -> int:
+        """
+        Tasks ended so far in the current or last run, for progress reporting
+        """
+        return self._completed
+
+    @property
+    def extractor(self) -> Any:
+        if self._extractor is None:
+            raise RuntimeError("extractor is only available during a run")
+        return self._extractor
+
+    @abstractmethod
+    def create_extractor(self) -> Any:
+        """
+        Build the extractor shared by all tasks of a run,
+        bound to the client pool, rate limiter, retry policy, cache and metrics of the run
+        """
+        pass
+
+    @abstractmethod
+    def task_key(self, **params: Any) -> str:
+        """
+        Key of the task in the run report
+        """
+        pass
+
+    @abstractmethod
+    async def run_task(self, **params: Any) -> None:
+        """
+        Extract a single task, raise on failure
+        """
+        pass
+
+    def task_priority(self, **params: Any) -> int:
+        """
+        Priority of the task in a prioritized run, lower runs first.
+        Tasks of the same priority run in the order they are queued.
+        """
+        return 0
+
+    async def extract(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Extract with the extractor of the run, streaming if the runner is set to
+        """
+        if self._streaming:
+            size = await self.extractor.extract_streaming(*args, **kwargs)
+        else:
+            size = await self.extractor.extract(*args, **kwargs)
+        if isinstance(size, int):
+            self._bytes_fetched += size
+
+    def partition_value(self, partition: str, **params: Any) -> Union[int, str]:
+        """
+        Value deciding the shard of the task, see Shard.owns().
+        Subclasses support partitions other than 'hash' where their parameters allow.
+        """
+        if partition == HASH:
+            return self.task_key(**params)
+        raise ValueError(f"{type(self).__name__} cannot partition by {partition}")
+
+    def shard_tasks(
+        self,
+        tasks: Iterable[Dict[str, Any]],
+        shard: Shard,
+        partition: str = HASH,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Tasks of the shard, the same partition must be used by every shard of a job
+
+        :param tasks: keyword arguments of run_task for each task
+        :type tasks: Iterable[Dict[str, Any]]
+        :param shard: share of the job to keep
+        :type shard: Shard
+        :param partition: one of 'round-robin', 'hash', 'season' and 'league'
+        :type partition: str
+        """
+        if partition not in PARTITIONS:
+            raise ValueError(f"unknown partition {partition}, expected one of {list(PARTITIONS)}")
+        if partition == ROUND_ROBIN:
+            return shard.take_every(tasks)
+        return shard.take(tasks, lambda params: self.partition_value(partition, **params))
+
+    def dump_params(self, **params: Any) -> Dict[str, Any]:
+        """
+        JSON-serializable form of the task parameters, see load_params()
+        """
+        return dict(params)
+
+    def load_params(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Task parameters from the form of dump_params()
+        """
+        return dict(data)
+
+    def is_permanent_failure(self, error: Exception) -> bool:
+        """
+        Whether running the task again would fail the same way,
+        i.e. a response which is neither valid nor worth a retry
+        """
+        if not isinstance(error, InvalidResponseError):
+            return False
+        retry_policy = self._retry_policy or RetryPolicy()
+        return not retry_policy.is_retryable_response(error.response)
+
+    async def _dead_letter(self, params: Dict[str, Any], error: Exception) -> None:
+        if self._dead_letters is None or not self.is_permanent_failure(error):
+            return
+        await asyncio.to_thread(
+            self._dead_letters.add,
+            self.task_key(**params),
+            self.dump_params(**params),
+            error,
+        )
+
+    async def fetch_task(self, **params: Any) -> Any:
+        """
+        Fetch stage of a pipelined run, the validated response of the task
+        """
+        if await self.should_skip(**params):
+            return SKIPPED
+        return await self.extractor.fetch(**params)
+
+    def transform_task(self, content: bytes, **params: Any) -> bytes:
+        """
+        Transform stage of a pipelined run, the content to store
+        """
+        return content
+
+    async def store_task(self, content: bytes, **params: Any) -> None:
+        """
+        Store stage of a pipelined run
+        """
+        extractor = self.extractor
+        await extractor.store_object(content, "application/json", extractor.object_name(**params))
+
+    def build_pipeline(self) -> Pipeline:
+        """
+        fetch -> transform -> store stages, passing (params, response, payload) triples along
+        """
+        stages = self._stages or {}
+        default = StageConfig(workers=self._concurrency, queue_size=self._concurrency)
+
+        async def fetch(params: Dict[str, Any]) -> Any:
+            try:
+                response = await self.fetch_task(**params)
+            except NotModifiedError:
+                self.extractor.count_store(UNCHANGED)
+                return SKIPPED
+            except Exception as e:
+                await self._dead_letter(params, e)
+                raise
+            if response is SKIPPED:
+                return SKIPPED
+            self._bytes_fetched += len(response.content)
+            return params, response, response.content
+
+        async def transform(
+            task: Tuple[Dict[str, Any], httpx.Response, bytes],
+        ) -> Tuple[Dict[str, Any], httpx.Response, bytes]:
+            params, response, content = task
+            return params, response, self.transform_task(content, **params)
+
+        async def store(task: Tuple[Dict[str, Any], httpx.Response, bytes]) -> None:
+            params, response, content = task
+            await self.store_task(content, **params)
+            self._hold_until_archived(params)
+            # only once stored, a later 304 stands for the stored payload
+            await self.extractor.remember_validators_once_stored(response, **params)
+
+        handlers = {'fetch': fetch, 'transform': transform, 'store': store}
+        return Pipeline(
+            [
+                Stage(name=name, handler=handlers[name], config=stages.get(name, default))
+                for name in PIPELINE_STAGES
+            ],
+            key=lambda params: self.task_key(**params),
+            metrics=self._metrics,
+        )
+
+    @asynccontextmanager
+    async def _open_pool(self) -> AsyncContextManager[ClientPool]:
+        if self._pool is not None:
+            yield self._pool
+            return
+
+        async with ClientPool(max_connections=self._concurrency) as pool:
+            self._pool = pool
+            try:
+                yield pool
+            finally:
+                self._pool = None
+
+    @asynccontextmanager
+    async def _open_session(self) -> AsyncContextManager[Any]:
+        async with self._open_pool() as pool:
+            requests = pool.requests
+            extractor = self.create_extractor()
+            store_workers = self._concurrency
+            if self._stages is not None and 'store' in self._stages:
+                store_workers = self._stages['store'].workers
+            # storage scales with the run rather than with the default executor
+            extractor.configure_storage(
+                max_workers=store_workers,
+                max_in_flight=store_workers,
+                codec=self._codec,
+                packed=self._packed,
+                dedup=self._dedup,
+            )
+            self._extractor = extractor
+            try:
+                yield extractor
+            finally:
+                self._extractor = None
+                self._requests += pool.requests - requests
+                try:
+                    await extractor.flush_archives()
+                except Exception as e:
+                    # parts failing again are dropped along with the extractor, their tasks fail
+                    logger.error("archive parts not uploaded, failing their %d tasks: %r", len(self._unarchived), e)
+                    self._fail_unarchived(e)
+                finally:
+                    # waits for uploads in flight, off the event loop
+                    await asyncio.to_thread(extractor.close_storage)
+                    self._store_outcomes.update(extractor.store_outcomes)
+
+    async def should_skip(self, **params: Any) -> bool:
+        """
+        In incremental mode, skip the task if its object is stored and not recent
+        """
+        if not self._incremental:
+            return False
+        extractor = self.extractor
+        if self._refresh_window is not None and extractor.is_recent(self._refresh_window, **params):
+            return False
+        return await extractor.is_stored(**params)
+
+    async def _execute(self, params: Dict[str, Any]) -> TaskResult:
+        # a task whose params do not fit fails on its own rather than taking its worker down
+        key = repr(params)
+        started = time.perf_counter()
+        try:
+            key = self.task_key(**params)
+            if await self.should_skip(**params):
+                return TaskResult(
+                    key=key,
+                    succeeded=True,
+                    skipped=True,
+                    elapsed=time.perf_counter() - started,
+                )
+            await self.run_task(**params)
+            self._hold_until_archived(params)
+        except Exception as e:
+            logger.warning("task %s failed: %r", key, e)
+            await self._dead_letter(params, e)
+            return TaskResult(
+                key=key,
+                succeeded=False,
+                error=f'{type(e).__name__}: {e}',
+                elapsed=time.perf_counter() - started,
+            )
+        return TaskResult(
+            key=key,
+            succeeded=True,
+            elapsed=time.perf_counter() - started,
+        )
+
+    async def run(
+        self,
+        tasks: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        *more_tasks: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+    ) -> RunReport:
+        """
+        Run the tasks and report per-task success or failure
+
+        :param tasks: keyword arguments of run_task for each task,
+            consumed lazily so large ranges are never materialized.
+            An async iterable is consumed within the session of the run,
+            so it may itself use the client pool, e.g. to discover tasks.
+        :type tasks: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+        :param more_tasks: other sources of tasks consumed side by side, e.g. live games next to a backfill,
+            sharing the workers and rate limiter of the run. The run ends once every source is exhausted.
+            Prioritized runs take the most urgent queued task first whatever its source.
+        :type more_tasks: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+        """
+        return await self._run([tasks, *more_tasks], skip_dead_letters=True)
+
+    async def replay(self) -> RunReport:
+        """
+        Run the dead-lettered tasks again, those succeeding leave the dead letters
+        """
+        if self._dead_letters is None:
+            raise RuntimeError("replay requires a dead letter store")
+        letters = await asyncio.to_thread(self._dead_letters.load)
+        logger.info("replaying %d dead-lettered tasks", len(letters))
+        report = await self._run(
+            [(self.load_params(letter.params) for letter in letters.values())],
+            skip_dead_letters=False,
+        )
+        await asyncio.to_thread(
+            self._dead_letters.remove,
+            [result.key for result in report.succeeded],
+        )
+        return report
+
+    async def _run(
+        self,
+        sources: Sequence[Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]],
+        skip_dead_letters: bool,
+    ) -> RunReport:
+        started = time.perf_counter()
+        self._run_date = game_date_today()
+        self._completed = 0
+        self._bytes_fetched = 0
+        self._requests = 0
+        self._store_outcomes.clear()
+        self._unarchived.clear()
+        completed: Set[str] = set()
+        dead_letters: Dict[str, str] = {}
+        if self._journal is not None:
+            completed = await asyncio.to_thread(self._journal.completed_keys)
+            if completed:
+                logger.info("resuming %s, %d tasks already succeeded", self._journal.job, len(completed))
+        if skip_dead_letters and self._dead_letters is not None:
+            letters = await asyncio.to_thread(self._dead_letters.load)
+            dead_letters = {key: letter.error for key, letter in letters.items()}
+        left_out: List[TaskResult] = []
+        if completed or dead_letters:
+            sources = [self._leave_out(tasks, completed, dead_letters, left_out) for tasks in sources]
+        tasks = sources[0] if len(sources) == 1 else merge_tasks(*sources)
+
+        try:
+            if self._stages is not None:
+                report = await self._run_pipeline(tasks)
+            else:
+                report = await self._run_workers(tasks)
+        finally:
+            # keep what was done even if the run is interrupted
+            if self._journal is not None:
+                await asyncio.to_thread(self._journal.flush)
+
+        report.results.extend(left_out)
+        report.bytes_fetched = self._bytes_fetched
+        report.requests = self._requests
+        report.objects_changed = self._store_outcomes[CHANGED]
+        report.objects_unchanged = self._store_outcomes[UNCHANGED]
+        report.elapsed = time.perf_counter() - started
+        self._log_report(report)
+        self._metrics.flush()
+        return report
+
+    async def _leave_out(
+        self,
+        tasks: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        completed: Set[str],
+        dead_letters: Dict[str, str],
+        left_out: List[TaskResult],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Leave out the tasks succeeded in a previous run, reported as skipped,
+        and the dead-lettered ones, reported as failed without a request
+        """
+        if not isinstance(tasks, AsyncIterable):
+            tasks = _aiter(tasks)
+        async for params in tasks:
+            key = self.task_key(**params)
+            if key in completed:
+                left_out.append(TaskResult(key=key, succeeded=True, skipped=True))
+                continue
+            if key in dead_letters:
+                left_out.append(TaskResult(key=key, succeeded=False, error=f'dead-lettered: {dead_letters[key]}'))
+                continue
+            yield params
+
+    def _hold_until_archived(self, params: Dict[str, Any]) -> None:
+        """
+        In packed mode, hold the result of the task until the archive part packing its object is uploaded,
+        so the task is not journaled as succeeded while its payload may still be lost
+        """
+        if not self._packed:
+            return
+        key = self.task_key(**params)
+        extractor = self.extractor
+        if extractor.on_archived(extractor.object_name(**params), functools.partial(self._archived, key)):
+            self._unarchived[key] = None
+
+    async def _archived(self, key: str) -> None:
+        result = self._unarchived.pop(key, None)
+        if result is not None:
+            self._account(result)
+
+    def _fail_unarchived(self, error: Exception) -> None:
+        for result in self._unarchived.values():
+            if result is not None:
+                result.succeeded = False
+                result.error = f'archive part not uploaded, {type(error).__name__}: {error}'
+                self._account(result)
+        self._unarchived.clear()
+
+    def _record(self, result: TaskResult) -> None:
+        self._completed += 1
+        if result.key in self._unarchived:
+            # accounted once its archive part is uploaded, see _hold_until_archived()
+            self._unarchived[result.key] = result
+            return
+        self._account(result)
+
+    def _account(self, result: TaskResult) -> None:
+        if result.skipped:
+            outcome = 'skipped'
+        else:
+            outcome = 'succeeded' if result.succeeded else 'failed'
+        self._metrics.increment('tasks', outcome=outcome)
+        if self._journal is not None:
+            self._journal.record(result)
+
+    async def _run_workers(
+        self,
+        tasks: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+    ) -> RunReport:
+        report = RunReport()
+        queue: asyncio.Queue
+        if self._prioritized:
+            queue = asyncio.PriorityQueue(maxsize=self._concurrency)
+        else:
+            queue = asyncio.Queue(maxsize=self._concurrency)
+        # breaks ties in the order tasks are queued, params are not comparable
+        sequence = itertools.count()
+
+        async def put(params: Dict[str, Any]) -> None:
+            if self._prioritized:
+                await queue.put((self.task_priority(**params), next(sequence), params))
+            else:
+                await queue.put(params)
+
+        async def worker() -> None:
+            while True:
+                item = await queue.get()
+                params = item[-1] if self._prioritized else item
+                self._metrics.gauge('queue.depth', queue.qsize(), stage='tasks')
+                try:
+                    result = await self._execute(params)
+                    report.results.append(result)
+                    self._record(result)
+                finally:
+                    queue.task_done()
+
+        async with self._open_session():
+            workers = [asyncio.create_task(worker()) for _ in range(self._concurrency)]
+            try:
+                if isinstance(tasks, AsyncIterable):
+                    async for params in tasks:
+                        await put(params)
+                else:
+                    for params in tasks:
+                        await put(params)
+                await queue.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+        return report
+
+    async def _run_pipeline(
+        self,
+        tasks: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+    ) -> RunReport:
+        async with self._open_session():
+            return await self.build_pipeline().run(tasks, on_result=self._record)
+
+    @staticmethod
+    def _log_report(report: RunReport) -> None:
+        logger.info(
+            "run finished: %d succeeded (%d skipped), %d failed in %.2fs, %.1f tasks/s, %.1f requests/s, %.2f MB/s",
+            len(report.succeeded),
+            len(report.skipped),
+            len(report.failed),
+            report.elapsed,
+            report.tasks_per_second,
+            report.requests_per_second,
+            report.megabytes_per_second,
+        )
+
+
+async def _aiter(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+async def merge_tasks(
+    *sources: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Tasks of every source as they come, each source consumed by a task of its own,
+    so a source waiting e.g. on a poll does not hold back the others.
+    A task ready in one source waits behind at most one task of each other source.
+    A failing source fails the merge, the other sources are closed.
+    """
+    merged: asyncio.Queue = asyncio.Queue(maxsize=1)
+    done = object()
+
+    async def pump(source: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]) -> None:
+        items = source if isinstance(source, AsyncIterable) else _aiter(source)
+        try:
+            async for params in items:
+                await merged.put((None, params))
+        except Exception as e:
+            await merged.put((e, None))
+        finally:
+            aclose = getattr(items, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+        await merged.put((done, None))
+
+    pumps = [asyncio.create_task(pump(source)) for source in sources]
+    try:
+        remaining = len(pumps)
+        while remaining:
+            error, params = await merged.get()
+            if error is done:
+                remaining -= 1
+            elif error is not None:
+                raise error
+            else:
+                yield params
+    finally:
+        for task in pumps:
+            task.cancel()
+        await asyncio.gather(*pumps, return_exceptions=True)
@@ -0,0 +1,324 @@
+import asyncio
+import collections
+import datetime
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterable,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from .base import BaseRunner, RunReport, TaskResult
+from .scoreboard import season_year_of
+from .shard import LEAGUE, SEASON, Shard
+from ..extractors.boxscore_summary_extractor import BoxscoreSummaryExtractor
+from ..extractors.scoreboard_extractor import ScoreboardExtractor
+from ..utils.game_id import GameId, iter_game_ids
+
+
+logger = logging.getLogger(__name__)
+
+
+REGULAR_SEASON_GAME_TYPE_ID = 2
+PLAYOFF_GAME_TYPE_IDS = (4, 5)  # playoffs and play-in tournament
+MAX_GAME_SEQ_ID = 1230  # regular season games of a 30-team league
+DISCOVERY_LOOKAHEAD = 4
+
+
+class BoxscoreSummaryRunner(BaseRunner):
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # priority of the games of a season and game type, by the game ID prefix they share
+        self._season_priorities: Dict[str, int] = {}
+
+    def create_extractor(self) -> BoxscoreSummaryExtractor:
+        return BoxscoreSummaryExtractor(
+            pool=self.pool,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache,
+            metrics=self.metrics,
+            validators=self.validators,
+        )
+
+    def task_key(self, game_id: str) -> str:
+        return game_id
+
+    async def run_task(self, game_id: str) -> None:
+        await self.extract(game_id)
+
+    def task_priority(self, game_id: str) -> int:
+        """
+        Games of recent seasons first, playoff and play-in games ahead of the rest of their season
+        """
+        # league, game type and season, parsed once per run rather than on every put
+        prefix = game_id[:5]
+        priority = self._season_priorities.get(prefix)
+        if priority is None:
+            game = GameId(game_id)
+            age = max(season_year_of(self.run_date) - game.season_year, 0)
+            priority = 2 * age + (0 if game.game_type_id in PLAYOFF_GAME_TYPE_IDS else 1)
+            self._season_priorities[prefix] = priority
+        return priority
+
+    async def _run(
+        self,
+        sources: Sequence[Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]],
+        skip_dead_letters: bool,
+    ) -> RunReport:
+        # priorities are relative to the season of the run date
+        self._season_priorities.clear()
+        return await super()._run(sources, skip_dead_letters)
+
+    def partition_value(self, partition: str, game_id: str) -> Union[int, str]:
+        if partition == SEASON:
+            return GameId(game_id).season_year
+        if partition == LEAGUE:
+            return GameId(game_id).league_id
+        return super().partition_value(partition, game_id=game_id)
+
+    @staticmethod
+    def iter_tasks(
+        league_id: str,
+        season_years: Iterable[int],
+        game_type_ids: Iterable[int] = (REGULAR_SEASON_GAME_TYPE_ID,),
+        max_game_seq_id: int = MAX_GAME_SEQ_ID,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        :param league_id: Identifier of league
+        :type league_id: str
+        :param season_years: starting years of the seasons
+        :type season_years: Iterable[int]
+        :param game_type_ids: Identifiers of game types, default is regular season only
+        :type game_type_ids: Iterable[int]
+        :param max_game_seq_id: last game sequence number of each season and game type
+        :type max_game_seq_id: int
+        """
+        game_type_ids = tuple(game_type_ids)
+        for season_year in season_years:
+            for game_type_id in game_type_ids:
+                for game_id in iter_game_ids(
+                    league_id,
+                    season_year,
+                    game_type_id,
+                    max_game_seq_id,
+                ):
+                    yield {'game_id': game_id.value}
+
+    async def backfill(
+        self,
+        league_id: str,
+        season_years: Iterable[int],
+        game_type_ids: Iterable[int] = (REGULAR_SEASON_GAME_TYPE_ID,),
+        max_game_seq_id: int = MAX_GAME_SEQ_ID,
+    ) -> RunReport:
+        """
+        Extract every game of the seasons and game types
+
+        :param league_id: Identifier of league
+        :type league_id: str
+        :param season_years: starting years of the seasons
+        :type season_years: Iterable[int]
+        :param game_type_ids: Identifiers of game types, default is regular season only
+        :type game_type_ids: Iterable[int]
+        :param max_game_seq_id: last game sequence number of each season and game type
+        :type max_game_seq_id: int
+        """
+        return await self.run(
+            self.iter_tasks(league_id, season_years, game_type_ids, max_game_seq_id)
+        )
+
+    async def iter_discovered_tasks(
+        self,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        league_id: str = "00",
+        use_stored_scoreboards: bool = False,
+        lookahead: int = DISCOVERY_LOOKAHEAD,
+        failures: Optional[List[TaskResult]] = None,
+        shard: Optional[Shard] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the games listed by the scoreboard of every date in the range.
+        Up to lookahead scoreboards are resolved ahead of the date being yielded,
+        so boxscore workers do not wait on the next scoreboard.
+        Must be consumed within a run, whose client pool it shares.
+
+        :param start_date: first game date
+        :type start_date: datetime.date
+        :param end_date: last game date, inclusive
+        :type end_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        :param use_stored_scoreboards: read scoreboards already stored rather than fetching them
+        :type use_stored_scoreboards: bool
+        :param lookahead: scoreboards resolved at once
+        :type lookahead: int
+        :param failures: collects a failed result per scoreboard which could not be resolved
+        :type failures: Optional[List[TaskResult]]
+        :param shard: only discover the dates of the shard, dates are spread between shards in turn
+        :type shard: Optional[Shard]
+        """
+        if lookahead < 1:
+            raise ValueError("lookahead should be a positive integer")
+        game_dates: Iterable[datetime.date] = (
+            start_date + datetime.timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+        )
+        if shard is not None:
+            game_dates = shard.take_every(game_dates)
+
+        async with self.open_scoreboard_extractor(lookahead, failures) as scoreboard_extractor:
+
+            async def discover(game_date: datetime.date) -> List[str]:
+                return await scoreboard_extractor.discover_game_ids(
+                    game_date,
+                    league_id,
+                    use_stored=use_stored_scoreboards,
+                )
+
+            pending: Deque = collections.deque()
+            try:
+                for game_date in game_dates:
+                    pending.append((game_date, time.perf_counter(), asyncio.ensure_future(discover(game_date))))
+                    if len(pending) < lookahead:
+                        continue
+                    async for params in self._drain_discovery(pending.popleft(), league_id, failures):
+                        yield params
+                while pending:
+                    async for params in self._drain_discovery(pending.popleft(), league_id, failures):
+                        yield params
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+                await asyncio.gather(*(future for _, _, future in pending), return_exceptions=True)
+
+    @asynccontextmanager
+    async def open_scoreboard_extractor(
+        self,
+        workers: int,
+        failures: Optional[List[TaskResult]] = None,
+    ) -> AsyncContextManager[ScoreboardExtractor]:
+        """
+        Scoreboard extractor sharing the clients, limiter and storage settings of the run,
+        whose archives are flushed and storage closed on exit.
+        Must be used within a run, whose client pool it shares.
+
+        :param workers: scoreboards stored at once
+        :type workers: int
+        :param failures: collects a failed result per scoreboard whose archive part could not be uploaded
+        :type failures: Optional[List[TaskResult]]
+        """
+        scoreboard_extractor = ScoreboardExtractor(
+            pool=self.pool,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache,
+            metrics=self.metrics,
+            validators=self.validators,
+        )
+        scoreboard_extractor.configure_storage(
+            max_workers=workers,
+            max_in_flight=workers,
+            codec=self._codec,
+            packed=self._packed,
+            dedup=self._dedup,
+        )
+        try:
+            yield scoreboard_extractor
+        finally:
+            try:
+                await scoreboard_extractor.flush_archives()
+            except Exception as e:
+                # the games they listed are extracted regardless, only the scoreboards are lost
+                lost = scoreboard_extractor.unarchived_object_names
+                logger.error("scoreboard archive parts not uploaded, failing their %d scoreboards: %r", len(lost), e)
+                if failures is not None:
+                    failures.extend(
+                        TaskResult(
+                            key=f'scoreboard/{object_name}',
+                            succeeded=False,
+                            error=f'archive part not uploaded, {type(e).__name__}: {e}',
+                        )
+                        for object_name in lost
+                    )
+            finally:
+                await asyncio.to_thread(scoreboard_extractor.close_storage)
+                self._store_outcomes.update(scoreboard_extractor.store_outcomes)
+
+    @staticmethod
+    async def _drain_discovery(
+        discovery: Any,
+        league_id: str,
+        failures: Optional[List[TaskResult]],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        game_date, started, future = discovery
+        key = f'scoreboard/{league_id}/{game_date.isoformat()}'
+        try:
+            game_ids = await future
+        except Exception as e:
+            logger.warning("discovery of %s failed: %r", key, e)
+            if failures is not None:
+                failures.append(TaskResult(
+                    key=key,
+                    succeeded=False,
+                    error=f'{type(e).__name__}: {e}',
+                    elapsed=time.perf_counter() - started,
+                ))
+            return
+        logger.debug("discovered %d games on %s", len(game_ids), game_date)
+        for game_id in game_ids:
+            yield {'game_id': game_id}
+
+    async def discover(
+        self,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        league_id: str = "00",
+        use_stored_scoreboards: bool = False,
+        lookahead: int = DISCOVERY_LOOKAHEAD,
+        shard: Optional[Shard] = None,
+    ) -> RunReport:
+        """
+        Extract every game played in the date range, as listed by the scoreboards,
+        rather than probing every game sequence number of the seasons.
+        Scoreboards are stored along the way, failed ones are reported under
+        'scoreboard/<league_id>/<date>' keys.
+
+        :param start_date: first game date
+        :type start_date: datetime.date
+        :param end_date: last game date, inclusive
+        :type end_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        :param use_stored_scoreboards: read scoreboards already stored rather than fetching them
+        :type use_stored_scoreboards: bool
+        :param lookahead: scoreboards resolved at once
+        :type lookahead: int
+        :param shard: only extract the games of the dates of the shard
+        :type shard: Optional[Shard]
+        """
+        failures: List[TaskResult] = []
+        report = await self.run(self.iter_discovered_tasks(
+            start_date,
+            end_date,
+            league_id,
+            use_stored_scoreboards,
+            lookahead,
+            failures,
+            shard,
+        ))
+        report.results.extend(failures)
+        return report
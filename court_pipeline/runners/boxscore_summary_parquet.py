@@ -0,0 +1,82 @@
+import logging
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from .base import BaseRunner, RunReport
+from .shard import LEAGUE, SEASON
+from ..materializers.base import DEFAULT_BATCH_SIZE, DEFAULT_LOOKAHEAD
+from ..materializers.boxscore_summary import BoxscoreSummaryMaterializer
+
+
+logger = logging.getLogger(__name__)
+
+
+class BoxscoreSummaryParquetRunner(BaseRunner):
+    """
+    Materialize the stored boxscore summaries of seasons as Parquet, one task per season.
+    Tasks only read from and write to storage, the concurrency is the seasons materialized at once.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        lookahead: int = DEFAULT_LOOKAHEAD,
+        compression: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param batch_size: games flattened per row group, see BoxscoreSummaryMaterializer
+        :type batch_size: int
+        :param lookahead: summaries loaded ahead per season
+        :type lookahead: int
+        :param compression: Parquet compression, default is 'zstd'
+        :type compression: Optional[str]
+        """
+        super().__init__(*args, **kwargs)
+        self._batch_size: int = batch_size
+        self._lookahead: int = lookahead
+        self._compression: Optional[str] = compression
+
+    def create_extractor(self) -> BoxscoreSummaryMaterializer:
+        return BoxscoreSummaryMaterializer(
+            batch_size=self._batch_size,
+            lookahead=self._lookahead,
+            compression=self._compression,
+            metrics=self.metrics,
+        )
+
+    def task_key(self, league_id: str, season_year: int) -> str:
+        return f'{league_id}/{season_year:04d}'
+
+    async def run_task(self, league_id: str, season_year: int) -> None:
+        result = await self.extractor.materialize_season(league_id, season_year)
+        self._bytes_fetched += result.bytes_read
+
+    def partition_value(self, partition: str, league_id: str, season_year: int) -> Union[int, str]:
+        if partition == SEASON:
+            return season_year
+        if partition == LEAGUE:
+            return league_id
+        return super().partition_value(partition, league_id=league_id, season_year=season_year)
+
+    @staticmethod
+    def iter_tasks(league_id: str, season_years: Iterable[int]) -> Iterator[Dict[str, Any]]:
+        """
+        :param league_id: Identifier of league
+        :type league_id: str
+        :param season_years: starting years of the seasons
+        :type season_years: Iterable[int]
+        """
+        for season_year in season_years:
+            yield {'league_id': league_id, 'season_year': season_year}
+
+    async def materialize(self, league_id: str, season_years: Iterable[int]) -> RunReport:
+        """
+        Materialize every season of the league
+
+        :param league_id: Identifier of league
+        :type league_id: str
+        :param season_years: starting years of the seasons
+        :type season_years: Iterable[int]
+        """
+        return await self.run(self.iter_tasks(league_id, season_years))
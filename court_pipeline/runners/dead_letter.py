@@ -0,0 +1,138 @@
+from dataclasses import asdict, dataclass
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from ..proxy.exceptions import InvalidResponseError
+
+
+logger = logging.getLogger(__name__)
+
+
+MAX_BODY_LENGTH = 1024
+
+
+@dataclass
+class DeadLetter:
+    """
+    Task which will not succeed by running it again, e.g. a 404 or a malformed JSON body
+    """
+
+    key: str
+    params: Dict[str, Any]
+    error: str
+    status_code: Optional[int] = None
+    body: Optional[str] = None
+    failed_at: float = 0.0
+
+    @classmethod
+    def from_error(
+        cls,
+        key: str,
+        params: Dict[str, Any],
+        error: Exception,
+        failed_at: float,
+    ) -> "DeadLetter":
+        """
+        :param key: key of the task
+        :type key: str
+        :param params: JSON-serializable keyword arguments of the task
+        :type params: Dict[str, Any]
+        :param error: failure of the task, the response of an InvalidResponseError is captured
+        :type error: Exception
+        """
+        status_code = None
+        body = None
+        if isinstance(error, InvalidResponseError):
+            status_code = error.status_code
+            body = error.response.content[:MAX_BODY_LENGTH].decode('utf-8', errors='replace')
+        return cls(
+            key=key,
+            params=params,
+            error=f'{type(error).__name__}: {error}',
+            status_code=status_code,
+            body=body,
+            failed_at=failed_at,
+        )
+
+
+class DeadLetterStore:
+    """
+    Dead letters of a job in a local JSON lines file, one letter per line.
+    Letters are appended as they come, the latest letter of a key wins.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time) -> None:
+        """
+        :param path: file of the dead letters, created along with its directory on the first write
+        :type path: str
+        """
+        self._path: str = path
+        self._clock: Callable[[], float] = clock
+        self._lock: threading.Lock = threading.Lock()
+        self._has_directory: bool = False
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _make_directory(self) -> None:
+        # callers hold the lock, reading letters creates nothing, e.g. for a dry run
+        if self._has_directory:
+            return
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._has_directory = True
+
+    def add(self, key: str, params: Dict[str, Any], error: Exception) -> DeadLetter:
+        letter = DeadLetter.from_error(key, params, error, self._clock())
+        line = json.dumps(asdict(letter), sort_keys=True)
+        with self._lock:
+            self._make_directory()
+            with open(self._path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        logger.warning("dead-lettered task %s: %s", key, letter.error)
+        return letter
+
+    def load(self) -> Dict[str, DeadLetter]:
+        """
+        Latest dead letter of each key
+        """
+        with self._lock:
+            return self._load()
+
+    def _load(self) -> Dict[str, DeadLetter]:
+        # callers hold the lock
+        letters: Dict[str, DeadLetter] = {}
+        if not os.path.exists(self._path):
+            return letters
+        with open(self._path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                letter = DeadLetter(**json.loads(line))
+                letters[letter.key] = letter
+        return letters
+
+    def remove(self, keys: Iterable[str]) -> None:
+        """
+        Drop the letters of the keys, e.g. once replayed successfully
+        """
+        keys = set(keys)
+        if not keys:
+            return
+        with self._lock:
+            # read and rewrite at once, so letters added meanwhile are kept
+            letters = self._load()
+            self._make_directory()
+            # write aside and swap, so a crash never leaves a truncated file
+            temporary_path = self._path + '.tmp'
+            with open(temporary_path, 'w', encoding='utf-8') as f:
+                for key, letter in letters.items():
+                    if key not in keys:
+                        f.write(json.dumps(asdict(letter), sort_keys=True) + '\n')
+            os.replace(temporary_path, self._path)
@@ -0,0 +1,166 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional, Set, Tuple
+
+from .report import TaskResult
+
+
+logger = logging.getLogger(__name__)
+
+
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    job TEXT NOT NULL,
+    key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job, key)
+);
+"""
+
+
+class JournalEntry(NamedTuple):
+
+    key: str
+    status: str
+    attempts: int
+    last_error: Optional[str]
+
+
+class Journal:
+    """
+    Durable per-task status of a job, so an interrupted run resumes where it stopped.
+
+    Results are buffered and written in batches on a single background thread,
+    in the order they were recorded, so recording never waits on the disk.
+    Results recorded after the last batch are lost on a crash and simply run again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        job: str,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        :param path: file of the SQLite database, created if missing
+        :type path: str
+        :param job: name of the job, e.g. 'boxscore_summary', several jobs may share a file
+        :type job: str
+        :param batch_size: results buffered before they are written
+        :type batch_size: int
+        :param flush_interval: seconds after which buffered results are written anyway
+        :type flush_interval: float
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._job: str = job
+        self._batch_size: int = batch_size
+        self._flush_interval: float = flush_interval
+        self._clock: Callable[[], float] = clock
+        self._buffer: List[Tuple[str, str, int, Optional[str], float]] = []
+        self._flushed_at: float = clock()
+        self._writes: List[Future] = []
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='journal')
+        self._lock: threading.Lock = threading.Lock()
+        self._conn: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    @property
+    def job(self) -> str:
+        return self._job
+
+    def completed_keys(self) -> Set[str]:
+        """
+        Keys of the tasks which already succeeded, flushed results included
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key FROM tasks WHERE job = ? AND status = ?',
+                (self._job, SUCCEEDED),
+            )
+            return {key for key, in rows}
+
+    def failed_entries(self) -> List[JournalEntry]:
+        """
+        Tasks whose last attempt failed, most attempted first
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key, status, attempts, last_error FROM tasks '
+                'WHERE job = ? AND status = ? ORDER BY attempts DESC, key',
+                (self._job, FAILED),
+            ).fetchall()
+        return [JournalEntry(*row) for row in rows]
+
+    def get(self, key: str) -> Optional[JournalEntry]:
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT key, status, attempts, last_error FROM tasks WHERE job = ? AND key = ?',
+                (self._job, key),
+            ).fetchone()
+        return None if row is None else JournalEntry(*row)
+
+    def record(self, result: TaskResult) -> None:
+        """
+        Buffer the outcome of one attempt, written with the next batch.
+        A task skipped as already stored is recorded as succeeded without counting an attempt
+        """
+        now = self._clock()
+        status = SUCCEEDED if result.succeeded else FAILED
+        attempts = 0 if result.skipped else 1
+        self._buffer.append((result.key, status, attempts, result.error, now))
+        if len(self._buffer) >= self._batch_size or now - self._flushed_at >= self._flush_interval:
+            self._submit()
+
+    def _submit(self) -> None:
+        self._flushed_at = self._clock()
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        self._writes = [write for write in self._writes if not write.done()]
+        self._writes.append(self._executor.submit(self._write, batch))
+
+    def _write(self, batch: List[Tuple[str, str, int, Optional[str], float]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                'INSERT INTO tasks (job, key, status, attempts, last_error, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (job, key) DO UPDATE SET '
+                'status = excluded.status, attempts = attempts + excluded.attempts, '
+                'last_error = excluded.last_error, updated_at = excluded.updated_at',
+                [(self._job, *result) for result in batch],
+            )
+            self._conn.commit()
+        logger.debug("journaled %d results of %s", len(batch), self._job)
+
+    def flush(self) -> None:
+        """
+        Write the buffered results and wait for every pending batch
+        """
+        self._submit()
+        writes, self._writes = self._writes, []
+        for write in writes:
+            write.result()
+
+    def close(self) -> None:
+        self.flush()
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
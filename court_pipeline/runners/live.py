@@ -0,0 +1,239 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Set
+
+from .boxscore_summary import BoxscoreSummaryRunner
+from .report import RunReport, TaskResult
+from ..proxy.constants import GAME_STATUS_FINAL, GAME_STATUS_LIVE, GAME_STATUS_SCHEDULED
+from ..utils.scoreboard import GameState, game_date_today, parse_game_states
+
+
+logger = logging.getLogger(__name__)
+
+
+LIVE_POLL_INTERVAL = 15.0
+IDLE_POLL_INTERVAL = 300.0
+MAX_POLL_FAILURES = 5
+# ahead of any backfill priority, see BoxscoreSummaryRunner.task_priority
+LIVE_PRIORITY = -1
+
+
+def changed_game_ids(previous: Mapping[str, GameState], states: Iterable[GameState]) -> List[str]:
+    """
+    Games whose status or score changed since the previous poll, in listing order.
+    Games not started yet have no boxscore worth fetching.
+
+    :param previous: states of the previous poll by game
+    :type previous: Mapping[str, GameState]
+    :param states: states of this poll
+    :type states: Iterable[GameState]
+    """
+    changed = []
+    for state in states:
+        if state.game_status == GAME_STATUS_SCHEDULED:
+            continue
+        known = previous.get(state.game_id)
+        if known is None or known.progress != state.progress:
+            changed.append(state.game_id)
+    return changed
+
+
+def next_poll_delay(
+    states: Iterable[GameState],
+    now: datetime.datetime,
+    live_interval: float = LIVE_POLL_INTERVAL,
+    idle_interval: float = IDLE_POLL_INTERVAL,
+) -> Optional[float]:
+    """
+    Seconds until the next poll, None once no game is left to follow.
+    Live games are polled every live_interval, otherwise polls wait for the next tip-off
+    at most idle_interval and at least live_interval.
+
+    :param states: states of the last poll
+    :type states: Iterable[GameState]
+    :param now: current time, timezone aware
+    :type now: datetime.datetime
+    :param live_interval: seconds between polls while games are live
+    :type live_interval: float
+    :param idle_interval: seconds between polls while no game is live
+    :type idle_interval: float
+    """
+    pending = [state for state in states if state.game_status != GAME_STATUS_FINAL]
+    if not pending:
+        return None
+    if any(state.game_status == GAME_STATUS_LIVE for state in pending):
+        return live_interval
+    tip_offs = [state.game_time_utc for state in pending if state.game_time_utc is not None]
+    if not tip_offs:
+        return idle_interval
+    until_tip_off = (min(tip_offs) - now).total_seconds()
+    return min(max(until_tip_off, live_interval), idle_interval)
+
+
+class LiveBoxscoreSummaryRunner(BoxscoreSummaryRunner):
+    """
+    Follow the games of a date as they are played.
+    The scoreboard of the date is polled on an adaptive interval, and the boxscore summary
+    of a game is only refreshed when its status or score changed since the previous poll.
+    Polling stops once every game is final.
+
+    Responses are not cached, a cached payload would hide the updates being polled for.
+    Pass validators instead, so unchanged scoreboards cost a 304 Not Modified only.
+
+    A backfill can run alongside the polls, sharing the rate limiter of the run.
+    In a prioritized run, games of the polls overtake the backfill tasks queued.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        live_interval: float = LIVE_POLL_INTERVAL,
+        idle_interval: float = IDLE_POLL_INTERVAL,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param live_interval: seconds between polls while games are live
+        :type live_interval: float
+        :param idle_interval: longest wait between polls while no game is live
+        :type idle_interval: float
+        """
+        super().__init__(*args, **kwargs)
+        if self.cache is not None:
+            raise ValueError("live polling cannot use a response cache, it would serve stale payloads")
+        # each would leave out games already extracted once, though still being played
+        if self.journal is not None or self.dead_letters is not None or self.incremental:
+            raise ValueError("live polling cannot use a journal, dead letters or incremental mode")
+        if not 0 < live_interval <= idle_interval:
+            raise ValueError("poll intervals should be positive, live_interval not above idle_interval")
+        self._live_interval: float = live_interval
+        self._idle_interval: float = idle_interval
+        self._live_game_ids: Set[str] = set()
+
+    @property
+    def live_interval(self) -> float:
+        return self._live_interval
+
+    @property
+    def idle_interval(self) -> float:
+        return self._idle_interval
+
+    def task_priority(self, game_id: str) -> int:
+        if game_id in self._live_game_ids:
+            return LIVE_PRIORITY
+        return super().task_priority(game_id)
+
+    async def iter_live_tasks(
+        self,
+        game_date: datetime.date,
+        league_id: str = "00",
+        max_polls: Optional[int] = None,
+        failures: Optional[List[TaskResult]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the games of the date whose status or score changed, poll after poll.
+        Must be consumed within a run, whose client pool it shares.
+
+        :param game_date: game date in format YYYY-MM-DD
+        :type game_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        :param max_polls: stop after that many polls even if games are not final, never when omitted
+        :type max_polls: Optional[int]
+        :param failures: collects a failed result if polling gives up after consecutive failed polls,
+            or if the scoreboard could not be archived
+        :type failures: Optional[List[TaskResult]]
+        """
+        key = f'scoreboard/{league_id}/{game_date.isoformat()}'
+        states: Dict[str, GameState] = {}
+        polls = 0
+        consecutive_failures = 0
+        async with self.open_scoreboard_extractor(1, failures) as scoreboard_extractor:
+            while True:
+                polls += 1
+                started = time.perf_counter()
+                try:
+                    content = await scoreboard_extractor.refresh(game_date, league_id)
+                    if content is None and not states:
+                        # not modified since stored by an earlier run, the states are still to be read
+                        content = await scoreboard_extractor.load_not_modified(game_date, league_id)
+                    polled = parse_game_states(content) if content is not None else None
+                except Exception as e:
+                    consecutive_failures += 1
+                    logger.warning("poll %d of %s failed: %r", polls, key, e)
+                    self.metrics.increment('live.polls', outcome='failed')
+                    if consecutive_failures >= MAX_POLL_FAILURES:
+                        logger.error("giving up polling %s after %d failed polls", key, consecutive_failures)
+                        if failures is not None:
+                            failures.append(TaskResult(
+                                key=key,
+                                succeeded=False,
+                                error=f'{type(e).__name__}: {e}',
+                                elapsed=time.perf_counter() - started,
+                            ))
+                        return
+                    delay: Optional[float] = self._live_interval
+                else:
+                    consecutive_failures = 0
+                    if polled is None:
+                        # not modified, neither are the games
+                        self.metrics.increment('live.polls', outcome='not_modified')
+                    else:
+                        self.metrics.increment('live.polls', outcome='modified')
+                        changed = changed_game_ids(states, polled)
+                        states = {state.game_id: state for state in polled}
+                        logger.debug("poll %d of %s: %d games, %d changed", polls, key, len(polled), len(changed))
+                        self._live_game_ids.update(changed)
+                        for game_id in changed:
+                            yield {'game_id': game_id}
+                    delay = next_poll_delay(
+                        states.values(),
+                        datetime.datetime.now(datetime.timezone.utc),
+                        self._live_interval,
+                        self._idle_interval,
+                    )
+                if delay is None:
+                    logger.info("every game of %s is final after %d polls", key, polls)
+                    return
+                if max_polls is not None and polls >= max_polls:
+                    logger.info("stopped polling %s after %d polls", key, polls)
+                    return
+                await asyncio.sleep(delay)
+
+    async def poll(
+        self,
+        game_date: Optional[datetime.date] = None,
+        league_id: str = "00",
+        max_polls: Optional[int] = None,
+        backfill: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> RunReport:
+        """
+        Refresh the boxscore summaries of the games of the date as they are played,
+        until every game is final. Scoreboards are stored poll after poll,
+        a failed poll is retried after live_interval, and polling giving up after
+        MAX_POLL_FAILURES failed polls in a row is reported under a 'scoreboard/<league_id>/<date>' key.
+
+        :param game_date: game date in format YYYY-MM-DD, default is today in US Eastern time
+        :type game_date: Optional[datetime.date]
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        :param max_polls: stop after that many polls even if games are not final, never when omitted
+        :type max_polls: Optional[int]
+        :param backfill: tasks run alongside the polls, e.g. of iter_tasks(),
+            behind the polled games when prioritized. The run goes on until both are done.
+        :type backfill: Optional[Iterable[Dict[str, Any]]]
+        """
+        failures: List[TaskResult] = []
+        live_tasks = self.iter_live_tasks(
+            game_date if game_date is not None else game_date_today(),
+            league_id,
+            max_polls,
+            failures,
+        )
+        if backfill is None:
+            report = await self.run(live_tasks)
+        else:
+            report = await self.run(live_tasks, backfill)
+        report.results.extend(failures)
+        return report
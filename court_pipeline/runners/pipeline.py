@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, List, Optional, Sequence, Union
+
+from .report import RunReport, StageStats, TaskResult
+from ..metrics.registry import NULL_METRICS, Metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+# returned by a stage handler to end the item early, e.g. already stored
+SKIPPED = object()
+_STOP = object()
+
+
+@dataclass
+class StageConfig:
+    """
+    :param workers: items handled at once by the stage
+    :param queue_size: items waiting for the stage before upstream blocks
+    """
+
+    workers: int = 1
+    queue_size: int = 1
+
+    def __post_init__(self) -> None:
+        if self.workers < 1:
+            raise ValueError("workers should be a positive integer")
+        if self.queue_size < 1:
+            raise ValueError("queue_size should be a positive integer")
+
+
+@dataclass
+class Stage:
+
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    config: StageConfig
+
+
+@dataclass
+class _Item:
+
+    key: str
+    value: Any
+    started: float
+
+
+class Pipeline:
+    """
+    Stages connected by bounded queues, each stage with its own workers.
+    The output of a stage handler is the input of the next one,
+    so e.g. downloads and uploads of different items overlap.
+
+    A failing handler fails its item only, the other items carry on.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        key: Callable[[Any], str],
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        """
+        :param stages: stages in processing order
+        :type stages: Sequence[Stage]
+        :param key: key of an input item in the run report
+        :type key: Callable[[Any], str]
+        :param metrics: records the queue depth and handling time of each stage
+        :type metrics: Optional[Metrics]
+        """
+        if not stages:
+            raise ValueError("pipeline needs at least one stage")
+        self._stages: List[Stage] = list(stages)
+        self._key: Callable[[Any], str] = key
+        self._metrics: Metrics = metrics if metrics is not None else NULL_METRICS
+
+    async def run(
+        self,
+        items: Union[Iterable[Any], AsyncIterable[Any]],
+        on_result: Optional[Callable[[TaskResult], None]] = None,
+    ) -> RunReport:
+        """
+        Push the items through every stage and report per-item success or failure
+
+        :param items: inputs of the first stage, consumed lazily
+        :type items: Union[Iterable[Any], AsyncIterable[Any]]
+        :param on_result: called with the result of each item as soon as it ends
+        :type on_result: Optional[Callable[[TaskResult], None]]
+        """
+        report = RunReport(stages=[
+            StageStats(name=stage.name, workers=stage.config.workers)
+            for stage in self._stages
+        ])
+        queues = [asyncio.Queue(maxsize=stage.config.queue_size) for stage in self._stages]
+        metrics = self._metrics
+
+        def finish(item: _Item, error: Optional[BaseException] = None, skipped: bool = False) -> None:
+            result = TaskResult(
+                key=item.key,
+                succeeded=error is None,
+                error=None if error is None else f'{type(error).__name__}: {error}',
+                elapsed=time.perf_counter() - item.started,
+                skipped=skipped,
+            )
+            report.results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+        async def worker(index: int) -> None:
+            stage = self._stages[index]
+            stats = report.stages[index]
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            while True:
+                waited = time.perf_counter()
+                item = await inbox.get()
+                started = time.perf_counter()
+                stats.idle += started - waited
+                if item is _STOP:
+                    return
+                metrics.gauge('queue.depth', inbox.qsize(), stage=stage.name)
+                try:
+                    value = await stage.handler(item.value)
+                except Exception as e:
+                    stats.failed += 1
+                    logger.warning("task %s failed at %s: %r", item.key, stage.name, e)
+                    finish(item, error=e)
+                    continue
+                finally:
+                    busy = time.perf_counter() - started
+                    stats.busy += busy
+                    metrics.observe('stage.seconds', busy, stage=stage.name)
+                stats.processed += 1
+
+                if value is SKIPPED:
+                    finish(item, skipped=True)
+                elif outbox is None:
+                    finish(item)
+                else:
+                    item.value = value
+                    blocked = time.perf_counter()
+                    await outbox.put(item)
+                    stats.blocked += time.perf_counter() - blocked
+
+        async def run_stage(index: int) -> None:
+            workers = [
+                asyncio.create_task(worker(index))
+                for _ in range(self._stages[index].config.workers)
+            ]
+            await asyncio.gather(*workers)
+            # every worker is done, so is the input of the next stage
+            if index + 1 < len(queues):
+                for _ in range(self._stages[index + 1].config.workers):
+                    await queues[index + 1].put(_STOP)
+
+        async def feed(value: Any) -> None:
+            await queues[0].put(_Item(key=self._key(value), value=value, started=time.perf_counter()))
+
+        started = time.perf_counter()
+        stages = [asyncio.create_task(run_stage(index)) for index in range(len(self._stages))]
+        try:
+            if isinstance(items, AsyncIterable):
+                async for value in items:
+                    await feed(value)
+            else:
+                for value in items:
+                    await feed(value)
+            for _ in range(self._stages[0].config.workers):
+                await queues[0].put(_STOP)
+            await asyncio.gather(*stages)
+        finally:
+            for task in stages:
+                task.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+        report.elapsed = time.perf_counter() - started
+
+        for stats in report.stages:
+            logger.info(
+                "stage %s: %d processed, %d failed, %.0f%% busy, %.2fs blocked downstream",
+                stats.name,
+                stats.processed,
+                stats.failed,
+                stats.utilization * 100,
+                stats.blocked,
+            )
+        return report
@@ -0,0 +1,106 @@
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+
+@dataclass
+class TaskResult:
+
+    key: str
+    succeeded: bool
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    skipped: bool = False
+
+
+@dataclass
+class StageStats:
+    """
+    Activity of one pipeline stage over a run.
+    A stage mostly busy is the bottleneck, one mostly blocked waits on a slower stage downstream
+    """
+
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy: float = 0.0
+    idle: float = 0.0
+    blocked: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        """
+        Share of the worker time spent handling items
+        """
+        total = self.busy + self.idle + self.blocked
+        return self.busy / total if total > 0 else 0.0
+
+
+@dataclass
+class RunReport:
+
+    results: List[TaskResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    stages: List[StageStats] = field(default_factory=list)
+    bytes_fetched: int = 0
+    # HTTP requests sent, retries and scoreboards of discovery included
+    requests: int = 0
+    # objects uploaded, and objects left as is since stored with the same content
+    objects_changed: int = 0
+    objects_unchanged: int = 0
+
+    @property
+    def succeeded(self) -> List[TaskResult]:
+        return [result for result in self.results if result.succeeded]
+
+    @property
+    def failed(self) -> List[TaskResult]:
+        return [result for result in self.results if not result.succeeded]
+
+    @property
+    def skipped(self) -> List[TaskResult]:
+        return [result for result in self.results if result.skipped]
+
+    @property
+    def fetched(self) -> List[TaskResult]:
+        """
+        Tasks which requested the remote API, i.e. neither skipped nor left out
+        """
+        return [
+            result for result in self.results
+            if not result.skipped and not (result.error or '').startswith('dead-lettered')
+        ]
+
+    @property
+    def tasks_per_second(self) -> float:
+        """
+        Tasks which requested the remote API per second, retries and pages are not counted apart
+        """
+        return len(self.fetched) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def requests_per_second(self) -> float:
+        """
+        HTTP requests sent per second, to compare with the rate limit
+        """
+        return self.requests / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_fetched / 1024 / 1024 / self.elapsed if self.elapsed > 0 else 0.0
+
+    @classmethod
+    def merge(cls, reports: Iterable["RunReport"]) -> "RunReport":
+        """
+        Report of runs which ran side by side, e.g. one per process
+        """
+        merged = cls()
+        for report in reports:
+            merged.results.extend(report.results)
+            merged.stages.extend(report.stages)
+            merged.bytes_fetched += report.bytes_fetched
+            merged.requests += report.requests
+            merged.objects_changed += report.objects_changed
+            merged.objects_unchanged += report.objects_unchanged
+            merged.elapsed = max(merged.elapsed, report.elapsed)
+        return merged
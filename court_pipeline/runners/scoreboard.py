@@ -0,0 +1,100 @@
+import datetime
+import logging
+from typing import Any, Dict, Iterator, Union
+
+from .base import BaseRunner, RunReport
+from .shard import LEAGUE, SEASON
+from ..extractors.scoreboard_extractor import ScoreboardExtractor
+
+
+logger = logging.getLogger(__name__)
+
+
+def season_year_of(game_date: datetime.date) -> int:
+    """
+    Starting year of the season of the date, seasons run from July to June
+    """
+    return game_date.year if game_date.month >= 7 else game_date.year - 1
+
+
+class ScoreboardRunner(BaseRunner):
+
+    def create_extractor(self) -> ScoreboardExtractor:
+        return ScoreboardExtractor(
+            pool=self.pool,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache,
+            metrics=self.metrics,
+            validators=self.validators,
+        )
+
+    def task_key(self, game_date: datetime.date, league_id: str = "00") -> str:
+        return f'{league_id}/{game_date.isoformat()}'
+
+    def task_priority(self, game_date: datetime.date, league_id: str = "00") -> int:
+        """
+        Recent dates first, today and later dates ahead of all
+        """
+        return max((self.run_date - game_date).days, 0)
+
+    def partition_value(
+        self,
+        partition: str,
+        game_date: datetime.date,
+        league_id: str = "00",
+    ) -> Union[int, str]:
+        if partition == SEASON:
+            return season_year_of(game_date)
+        if partition == LEAGUE:
+            return league_id
+        return super().partition_value(partition, game_date=game_date, league_id=league_id)
+
+    def dump_params(self, game_date: datetime.date, league_id: str = "00") -> Dict[str, Any]:
+        return {'game_date': game_date.isoformat(), 'league_id': league_id}
+
+    def load_params(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'game_date': datetime.date.fromisoformat(data['game_date']),
+            'league_id': data.get('league_id', "00"),
+        }
+
+    async def run_task(self, game_date: datetime.date, league_id: str = "00") -> None:
+        await self.extract(game_date, league_id)
+
+    @staticmethod
+    def iter_tasks(
+        start_date: datetime.date,
+        end_date: datetime.date,
+        league_id: str = "00",
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        :param start_date: first game date
+        :type start_date: datetime.date
+        :param end_date: last game date, inclusive
+        :type end_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        """
+        game_date = start_date
+        while game_date <= end_date:
+            yield {'game_date': game_date, 'league_id': league_id}
+            game_date += datetime.timedelta(days=1)
+
+    async def backfill(
+        self,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        league_id: str = "00",
+    ) -> RunReport:
+        """
+        Extract the scoreboard of every date in the range
+
+        :param start_date: first game date
+        :type start_date: datetime.date
+        :param end_date: last game date, inclusive
+        :type end_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        """
+        return await self.run(self.iter_tasks(start_date, end_date, league_id))
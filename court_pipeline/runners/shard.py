@@ -0,0 +1,138 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import logging
+import multiprocessing
+import os
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List, Union
+import zlib
+
+from .report import RunReport
+
+
+logger = logging.getLogger(__name__)
+
+
+# strategies partitioning tasks between shards
+ROUND_ROBIN = 'round-robin'
+HASH = 'hash'
+SEASON = 'season'
+LEAGUE = 'league'
+PARTITIONS = (ROUND_ROBIN, HASH, SEASON, LEAGUE)
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    One of count disjoint shares of a job.
+    Shards of several nodes each split in processes are still shards of the one job,
+    see split(), so every task is run by exactly one process of one node.
+    """
+
+    index: int = 0
+    count: int = 1
+
+    def __post_init__(self) -> None:
+        if self.count < 1:
+            raise ValueError("count should be a positive integer")
+        if not 0 <= self.index < self.count:
+            raise ValueError(f"index should be between 0 and {self.count - 1}")
+
+    @classmethod
+    def from_env(cls) -> "Shard":
+        """
+        Shard of this node from SHARD_INDEX and SHARD_COUNT environment variables,
+        the whole job when unset
+        """
+        return cls(
+            index=int(os.getenv('SHARD_INDEX', 0)),
+            count=int(os.getenv('SHARD_COUNT', 1)),
+        )
+
+    @property
+    def label(self) -> str:
+        return f'{self.index + 1}/{self.count}'
+
+    def split(self, parts: int) -> List["Shard"]:
+        """
+        Disjoint sub-shards covering this shard, e.g. one per process
+        """
+        if parts < 1:
+            raise ValueError("parts should be a positive integer")
+        return [
+            Shard(index=self.index * parts + part, count=self.count * parts)
+            for part in range(parts)
+        ]
+
+    def owns(self, value: Union[int, str]) -> bool:
+        """
+        Whether the partition value belongs to this shard,
+        integers are spread in turn, strings by a hash stable across processes
+        """
+        if isinstance(value, str):
+            value = zlib.crc32(value.encode('utf-8'))
+        return value % self.count == self.index
+
+    def take(
+        self,
+        tasks: Iterable[Any],
+        partition_value: Callable[[Any], Union[int, str]],
+    ) -> Iterator[Any]:
+        for task in tasks:
+            if self.owns(partition_value(task)):
+                yield task
+
+    def take_every(self, tasks: Iterable[Any]) -> Iterator[Any]:
+        """
+        Every count-th task from index, even shares of any ordered range
+        """
+        for position, task in enumerate(tasks):
+            if position % self.count == self.index:
+                yield task
+
+
+def _run_shard(
+    target: Callable[[Any, Shard], Awaitable[RunReport]],
+    args: Any,
+    shard: Shard,
+    initializer: Callable[[Any], None],
+) -> RunReport:
+    initializer(args)
+    return asyncio.run(target(args, shard))
+
+
+def _noop(args: Any) -> None:
+    pass
+
+
+def run_shards(
+    target: Callable[[Any, Shard], Awaitable[RunReport]],
+    args: Any,
+    shards: List[Shard],
+    initializer: Callable[[Any], None] = _noop,
+) -> RunReport:
+    """
+    Run each shard in its own process, with its own event loop and clients,
+    and merge their reports
+
+    :param target: run one shard, a module-level coroutine function so it can be pickled
+    :type target: Callable[[Any, Shard], Awaitable[RunReport]]
+    :param args: picklable arguments passed to target, e.g. parsed command-line arguments
+    :type args: Any
+    :param shards: shards to run side by side
+    :type shards: List[Shard]
+    :param initializer: prepare each process before its shard runs, e.g. configure logging
+    :type initializer: Callable[[Any], None]
+    """
+    if len(shards) == 1:
+        return asyncio.run(target(args, shards[0]))
+    # spawn rather than fork, a forked event loop or connection pool is unusable
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as executor:
+        futures = [
+            executor.submit(_run_shard, target, args, shard, initializer)
+            for shard in shards
+        ]
+        reports = [future.result() for future in futures]
+    logger.info("merged reports of %d shards", len(reports))
+    return RunReport.merge(reports)
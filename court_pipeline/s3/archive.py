@@ -0,0 +1,264 @@
+import asyncio
+from dataclasses import dataclass, field
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import uuid
+
+from .codecs import Codec
+from .index import normalize_object_name
+
+
+logger = logging.getLogger(__name__)
+
+
+ARCHIVE_DIRECTORY = '_archive'
+ARCHIVE_SUFFIX = '.ndjson'
+INDEX_SUFFIX = '.index.json'
+DEFAULT_PART_SIZE = 64 * 1024 * 1024
+MAX_OPEN_PARTS = 4
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """
+    Byte range of a packed object within its archive part
+    """
+
+    archive_name: str
+    offset: int
+    length: int
+
+
+def is_archive_name(object_name: str) -> bool:
+    return f'/{ARCHIVE_DIRECTORY}/' in f'/{normalize_object_name(object_name)}'
+
+
+def is_index_name(object_name: str) -> bool:
+    return is_archive_name(object_name) and object_name.endswith(INDEX_SUFFIX)
+
+
+def index_name_of(archive_name: str) -> str:
+    """
+    Name of the sidecar index of an archive part
+    """
+    return archive_name[:archive_name.index(ARCHIVE_SUFFIX)] + INDEX_SUFFIX
+
+
+def archive_prefix_of(archive_name: str) -> str:
+    """
+    Prefix of the objects packed by an archive part
+    """
+    return archive_name[:archive_name.rindex(f'{ARCHIVE_DIRECTORY}/')]
+
+
+def pack_entry(data: bytes, codec: Codec) -> bytes:
+    """
+    One NDJSON line of the payload, compressed on its own.
+    Compressed lines concatenate into a valid gzip or zstd stream,
+    so an archive part decompresses whole as well as line by line.
+    """
+    # JSON strings cannot hold raw line breaks, outside of them they are mere whitespace
+    return codec.compress(data.replace(b'\r', b' ').replace(b'\n', b' ') + b'\n')
+
+
+def unpack_entry(data: bytes, codec: Codec) -> bytes:
+    return codec.decompress(data).rstrip(b'\n')
+
+
+def parse_index(content: bytes) -> Dict[str, ArchiveEntry]:
+    """
+    Entries of a sidecar index by normalized object name
+    """
+    index = json.loads(content)
+    archive_name = index['archive']
+    return {
+        normalize_object_name(object_name): ArchiveEntry(archive_name, offset, length)
+        for object_name, (offset, length) in index['entries'].items()
+    }
+
+
+@dataclass
+class ArchivePart:
+    """
+    Archive part being packed in memory, uploaded once full
+    """
+
+    archive_name: str
+    data: bytearray = field(default_factory=bytearray)
+    entries: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    # awaited once the part is uploaded, e.g. to acknowledge its objects
+    callbacks: List[Callable[[], Awaitable[None]]] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    def append(self, object_name: str, entry: bytes) -> None:
+        self.entries[normalize_object_name(object_name)] = (len(self.data), len(entry))
+        self.data += entry
+
+    def index(self) -> bytes:
+        return json.dumps({
+            'archive': self.archive_name,
+            'entries': self.entries,
+        }).encode('utf-8')
+
+    def archive_entries(self) -> Dict[str, ArchiveEntry]:
+        return {
+            object_name: ArchiveEntry(self.archive_name, offset, length)
+            for object_name, (offset, length) in self.entries.items()
+        }
+
+
+def new_archive_name(prefix: str, codec: Codec) -> str:
+    """
+    Name of a new archive part under the prefix, parts sort in creation order
+    so that later parts take precedence for objects packed more than once
+    """
+    return f'{prefix}{ARCHIVE_DIRECTORY}/{time.time_ns():020d}-{uuid.uuid4().hex[:8]}{ARCHIVE_SUFFIX}{codec.suffix}'
+
+
+class ArchivePacker:
+    """
+    Pack objects sharing a prefix, e.g. the games of a season or the scoreboards of a month,
+    into archive parts of about part_size bytes, each uploaded along with a sidecar index
+    of the byte range of every object.
+
+    At most max_open_parts parts are held in memory, opening one more uploads the oldest.
+    Objects are only readable once their part is uploaded, see on_uploaded() and flush().
+    A part failing to upload is kept in memory and uploaded again by the next flush().
+    """
+
+    def __init__(
+        self,
+        upload: Callable[[ArchivePart], Awaitable[None]],
+        codec: Codec,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_open_parts: int = MAX_OPEN_PARTS,
+    ) -> None:
+        """
+        :param upload: store the archive part and its index
+        :type upload: Callable[[ArchivePart], Awaitable[None]]
+        :param codec: compression of each packed object
+        :type codec: Codec
+        :param part_size: size from which a part is uploaded
+        :type part_size: int
+        :param max_open_parts: parts held in memory at once
+        :type max_open_parts: int
+        """
+        if part_size < 1:
+            raise ValueError("part_size should be a positive integer")
+        self._upload: Callable[[ArchivePart], Awaitable[None]] = upload
+        self._codec: Codec = codec
+        self._part_size: int = part_size
+        self._max_open_parts: int = max_open_parts
+        # insertion ordered, the first part is the oldest
+        self._parts: Dict[str, ArchivePart] = {}
+        # closed parts not uploaded yet, e.g. failed to
+        self._closed: List[ArchivePart] = []
+        # closed parts being uploaded and their uploads, by archive name
+        self._uploading: Dict[str, Tuple[ArchivePart, asyncio.Future]] = {}
+
+    def _held_parts(self) -> Iterator[ArchivePart]:
+        yield from self._parts.values()
+        yield from self._closed
+        for part, _ in self._uploading.values():
+            yield part
+
+    @property
+    def buffered(self) -> int:
+        """
+        Objects packed but not uploaded yet
+        """
+        return sum(len(part.entries) for part in self._held_parts())
+
+    @property
+    def buffered_object_names(self) -> List[str]:
+        """
+        Names of the objects packed but not uploaded yet
+        """
+        return [object_name for part in self._held_parts() for object_name in part.entries]
+
+    def on_uploaded(self, object_name: str, callback: Callable[[], Awaitable[None]]) -> bool:
+        """
+        Queue the callback until the part packing the object is uploaded,
+        False if no part held in memory packs the object
+        """
+        object_name = normalize_object_name(object_name)
+        for part in self._held_parts():
+            if object_name in part.entries:
+                part.callbacks.append(callback)
+                return True
+        return False
+
+    async def _upload_part(self, part: ArchivePart) -> None:
+        try:
+            await self._upload(part)
+        except BaseException:
+            self._closed.append(part)
+            raise
+        finally:
+            del self._uploading[part.archive_name]
+        for callback in part.callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                logger.warning("callback of %s failed: %r", part.archive_name, e)
+
+    def _start_upload(self, part: ArchivePart) -> asyncio.Future:
+        # out of the closed parts while in flight, so a concurrent flush() waits for it rather than uploading it again
+        self._closed.remove(part)
+        upload = asyncio.ensure_future(self._upload_part(part))
+        self._uploading[part.archive_name] = (part, upload)
+        return upload
+
+    async def add(self, prefix: str, object_name: str, data: bytes) -> None:
+        """
+        Pack the object into the part of its prefix, upload the part if full.
+        A failed upload is logged rather than raised, the part is uploaded again by flush()
+        """
+        entry = pack_entry(data, self._codec)
+        closed: List[ArchivePart] = []
+        part = self._parts.get(prefix)
+        if part is None:
+            if len(self._parts) >= self._max_open_parts:
+                closed.append(self._parts.pop(next(iter(self._parts))))
+            part = self._parts[prefix] = ArchivePart(new_archive_name(prefix, self._codec))
+        part.append(object_name, entry)
+        if part.size >= self._part_size:
+            closed.append(self._parts.pop(prefix))
+        # parts are closed and their uploads started before any await, so concurrent adds open new ones
+        self._closed.extend(closed)
+        uploads = [(part, self._start_upload(part)) for part in closed]
+        for part, upload in uploads:
+            try:
+                # shielded, so a cancelled add leaves the upload for flush() to wait for
+                await asyncio.shield(upload)
+            except Exception as e:
+                logger.warning("upload of %s failed, kept for the next flush: %r", part.archive_name, e)
+
+    async def flush(self) -> None:
+        """
+        Upload every part held in memory, those failed to before included,
+        and wait for the uploads started by add() meanwhile.
+        Parts failing to upload are kept for the next call, the first error is raised once all are tried
+        """
+        self._closed.extend(self._parts.values())
+        self._parts.clear()
+        for part in list(self._closed):
+            self._start_upload(part)
+        uploads = list(self._uploading.values())
+        if not uploads:
+            return
+        # waited for rather than gathered, so a cancelled flush leaves the uploads of add() alone
+        await asyncio.wait([upload for _, upload in uploads])
+        error: Optional[BaseException] = None
+        for part, upload in uploads:
+            e = upload.exception()
+            if e is not None:
+                logger.error("upload of %s failed: %r", part.archive_name, e)
+                error = error or e
+        if error is not None:
+            raise error
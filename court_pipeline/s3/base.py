@@ -1,10 +1,45 @@
 from abc import ABC, abstractmethod
 import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import io
+import logging
 import os
-from typing import Any
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
 
+import certifi
+import urllib3
 from minio import Minio
+from minio.helpers import MIN_PART_SIZE
+
+from .archive import (
+    DEFAULT_PART_SIZE,
+    ArchiveEntry,
+    ArchivePacker,
+    ArchivePart,
+    archive_prefix_of,
+    index_name_of,
+    is_archive_name,
+    is_index_name,
+    parse_index,
+    unpack_entry,
+)
+from .codecs import Codec, codec_for_object_name, get_codec
+from .dedup import CHANGED, CONTENT_SHA256_METADATA, UNCHANGED, content_sha256, is_unchanged, normalize_etag
+from .index import ObjectIndex, normalize_object_name
+from .stream import ChunkReader
+from ..metrics.registry import NULL_METRICS, Metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+T = TypeVar('T')
+
+DEFAULT_MAX_WORKERS = 16
+HTTP_TIMEOUT = 300  # same as the default client of Minio
 
 
 class S3MixIn(ABC):
@@ -23,15 +58,165 @@ class S3MixIn(ABC):
         """
         pass
 
-    @property
     @abstractmethod
     def object_name(self, *args: Any, **kwargs: Any) -> str:
         """
-        Generate object name based on parameters.
+        Generate object name based on the request parameters.
         Must be implemented by concrete subclasses.
         """
         pass
 
+    def object_prefix(self, *args: Any, **kwargs: Any) -> str:
+        """
+        Prefix shared by the object and its siblings, e.g. all games of a season,
+        so that one listing covers many objects
+        """
+        return self.object_name(*args, **kwargs).rsplit('/', 1)[0] + '/'
+
+    def configure_storage(
+        self,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        codec: Optional[Union[str, Codec]] = None,
+        metrics: Optional[Metrics] = None,
+        packed: Optional[bool] = None,
+        archive_part_size: Optional[int] = None,
+        dedup: Optional[bool] = None,
+    ) -> None:
+        """
+        Configure the storage resources, must be called before the first S3 call.
+        Unset values fall back to S3_MAX_WORKERS, S3_MAX_IN_FLIGHT and S3_CODEC
+        environment variables.
+
+        :param max_workers: threads running blocking S3 calls, also the HTTP connection pool size
+        :type max_workers: Optional[int]
+        :param max_in_flight: uploads running or queued at once,
+            further store_object calls wait for a slot
+        :type max_in_flight: Optional[int]
+        :param codec: compression of stored objects, a codec or one of 'identity', 'gzip', 'zstd'
+        :type codec: Optional[Union[str, Codec]]
+        :param metrics: records upload latency and bytes out
+        :type metrics: Optional[Metrics]
+        :param packed: pack objects into archive parts per prefix rather than storing one object each,
+            see flush_archives()
+        :type packed: Optional[bool]
+        :param archive_part_size: size from which an archive part is uploaded, default is 64 MiB
+        :type archive_part_size: Optional[int]
+        :param dedup: skip the upload of objects already stored with the same content, see store_object()
+        :type dedup: Optional[bool]
+        """
+        if getattr(self, '_s3_executor', None) is not None:
+            raise RuntimeError("storage is already in use and cannot be reconfigured")
+        if max_workers is not None:
+            setattr(self, '_s3_max_workers', max_workers)
+        if max_in_flight is not None:
+            setattr(self, '_s3_max_in_flight', max_in_flight)
+        if codec is not None:
+            setattr(self, '_codec', get_codec(codec) if isinstance(codec, str) else codec)
+        if metrics is not None:
+            setattr(self, '_metrics', metrics)
+        if packed is not None:
+            setattr(self, '_packed', packed)
+        if archive_part_size is not None:
+            setattr(self, '_archive_part_size', archive_part_size)
+        if dedup is not None:
+            setattr(self, '_dedup', dedup)
+
+    @property
+    def metrics(self) -> Metrics:
+        """
+        Metrics of the storage calls, shared with the proxy of an extractor
+        """
+        _metrics = getattr(self, '_metrics', None)
+        return _metrics if _metrics is not None else NULL_METRICS
+
+    @property
+    def codec(self) -> Codec:
+        """
+        Compression of stored objects, subclasses append its suffix to object names
+        """
+        _codec = getattr(self, '_codec', None)
+        if _codec is None:
+            _codec = get_codec(os.getenv('S3_CODEC', 'identity'))
+            setattr(self, '_codec', _codec)
+        return _codec
+
+    @property
+    def packed(self) -> bool:
+        return getattr(self, '_packed', False)
+
+    @property
+    def dedup(self) -> bool:
+        return getattr(self, '_dedup', False)
+
+    @property
+    def object_etags(self) -> Dict[str, str]:
+        """
+        ETags of the stored objects by normalized name, known once their prefix is listed
+        """
+        _object_etags = getattr(self, '_object_etags', None)
+        if _object_etags is None:
+            _object_etags = {}
+            setattr(self, '_object_etags', _object_etags)
+        return _object_etags
+
+    @property
+    def store_outcomes(self) -> collections.Counter:
+        """
+        Objects stored as 'changed', i.e. uploaded, and 'unchanged', i.e. already stored as is
+        """
+        _store_outcomes = getattr(self, '_store_outcomes', None)
+        if _store_outcomes is None:
+            _store_outcomes = collections.Counter()
+            setattr(self, '_store_outcomes', _store_outcomes)
+        return _store_outcomes
+
+    def count_store(self, outcome: str) -> None:
+        """
+        :param outcome: 'changed' or 'unchanged', see store_outcomes
+        :type outcome: str
+        """
+        self.store_outcomes[outcome] += 1
+        self.metrics.increment('s3.objects', bucket=self.bucket_name, outcome=outcome)
+
+    @property
+    def archive_packer(self) -> ArchivePacker:
+        _archive_packer = getattr(self, '_archive_packer', None)
+        if _archive_packer is None:
+            _archive_packer = ArchivePacker(
+                self._store_archive,
+                self.codec,
+                part_size=getattr(self, '_archive_part_size', None) or DEFAULT_PART_SIZE,
+            )
+            setattr(self, '_archive_packer', _archive_packer)
+        return _archive_packer
+
+    @property
+    def archive_entries(self) -> Dict[str, ArchiveEntry]:
+        """
+        Byte ranges of the packed objects by normalized name,
+        known once their prefix is listed or their archive part uploaded
+        """
+        _archive_entries = getattr(self, '_archive_entries', None)
+        if _archive_entries is None:
+            _archive_entries = {}
+            setattr(self, '_archive_entries', _archive_entries)
+        return _archive_entries
+
+    @property
+    def s3_max_workers(self) -> int:
+        _s3_max_workers = getattr(self, '_s3_max_workers', None)
+        if _s3_max_workers is None:
+            _s3_max_workers = int(os.getenv('S3_MAX_WORKERS', DEFAULT_MAX_WORKERS))
+        return _s3_max_workers
+
+    @property
+    def s3_max_in_flight(self) -> int:
+        _s3_max_in_flight = getattr(self, '_s3_max_in_flight', None)
+        if _s3_max_in_flight is None:
+            _s3_max_in_flight = int(os.getenv('S3_MAX_IN_FLIGHT', self.s3_max_workers * 2))
+        return _s3_max_in_flight
+
     @property
     def s3_client(self) -> Minio:
         _s3_client = getattr(self, '_s3_client', None)
@@ -40,11 +225,126 @@ class S3MixIn(ABC):
                 endpoint=os.getenv('S3_ENDPOINT', 'localhost:9000'),
                 access_key=os.getenv('S3_ACCESS_KEY', 'minioadmin'),
                 secret_key=os.getenv('S3_SECRET_KEY', 'minioadmin'),
-                secure=os.getenv('S3_SECURE', 'false').lower() == 'true'
+                secure=os.getenv('S3_SECURE', 'false').lower() == 'true',
+                http_client=urllib3.PoolManager(
+                    # one connection per worker thread, Minio defaults to 10
+                    maxsize=self.s3_max_workers,
+                    timeout=urllib3.Timeout(connect=HTTP_TIMEOUT, read=HTTP_TIMEOUT),
+                    cert_reqs='CERT_REQUIRED',
+                    ca_certs=os.environ.get('SSL_CERT_FILE') or certifi.where(),
+                    retries=urllib3.Retry(
+                        total=5,
+                        backoff_factor=0.2,
+                        status_forcelist=[500, 502, 503, 504],
+                    ),
+                ),
             )
             setattr(self, '_s3_client', _s3_client)
         return _s3_client
 
+    @property
+    def s3_executor(self) -> ThreadPoolExecutor:
+        """
+        Dedicated executor of blocking S3 calls, so uploads do not queue
+        behind the size of the default executor or other thread users
+        """
+        _s3_executor = getattr(self, '_s3_executor', None)
+        if _s3_executor is None:
+            _s3_executor = ThreadPoolExecutor(
+                max_workers=self.s3_max_workers,
+                thread_name_prefix='s3',
+            )
+            setattr(self, '_s3_executor', _s3_executor)
+        return _s3_executor
+
+    @property
+    def s3_upload_slots(self) -> asyncio.Semaphore:
+        _s3_upload_slots = getattr(self, '_s3_upload_slots', None)
+        if _s3_upload_slots is None:
+            _s3_upload_slots = asyncio.Semaphore(self.s3_max_in_flight)
+            setattr(self, '_s3_upload_slots', _s3_upload_slots)
+        return _s3_upload_slots
+
+    async def run_blocking(self, func: Callable[..., T], **kwargs: Any) -> T:
+        """
+        Run a blocking S3 call on the storage executor
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.s3_executor, functools.partial(func, **kwargs))
+
+    def close_storage(self) -> None:
+        """
+        Release the storage executor, storage may be used again afterwards.
+        Blocks until the storage calls in flight end, run it off the event loop, e.g. with asyncio.to_thread.
+        """
+        _s3_executor = getattr(self, '_s3_executor', None)
+        if _s3_executor is not None:
+            _s3_executor.shutdown(wait=True)
+            setattr(self, '_s3_executor', None)
+
+    @property
+    def object_index(self) -> ObjectIndex:
+        _object_index = getattr(self, '_object_index', None)
+        if _object_index is None:
+            _object_index = ObjectIndex(self.list_object_names)
+            setattr(self, '_object_index', _object_index)
+        return _object_index
+
+    def record_stored(self, object_name: str, etag: Optional[str] = None) -> None:
+        """
+        Add an object stored by this process to the object index and its ETag to object_etags,
+        so is_stored() and dedup find it without listing its prefix again
+        """
+        self.object_index.add(object_name, self.archive_prefix(object_name))
+        name = normalize_object_name(object_name)
+        if etag is None:
+            self.object_etags.pop(name, None)
+        else:
+            self.object_etags[name] = etag
+
+    async def list_object_names(self, prefix: str) -> Set[str]:
+        """
+        List names of all objects under the prefix in one pass.
+        Objects packed into archive parts are listed by their own names, read from the sidecar indexes,
+        while the archive parts themselves are left out.
+        """
+
+        def _list_object_names(client: Minio, bucket_name: str, prefix: str) -> Dict[str, Optional[str]]:
+            return {
+                obj.object_name: normalize_etag(obj.etag)
+                for obj in client.list_objects(bucket_name, prefix=prefix, recursive=True)
+            }
+
+        names = await self.run_blocking(
+            _list_object_names,
+            client=self.s3_client,
+            bucket_name=self.bucket_name,
+            prefix=prefix,
+        )
+        object_names = {name for name in names if not is_archive_name(name)}
+        # the listing is the manifest of ETags which dedup compares payloads with
+        self.object_etags.update({
+            normalize_object_name(name): names[name]
+            for name in object_names
+            if names[name] is not None
+        })
+        # later parts take precedence for objects packed more than once
+        for index_name in sorted(name for name in names if is_index_name(name)):
+            entries = parse_index(await self.load_object(index_name))
+            self.archive_entries.update(entries)
+            object_names.update(entries)
+        return object_names
+
+    async def is_stored(self, *args: Any, **kwargs: Any) -> bool:
+        """
+        Whether the object of the request parameters exists,
+        looked up in the object index rather than one request per object
+        """
+        return await self.object_index.contains(
+            self.object_name(*args, **kwargs),
+            self.object_prefix(*args, **kwargs),
+        )
+
     async def create_bucket(self) -> None:
 
         def _create_bucket(client: Minio, bucket_name: str) -> None:
@@ -53,16 +353,36 @@ class S3MixIn(ABC):
                 return
             client.make_bucket(bucket_name)
 
-        await asyncio.to_thread(
+        await self.run_blocking(
             _create_bucket,
             client=self.s3_client,
             bucket_name=self.bucket_name,
         )
 
-    async def store_object(self, data: bytes, content_type: str) -> None:
+    async def store_object(
+        self,
+        data: bytes,
+        content_type: str,
+        object_name: str,
+    ) -> None:
         """
-        Store object to S3-compatible storage
+        Store object to S3-compatible storage, compressed with the codec.
+        At most s3_max_in_flight uploads run at once, callers beyond that wait,
+        which pushes back on whoever produces the data.
+        With dedup, the upload is skipped if the stored object has the same content,
+        compared by ETag with one listing per prefix, see store_outcomes.
+
+        :param data: object content
+        :type data: bytes
+        :param content_type: MIME type of the content before compression
+        :type content_type: str
+        :param object_name: name of the object, see object_name()
+        :type object_name: str
         """
+        if self.packed:
+            await self.archive_packer.add(self.archive_prefix(object_name), object_name, data)
+            self.count_store(CHANGED)
+            return
 
         def _store_object(
             client: Minio,
@@ -70,22 +390,299 @@ class S3MixIn(ABC):
             object_name: str,
             data: bytes,
             content_type: str,
-        ) -> None:
-            data_io = io.BytesIO(data)
-            data_length = len(data)
-            client.put_object(
+            codec: Codec,
+            dedup: bool,
+            etag: Optional[str],
+        ) -> Optional[Tuple[int, Optional[str]]]:
+            compressed = codec.compress(data)
+            if dedup and is_unchanged(client, bucket_name, object_name, etag, data, compressed):
+                return None
+            metadata = None
+            if codec.content_encoding is not None:
+                metadata = {'Content-Encoding': codec.content_encoding}
+            if dedup:
+                # compared with by HEAD when the ETag is not an MD5
+                metadata = {**(metadata or {}), CONTENT_SHA256_METADATA: content_sha256(data)}
+            data_io = io.BytesIO(compressed)
+            data_length = len(compressed)
+            result = client.put_object(
                 bucket_name=bucket_name,
                 object_name=object_name,
                 data=data_io,
                 length=data_length,
                 content_type=content_type,
+                metadata=metadata,
             )
+            return data_length, normalize_etag(getattr(result, 'etag', None))
 
-        await asyncio.to_thread(
-            _store_object,
-            client=self.s3_client,
-            bucket_name=self.bucket_name,
-            object_name=self.object_name,
-            data=data,
-            content_type=content_type,
-        )
+        etag = None
+        if self.dedup:
+            await self.object_index.load(self.archive_prefix(object_name))
+            etag = self.object_etags.get(normalize_object_name(object_name))
+        metrics = self.metrics
+        waited = time.perf_counter()
+        async with self.s3_upload_slots:
+            started = time.perf_counter()
+            metrics.observe('s3.upload_wait.seconds', started - waited, bucket=self.bucket_name)
+            stored = await self.run_blocking(
+                _store_object,
+                client=self.s3_client,
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                data=data,
+                content_type=content_type,
+                codec=self.codec,
+                dedup=self.dedup,
+                etag=etag,
+            )
+            metrics.observe('s3.upload.seconds', time.perf_counter() - started, bucket=self.bucket_name)
+        if stored is None:
+            self.count_store(UNCHANGED)
+            return
+        size, stored_etag = stored
+        self.record_stored(object_name, stored_etag)
+        self.count_store(CHANGED)
+        metrics.increment('s3.bytes_out', size, bucket=self.bucket_name)
+
+    async def store_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        content_type: str,
+        object_name: str,
+        part_size: int = MIN_PART_SIZE,
+        max_buffered_chunks: int = 8,
+    ) -> None:
+        """
+        Store streamed content to S3-compatible storage as a multipart upload,
+        compressed on the fly with the codec.
+        Memory per call is bounded by one part plus the buffered chunks,
+        whatever the size of the content.
+
+        :param chunks: content chunks, e.g. httpx.Response.aiter_bytes()
+        :type chunks: AsyncIterable[bytes]
+        :param content_type: MIME type of the content before compression
+        :type content_type: str
+        :param object_name: name of the object, see object_name()
+        :type object_name: str
+        :param part_size: size of each uploaded part, at least 5 MiB
+        :type part_size: int
+        :param max_buffered_chunks: chunks buffered between download and upload
+        :type max_buffered_chunks: int
+        """
+        if self.packed:
+            # packed objects are small by design, they are held in memory until their part is uploaded anyway
+            await self.store_object(b''.join([chunk async for chunk in chunks]), content_type, object_name)
+            return
+
+        def _store_stream(
+            client: Minio,
+            bucket_name: str,
+            object_name: str,
+            reader: ChunkReader,
+            content_type: str,
+            metadata: Optional[dict],
+            part_size: int,
+        ) -> Optional[str]:
+            result = client.put_object(
+                bucket_name=bucket_name,
+                object_name=object_name,
+                data=reader,
+                length=-1,
+                content_type=content_type,
+                metadata=metadata,
+                part_size=part_size,
+            )
+            return normalize_etag(getattr(result, 'etag', None))
+
+        codec = self.codec
+        metadata = None
+        if codec.content_encoding is not None:
+            metadata = {'Content-Encoding': codec.content_encoding}
+        compressor = codec.compressobj()
+        reader = ChunkReader(asyncio.get_running_loop(), max_chunks=max_buffered_chunks)
+        metrics = self.metrics
+        size = 0
+
+        async def feed(data: bytes) -> None:
+            nonlocal size
+            size += len(data)
+            await reader.feed(data, upload)
+
+        waited = time.perf_counter()
+        async with self.s3_upload_slots:
+            started = time.perf_counter()
+            metrics.observe('s3.upload_wait.seconds', started - waited, bucket=self.bucket_name)
+            upload = asyncio.ensure_future(self.run_blocking(
+                _store_stream,
+                client=self.s3_client,
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                reader=reader,
+                content_type=content_type,
+                metadata=metadata,
+                part_size=part_size,
+            ))
+            try:
+                async for chunk in chunks:
+                    await feed(compressor.compress(chunk))
+                await feed(compressor.flush())
+            except BaseException as e:
+                reader.close(e)
+                # the upload fails on the closed reader, surface the original error
+                await asyncio.gather(upload, return_exceptions=True)
+                raise
+            reader.close()
+            stored_etag = await upload
+            metrics.observe('s3.upload.seconds', time.perf_counter() - started, bucket=self.bucket_name)
+        self.record_stored(object_name, stored_etag)
+        self.count_store(CHANGED)
+        metrics.increment('s3.bytes_out', size, bucket=self.bucket_name)
+
+    def archive_prefix(self, object_name: str) -> str:
+        """
+        Prefix whose objects are packed together, the same as object_prefix(),
+        e.g. the games of a season or the scoreboards of a month
+        """
+        return object_name.rsplit('/', 1)[0] + '/'
+
+    async def _store_archive(self, part: ArchivePart) -> None:
+        """
+        Upload an archive part, then its sidecar index which makes its objects visible
+        """
+
+        def _put_object(
+            client: Minio,
+            bucket_name: str,
+            object_name: str,
+            data: bytes,
+            content_type: str,
+            metadata: Optional[dict],
+        ) -> None:
+            client.put_object(
+                bucket_name=bucket_name,
+                object_name=object_name,
+                data=io.BytesIO(data),
+                length=len(data),
+                content_type=content_type,
+                metadata=metadata,
+            )
+
+        codec = codec_for_object_name(part.archive_name)
+        metadata = None
+        if codec.content_encoding is not None:
+            metadata = {'Content-Encoding': codec.content_encoding}
+        index = part.index()
+        metrics = self.metrics
+        waited = time.perf_counter()
+        async with self.s3_upload_slots:
+            started = time.perf_counter()
+            metrics.observe('s3.upload_wait.seconds', started - waited, bucket=self.bucket_name)
+            await self.run_blocking(
+                _put_object,
+                client=self.s3_client,
+                bucket_name=self.bucket_name,
+                object_name=part.archive_name,
+                data=bytes(part.data),
+                content_type='application/x-ndjson',
+                metadata=metadata,
+            )
+            await self.run_blocking(
+                _put_object,
+                client=self.s3_client,
+                bucket_name=self.bucket_name,
+                object_name=index_name_of(part.archive_name),
+                data=index,
+                content_type='application/json',
+                metadata=None,
+            )
+            metrics.observe('s3.upload.seconds', time.perf_counter() - started, bucket=self.bucket_name)
+        metrics.increment('s3.bytes_out', part.size + len(index), bucket=self.bucket_name)
+        metrics.increment('s3.archive_parts', bucket=self.bucket_name)
+        self.archive_entries.update(part.archive_entries())
+        prefix = archive_prefix_of(part.archive_name)
+        for object_name in part.entries:
+            self.object_index.add(object_name, prefix)
+        logger.debug("stored %d objects in %s (%d bytes)", len(part.entries), part.archive_name, part.size)
+
+    def on_archived(self, object_name: str, callback: Callable[[], Awaitable[None]]) -> bool:
+        """
+        In packed mode, queue the callback until the archive part packing the object is uploaded,
+        e.g. to acknowledge the object only once readable.
+        False if no archive part held in memory packs the object, i.e. it is readable already.
+
+        :param object_name: name of the object, see object_name()
+        :type object_name: str
+        :param callback: awaited once the part is uploaded, never if it fails to
+        :type callback: Callable[[], Awaitable[None]]
+        """
+        _archive_packer = getattr(self, '_archive_packer', None)
+        return _archive_packer is not None and _archive_packer.on_uploaded(object_name, callback)
+
+    @property
+    def unarchived_object_names(self) -> List[str]:
+        """
+        In packed mode, names of the objects whose archive part is not uploaded yet,
+        e.g. lost if flush_archives() fails
+        """
+        _archive_packer = getattr(self, '_archive_packer', None)
+        return _archive_packer.buffered_object_names if _archive_packer is not None else []
+
+    async def flush_archives(self) -> None:
+        """
+        Upload the archive parts still held in memory, must be called once done storing in packed mode.
+        Objects of parts not uploaded yet are lost if the process dies.
+        Parts failing to upload, now or earlier, are kept and uploaded again by the next call,
+        which raises meanwhile.
+        """
+        _archive_packer = getattr(self, '_archive_packer', None)
+        if _archive_packer is not None:
+            await _archive_packer.flush()
+
+    async def load_object(self, object_name: str) -> bytes:
+        """
+        Read object from S3-compatible storage,
+        decompressed per the codec its name suffix denotes.
+        Packed objects are read with one ranged request on their archive part,
+        located by the listing of their prefix, see list_object_names().
+
+        :param object_name: name of the object, see object_name()
+        :type object_name: str
+        """
+
+        def _load_object(
+            client: Minio,
+            bucket_name: str,
+            object_name: str,
+            entry: Optional[ArchiveEntry],
+        ) -> bytes:
+            if entry is None:
+                response = client.get_object(bucket_name, object_name)
+                codec = codec_for_object_name(object_name)
+            else:
+                response = client.get_object(bucket_name, entry.archive_name, offset=entry.offset, length=entry.length)
+                codec = codec_for_object_name(entry.archive_name)
+            try:
+                # raw bytes, the codec decodes regardless of Content-Encoding
+                data = response.read(decode_content=False)
+            finally:
+                response.close()
+                response.release_conn()
+            if entry is None:
+                return codec.decompress(data)
+            return unpack_entry(data, codec)
+
+        # archive parts and their indexes are read directly, listing their prefix would read them again
+        if (
+            self.packed
+            and not is_archive_name(object_name)
+            and normalize_object_name(object_name) not in self.archive_entries
+        ):
+            await self.object_index.load(self.archive_prefix(object_name))
+        with self.metrics.timer('s3.load.seconds', bucket=self.bucket_name):
+            return await self.run_blocking(
+                _load_object,
+                client=self.s3_client,
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                entry=self.archive_entries.get(normalize_object_name(object_name)),
+            )
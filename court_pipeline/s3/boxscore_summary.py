@@ -1,26 +1,52 @@
-from typing import Optional, Protocol
-
 from .base import S3MixIn
+from .codecs import Codec, IdentityCodec
 from ..utils.game_id import GameId
 
 
-class BoxscoreSummaryProtocol(Protocol):
-
-    _game_id: Optional[str]
-
-
 class BoxscoreSummaryS3MixIn(S3MixIn):
 
     @property
     def bucket_name(self) -> str:
         return "boxscoresummary"
 
-    @property
-    def object_name(self: BoxscoreSummaryProtocol) -> str:
-        game_id_obj = GameId(self._game_id)
+    def object_name(self, game_id: str) -> str:
+        """
+        :param game_id: Identifier of game
+        :type game_id: str
+        """
+        game_id_obj = GameId(game_id)
         pattern = '/{league_id}/{season_year:04d}/{game_id}.json'
         return pattern.format(
             league_id=game_id_obj.league_id,
             season_year=game_id_obj.season_year,
             game_id=game_id_obj.value,
-        )
+        ) + self.codec.suffix
+
+
+class BoxscoreSummaryParquetS3MixIn(S3MixIn):
+    """
+    Boxscore summaries of a season flattened into one Parquet file per table,
+    partitioned by league and season in the Hive layout, e.g.
+    /league_id=00/season_year=2024/games.parquet
+    """
+
+    @property
+    def bucket_name(self) -> str:
+        return "boxscoresummary-parquet"
+
+    @property
+    def codec(self) -> Codec:
+        # Parquet pages are compressed already, so is the file left as is
+        return IdentityCodec()
+
+    def object_name(self, league_id: str, season_year: int, table: str = 'games') -> str:
+        """
+        :param league_id: Identifier of league
+        :type league_id: str
+        :param season_year: starting year of the season
+        :type season_year: int
+        :param table: one of 'games', 'teams', 'line_scores' and 'officials'
+        :type table: str
+        """
+        pattern = '/league_id={league_id}/season_year={season_year:04d}/{table}.parquet'
+        return pattern.format(league_id=league_id, season_year=season_year, table=table)
@@ -0,0 +1,147 @@
+from abc import ABC, abstractmethod
+import gzip
+from typing import Dict, Optional, Protocol, Type
+import zlib
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+
+class Compressor(Protocol):
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class PassthroughCompressor:
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b''
+
+
+class Codec(ABC):
+    """
+    Compression of stored objects.
+    The suffix is appended to object names, so the codec of a stored object
+    is known from its name alone.
+    """
+
+    name: str = ''
+    suffix: str = ''
+    content_encoding: Optional[str] = None
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def compressobj(self) -> Compressor:
+        """
+        Incremental compressor for streamed content
+        """
+        pass
+
+
+class IdentityCodec(Codec):
+
+    name = 'identity'
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+    def compressobj(self) -> Compressor:
+        return PassthroughCompressor()
+
+
+class GzipCodec(Codec):
+
+    name = 'gzip'
+    suffix = '.gz'
+    content_encoding = 'gzip'
+
+    def __init__(self, level: int = 6) -> None:
+        self._level: int = level
+
+    def compress(self, data: bytes) -> bytes:
+        # fixed mtime keeps the output identical for identical payloads
+        return gzip.compress(data, compresslevel=self._level, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+    def compressobj(self) -> Compressor:
+        # wbits 31 writes a gzip container
+        return zlib.compressobj(self._level, zlib.DEFLATED, 31)
+
+
+class ZstdCodec(Codec):
+
+    name = 'zstd'
+    suffix = '.zst'
+    content_encoding = 'zstd'
+
+    def __init__(self, level: int = 3) -> None:
+        if zstd is None:
+            raise ImportError(
+                "zstd compression requires Python 3.14+ or the 'zstandard' package"
+            )
+        self._level: int = level
+
+    def compress(self, data: bytes) -> bytes:
+        if zstd.__name__ == 'zstandard':
+            return zstd.ZstdCompressor(level=self._level).compress(data)
+        return zstd.compress(data, level=self._level)
+
+    def decompress(self, data: bytes) -> bytes:
+        if zstd.__name__ == 'zstandard':
+            # frames written by compressobj carry no content size
+            return zstd.ZstdDecompressor().decompressobj().decompress(data)
+        return zstd.decompress(data)
+
+    def compressobj(self) -> Compressor:
+        if zstd.__name__ == 'zstandard':
+            return zstd.ZstdCompressor(level=self._level).compressobj()
+        return zstd.ZstdCompressor(level=self._level)
+
+
+CODECS: Dict[str, Type[Codec]] = {
+    IdentityCodec.name: IdentityCodec,
+    GzipCodec.name: GzipCodec,
+    ZstdCodec.name: ZstdCodec,
+}
+
+
+def get_codec(name: str) -> Codec:
+    """
+    :param name: one of 'identity', 'gzip' and 'zstd'
+    :type name: str
+    """
+    if name not in CODECS:
+        raise ValueError(f"unknown codec {name}, expected one of {sorted(CODECS)}")
+    return CODECS[name]()
+
+
+def codec_for_object_name(object_name: str) -> Codec:
+    """
+    Codec of a stored object, inferred from its name suffix
+    """
+    for codec_cls in CODECS.values():
+        if codec_cls.suffix and object_name.endswith(codec_cls.suffix):
+            return codec_cls()
+    return IdentityCodec()
@@ -0,0 +1,60 @@
+import hashlib
+import re
+from typing import Any, Optional
+
+
+# user metadata recording the hash of the uncompressed payload
+CONTENT_SHA256_METADATA = 'x-amz-meta-content-sha256'
+
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+_MD5_ETAG = re.compile(r'^[0-9a-f]{32}$')
+
+
+def content_sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_etag(etag: Optional[str]) -> Optional[str]:
+    """
+    ETags are quoted in responses, which listings may or may not strip
+    """
+    if not isinstance(etag, str):
+        return None
+    return etag.strip('"').lower()
+
+
+def is_md5_etag(etag: str) -> bool:
+    """
+    Whether the ETag is the MD5 of the stored bytes, as for single-part uploads.
+    Multipart uploads, e.g. by store_stream, have ETags of the form '<md5 of part MD5s>-<parts>'.
+    """
+    return _MD5_ETAG.match(etag) is not None
+
+
+def is_unchanged(client: Any, bucket_name: str, object_name: str, etag: Optional[str], data: bytes, stored: bytes) -> bool:
+    """
+    Whether the stored object already holds the payload, blocking.
+    The listed ETag is compared with the MD5 of the bytes to store, which takes no request,
+    objects whose ETag is not an MD5 are compared by the hash recorded in their metadata with one HEAD request.
+
+    :param client: Minio client
+    :type client: Any
+    :param bucket_name: bucket of the object
+    :type bucket_name: str
+    :param object_name: name of the object
+    :type object_name: str
+    :param etag: ETag of the stored object as listed, None if not stored
+    :type etag: Optional[str]
+    :param data: uncompressed payload
+    :type data: bytes
+    :param stored: bytes to store, i.e. the compressed payload
+    :type stored: bytes
+    """
+    if etag is None:
+        return False
+    if is_md5_etag(etag):
+        return hashlib.md5(stored, usedforsecurity=False).hexdigest() == etag
+    stat = client.stat_object(bucket_name, object_name)
+    return (stat.metadata or {}).get(CONTENT_SHA256_METADATA) == content_sha256(data)
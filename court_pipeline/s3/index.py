@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Set
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_object_name(object_name: str) -> str:
+    """
+    Object names are built with a leading slash which listings may not return
+    """
+    return object_name.lstrip('/')
+
+
+class ObjectIndex:
+    """
+    In-memory set of stored object names, filled by one listing per prefix
+    and kept current with the objects stored since, see add().
+    Concurrent lookups under the same prefix wait for a single listing.
+    """
+
+    def __init__(self, list_object_names: Callable[[str], Awaitable[Set[str]]]) -> None:
+        """
+        :param list_object_names: list the object names under a prefix
+        :type list_object_names: Callable[[str], Awaitable[Set[str]]]
+        """
+        self._list_object_names: Callable[[str], Awaitable[Set[str]]] = list_object_names
+        self._prefixes: Dict[str, Set[str]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # objects stored under prefixes not loaded yet, which a listing in flight may miss
+        self._added: Dict[str, Set[str]] = {}
+
+    async def load(self, prefix: str) -> Set[str]:
+        names = self._prefixes.get(prefix)
+        if names is not None:
+            return names
+
+        lock = self._locks.setdefault(prefix, asyncio.Lock())
+        async with lock:
+            names = self._prefixes.get(prefix)
+            if names is None:
+                names = {
+                    normalize_object_name(name)
+                    for name in await self._list_object_names(prefix)
+                }
+                names.update(self._added.pop(prefix, ()))
+                self._prefixes[prefix] = names
+                logger.debug("indexed %d objects under %s", len(names), prefix)
+        return names
+
+    async def contains(self, object_name: str, prefix: str) -> bool:
+        names = await self.load(prefix)
+        return normalize_object_name(object_name) in names
+
+    def add(self, object_name: str, prefix: str) -> None:
+        """
+        Record a newly stored object, so lookups find it whether its prefix is loaded already or later
+        """
+        names = self._prefixes.get(prefix)
+        if names is None:
+            names = self._added.setdefault(prefix, set())
+        names.add(normalize_object_name(object_name))
@@ -1,27 +1,29 @@
 import datetime
-from typing import Any, Dict, Optional, Protocol
 
 from .base import S3MixIn
 
 
-class ScoreboardProtocol(Protocol):
-
-    _game_date: Optional[datetime.date]
-    _league_id: Optional[str]
-
-
 class ScoreboardS3MixIn(S3MixIn):
 
     @property
     def bucket_name(self) -> str:
         return "scoreboard"
 
-    @property
-    def object_name(self: ScoreboardProtocol) -> str:
+    def object_name(
+        self,
+        game_date: datetime.date,
+        league_id: str = "00",
+    ) -> str:
+        """
+        :param game_date: game date in format YYYY-MM-DD
+        :type game_date: datetime.date
+        :param league_id: Identifier of league, default is '00' for National Basketball Association
+        :type league_id: str
+        """
         pattern = '/{league_id}/{year:04d}/{month:02d}/{day:02d}.json'
         return pattern.format(
-            league_id=self._league_id,
-            year=self._game_date.year,
-            month=self._game_date.month,
-            day=self._game_date.day,
-        )
+            league_id=league_id,
+            year=game_date.year,
+            month=game_date.month,
+            day=game_date.day,
+        ) + self.codec.suffix
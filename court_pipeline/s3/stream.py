@@ -0,0 +1,84 @@
+import asyncio
+import queue
+from typing import Optional, Union
+
+
+_EOF = object()
+
+
+class ChunkReader:
+    """
+    File-like reader handing chunks produced on the event loop
+    to a blocking consumer running in a worker thread, e.g. Minio.put_object.
+
+    Producers await ``feed``, which waits while ``max_chunks`` chunks are buffered,
+    so memory is bounded regardless of the size of the whole content.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_chunks: int = 8) -> None:
+        """
+        :param loop: event loop of the producer
+        :type loop: asyncio.AbstractEventLoop
+        :param max_chunks: maximum number of chunks buffered between producer and consumer
+        :type max_chunks: int
+        """
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(max_chunks)
+        self._chunks: queue.SimpleQueue = queue.SimpleQueue()
+        self._buffer: bytes = b''
+        self._is_eof: bool = False
+
+    async def feed(self, chunk: bytes, consumer: Optional[asyncio.Future] = None) -> None:
+        """
+        Hand a chunk to the consumer, waiting for buffer space
+
+        :param chunk: content to append
+        :type chunk: bytes
+        :param consumer: future of the consumer, stop waiting if it ends early
+        :type consumer: Optional[asyncio.Future]
+        """
+        if not chunk:
+            return
+        if consumer is None or not self._slots.locked():
+            await self._slots.acquire()
+        else:
+            acquire = asyncio.ensure_future(self._slots.acquire())
+            await asyncio.wait({acquire, consumer}, return_when=asyncio.FIRST_COMPLETED)
+            if not acquire.done():
+                acquire.cancel()
+                consumer.result()
+                raise RuntimeError("consumer stopped before the end of the content")
+        self._chunks.put(chunk)
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """
+        Signal the end of the content, or its failure to the consumer
+        """
+        self._chunks.put(error if error is not None else _EOF)
+
+    def _release(self) -> None:
+        self._loop.call_soon_threadsafe(self._slots.release)
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Blocking read from the consumer thread,
+        returns at most size bytes and b'' at the end of the content
+        """
+        if size == 0:
+            return b''
+        while not self._is_eof and (size < 0 or not self._buffer):
+            item: Union[bytes, BaseException, object] = self._chunks.get()
+            if item is _EOF:
+                self._is_eof = True
+            elif isinstance(item, BaseException):
+                self._is_eof = True
+                raise IOError("content producer failed") from item
+            else:
+                self._buffer += item
+                self._release()
+
+        if size < 0 or size >= len(self._buffer):
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
@@ -0,0 +1,179 @@
+import datetime
+import json
+from typing import Any, Dict, List, Optional, Union
+
+from .game_id import GameId
+
+
+# postgame team statistics kept as columns of the teams table, in payload naming
+TEAM_STATISTICS = (
+    'points',
+    'reboundsTotal',
+    'assists',
+    'steals',
+    'blocks',
+    'turnovers',
+    'fieldGoalsPercentage',
+    'threePointersPercentage',
+    'freeThrowsPercentage',
+    'pointsInThePaint',
+    'pointsSecondChance',
+    'pointsFastBreak',
+    'pointsFromTurnovers',
+    'benchPoints',
+    'biggestLead',
+    'leadChanges',
+    'timesTied',
+)
+
+
+def snake_case(name: str) -> str:
+    """
+    'fieldGoalsPercentage' -> 'field_goals_percentage'
+    """
+    return ''.join(f'_{char.lower()}' if char.isupper() else char for char in name)
+
+
+def _int(value: Any) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    return int(value)
+
+
+def _float(value: Any) -> Optional[float]:
+    if value is None or value == '':
+        return None
+    return float(value)
+
+
+def _str(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return str(value).strip()
+
+
+def _bool(value: Any) -> Optional[bool]:
+    if value is None or value == '':
+        return None
+    return bool(value)
+
+
+def _timestamp(value: Any) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"invalid timestamp {value!r}")
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def flatten_boxscore_summary(content: Union[bytes, str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Rows of a boxscoresummaryv3 payload per table, typed and named in snake case:
+    'games' with one row, 'teams' with one row per team,
+    'line_scores' with one row per team and period, 'officials' with one row per official.
+    Rows of every table carry the game_id, league_id and season_year of the game.
+
+    :param content: boxscoresummaryv3 response body
+    :type content: Union[bytes, str]
+    """
+    payload = json.loads(content)
+    summary = payload.get('boxScoreSummary') if isinstance(payload, dict) else None
+    if not isinstance(summary, dict):
+        raise ValueError("payload is not a boxscore summary")
+    try:
+        game_id = GameId(summary['gameId'])
+    except (KeyError, TypeError) as e:
+        raise ValueError("payload is not a boxscore summary") from e
+    try:
+        return _flatten(summary, game_id)
+    except (AttributeError, TypeError) as e:
+        # nested values of another shape, e.g. a list where an object is expected
+        raise ValueError(f"boxscore summary of {game_id.value} has an unexpected shape") from e
+
+
+def _flatten(summary: Dict[str, Any], game_id: GameId) -> Dict[str, List[Dict[str, Any]]]:
+    keys = {
+        'game_id': game_id.value,
+        'league_id': game_id.league_id,
+        'season_year': game_id.season_year,
+    }
+    home_team = summary.get('homeTeam') or {}
+    away_team = summary.get('awayTeam') or {}
+    arena = summary.get('arena') or {}
+    games = [{
+        **keys,
+        'game_type_id': game_id.game_type_id,
+        'game_code': _str(summary.get('gameCode')),
+        'game_status': _int(summary.get('gameStatus')),
+        'game_status_text': _str(summary.get('gameStatusText')),
+        'period': _int(summary.get('period')),
+        'game_time_utc': _timestamp(summary.get('gameTimeUTC')),
+        # local time of the arena despite its 'Z' suffix, kept as is
+        'game_et': _str(summary.get('gameEt')),
+        'duration': _str(summary.get('duration')),
+        'attendance': _int(summary.get('attendance')),
+        'sellout': _bool(_int(summary.get('sellout'))),
+        'home_team_id': _int(summary.get('homeTeamId')),
+        'away_team_id': _int(summary.get('awayTeamId')),
+        'home_score': _int(home_team.get('score')),
+        'away_score': _int(away_team.get('score')),
+        'arena_id': _int(arena.get('arenaId')),
+        'arena_name': _str(arena.get('arenaName')),
+        'arena_city': _str(arena.get('arenaCity')),
+        'arena_state': _str(arena.get('arenaState')),
+        'arena_country': _str(arena.get('arenaCountry')),
+        'game_label': _str(summary.get('gameLabel')),
+        'game_sub_label': _str(summary.get('gameSubLabel')),
+        'game_subtype': _str(summary.get('gameSubtype')),
+        'series_text': _str(summary.get('seriesText')),
+        'is_neutral': _bool(summary.get('isNeutral')),
+        'if_necessary': _bool(summary.get('ifNecessary')),
+    }]
+
+    teams = []
+    line_scores = []
+    postgame = summary.get('postgameCharts') or {}
+    for side, team, is_home in (('homeTeam', home_team, True), ('awayTeam', away_team, False)):
+        if not team:
+            continue
+        team_id = _int(team.get('teamId'))
+        statistics = (postgame.get(side) or {}).get('statistics') or {}
+        teams.append({
+            **keys,
+            'team_id': team_id,
+            'is_home': is_home,
+            'team_name': _str(team.get('teamName')),
+            'team_city': _str(team.get('teamCity')),
+            'team_tricode': _str(team.get('teamTricode')),
+            'team_wins': _int(team.get('teamWins')),
+            'team_losses': _int(team.get('teamLosses')),
+            'score': _int(team.get('score')),
+            **{snake_case(name): _float(statistics.get(name)) for name in TEAM_STATISTICS},
+        })
+        for period in team.get('periods') or []:
+            line_scores.append({
+                **keys,
+                'team_id': team_id,
+                'period': _int(period.get('period')),
+                'period_type': _str(period.get('periodType')),
+                'score': _int(period.get('score')),
+            })
+
+    officials = [
+        {
+            **keys,
+            'person_id': _int(official.get('personId')),
+            'name': _str(official.get('name')),
+            'first_name': _str(official.get('firstName')),
+            'family_name': _str(official.get('familyName')),
+            'jersey_num': _str(official.get('jerseyNum')),
+            'assignment': _str(official.get('assignment')),
+        }
+        for official in summary.get('officials') or []
+    ]
+    return {
+        'games': games,
+        'teams': teams,
+        'line_scores': line_scores,
+        'officials': officials,
+    }
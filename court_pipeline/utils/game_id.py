@@ -1,7 +1,16 @@
-import re
+import array
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, List, Sequence
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-GAME_ID_PATTERN = re.compile(r'^(\d{2})(\d{1})(\d{2})(\d{5})$')
+
+FIRST_SEASON_YEAR = 1946  # first game is in 1946-11-01
+MAX_GAME_SEQ_ID = 99999
+COLUMN_BACKENDS = ('list', 'array', 'numpy')
 LEAGUE_MAPPING = {
     "00": "NBA",
     "01": "WNBA",
@@ -17,6 +26,20 @@ GAME_TYPE_MAPPING = {
 
 
 class GameId:
+    """
+    Parsed game identifier, e.g. '0022400001' is game 1 of the 2024-25 NBA regular season.
+    Fields are derived once on creation, instances are compact and hashable
+    so that large numbers of them can be held as keys.
+    """
+
+    __slots__ = (
+        '_game_id',
+        '_league_id',
+        '_game_type_id',
+        '_season_id',
+        '_season_year',
+        '_game_seq_id',
+    )
 
     def __init__(self, game_id: str) -> None:
         self._game_id = game_id
@@ -29,19 +52,31 @@ class GameId:
     def _validate(self) -> None:
         if not isinstance(self._game_id, str):
             raise TypeError("game_id should be a string")
-        if not self._game_id.isdigit():
+        # isdigit alone accepts non-ASCII digits such as superscripts
+        if not (self._game_id.isascii() and self._game_id.isdigit()):
             raise ValueError("game_id should be a numeric string")
         if len(self._game_id) != 10:
             raise ValueError("game_id should be 10 digits")
 
     def _parse(self) -> None:
         self._validate()
-        match = GAME_ID_PATTERN.match(self._game_id)
-        league_str, game_type_str, season_str, game_seq_str = match.groups()
-        self._league_id = league_str
-        self._game_type_id = int(game_type_str)
-        self._season_id = season_str
-        self._game_seq_id = int(game_seq_str)
+        game_id = self._game_id
+        self._league_id = game_id[:2]
+        self._game_type_id = int(game_id[2])
+        self._season_id = game_id[3:5]
+        self._season_year = to_season_year(int(self._season_id))
+        self._game_seq_id = int(game_id[5:])
+
+    def __repr__(self) -> str:
+        return f'GameId({self._game_id!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GameId):
+            return NotImplemented
+        return self._game_id == other._game_id
+
+    def __hash__(self) -> int:
+        return hash(self._game_id)
 
     @property
     def league_id(self) -> str:
@@ -69,12 +104,273 @@ class GameId:
 
     @property
     def season_year(self) -> int:
-        year_suffix = int(self._season_id)
-        year_prefix = 19
-        if year_suffix < 46:  # first game is in 1946-11-01
-            year_prefix = 20
-        return int(f'{year_prefix}{year_suffix}')
+        return self._season_year
 
     @property
     def game_seq_id(self) -> int:
         return self._game_seq_id
+
+    @classmethod
+    def from_parts(
+        cls,
+        league_id: str,
+        game_type_id: int,
+        season_year: int,
+        game_seq_id: int,
+    ) -> "GameId":
+        """
+        :param league_id: Identifier of league, e.g. '00' for National Basketball Association
+        :type league_id: str
+        :param game_type_id: Identifier of game type, e.g. 2 for regular season
+        :type game_type_id: int
+        :param season_year: starting year of the season, e.g. 2024 for 2024-25 season
+        :type season_year: int
+        :param game_seq_id: sequence number of the game within the season and game type
+        :type game_seq_id: int
+        """
+        _validate_parts(league_id, game_type_id, season_year)
+        if not 0 <= game_seq_id <= MAX_GAME_SEQ_ID:
+            raise ValueError(f"game_seq_id should be between 0 and {MAX_GAME_SEQ_ID}")
+        # fields are known already, skip parsing the assembled value
+        game_id = cls.__new__(cls)
+        game_id._season_id = f'{season_year % 100:02d}'
+        game_id._game_id = f'{league_id}{game_type_id}{game_id._season_id}{game_seq_id:05d}'
+        game_id._league_id = league_id
+        game_id._game_type_id = game_type_id
+        game_id._season_year = season_year
+        game_id._game_seq_id = game_seq_id
+        return game_id
+
+
+def to_season_year(season_suffix: int) -> int:
+    """
+    Starting year of the season from its two last digits,
+    seasons span a century from FIRST_SEASON_YEAR
+    """
+    if season_suffix < FIRST_SEASON_YEAR % 100:
+        return 2000 + season_suffix
+    return 1900 + season_suffix
+
+
+def _validate_parts(league_id: str, game_type_id: int, season_year: int) -> None:
+    is_digits = isinstance(league_id, str) and league_id.isascii() and league_id.isdigit()
+    if not (is_digits and len(league_id) == 2):
+        raise ValueError("league_id should be 2 digits")
+    if not 0 <= game_type_id <= 9:
+        raise ValueError("game_type_id should be a single digit")
+    if not FIRST_SEASON_YEAR <= season_year < FIRST_SEASON_YEAR + 100:
+        raise ValueError(
+            f"season_year should be between {FIRST_SEASON_YEAR} "
+            f"and {FIRST_SEASON_YEAR + 99}"
+        )
+
+
+def iter_game_ids(
+    league_id: str,
+    season_year: int,
+    game_type_id: int,
+    stop: int,
+    start: int = 1,
+) -> Iterator[GameId]:
+    """
+    Enumerate game IDs of one league, season and game type
+
+    :param league_id: Identifier of league
+    :type league_id: str
+    :param season_year: starting year of the season
+    :type season_year: int
+    :param game_type_id: Identifier of game type
+    :type game_type_id: int
+    :param stop: last game sequence number, inclusive
+    :type stop: int
+    :param start: first game sequence number, default is 1
+    :type start: int
+    """
+    for game_seq_id in range(start, stop + 1):
+        yield GameId.from_parts(league_id, game_type_id, season_year, game_seq_id)
+
+
+@dataclass
+class GameIdColumns:
+    """
+    Game identifiers and their fields as parallel columns,
+    held in lists, array.array or numpy.ndarray per the backend
+    """
+
+    value: Sequence[str]
+    league_id: Sequence[str]
+    game_type_id: Sequence[int]
+    season_year: Sequence[int]
+    game_seq_id: Sequence[int]
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+
+def generate_game_ids(
+    league_ids: Iterable[str],
+    game_type_ids: Iterable[int],
+    season_years: Iterable[int],
+    stop: int,
+    start: int = 1,
+) -> List[str]:
+    """
+    Game IDs of every league x game type x season x sequence number combination, in that order.
+    The parts are validated once per combination rather than once per identifier.
+
+    :param league_ids: Identifiers of leagues
+    :type league_ids: Iterable[str]
+    :param game_type_ids: Identifiers of game types
+    :type game_type_ids: Iterable[int]
+    :param season_years: starting years of the seasons
+    :type season_years: Iterable[int]
+    :param stop: last game sequence number, inclusive
+    :type stop: int
+    :param start: first game sequence number, default is 1
+    :type start: int
+    """
+    return [
+        prefix + suffix
+        for prefix in _iter_prefixes(league_ids, game_type_ids, season_years)
+        for suffix in _seq_suffixes(start, stop)
+    ]
+
+
+def generate_game_id_columns(
+    league_ids: Iterable[str],
+    game_type_ids: Iterable[int],
+    season_years: Iterable[int],
+    stop: int,
+    start: int = 1,
+    backend: str = 'list',
+) -> GameIdColumns:
+    """
+    Like generate_game_ids, with the fields as columns and nothing parsed
+
+    :param backend: one of 'list', 'array' and 'numpy'
+    :type backend: str
+    """
+    _check_backend(backend)
+    league_ids = tuple(league_ids)
+    game_type_ids = tuple(game_type_ids)
+    season_years = tuple(season_years)
+    suffixes = _seq_suffixes(start, stop)
+    seq_ids = range(start, stop + 1)
+    size = len(seq_ids)
+
+    columns = GameIdColumns(value=[], league_id=[], game_type_id=[], season_year=[], game_seq_id=[])
+    for league_id in league_ids:
+        for game_type_id in game_type_ids:
+            for season_year in season_years:
+                _validate_parts(league_id, game_type_id, season_year)
+                prefix = f'{league_id}{game_type_id}{season_year % 100:02d}'
+                columns.value.extend(prefix + suffix for suffix in suffixes)
+                columns.league_id.extend([league_id] * size)
+                columns.game_type_id.extend([game_type_id] * size)
+                columns.season_year.extend([season_year] * size)
+                columns.game_seq_id.extend(seq_ids)
+    return _to_backend(columns, backend)
+
+
+def parse_game_id_columns(values: Iterable[str], backend: str = 'list') -> GameIdColumns:
+    """
+    Validate and split game IDs into columns in bulk, without a GameId per value.
+    With the numpy backend the digits are checked and decoded as one array.
+
+    :param values: game IDs, e.g. '0022400001'
+    :type values: Iterable[str]
+    :param backend: one of 'list', 'array' and 'numpy'
+    :type backend: str
+    """
+    _check_backend(backend)
+    if backend == 'numpy':
+        return _parse_game_id_columns_numpy(values)
+
+    values = list(values)
+    for value in values:
+        if not (isinstance(value, str) and len(value) == 10 and value.isascii() and value.isdigit()):
+            raise ValueError(f"invalid game_id {value!r}, should be 10 digits")
+    columns = GameIdColumns(
+        value=values,
+        league_id=[value[:2] for value in values],
+        game_type_id=[int(value[2]) for value in values],
+        season_year=[to_season_year(int(value[3:5])) for value in values],
+        game_seq_id=[int(value[5:]) for value in values],
+    )
+    return _to_backend(columns, backend)
+
+
+def _iter_prefixes(
+    league_ids: Iterable[str],
+    game_type_ids: Iterable[int],
+    season_years: Iterable[int],
+) -> Iterator[str]:
+    game_type_ids = tuple(game_type_ids)
+    season_years = tuple(season_years)
+    for league_id in league_ids:
+        for game_type_id in game_type_ids:
+            for season_year in season_years:
+                _validate_parts(league_id, game_type_id, season_year)
+                yield f'{league_id}{game_type_id}{season_year % 100:02d}'
+
+
+def _seq_suffixes(start: int, stop: int) -> List[str]:
+    if not 0 <= start <= MAX_GAME_SEQ_ID or stop > MAX_GAME_SEQ_ID:
+        raise ValueError(f"game sequence numbers should be between 0 and {MAX_GAME_SEQ_ID}")
+    return [f'{game_seq_id:05d}' for game_seq_id in range(start, stop + 1)]
+
+
+def _check_backend(backend: str) -> None:
+    if backend not in COLUMN_BACKENDS:
+        raise ValueError(f"unknown backend {backend}, expected one of {list(COLUMN_BACKENDS)}")
+    if backend == 'numpy' and np is None:
+        raise ImportError("numpy backend requires the 'numpy' package")
+
+
+def _to_backend(columns: GameIdColumns, backend: str) -> GameIdColumns:
+    if backend == 'array':
+        return GameIdColumns(
+            value=columns.value,
+            league_id=columns.league_id,
+            game_type_id=array.array('B', columns.game_type_id),
+            season_year=array.array('H', columns.season_year),
+            game_seq_id=array.array('L', columns.game_seq_id),
+        )
+    if backend == 'numpy':
+        return GameIdColumns(
+            value=np.array(columns.value, dtype='U10'),
+            league_id=np.array(columns.league_id, dtype='U2'),
+            game_type_id=np.array(columns.game_type_id, dtype=np.uint8),
+            season_year=np.array(columns.season_year, dtype=np.uint16),
+            game_seq_id=np.array(columns.game_seq_id, dtype=np.uint32),
+        )
+    return columns
+
+
+def _parse_game_id_columns_numpy(values: Any) -> GameIdColumns:
+    if not (isinstance(values, np.ndarray) and values.dtype.kind == 'U'):
+        values = list(values)
+        # checked up front, an array of dtype str would silently convert e.g. ints
+        for value in values:
+            if not isinstance(value, str):
+                raise ValueError(f"invalid game_id {value!r}, should be 10 digits")
+    values = np.asarray(values, dtype=str)
+    if values.size == 0:
+        values = values.astype('U10')
+    elif values.dtype.itemsize != 40 or (np.char.str_len(values) != 10).any():
+        raise ValueError("invalid game_id, should be 10 digits")
+    # unicode strings are stored as UCS-4 code points, one row of 10 per value
+    digits = values.view(np.uint32).reshape(-1, 10) - ord('0')
+    if (digits > 9).any():
+        raise ValueError("invalid game_id, should be 10 digits")
+
+    season_suffix = digits[:, 3] * 10 + digits[:, 4]
+    season_year = season_suffix + np.where(season_suffix < FIRST_SEASON_YEAR % 100, 2000, 1900)
+    game_seq_id = digits[:, 5:] @ np.array([10000, 1000, 100, 10, 1], dtype=np.uint32)
+    return GameIdColumns(
+        value=values,
+        league_id=values.astype('U2'),
+        game_type_id=digits[:, 2].astype(np.uint8),
+        season_year=season_year.astype(np.uint16),
+        game_seq_id=game_seq_id.astype(np.uint32),
+    )
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+import datetime
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+from .game_id import GameId
+
+
+# scoreboards are dated in US Eastern time, a late game is still on the date it tipped off
+GAME_DATE_TIMEZONE = 'America/New_York'
+
+
+def game_date_today() -> datetime.date:
+    """
+    Game date of today, whatever the timezone of the host
+    """
+    return datetime.datetime.now(ZoneInfo(GAME_DATE_TIMEZONE)).date()
+
+
+@dataclass(frozen=True)
+class GameState:
+    """
+    Progress of a game as listed by a scoreboard
+    """
+
+    game_id: str
+    game_status: int
+    home_score: Optional[int] = None
+    away_score: Optional[int] = None
+    game_time_utc: Optional[datetime.datetime] = None
+
+    @property
+    def progress(self) -> Tuple[int, Optional[int], Optional[int]]:
+        """
+        What a boxscore refresh is worth it for, the game clock is left out
+        """
+        return self.game_status, self.home_score, self.away_score
+
+
+def _games(content: Union[bytes, str]) -> List[Dict[str, Any]]:
+    payload = json.loads(content)
+    try:
+        return payload['scoreboard']['games']
+    except (KeyError, TypeError) as e:
+        raise ValueError("payload is not a scoreboard") from e
+
+
+def parse_game_ids(content: Union[bytes, str]) -> List[str]:
+    """
+    Identifiers of the games listed by a scoreboardv3 payload, in listing order
+
+    :param content: scoreboardv3 response body
+    :type content: Union[bytes, str]
+    """
+    game_ids = []
+    for game in _games(content):
+        # validate early, a malformed identifier would only fail at fetch time
+        game_ids.append(GameId(game['gameId']).value)
+    return game_ids
+
+
+def _score(team: Optional[Dict[str, Any]]) -> Optional[int]:
+    score = (team or {}).get('score')
+    return None if score is None or score == '' else int(score)
+
+
+def _game_time_utc(value: Optional[str]) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def parse_game_states(content: Union[bytes, str]) -> List[GameState]:
+    """
+    State of the games listed by a scoreboardv3 payload, in listing order
+
+    :param content: scoreboardv3 response body
+    :type content: Union[bytes, str]
+    """
+    return [
+        GameState(
+            game_id=GameId(game['gameId']).value,
+            game_status=int(game['gameStatus']),
+            home_score=_score(game.get('homeTeam')),
+            away_score=_score(game.get('awayTeam')),
+            game_time_utc=_game_time_utc(game.get('gameTimeUTC')),
+        )
+        for game in _games(content)
+    ]
@@ -0,0 +1,91 @@
+"""
+Test cases for the fake stats server and the S3 stand-in of benchmarks
+"""
+import datetime
+import io
+import json
+
+import httpx
+import pytest
+
+from benchmarks.fake_s3 import InMemoryS3Client
+from benchmarks.fake_server import FakeStatsServer, ServerConfig, scoreboard_game_ids
+from court_pipeline.utils.scoreboard import parse_game_ids
+
+
+class TestFakeStatsServer:
+
+    def test_scoreboard_game_ids_are_valid_and_unique(self):
+        first = scoreboard_game_ids(datetime.date(2024, 10, 22), 10)
+        second = scoreboard_game_ids(datetime.date(2024, 10, 23), 10)
+
+        assert first[0] == "0022401131"
+        assert len(set(first + second)) == 20
+
+    def test_respond(self):
+        server = FakeStatsServer(ServerConfig(payload_size=1000, games_per_date=3))
+
+        status, body = server.respond('/stats/scoreboardv3', {'GameDate': '2024-10-22', 'LeagueID': '00'})
+        assert status == 200
+        assert parse_game_ids(body) == scoreboard_game_ids(datetime.date(2024, 10, 22), 3)
+
+        status, body = server.respond('/stats/boxscoresummaryv3', {'GameID': '0022400001'})
+        assert status == 200
+        assert json.loads(body)['boxScoreSummary']['gameId'] == '0022400001'
+        assert 800 <= len(body) <= 1000
+
+        status, _ = server.respond('/stats/unknown', {})
+        assert status == 404
+
+    def test_respond_with_errors(self):
+        server = FakeStatsServer(ServerConfig(error_rate=1.0))
+
+        status, _ = server.respond('/stats/boxscoresummaryv3', {'GameID': '0022400001'})
+
+        assert status == 503
+
+    @pytest.mark.asyncio
+    async def test_serves_keep_alive_requests(self):
+        async with FakeStatsServer(ServerConfig(latency=0.0, payload_size=100)) as server:
+            async with httpx.AsyncClient(base_url=server.url) as client:
+                for _ in range(3):
+                    response = await client.get('boxscoresummaryv3', params={'GameID': '0022400001'})
+                    assert response.status_code == 200
+                    assert response.json()['boxScoreSummary']['gameStatus'] == 3
+
+        assert server.requests == 3
+
+    def test_config_validation(self):
+        with pytest.raises(ValueError):
+            ServerConfig(error_rate=2.0)
+        with pytest.raises(ValueError):
+            ServerConfig(latency=-1.0)
+
+
+class TestInMemoryS3Client:
+
+    def test_put_and_get_object(self):
+        client = InMemoryS3Client(keep_data=True)
+
+        client.put_object('bucket', '/00/2024/a.json', io.BytesIO(b'{"a": 1}'), 8, 'application/json')
+
+        assert client.get_object('bucket', '/00/2024/a.json').read(decode_content=False) == b'{"a": 1}'
+        assert [obj.object_name for obj in client.list_objects('bucket', prefix='/00/')] == ['/00/2024/a.json']
+        assert client.bucket_exists('bucket') is True
+
+    def test_get_object_range(self):
+        client = InMemoryS3Client(keep_data=True)
+        client.put_object('bucket', 'a.json', io.BytesIO(b'0123456789'), 10)
+
+        assert client.get_object('bucket', 'a.json', offset=2, length=3).read() == b'234'
+        assert client.get_object('bucket', 'a.json', offset=7).read() == b'789'
+
+    def test_put_object_of_unknown_length(self):
+        client = InMemoryS3Client()
+
+        client.put_object('bucket', 'a.json', io.BytesIO(b'x' * 10), -1, part_size=4)
+
+        assert client.bytes_stored == 10
+        assert client.uploads == 1
+        with pytest.raises(KeyError):
+            client.get_object('bucket', 'a.json')
@@ -0,0 +1,73 @@
+"""
+Test cases for the benchmark runner
+"""
+import pytest
+
+from benchmarks.fake_server import FakeStatsServer, ServerConfig
+from benchmarks.run import BenchmarkConfig, build_parser, compare, percentile, run_level
+
+
+class TestRun:
+
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile([], 0.5) == 0.0
+        assert percentile([3.0], 0.99) == 3.0
+
+    def test_compare(self):
+        baseline = {'levels': [
+            {'concurrency': 1, 'tasks_per_second': 100.0, 'p99_ms': 20.0},
+            {'concurrency': 8, 'tasks_per_second': 500.0, 'p99_ms': 40.0},
+        ]}
+        result = {'levels': [
+            {'concurrency': 1, 'tasks_per_second': 95.0, 'p99_ms': 21.0},
+            {'concurrency': 8, 'tasks_per_second': 400.0, 'p99_ms': 60.0},
+            {'concurrency': 32, 'tasks_per_second': 1.0, 'p99_ms': 1000.0},
+        ]}
+
+        regressions = compare(result, baseline, tolerance=0.1)
+
+        assert len(regressions) == 2
+        assert all(regression.startswith("concurrency 8:") for regression in regressions)
+
+    def test_compare_requests_per_second(self):
+        baseline = {'levels': [
+            {'concurrency': 1, 'tasks_per_second': 100.0, 'requests_per_second': 120.0, 'p99_ms': 20.0},
+            {'concurrency': 8, 'tasks_per_second': 500.0, 'p99_ms': 40.0},
+        ]}
+        result = {'levels': [
+            {'concurrency': 1, 'tasks_per_second': 100.0, 'requests_per_second': 100.0, 'p99_ms': 20.0},
+            {'concurrency': 8, 'tasks_per_second': 500.0, 'requests_per_second': 1.0, 'p99_ms': 40.0},
+        ]}
+
+        assert compare(result, baseline, tolerance=0.1) == [
+            "concurrency 1: 100.0 requests/s, baseline 120.0",
+        ]
+
+    def test_parse_concurrency_levels(self):
+        args = build_parser().parse_args(['scoreboard', '--concurrency', '2,4'])
+
+        assert args.concurrency == [2, 4]
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(['scoreboard', '--concurrency', '0'])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('job', ['scoreboard', 'boxscore'])
+    async def test_run_level(self, job):
+        config = BenchmarkConfig(job=job, tasks=12, codec='gzip', server=ServerConfig(latency=0.0, payload_size=500))
+
+        async with FakeStatsServer(config.server) as server:
+            level = await run_level(config, server.url, concurrency=4)
+
+        assert server.requests == 12
+        assert level['tasks'] == 12
+        assert level['failed'] == 0
+        assert level['tasks_per_second'] > 0
+        assert level['requests'] == server.requests
+        assert level['requests_per_second'] > 0
+        assert level['p99_ms'] >= level['p50_ms'] > 0
+        assert level['peak_rss_mb'] > 0
+        assert any(name.startswith('s3.upload.seconds') for name in level['timings'])
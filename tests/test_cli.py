@@ -0,0 +1,273 @@
+"""
+Test cases for the command-line entry point
+"""
+import argparse
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from court_pipeline.cli import (
+    build_metrics,
+    build_parser,
+    build_runner,
+    main,
+    parse_seasons,
+    run_job,
+)
+from court_pipeline.metrics.sinks import PrometheusTextfileSink, StatsdSink, SummarySink
+from court_pipeline.runners.boxscore_summary import BoxscoreSummaryRunner
+from court_pipeline.runners.boxscore_summary_parquet import BoxscoreSummaryParquetRunner
+from court_pipeline.runners.live import LiveBoxscoreSummaryRunner
+from court_pipeline.runners.report import RunReport, TaskResult
+from court_pipeline.runners.scoreboard import ScoreboardRunner
+from court_pipeline.runners.shard import Shard
+
+
+class TestParsing:
+
+    def test_parse_seasons(self):
+        assert parse_seasons("2024") == [2024]
+        assert parse_seasons("2019-2021") == [2019, 2020, 2021]
+
+    def test_parse_seasons_invalid(self):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_seasons("2024-2019")
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_seasons("last")
+
+    def test_parse_boxscore_arguments(self):
+        args = build_parser().parse_args([
+            "boxscore", "--seasons", "2023-2024", "--game-types", "2,4", "--concurrency", "8", "--incremental",
+        ])
+
+        assert args.seasons == [2023, 2024]
+        assert args.game_types == [2, 4]
+        assert args.concurrency == 8
+        assert args.incremental is True
+        assert args.processes == 1
+
+    def test_parse_invalid_date(self):
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["scoreboard", "--start-date", "2025/01/01", "--end-date", "2025-01-02"])
+
+
+class TestBuildRunner:
+
+    def test_build_runner_splits_rate_between_processes(self):
+        args = build_parser().parse_args([
+            "scoreboard", "--start-date", "2025-01-01", "--end-date", "2025-01-02",
+            "--rate", "8", "--processes", "4", "--concurrency", "4",
+        ])
+
+        runner = build_runner(args)
+
+        assert isinstance(runner, ScoreboardRunner)
+        assert runner.concurrency == 4
+        assert runner.rate_limiter.rate == 2.0
+        assert runner.rate_limiter.max_rate == 2.0
+
+    def test_build_live_runner_keeps_whole_rate(self):
+        args = build_parser().parse_args(["live", "--rate", "8", "--processes", "4"])
+
+        runner = build_runner(args)
+
+        assert runner.rate_limiter.rate == 8.0
+
+    def test_build_runner_with_validators(self, tmp_path):
+        args = build_parser().parse_args([
+            "boxscore", "--seasons", "2024", "--validators", str(tmp_path / "validators.db"),
+        ])
+
+        runner = build_runner(args)
+
+        assert runner.create_extractor().validators is runner.validators
+        runner.validators.close()
+
+    def test_build_materialize_runner(self):
+        args = build_parser().parse_args(["materialize", "--seasons", "2024", "--batch-size", "64"])
+
+        runner = build_runner(args)
+
+        assert isinstance(runner, BoxscoreSummaryParquetRunner)
+        assert runner.create_extractor().batch_size == 64
+
+    def test_build_live_runner(self):
+        args = build_parser().parse_args(["live", "--game-date", "2025-11-23", "--live-interval", "10"])
+
+        runner = build_runner(args)
+
+        assert isinstance(runner, LiveBoxscoreSummaryRunner)
+        assert runner.live_interval == 10.0
+        assert runner.prioritized is False
+        assert args.game_date == datetime.date(2025, 11, 23)
+
+    def test_build_live_runner_with_backfill_is_prioritized(self):
+        args = build_parser().parse_args(["live", "--backfill-seasons", "1946-2024"])
+
+        runner = build_runner(args)
+
+        assert runner.prioritized is True
+        assert args.backfill_seasons[0] == 1946
+
+    def test_build_replay_runner(self, tmp_path):
+        args = build_parser().parse_args([
+            "replay", "boxscore", "--dead-letters", str(tmp_path / "dead_letters.jsonl"),
+        ])
+
+        runner = build_runner(args)
+
+        assert isinstance(runner, BoxscoreSummaryRunner)
+        assert runner.dead_letters is not None
+        assert runner.rate_limiter is None
+
+    def test_build_metrics_only_when_asked(self):
+        args = build_parser().parse_args(["boxscore", "--seasons", "2024"])
+
+        assert build_metrics(args, Shard()) is None
+        assert build_runner(args).metrics.enabled is False
+
+    def test_build_metrics_textfile_per_shard(self, tmp_path):
+        args = build_parser().parse_args([
+            "boxscore", "--seasons", "2024",
+            "--metrics-textfile", str(tmp_path / "boxscore.prom"), "--statsd", "localhost:9125",
+        ])
+
+        metrics = build_metrics(args, Shard(index=2, count=4))
+
+        summary, textfile, statsd = metrics.sinks
+        assert isinstance(summary, SummarySink)
+        assert isinstance(textfile, PrometheusTextfileSink)
+        assert textfile.path == str(tmp_path / "boxscore-2.prom")
+        assert isinstance(statsd, StatsdSink)
+
+
+class TestRunJob:
+
+    @pytest.mark.asyncio
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    async def test_run_job_runs_tasks_of_shard(self, mock_extract):
+        args = build_parser().parse_args([
+            "boxscore", "--seasons", "2024", "--max-game-seq-id", "6", "--partition", "round-robin",
+        ])
+
+        report = await run_job(args, Shard(index=1, count=3))
+
+        assert sorted(result.key for result in report.succeeded) == ["0022400002", "0022400005"]
+
+    @pytest.mark.asyncio
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    async def test_run_job_stops_progress_reporter(self, mock_extract):
+        args = build_parser().parse_args(["boxscore", "--seasons", "2024", "--max-game-seq-id", "2"])
+
+        await run_job(args, Shard(index=0, count=1))
+
+        reporters = [task for task in asyncio.all_tasks() if task.get_coro().__name__ == 'report_progress']
+        assert reporters == []
+
+
+class TestMain:
+
+    def test_dry_run(self, capsys):
+        exit_code = main(["boxscore", "--seasons", "2024", "--max-game-seq-id", "3", "--dry-run"])
+
+        captured = capsys.readouterr()
+        assert exit_code == 0
+        assert captured.out.split() == ["0022400001", "0022400002", "0022400003"]
+        assert "3 tasks" in captured.err
+
+    def test_dry_run_opens_no_files(self, tmp_path, capsys):
+        main([
+            "boxscore", "--seasons", "2024", "--max-game-seq-id", "3", "--dry-run",
+            "--journal", str(tmp_path / "journal.db"),
+            "--cache", str(tmp_path / "cache.db"),
+            "--validators", str(tmp_path / "validators.db"),
+        ])
+
+        assert capsys.readouterr().out.split() == ["0022400001", "0022400002", "0022400003"]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_dry_run_materialize(self, capsys):
+        main(["materialize", "--seasons", "2023-2024", "--dry-run"])
+
+        assert capsys.readouterr().out.split() == ["00/2023", "00/2024"]
+
+    def test_dry_run_discover_lists_scoreboards(self, capsys):
+        main(["discover", "--start-date", "2025-01-01", "--end-date", "2025-01-02", "--dry-run"])
+
+        assert capsys.readouterr().out.split() == ["scoreboard/00/2025-01-01", "scoreboard/00/2025-01-02"]
+
+    def test_dry_run_of_shards_covers_the_job(self, capsys):
+        keys = []
+        for shard_index in range(3):
+            main([
+                "boxscore", "--seasons", "2023-2024", "--max-game-seq-id", "10", "--dry-run",
+                "--shard-index", str(shard_index), "--shard-count", "3", "--partition", "hash",
+            ])
+            shard_keys = capsys.readouterr().out.split()
+            assert shard_keys
+            keys.extend(shard_keys)
+
+        assert len(keys) == 20
+        assert len(set(keys)) == 20
+
+    def test_shard_count_from_env(self, monkeypatch):
+        monkeypatch.setenv("SHARD_INDEX", "1")
+        monkeypatch.setenv("SHARD_COUNT", "2")
+
+        args = build_parser().parse_args(["boxscore", "--seasons", "2024"])
+
+        assert (args.shard_index, args.shard_count) == (1, 2)
+
+    def test_invalid_shard_index(self):
+        with pytest.raises(SystemExit):
+            main(["boxscore", "--seasons", "2024", "--shard-index", "2", "--shard-count", "2"])
+
+    def test_invalid_date_range(self):
+        with pytest.raises(SystemExit):
+            main(["scoreboard", "--start-date", "2025-01-02", "--end-date", "2025-01-01"])
+
+    def test_live_rejects_cache(self, tmp_path):
+        with pytest.raises(SystemExit):
+            main(["live", "--cache", str(tmp_path / "cache.db")])
+
+    @pytest.mark.parametrize("flags", [["--journal", "journal.db"], ["--dead-letters", "dead.jsonl"], ["--incremental"]])
+    def test_live_rejects_resume_flags(self, flags):
+        with pytest.raises(SystemExit):
+            main(["live", *flags])
+
+    def test_dry_run_live_lists_scoreboard(self, capsys):
+        main(["live", "--game-date", "2025-11-23", "--dry-run"])
+
+        assert capsys.readouterr().out.split() == ["scoreboard/00/2025-11-23"]
+
+    def test_dry_run_replay_creates_nothing(self, tmp_path, capsys):
+        main(["replay", "boxscore", "--dead-letters", str(tmp_path / "var" / "dead_letters.jsonl"), "--dry-run"])
+
+        assert capsys.readouterr().out.split() == []
+        assert list(tmp_path.iterdir()) == []
+
+    def test_replay_requires_dead_letters(self):
+        with pytest.raises(SystemExit):
+            main(["replay", "scoreboard"])
+
+    @patch('court_pipeline.cli.run_processes')
+    def test_main_prints_summary(self, mock_run_processes, capsys):
+        mock_run_processes.return_value = RunReport(
+            results=[
+                TaskResult(key="00/2025-01-01", succeeded=True),
+                TaskResult(key="00/2025-01-02", succeeded=False, error="ValueError: bad"),
+            ],
+            elapsed=2.0,
+            bytes_fetched=2 * 1024 * 1024,
+            requests=5,
+        )
+
+        exit_code = main(["scoreboard", "--start-date", "2025-01-01", "--end-date", "2025-01-02"])
+
+        output = capsys.readouterr().out
+        assert exit_code == 1
+        assert "succeeded: 1 (skipped: 0), failed: 1" in output
+        assert "1.0 tasks/s, 2.5 requests/s (5 requests), 1.00 MB/s" in output
+        assert "failed 00/2025-01-02: ValueError: bad" in output
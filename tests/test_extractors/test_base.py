@@ -3,12 +3,14 @@ Test cases for BaseExtractorMixIn
 """
 import datetime
 import json
+from contextlib import asynccontextmanager
 from unittest.mock import Mock
 
 import httpx
 import pytest
 
 from court_pipeline.extractors.base import BaseExtractorMixIn
+from court_pipeline.proxy.exceptions import NotModifiedError
 
 
 class MockExtractor(BaseExtractorMixIn):
@@ -20,30 +22,101 @@ class MockExtractor(BaseExtractorMixIn):
         self.store_object_called = False
         self.store_object_data = None
         self.store_object_content_type = None
+        self.store_object_name = None
+        self.not_modified = False
+        self.remembered = []
+        self.outcomes = []
+        # callbacks waiting for their archive part, when packed
+        self.unarchived = None
 
     async def fetch(self, *args, **kwargs):
         self.fetch_called = True
         self.fetch_args = args
         self.fetch_kwargs = kwargs
+        if self.not_modified:
+            raise NotModifiedError("not modified", httpx.Response(304))
 
         mock_response = Mock(spec=httpx.Response)
         mock_response.content = json.dumps({"test": "data"}).encode()
         return mock_response
 
-    async def store_object(self, data: bytes, content_type: str):
+    def object_name(self, *args, **kwargs):
+        return "/".join([str(arg) for arg in args] + [str(value) for value in kwargs.values()])
+
+    @asynccontextmanager
+    async def stream(self, *args, **kwargs):
+        self.fetch_args = args
+        self.fetch_kwargs = kwargs
+        if self.not_modified:
+            raise NotModifiedError("not modified", httpx.Response(304))
+        yield httpx.Response(200, content=json.dumps({"test": "data"}).encode())
+
+    async def store_stream(self, chunks, content_type: str, object_name: str):
+        self.store_object_data = b"".join([chunk async for chunk in chunks])
+        self.store_object_content_type = content_type
+        self.store_object_name = object_name
+
+    async def store_object(self, data: bytes, content_type: str, object_name: str):
         self.store_object_called = True
         self.store_object_data = data
         self.store_object_content_type = content_type
+        self.store_object_name = object_name
+
+    async def remember_validators(self, response, *args, **kwargs):
+        self.remembered.append((args, kwargs))
+
+    def on_archived(self, object_name, callback):
+        if self.unarchived is None:
+            return False
+        self.unarchived.append(callback)
+        return True
+
+    def count_store(self, outcome):
+        self.outcomes.append(outcome)
 
 
 class TestBaseExtractorMixIn:
 
+    @pytest.mark.asyncio
+    async def test_extract_remembers_validators_once_stored(self):
+        extractor = MockExtractor()
+
+        await extractor.extract("0022400001")
+
+        assert extractor.remembered == [(("0022400001",), {})]
+
+    @pytest.mark.asyncio
+    async def test_extract_packed_remembers_validators_once_archived(self):
+        extractor = MockExtractor()
+        extractor.unarchived = []
+
+        await extractor.extract("0022400001")
+
+        assert extractor.remembered == []
+        for callback in extractor.unarchived:
+            await callback()
+        assert extractor.remembered == [(("0022400001",), {})]
+
+    @pytest.mark.asyncio
+    async def test_extract_not_modified_skips_store(self):
+        extractor = MockExtractor()
+        extractor.not_modified = True
+
+        assert await extractor.extract("0022400001") == 0
+        assert await extractor.extract_streaming("0022400001") == 0
+
+        assert extractor.store_object_called is False
+        assert extractor.store_object_data is None
+        assert extractor.remembered == []
+        assert extractor.outcomes == ["unchanged", "unchanged"]
+
     @pytest.mark.asyncio
     async def test_extract_calls_fetch_and_store_object(self):
         extractor = MockExtractor()
 
-        await extractor.extract(game_id="0012300001")
+        size = await extractor.extract(game_id="0012300001")
 
+        assert size == len(json.dumps({"test": "data"}).encode())
         assert extractor.fetch_called is True
         assert extractor.fetch_args == ()
         assert extractor.fetch_kwargs == {"game_id": "0012300001"}
@@ -52,6 +125,7 @@ class TestBaseExtractorMixIn:
         expected_data = json.dumps({"test": "data"}).encode()
         assert extractor.store_object_data == expected_data
         assert extractor.store_object_content_type == "application/json"
+        assert extractor.store_object_name == "0012300001"
 
     @pytest.mark.asyncio
     async def test_extract_with_multiple_arguments(self):
@@ -61,6 +135,7 @@ class TestBaseExtractorMixIn:
 
         assert extractor.fetch_args == (datetime.date(2025, 11, 28),)
         assert extractor.fetch_kwargs == {"league_id": "00"}
+        assert extractor.store_object_name == "2025-11-28/00"
 
     @pytest.mark.asyncio
     async def test_extract_content_type_is_application_json(self):
@@ -69,3 +144,16 @@ class TestBaseExtractorMixIn:
         await extractor.extract()
 
         assert extractor.store_object_content_type == "application/json"
+
+    @pytest.mark.asyncio
+    async def test_extract_streaming(self):
+        extractor = MockExtractor()
+
+        size = await extractor.extract_streaming(game_id="0012300001")
+
+        assert size == len(json.dumps({"test": "data"}).encode())
+        assert extractor.fetch_called is False
+        assert extractor.fetch_kwargs == {"game_id": "0012300001"}
+        assert extractor.store_object_data == json.dumps({"test": "data"}).encode()
+        assert extractor.store_object_content_type == "application/json"
+        assert extractor.store_object_name == "0012300001"
@@ -1,12 +1,15 @@
 """
 Test cases for BoxscoreSummaryExtractor
 """
+import asyncio
+import datetime
 import json
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from court_pipeline.extractors.boxscore_summary_extractor import BoxscoreSummaryExtractor
+from court_pipeline.utils.scoreboard import game_date_today
 
 
 with open("tests/fixtures/0022400001.json") as f:
@@ -44,42 +47,61 @@ class TestBoxscoreSummaryExtractor:
         mock_store_object.assert_called_once_with(
             json.dumps(boxscore_summary_data).encode('utf-8'),
             "application/json",
+            "/00/2024/0022400001.json",
         )
 
     @patch('court_pipeline.extractors.boxscore_summary_extractor.BoxscoreSummaryS3MixIn.store_object')
-    @patch('httpx.AsyncClient') 
+    @patch('httpx.AsyncClient')
     @pytest.mark.asyncio
-    async def test_extract_stores_game_id_internal_state(self, mocked_client, mock_store_object):
+    async def test_extract_stores_under_game_id_object_name(self, mocked_client, mock_store_object):
         mock_response = AsyncMock()
         mock_response.content = json.dumps(boxscore_summary_data).encode('utf-8')
         mocked_client.return_value.__aenter__.return_value.get.return_value = mock_response
         mock_store_object.return_value = None
 
         extractor = BoxscoreSummaryExtractor()
-        game_id = "0022400001"
+        game_id = "0012300001"
 
         await extractor.extract(game_id)
-        assert extractor._game_id == game_id
+
+        assert mock_store_object.call_args[0][2] == "/00/2023/0012300001.json"
 
     @patch('court_pipeline.extractors.boxscore_summary_extractor.BoxscoreSummaryS3MixIn.store_object')
-    @patch('httpx.AsyncClient') 
+    @patch('court_pipeline.extractors.boxscore_summary_extractor.BoxscoreSummaryProxy.fetch')
     @pytest.mark.asyncio
-    async def test_object_name_property_with_valid_game_id(self, mocked_client, mock_store_object):
-        mock_response = AsyncMock()
-        mock_response.content = json.dumps(boxscore_summary_data).encode('utf-8')
-        mocked_client.return_value.__aenter__.return_value.get.return_value = mock_response
-        mock_store_object.return_value = None
+    async def test_concurrent_extract_keeps_object_names_apart(self, mock_fetch, mock_store_object):
+        async def fetch(game_id):
+            # finish in reverse order of the calls
+            await asyncio.sleep(0.01 * (3 - int(game_id[-1])))
+            mock_response = Mock()
+            mock_response.content = game_id.encode('utf-8')
+            return mock_response
+
+        mock_fetch.side_effect = fetch
 
         extractor = BoxscoreSummaryExtractor()
-        game_id = "0012300001"
+        await asyncio.gather(*[extractor.extract(f"002240000{i}") for i in range(1, 4)])
 
-        await extractor.extract(game_id)
+        stored = {call[0][0]: call[0][2] for call in mock_store_object.call_args_list}
+        assert stored == {
+            b"0022400001": "/00/2024/0022400001.json",
+            b"0022400002": "/00/2024/0022400002.json",
+            b"0022400003": "/00/2024/0022400003.json",
+        }
 
-        object_name = extractor.object_name
+    def test_object_name_with_valid_game_id(self):
+        extractor = BoxscoreSummaryExtractor()
+        assert extractor.object_name("0012300001") == "/00/2023/0012300001.json"
 
-        expected = "/00/2023/0012300001.json"
-        assert object_name == expected
+    def test_reference_date_is_end_of_season(self):
+        extractor = BoxscoreSummaryExtractor()
+        assert extractor.reference_date("0022400001") == datetime.date(2025, 6, 30)
 
-    def test_game_id_is_optional_for_initialization(self):
+    def test_is_recent(self):
         extractor = BoxscoreSummaryExtractor()
-        assert extractor._game_id is None
+        today = game_date_today()
+        season_year = today.year if today.month >= 7 else today.year - 1
+        current_game_id = f"002{season_year % 100:02d}00001"
+
+        assert extractor.is_recent(datetime.timedelta(days=1), current_game_id) is True
+        assert extractor.is_recent(datetime.timedelta(days=1), "0029900001") is False
@@ -5,9 +5,14 @@ import datetime
 import json
 from unittest.mock import AsyncMock, Mock, patch
 
+import httpx
 import pytest
 
+from benchmarks.fake_s3 import InMemoryS3Client
 from court_pipeline.extractors.scoreboard_extractor import ScoreboardExtractor
+from court_pipeline.proxy.exceptions import NotModifiedError
+from court_pipeline.proxy.validators import Validators, ValidatorStore
+from court_pipeline.utils.scoreboard import game_date_today
 
 
 with open("tests/fixtures/2025-11-23.json") as f:
@@ -46,6 +51,7 @@ class TestScoreboardExtractor:
         mock_store_object.assert_called_once_with(
             json.dumps(scoreboard_data).encode('utf-8'),
             "application/json",
+            "/00/2025/11/23.json",
         )
 
     @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardS3MixIn.store_object')
@@ -66,12 +72,13 @@ class TestScoreboardExtractor:
         mock_store_object.assert_called_once_with(
             json.dumps(scoreboard_data).encode('utf-8'),
             "application/json",
+            "/00/2025/11/23.json",
         )
 
     @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardS3MixIn.store_object')
-    @patch('httpx.AsyncClient') 
+    @patch('httpx.AsyncClient')
     @pytest.mark.asyncio
-    async def test_extract_stores_internal_state(self, mocked_client, mock_store_object):
+    async def test_extract_stores_under_date_object_name(self, mocked_client, mock_store_object):
         mock_response = AsyncMock()
         mock_response.content = json.dumps(scoreboard_data).encode('utf-8')
         mocked_client.return_value.__aenter__.return_value.get.return_value = mock_response
@@ -79,32 +86,151 @@ class TestScoreboardExtractor:
 
         extractor = ScoreboardExtractor()
         game_date = datetime.date(2025, 11, 23)
-        await extractor.extract(game_date)
+        league_id = "10"
+
+        await extractor.extract(game_date, league_id)
+
+        assert mock_store_object.call_args[0][2] == "/10/2025/11/23.json"
+
+    def test_object_name_with_valid_date(self):
+        extractor = ScoreboardExtractor()
+        object_name = extractor.object_name(datetime.date(2025, 11, 23), "00")
+        assert object_name == "/00/2025/11/23.json"
+
+    def test_object_name_with_default_league_id(self):
+        extractor = ScoreboardExtractor()
+        assert extractor.object_name(datetime.date(2025, 1, 2)) == "/00/2025/01/02.json"
+
+    def test_reference_date_is_game_date(self):
+        extractor = ScoreboardExtractor()
+        assert extractor.reference_date(datetime.date(2025, 11, 23)) == datetime.date(2025, 11, 23)
+
+    def test_is_recent(self):
+        extractor = ScoreboardExtractor()
+        today = game_date_today()
+        window = datetime.timedelta(days=3)
 
-        assert extractor._game_date == game_date
-        assert extractor._league_id == "00"
+        assert extractor.is_recent(window, today - datetime.timedelta(days=2)) is True
+        assert extractor.is_recent(window, game_date=today - datetime.timedelta(days=4)) is False
 
     @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardS3MixIn.store_object')
-    @patch('httpx.AsyncClient') 
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardProxy.fetch')
     @pytest.mark.asyncio
-    async def test_object_name_property_with_valid_date(self, mocked_client, mock_store_object):
-        mock_response = AsyncMock()
-        mock_response.content = json.dumps(scoreboard_data).encode('utf-8')
-        mocked_client.return_value.__aenter__.return_value.get.return_value = mock_response
-        mock_store_object.return_value = None
+    async def test_discover_game_ids_fetches_and_stores(self, mock_fetch, mock_store_object):
+        content = json.dumps(scoreboard_data).encode('utf-8')
+        mock_response = Mock()
+        mock_response.content = content
+        mock_fetch.return_value = mock_response
 
         extractor = ScoreboardExtractor()
-        game_date = datetime.date(2025, 11, 23)
-        league_id = "00"
+        game_ids = await extractor.discover_game_ids(datetime.date(2025, 11, 23))
 
-        await extractor.extract(game_date, league_id)
+        assert len(game_ids) == 8
+        mock_store_object.assert_called_once_with(content, "application/json", "/00/2025/11/23.json")
 
-        object_name = extractor.object_name
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardS3MixIn.load_object')
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardS3MixIn.is_stored')
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardProxy.fetch')
+    @pytest.mark.asyncio
+    async def test_discover_game_ids_reads_stored_scoreboard(self, mock_fetch, mock_is_stored, mock_load_object):
+        mock_is_stored.return_value = True
+        mock_load_object.return_value = json.dumps(scoreboard_data).encode('utf-8')
+
+        extractor = ScoreboardExtractor()
+        game_ids = await extractor.discover_game_ids(datetime.date(2025, 11, 23), use_stored=True)
+
+        assert len(game_ids) == 8
+        mock_load_object.assert_called_once_with("/00/2025/11/23.json")
+        mock_fetch.assert_not_called()
+
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardS3MixIn.store_object')
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardProxy.fetch')
+    @pytest.mark.asyncio
+    async def test_refresh_returns_none_when_not_modified(self, mock_fetch, mock_store_object):
+        mock_fetch.side_effect = NotModifiedError("not modified", httpx.Response(304))
+
+        extractor = ScoreboardExtractor()
+        content = await extractor.refresh(datetime.date(2025, 11, 23))
 
-        expected = "/00/2025/11/23.json"
-        assert object_name == expected
+        assert content is None
+        mock_store_object.assert_not_called()
+        assert extractor.store_outcomes["unchanged"] == 1
+
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardS3MixIn.is_stored')
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardS3MixIn.load_object')
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardProxy.fetch')
+    @pytest.mark.asyncio
+    async def test_discover_game_ids_reads_scoreboard_not_modified(self, mock_fetch, mock_load_object, mock_is_stored):
+        mock_fetch.side_effect = NotModifiedError("not modified", httpx.Response(304))
+        mock_load_object.return_value = json.dumps(scoreboard_data).encode('utf-8')
+        mock_is_stored.return_value = True
 
-    def test_internal_state_is_optional_for_initialization(self):
         extractor = ScoreboardExtractor()
-        assert extractor._game_date is None
-        assert extractor._league_id is None
+        game_ids = await extractor.discover_game_ids(datetime.date(2025, 11, 23))
+
+        assert len(game_ids) == 8
+        mock_load_object.assert_called_once_with("/00/2025/11/23.json")
+
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardS3MixIn.is_stored')
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardS3MixIn.store_object')
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardProxy.fetch')
+    @pytest.mark.asyncio
+    async def test_discover_game_ids_fetches_again_scoreboard_not_stored(
+        self,
+        mock_fetch,
+        mock_store_object,
+        mock_is_stored,
+        tmp_path,
+    ):
+        content = json.dumps(scoreboard_data).encode('utf-8')
+        validators = ValidatorStore(str(tmp_path / "validators.db"))
+        extractor = ScoreboardExtractor(validators=validators)
+        key = validators.build_key(extractor.path, extractor.build_http_params(datetime.date(2025, 11, 23)))
+        await validators.set(key, Validators(etag='"v1"'))
+        conditional = []
+
+        async def fetch(**kwargs):
+            conditional.append(await validators.get(key) is not None)
+            if len(conditional) == 1:
+                raise NotModifiedError("not modified", httpx.Response(304))
+            return httpx.Response(200, content=content, headers={"ETag": '"v2"'})
+
+        mock_fetch.side_effect = fetch
+        mock_is_stored.return_value = False
+
+        game_ids = await extractor.discover_game_ids(datetime.date(2025, 11, 23))
+
+        assert len(game_ids) == 8
+        mock_store_object.assert_called_once_with(content, "application/json", "/00/2025/11/23.json")
+        assert conditional == [True, False]
+        assert (await validators.get(key)).etag == '"v2"'
+        validators.close()
+
+    @patch('court_pipeline.extractors.scoreboard_extractor.ScoreboardProxy.fetch')
+    @pytest.mark.asyncio
+    async def test_discover_game_ids_stays_conditional_once_stored(self, mock_fetch, tmp_path):
+        content = json.dumps(scoreboard_data).encode('utf-8')
+        client = InMemoryS3Client(keep_data=True)
+        validators = ValidatorStore(str(tmp_path / "validators.db"))
+        extractor = ScoreboardExtractor(validators=validators)
+        extractor.configure_storage(dedup=True)
+        extractor._s3_client = client
+        key = validators.build_key(extractor.path, extractor.build_http_params(datetime.date(2025, 11, 23)))
+        conditional = []
+
+        async def fetch(**kwargs):
+            conditional.append(await validators.get(key) is not None)
+            if conditional[-1]:
+                raise NotModifiedError("not modified", httpx.Response(304))
+            return httpx.Response(200, content=content, headers={"ETag": '"v1"'})
+
+        mock_fetch.side_effect = fetch
+
+        for _ in range(3):
+            assert len(await extractor.discover_game_ids(datetime.date(2025, 11, 23))) == 8
+
+        assert conditional == [False, True, True]
+        assert client.uploads == 1
+        assert extractor.object_etags["00/2025/11/23.json"] is not None
+        extractor.close_storage()
+        validators.close()
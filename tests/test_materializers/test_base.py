@@ -0,0 +1,75 @@
+"""
+Test cases for ParquetMaterializerMixIn
+"""
+import asyncio
+
+import pytest
+
+from court_pipeline.materializers.base import ParquetMaterializerMixIn
+
+
+class MockSource:
+
+    def __init__(self):
+        self.cancelled = []
+
+    async def load_object(self, object_name):
+        try:
+            await asyncio.sleep(0 if object_name == "a" else 10)
+        except asyncio.CancelledError:
+            self.cancelled.append(object_name)
+            raise
+        return object_name.encode("utf-8")
+
+
+class MockMaterializer(ParquetMaterializerMixIn):
+
+    lookahead = 2
+
+    def __init__(self, source):
+        self._source = source
+
+    @property
+    def bucket_name(self):
+        return "mock"
+
+    def object_name(self, prefix):
+        return prefix
+
+    @property
+    def source(self):
+        return self._source
+
+    @property
+    def tables(self):
+        return {"games": [("game_id", "string")]}
+
+    def flatten(self, content):
+        return {"games": [{"game_id": content.decode("utf-8")}]}
+
+
+class TestParquetMaterializerMixIn:
+
+    def test_requires_source_tables_and_flatten(self):
+        class PartialMaterializer(ParquetMaterializerMixIn):
+
+            @property
+            def bucket_name(self):
+                return "mock"
+
+            def object_name(self, prefix):
+                return prefix
+
+        with pytest.raises(TypeError):
+            PartialMaterializer()
+
+    @pytest.mark.asyncio
+    async def test_load_objects_waits_for_cancelled_loads(self):
+        source = MockSource()
+        materializer = MockMaterializer(source)
+
+        loads = materializer._load_objects(["a", "b", "c"])
+        assert await anext(loads) == ("a", b"a")
+        await loads.aclose()
+
+        assert source.cancelled == ["b"]
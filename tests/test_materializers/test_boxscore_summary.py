@@ -0,0 +1,128 @@
+"""
+Test cases for the Parquet materialization of boxscore summaries
+"""
+import datetime
+import io
+import json
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from benchmarks.fake_s3 import InMemoryS3Client
+from court_pipeline.materializers.boxscore_summary import TABLES, BoxscoreSummaryMaterializer
+from court_pipeline.metrics.registry import Metrics
+
+
+with open("tests/fixtures/0022400001.json") as f:
+    boxscore_summary_content = f.read()
+
+
+def summary_of(game_id: str) -> bytes:
+    payload = json.loads(boxscore_summary_content)
+    payload['boxScoreSummary']['gameId'] = game_id
+    return json.dumps(payload).encode('utf-8')
+
+
+@pytest.fixture
+def s3_client():
+    client = InMemoryS3Client(keep_data=True)
+    for seq in range(1, 6):
+        game_id = f'00224{seq:05d}'
+        content = summary_of(game_id)
+        client.put_object('boxscoresummary', f'/00/2024/{game_id}.json', io.BytesIO(content), len(content))
+    return client
+
+
+def build_materializer(s3_client, **kwargs) -> BoxscoreSummaryMaterializer:
+    materializer = BoxscoreSummaryMaterializer(**kwargs)
+    materializer._s3_client = s3_client
+    materializer.source._s3_client = s3_client
+    return materializer
+
+
+def read_table(s3_client, object_name: str):
+    data = s3_client.get_object('boxscoresummary-parquet', object_name).read()
+    return pq.ParquetFile(io.BytesIO(data))
+
+
+class TestBoxscoreSummaryMaterializer:
+
+    def test_object_name(self):
+        materializer = BoxscoreSummaryMaterializer()
+        assert materializer.object_name("00", 2024, 'teams') == '/league_id=00/season_year=2024/teams.parquet'
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            BoxscoreSummaryMaterializer(batch_size=0)
+
+    @pytest.mark.asyncio
+    async def test_materialize_season(self, s3_client):
+        materializer = build_materializer(s3_client)
+        try:
+            result = await materializer.materialize_season("00", 2024)
+        finally:
+            materializer.close_storage()
+
+        assert result.objects == 5
+        assert result.skipped == 0
+        assert result.rows == {'games': 5, 'teams': 10, 'line_scores': 40, 'officials': 15}
+        assert result.bytes_written > 0
+        assert s3_client.object_names('boxscoresummary-parquet') == {
+            f'/league_id=00/season_year=2024/{table}.parquet' for table in TABLES
+        }
+
+        games = read_table(s3_client, '/league_id=00/season_year=2024/games.parquet').read()
+        assert games.num_rows == 5
+        assert games.schema.field('game_time_utc').type == pa.timestamp('us', tz='UTC')
+        assert games.schema.field('sellout').type == pa.bool_()
+        assert games.column('game_id').to_pylist() == [f'00224{seq:05d}' for seq in range(1, 6)]
+        assert games.column('game_time_utc').to_pylist()[0] == datetime.datetime(
+            2024, 11, 13, tzinfo=datetime.timezone.utc,
+        )
+
+    @pytest.mark.asyncio
+    async def test_materialize_writes_row_group_per_batch(self, s3_client):
+        materializer = build_materializer(s3_client, batch_size=2, lookahead=2)
+        try:
+            await materializer.materialize_season("00", 2024)
+        finally:
+            materializer.close_storage()
+
+        games = read_table(s3_client, '/league_id=00/season_year=2024/games.parquet')
+        assert games.num_row_groups == 3
+        assert games.metadata.num_rows == 5
+
+    @pytest.mark.asyncio
+    async def test_materialize_skips_malformed_objects(self, s3_client):
+        s3_client.put_object('boxscoresummary', '/00/2024/0022400099.json', io.BytesIO(b'{}'), 2)
+        metrics = Metrics()
+        materializer = build_materializer(s3_client, metrics=metrics)
+        try:
+            result = await materializer.materialize_season("00", 2024)
+        finally:
+            materializer.close_storage()
+
+        assert result.objects == 5
+        assert result.skipped == 1
+        snapshot = metrics.snapshot()
+        assert snapshot.counters[('materialize.rows', (('table', 'games'),))] == 5
+
+    @pytest.mark.asyncio
+    async def test_materialize_empty_season(self, s3_client):
+        materializer = build_materializer(s3_client)
+        try:
+            result = await materializer.materialize_season("00", 2023)
+        finally:
+            materializer.close_storage()
+
+        assert result.objects == 0
+        games = read_table(s3_client, '/league_id=00/season_year=2023/games.parquet').read()
+        assert games.num_rows == 0
+        assert games.schema.names == [name for name, _ in TABLES['games']]
+
+    def test_is_recent(self):
+        materializer = BoxscoreSummaryMaterializer()
+        assert materializer.is_recent(datetime.timedelta(days=30), "00", datetime.date.today().year)
+        assert not materializer.is_recent(datetime.timedelta(days=30), "00", 2010)
@@ -0,0 +1,154 @@
+"""
+Test cases for Metrics
+"""
+import pytest
+
+from court_pipeline.metrics.registry import NULL_METRICS, Metrics, TimerStats
+from court_pipeline.metrics.sinks import Sink, SummarySink
+
+
+class RecordingSink(Sink):
+
+    per_event = True
+
+    def __init__(self):
+        self.events = []
+        self.snapshots = []
+        self.closed = False
+
+    def record(self, kind, key, value):
+        self.events.append((kind, key, value))
+
+    def emit(self, snapshot):
+        self.snapshots.append(snapshot)
+
+    def close(self):
+        self.closed = True
+
+
+class FailingSink(Sink):
+
+    def emit(self, snapshot):
+        raise OSError("disk full")
+
+
+class TestTimerStats:
+
+    def test_add(self):
+        stats = TimerStats()
+        for seconds in (0.001, 0.02, 0.3):
+            stats.add(seconds)
+
+        assert stats.count == 3
+        assert stats.total == pytest.approx(0.321)
+        assert stats.max == 0.3
+        assert stats.mean == pytest.approx(0.107)
+        assert sum(stats.buckets) == 3
+
+    def test_quantile_is_bucket_upper_bound(self):
+        stats = TimerStats()
+        for _ in range(99):
+            stats.add(0.04)
+        stats.add(7.0)
+
+        assert stats.quantile(0.5) == 0.05
+        assert stats.quantile(0.99) == 0.05
+        assert stats.quantile(1.0) == 7.0
+
+    def test_quantile_capped_by_max(self):
+        stats = TimerStats()
+        stats.add(0.03)
+
+        assert stats.quantile(0.5) == 0.03
+
+    def test_quantile_beyond_last_bound(self):
+        stats = TimerStats()
+        stats.add(60.0)
+
+        assert stats.quantile(0.5) == 60.0
+
+    def test_empty(self):
+        assert TimerStats().quantile(0.99) == 0.0
+        assert TimerStats().mean == 0.0
+
+
+class TestMetrics:
+
+    def test_counters_sum_per_labels(self):
+        metrics = Metrics()
+        metrics.increment('http.requests', endpoint='scoreboardv3', status=200)
+        metrics.increment('http.requests', status=200, endpoint='scoreboardv3')
+        metrics.increment('http.requests', endpoint='scoreboardv3', status=404)
+        metrics.increment('http.bytes_in', 512)
+
+        counters = metrics.snapshot().counters
+        assert counters[('http.requests', (('endpoint', 'scoreboardv3'), ('status', '200')))] == 2
+        assert counters[('http.requests', (('endpoint', 'scoreboardv3'), ('status', '404')))] == 1
+        assert counters[('http.bytes_in', ())] == 512
+
+    def test_gauge_keeps_last_value(self):
+        metrics = Metrics()
+        metrics.gauge('queue.depth', 3, stage='fetch')
+        metrics.gauge('queue.depth', 1, stage='fetch')
+
+        assert metrics.snapshot().gauges[('queue.depth', (('stage', 'fetch'),))] == 1
+
+    def test_timer_observes_failed_blocks(self):
+        metrics = Metrics()
+        with metrics.timer('validate.seconds'):
+            pass
+        with pytest.raises(ValueError):
+            with metrics.timer('validate.seconds'):
+                raise ValueError
+
+        assert metrics.snapshot().timers[('validate.seconds', ())].count == 2
+
+    def test_snapshot_is_a_copy(self):
+        metrics = Metrics()
+        metrics.observe('s3.upload.seconds', 0.1)
+        snapshot = metrics.snapshot()
+        metrics.observe('s3.upload.seconds', 0.2)
+
+        assert snapshot.timers[('s3.upload.seconds', ())].count == 1
+
+    def test_events_reach_per_event_sinks_only(self):
+        recording = RecordingSink()
+        summary = SummarySink()
+        metrics = Metrics([recording, summary])
+
+        metrics.increment('tasks', outcome='succeeded')
+        metrics.observe('stage.seconds', 0.5, stage='store')
+
+        assert recording.events == [
+            ('counter', ('tasks', (('outcome', 'succeeded'),)), 1),
+            ('timer', ('stage.seconds', (('stage', 'store'),)), 0.5),
+        ]
+        assert summary.snapshot.counters == {}
+
+    def test_flush_survives_failing_sink(self):
+        recording = RecordingSink()
+        metrics = Metrics([FailingSink(), recording])
+        metrics.increment('tasks')
+
+        metrics.flush()
+
+        assert len(recording.snapshots) == 1
+
+    def test_close_flushes_and_closes_sinks(self):
+        recording = RecordingSink()
+        metrics = Metrics([recording])
+
+        metrics.close()
+
+        assert len(recording.snapshots) == 1
+        assert recording.closed is True
+
+    def test_null_metrics_record_nothing(self):
+        NULL_METRICS.increment('tasks')
+        NULL_METRICS.observe('stage.seconds', 1.0)
+        with NULL_METRICS.timer('validate.seconds'):
+            pass
+
+        assert NULL_METRICS.enabled is False
+        assert NULL_METRICS.snapshot().counters == {}
+        assert NULL_METRICS.snapshot().timers == {}
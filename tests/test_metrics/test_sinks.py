@@ -0,0 +1,124 @@
+"""
+Test cases for metrics sinks
+"""
+import socket
+
+import pytest
+
+from court_pipeline.metrics.registry import Metrics
+from court_pipeline.metrics.sinks import PrometheusTextfileSink, StatsdSink, SummarySink
+
+
+@pytest.fixture
+def udp_server():
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+    server.settimeout(1.0)
+    yield server
+    server.close()
+
+
+class TestSummarySink:
+
+    def test_lines(self):
+        sink = SummarySink()
+        metrics = Metrics([sink])
+        metrics.increment('cache.hits', endpoint='scoreboardv3')
+        metrics.gauge('queue.depth', 2, stage='store')
+        metrics.observe('http.ttfb.seconds', 0.08, endpoint='scoreboardv3')
+        metrics.flush()
+
+        assert sink.lines() == [
+            'cache.hits endpoint=scoreboardv3: 1',
+            'queue.depth stage=store: 2',
+            'http.ttfb.seconds endpoint=scoreboardv3: count 1, mean 80.0ms, '
+            'p50 80.0ms, p99 80.0ms, max 80.0ms',
+        ]
+
+
+class TestPrometheusTextfileSink:
+
+    def test_render(self, tmp_path):
+        path = tmp_path / "metrics" / "run.prom"
+        sink = PrometheusTextfileSink(str(path), labels={'shard': '0'})
+        metrics = Metrics([sink])
+        metrics.increment('http.requests', endpoint='scoreboardv3', status=200)
+        metrics.gauge('queue.depth', 4, stage='fetch')
+        metrics.observe('s3.upload.seconds', 0.02, bucket='scoreboard')
+        metrics.observe('s3.upload.seconds', 3.0, bucket='scoreboard')
+        metrics.flush()
+
+        lines = path.read_text().splitlines()
+        assert '# TYPE court_pipeline_http_requests_total counter' in lines
+        assert 'court_pipeline_http_requests_total{shard="0",endpoint="scoreboardv3",status="200"} 1' in lines
+        assert 'court_pipeline_queue_depth{shard="0",stage="fetch"} 4' in lines
+        assert '# TYPE court_pipeline_s3_upload_seconds histogram' in lines
+        assert 'court_pipeline_s3_upload_seconds_bucket{shard="0",bucket="scoreboard",le="0.025"} 1' in lines
+        assert 'court_pipeline_s3_upload_seconds_bucket{shard="0",bucket="scoreboard",le="5"} 2' in lines
+        assert 'court_pipeline_s3_upload_seconds_bucket{shard="0",bucket="scoreboard",le="+Inf"} 2' in lines
+        assert 'court_pipeline_s3_upload_seconds_count{shard="0",bucket="scoreboard"} 2' in lines
+        assert not (tmp_path / "metrics" / "run.prom.tmp").exists()
+
+    def test_escapes_label_values(self, tmp_path):
+        sink = PrometheusTextfileSink(str(tmp_path / "run.prom"))
+        metrics = Metrics([sink])
+        metrics.increment('http.requests', status='say "hi"')
+
+        assert 'court_pipeline_http_requests_total{status="say \\"hi\\""} 1' in sink.render(metrics.snapshot())
+
+
+class TestStatsdSink:
+
+    def test_sends_buffered_events_on_flush(self, udp_server):
+        host, port = udp_server.getsockname()
+        sink = StatsdSink(host, port)
+        metrics = Metrics([sink])
+        metrics.increment('http.requests', endpoint='scoreboardv3', status=200)
+        metrics.gauge('queue.depth', 3, stage='fetch')
+        metrics.observe('http.ttfb.seconds', 0.25, endpoint='scoreboardv3')
+
+        metrics.flush()
+
+        packet = udp_server.recv(65535).decode()
+        assert packet.split('\n') == [
+            'court_pipeline.http.requests:1|c|#endpoint:scoreboardv3,status:200',
+            'court_pipeline.queue.depth:3|g|#stage:fetch',
+            'court_pipeline.http.ttfb.seconds:250.000|ms|#endpoint:scoreboardv3',
+        ]
+        sink.close()
+
+    def test_plain_statsd_appends_labels_to_name(self, udp_server):
+        host, port = udp_server.getsockname()
+        sink = StatsdSink(host, port, tags=False)
+        metrics = Metrics([sink])
+        metrics.increment('tasks', outcome='failed')
+
+        metrics.close()
+
+        assert udp_server.recv(65535) == b'court_pipeline.tasks.failed:1|c'
+
+    def test_splits_datagrams(self, udp_server):
+        host, port = udp_server.getsockname()
+        sink = StatsdSink(host, port, max_packet_size=64)
+        metrics = Metrics([sink])
+        for _ in range(4):
+            metrics.increment('http.retries', endpoint='scoreboardv3')
+
+        metrics.flush()
+
+        packets = [udp_server.recv(65535) for _ in range(4)]
+        assert all(len(packet) <= 64 for packet in packets)
+        assert sum(packet.count(b'|c') for packet in packets) == 4
+        sink.close()
+
+    def test_connects_to_daemon_once(self, udp_server):
+        _, port = udp_server.getsockname()
+        sink = StatsdSink('localhost', port)
+        metrics = Metrics([sink])
+
+        assert sink._socket.getpeername() == ('127.0.0.1', port)
+        for _ in range(2):
+            metrics.increment('tasks', outcome='succeeded')
+            metrics.flush()
+            assert udp_server.recv(65535) == b'court_pipeline.tasks:1|c|#outcome:succeeded'
+        sink.close()
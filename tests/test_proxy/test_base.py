@@ -1,11 +1,20 @@
 """
 Test cases for BaseProxy
 """
+from unittest.mock import AsyncMock, Mock, patch
+
 import pytest
 
 import httpx
 
+from court_pipeline.metrics.registry import Metrics
 from court_pipeline.proxy.base import BaseProxy
+from court_pipeline.proxy.cache import ResponseCache
+from court_pipeline.proxy.exceptions import InvalidResponseError, NotModifiedError
+from court_pipeline.proxy.pool import ClientPool
+from court_pipeline.proxy.rate_limiter import AdaptiveRateLimiter
+from court_pipeline.proxy.retry import RetryBudget, RetryPolicy
+from court_pipeline.proxy.validators import ValidatorStore
 
 
 class MockProxy(BaseProxy):
@@ -59,6 +68,389 @@ class TestBaseProxy:
             assert client.headers["User-Agent"] == "test-proxy"
             assert client.headers["Authorization"] == "Bearer token"
 
+    def test_build_headers_does_not_mutate_default_headers(self):
+        proxy = MockProxy("https://api.test.com")
+        proxy.session_headers["Authorization"] = "Bearer token"
+
+        headers = proxy.build_headers()
+
+        assert headers == {"User-Agent": "test-proxy", "Authorization": "Bearer token"}
+        assert proxy.get_default_headers() == {"User-Agent": "test-proxy"}
+
+    @pytest.mark.asyncio
+    async def test_client_from_pool_is_shared(self):
+        async with ClientPool() as pool:
+            proxy1 = MockProxy("https://api.test.com", pool=pool)
+            proxy2 = MockProxy("https://api.test.com/", pool=pool)
+
+            async with proxy1.client() as client1:
+                pass
+            async with proxy2.client() as client2:
+                pass
+
+            assert proxy1.pool is pool
+            assert client1 is client2
+            assert client1.is_closed is False
+
+    @pytest.mark.asyncio
+    async def test_fetch_sends_headers_per_request_with_pool(self):
+        pool = Mock(spec=ClientPool)
+        mock_client = Mock()
+        mock_response = httpx.Response(200, json={"key": "value"})
+        mock_client.get = AsyncMock(return_value=mock_response)
+        pool.get_client.return_value = mock_client
+
+        proxy = MockProxy("https://api.test.com", timeout=10.0, pool=pool)
+        proxy.session_headers["Authorization"] = "Bearer token"
+        response = await proxy.fetch()
+
+        assert response is mock_response
+        pool.get_client.assert_called_once_with("https://api.test.com")
+        mock_client.get.assert_called_once_with(
+            "/test/endpoint",
+            params={"param1": "value1"},
+            headers={"User-Agent": "test-proxy", "Authorization": "Bearer token"},
+            timeout=10.0,
+        )
+
+    @pytest.mark.asyncio
+    async def test_fetch_reports_outcome_to_rate_limiter(self):
+        limiter = Mock(spec=AdaptiveRateLimiter)
+        pool = Mock(spec=ClientPool)
+        mock_client = Mock()
+        mock_client.get = AsyncMock(side_effect=[
+            httpx.Response(200, json={}),
+            httpx.Response(429),
+            httpx.Response(503),
+            httpx.ReadTimeout("timed out"),
+        ])
+        pool.get_client.return_value = mock_client
+
+        proxy = MockProxy(
+            "https://api.test.com",
+            pool=pool,
+            rate_limiter=limiter,
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        await proxy.fetch()
+        with pytest.raises(InvalidResponseError):
+            await proxy.fetch()
+        with pytest.raises(InvalidResponseError):
+            await proxy.fetch()
+        with pytest.raises(httpx.ReadTimeout):
+            await proxy.fetch()
+
+        assert limiter.acquire.await_count == 4
+        assert limiter.on_success.call_count == 1
+        assert limiter.on_throttle.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_records_rate_limit(self):
+        clock = Mock(return_value=100.0)
+        limiter = AdaptiveRateLimiter(rate=4.0, max_rate=4.0, clock=clock)
+        pool = Mock(spec=ClientPool)
+        mock_client = Mock()
+        mock_client.get = AsyncMock(side_effect=[
+            httpx.Response(200, json={}),
+            httpx.Response(429),
+            httpx.Response(429),
+        ])
+        pool.get_client.return_value = mock_client
+        metrics = Metrics()
+        proxy = MockProxy(
+            "https://api.test.com",
+            pool=pool,
+            rate_limiter=limiter,
+            retry_policy=RetryPolicy(max_attempts=1),
+            metrics=metrics,
+        )
+
+        await proxy.fetch()
+        for _ in range(2):
+            with pytest.raises(InvalidResponseError):
+                await proxy.fetch()
+
+        snapshot = metrics.snapshot()
+        assert snapshot.gauges[('http.rate_limit', ())] == 2.0
+        # the second throttle falls within the cooldown
+        assert snapshot.counters[('http.rate_limit.backoffs', ())] == 1
+
+    def test_validate_response(self):
+        proxy = MockProxy("https://api.test.com")
+
+        proxy.validate_response(httpx.Response(200, json={"key": "value"}))
+
+        with pytest.raises(InvalidResponseError) as exc_info:
+            proxy.validate_response(httpx.Response(404, json={}))
+        assert exc_info.value.status_code == 404
+
+        with pytest.raises(InvalidResponseError):
+            proxy.validate_response(httpx.Response(200, content=b"<html>error</html>"))
+
+    @pytest.mark.asyncio
+    @patch('court_pipeline.proxy.base.asyncio.sleep', new_callable=AsyncMock)
+    async def test_fetch_retries_transient_failures(self, mock_sleep):
+        pool = Mock(spec=ClientPool)
+        mock_client = Mock()
+        mock_client.get = AsyncMock(side_effect=[
+            httpx.ConnectError("connection refused"),
+            httpx.Response(503),
+            httpx.Response(200, json={"key": "value"}),
+        ])
+        pool.get_client.return_value = mock_client
+
+        proxy = MockProxy(
+            "https://api.test.com",
+            pool=pool,
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=1.0, rng=lambda: 1.0),
+        )
+        response = await proxy.fetch()
+
+        assert response.json() == {"key": "value"}
+        assert mock_client.get.await_count == 3
+        assert [call.args[0] for call in mock_sleep.await_args_list] == [1.0, 2.0]
+
+    @pytest.mark.asyncio
+    @patch('court_pipeline.proxy.base.asyncio.sleep', new_callable=AsyncMock)
+    async def test_fetch_gives_up_after_max_attempts(self, mock_sleep):
+        pool = Mock(spec=ClientPool)
+        mock_client = Mock()
+        mock_client.get = AsyncMock(return_value=httpx.Response(500))
+        pool.get_client.return_value = mock_client
+
+        proxy = MockProxy("https://api.test.com", pool=pool, retry_policy=RetryPolicy(max_attempts=3))
+
+        with pytest.raises(InvalidResponseError) as exc_info:
+            await proxy.fetch()
+
+        assert exc_info.value.status_code == 500
+        assert mock_client.get.await_count == 3
+
+    @pytest.mark.asyncio
+    @patch('court_pipeline.proxy.base.asyncio.sleep', new_callable=AsyncMock)
+    async def test_fetch_does_not_retry_client_errors(self, mock_sleep):
+        pool = Mock(spec=ClientPool)
+        mock_client = Mock()
+        mock_client.get = AsyncMock(return_value=httpx.Response(404))
+        pool.get_client.return_value = mock_client
+
+        proxy = MockProxy("https://api.test.com", pool=pool)
+
+        with pytest.raises(InvalidResponseError):
+            await proxy.fetch()
+
+        assert mock_client.get.await_count == 1
+        mock_sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch('court_pipeline.proxy.base.asyncio.sleep', new_callable=AsyncMock)
+    async def test_fetch_stops_retrying_when_budget_exhausted(self, mock_sleep):
+        pool = Mock(spec=ClientPool)
+        mock_client = Mock()
+        mock_client.get = AsyncMock(side_effect=httpx.ReadTimeout("timed out"))
+        pool.get_client.return_value = mock_client
+
+        budget = RetryBudget(ratio=0.0, min_retries=1)
+        proxy = MockProxy("https://api.test.com", pool=pool, retry_policy=RetryPolicy(budget=budget))
+
+        with pytest.raises(httpx.ReadTimeout):
+            await proxy.fetch()
+
+        assert mock_client.get.await_count == 2
+        assert budget.retries == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_unread_response(self):
+        body = b'{"key": "value"}'
+
+        def handler(request):
+            assert request.url.params["param1"] == "value1"
+            assert request.headers["User-Agent"] == "test-proxy"
+            return httpx.Response(200, headers={"content-type": "application/json"}, content=body)
+
+        pool = Mock(spec=ClientPool)
+        pool.get_client.return_value = httpx.AsyncClient(
+            base_url="https://api.test.com",
+            transport=httpx.MockTransport(handler),
+        )
+        proxy = MockProxy("https://api.test.com", pool=pool)
+
+        async with proxy.stream() as response:
+            chunks = [chunk async for chunk in response.aiter_bytes()]
+
+        assert b"".join(chunks) == body
+        assert response.is_closed is True
+
+    @pytest.mark.asyncio
+    @patch('court_pipeline.proxy.base.asyncio.sleep', new_callable=AsyncMock)
+    async def test_stream_retries_and_validates(self, mock_sleep):
+        responses = iter([
+            httpx.Response(503),
+            httpx.Response(200, headers={"content-type": "text/html"}, content=b"<html></html>"),
+        ])
+        pool = Mock(spec=ClientPool)
+        pool.get_client.return_value = httpx.AsyncClient(
+            base_url="https://api.test.com",
+            transport=httpx.MockTransport(lambda request: next(responses)),
+        )
+        proxy = MockProxy("https://api.test.com", pool=pool)
+
+        with pytest.raises(InvalidResponseError):
+            async with proxy.stream():
+                pass
+
+        assert mock_sleep.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_raises_on_error_status(self):
+        pool = Mock(spec=ClientPool)
+        pool.get_client.return_value = httpx.AsyncClient(
+            base_url="https://api.test.com",
+            transport=httpx.MockTransport(lambda request: httpx.Response(404, content=b"not found")),
+        )
+        proxy = MockProxy("https://api.test.com", pool=pool)
+
+        with pytest.raises(InvalidResponseError) as exc_info:
+            async with proxy.stream():
+                pass
+
+        assert exc_info.value.response.content == b"not found"
+
+    @pytest.mark.asyncio
+    async def test_fetch_serves_repeated_request_from_cache(self, tmp_path):
+        handler = Mock(return_value=httpx.Response(200, content=b'{"key": "value"}'))
+        pool = Mock(spec=ClientPool)
+        pool.get_client.return_value = httpx.AsyncClient(
+            base_url="https://api.test.com",
+            transport=httpx.MockTransport(handler),
+        )
+        cache = ResponseCache(str(tmp_path / "cache.db"))
+        proxy = MockProxy("https://api.test.com", pool=pool, cache=cache)
+
+        first = await proxy.fetch()
+        second = await proxy.fetch()
+
+        assert handler.call_count == 1
+        assert first.extensions.get("from_cache") is None
+        assert second.extensions["from_cache"] is True
+        assert second.content == b'{"key": "value"}'
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_fetch_does_not_cache_with_zero_ttl(self, tmp_path):
+        handler = Mock(return_value=httpx.Response(200, content=b'{"key": "value"}'))
+        pool = Mock(spec=ClientPool)
+        pool.get_client.return_value = httpx.AsyncClient(
+            base_url="https://api.test.com",
+            transport=httpx.MockTransport(handler),
+        )
+        cache = ResponseCache(str(tmp_path / "cache.db"))
+        proxy = MockProxy("https://api.test.com", pool=pool, cache=cache)
+        proxy.cache_ttl = Mock(return_value=0)
+
+        await proxy.fetch()
+        await proxy.fetch()
+
+        assert handler.call_count == 2
+        cache.close()
+
+    @pytest.mark.asyncio
+    @patch('court_pipeline.proxy.base.asyncio.sleep', new_callable=AsyncMock)
+    async def test_fetch_records_metrics(self, mock_sleep, tmp_path):
+        pool = Mock(spec=ClientPool)
+        mock_client = Mock()
+        mock_client.get = AsyncMock(side_effect=[
+            httpx.ConnectError("connection refused"),
+            httpx.Response(200, content=b'{"key": "value"}'),
+        ])
+        pool.get_client.return_value = mock_client
+        cache = ResponseCache(str(tmp_path / "cache.db"))
+        metrics = Metrics()
+        proxy = MockProxy("https://api.test.com", pool=pool, cache=cache, metrics=metrics)
+
+        await proxy.fetch()
+        await proxy.fetch()
+
+        endpoint = (('endpoint', '/test/endpoint'),)
+        snapshot = metrics.snapshot()
+        assert snapshot.counters[('http.requests', endpoint + (('status', 'ConnectError'),))] == 1
+        assert snapshot.counters[('http.requests', endpoint + (('status', '200'),))] == 1
+        assert snapshot.counters[('http.retries', endpoint)] == 1
+        assert snapshot.counters[('http.bytes_in', endpoint)] == 16
+        assert snapshot.counters[('cache.misses', endpoint)] == 1
+        assert snapshot.counters[('cache.hits', endpoint)] == 1
+        assert snapshot.timers[('http.request.seconds', endpoint)].count == 1
+        assert snapshot.timers[('validate.seconds', endpoint)].count == 1
+        trace = mock_client.get.await_args.kwargs['extensions']['trace']
+        assert callable(trace)
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_fetch_is_conditional_on_remembered_validators(self, tmp_path):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                headers={"ETag": '"v1"', "Last-Modified": "Sat, 01 Nov 2025 00:00:00 GMT"},
+                content=b'{"key": "value"}',
+            )
+
+        pool = Mock(spec=ClientPool)
+        pool.get_client.return_value = httpx.AsyncClient(
+            base_url="https://api.test.com",
+            transport=httpx.MockTransport(handler),
+        )
+        validators = ValidatorStore(str(tmp_path / "validators.db"))
+        metrics = Metrics()
+        proxy = MockProxy("https://api.test.com", pool=pool, metrics=metrics, validators=validators)
+
+        response = await proxy.fetch()
+        # not remembered until stored, the next request is still unconditional
+        await proxy.fetch()
+        await proxy.remember_validators(response)
+        with pytest.raises(NotModifiedError) as exc_info:
+            await proxy.fetch()
+
+        assert "If-None-Match" not in requests[1].headers
+        assert requests[2].headers["If-None-Match"] == '"v1"'
+        assert requests[2].headers["If-Modified-Since"] == "Sat, 01 Nov 2025 00:00:00 GMT"
+        assert exc_info.value.response.status_code == 304
+        endpoint = (('endpoint', '/test/endpoint'),)
+        assert metrics.snapshot().counters[('http.not_modified', endpoint)] == 1
+        validators.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_raises_not_modified(self, tmp_path):
+        pool = Mock(spec=ClientPool)
+        pool.get_client.return_value = httpx.AsyncClient(
+            base_url="https://api.test.com",
+            transport=httpx.MockTransport(lambda request: httpx.Response(304)),
+        )
+        validators = ValidatorStore(str(tmp_path / "validators.db"))
+        proxy = MockProxy("https://api.test.com", pool=pool, validators=validators)
+        await proxy.remember_validators(httpx.Response(200, headers={"ETag": '"v1"'}))
+
+        with pytest.raises(NotModifiedError):
+            async with proxy.stream():
+                pass
+        validators.close()
+
+    @pytest.mark.asyncio
+    async def test_remember_validators_forgets_response_without_validators(self, tmp_path):
+        validators = ValidatorStore(str(tmp_path / "validators.db"))
+        proxy = MockProxy("https://api.test.com", validators=validators)
+
+        await proxy.remember_validators(httpx.Response(200, headers={"ETag": '"v1"'}))
+        assert len(validators) == 1
+
+        await proxy.remember_validators(httpx.Response(200))
+        assert len(validators) == 0
+        validators.close()
+
     def test_abstract_methods(self):
         with pytest.raises(TypeError):
             BaseProxy("https://api.test.com")
@@ -5,6 +5,8 @@ import json
 import pytest
 from unittest.mock import AsyncMock, patch
 
+import httpx
+
 from court_pipeline.proxy.boxscore_summary import BoxscoreSummaryProxy
 
 
@@ -29,6 +31,19 @@ class TestBoxscoreSummaryProxy:
         actual = self.proxy.build_http_params(game_id="0022400001")
         assert actual == expected
 
+    def test_cache_ttl_of_final_game(self):
+        response = httpx.Response(200, json=boxscore_summary_data)
+        assert self.proxy.cache_ttl(response, game_id="0022400001") is None
+
+    def test_cache_ttl_of_live_game(self):
+        response = httpx.Response(200, json={"boxScoreSummary": {"gameStatus": 2}})
+        assert self.proxy.cache_ttl(response, game_id="0022400001") == 60.0
+
+    @pytest.mark.parametrize('payload', [[], None, "final", {"boxScoreSummary": [3]}])
+    def test_cache_ttl_of_other_json(self, payload):
+        response = httpx.Response(200, content=json.dumps(payload).encode('utf-8'))
+        assert self.proxy.cache_ttl(response, game_id="0022400001") == 60.0
+
     def test_build_http_params_with_invalid_keyword(self):
         with pytest.raises(TypeError):
             self.proxy.build_http_params(gameID="0022400001")
@@ -0,0 +1,82 @@
+"""
+Test cases for ResponseCache
+"""
+import pytest
+
+import httpx
+
+from court_pipeline.proxy.cache import ResponseCache
+
+
+class FakeClock:
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache:
+
+    def setup_method(self):
+        self.clock = FakeClock()
+
+    def test_build_key_ignores_param_order(self):
+        key = ResponseCache.build_key("scoreboardv3", {"GameDate": "2025-11-23", "LeagueID": "00"})
+        other = ResponseCache.build_key("scoreboardv3", {"LeagueID": "00", "GameDate": "2025-11-23"})
+        assert key == other
+        assert key != ResponseCache.build_key("scoreboardv3", {"GameDate": "2025-11-24", "LeagueID": "00"})
+        assert key != ResponseCache.build_key("boxscoresummaryv3", {"GameDate": "2025-11-23", "LeagueID": "00"})
+
+    @pytest.mark.asyncio
+    async def test_get_returns_stored_response(self, tmp_path):
+        cache = ResponseCache(str(tmp_path / "cache.db"), clock=self.clock)
+        response = httpx.Response(
+            200,
+            headers={"content-type": "application/json", "transfer-encoding": "chunked"},
+            content=b'{"key": "value"}',
+        )
+        await cache.set("key", response, ttl=None)
+
+        cached = await cache.get("key")
+
+        assert cached.status_code == 200
+        assert cached.content == b'{"key": "value"}'
+        assert cached.headers["content-type"] == "application/json"
+        assert "transfer-encoding" not in cached.headers
+        assert cached.extensions["from_cache"] is True
+        assert await cache.get("missing") is None
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_after_ttl(self, tmp_path):
+        cache = ResponseCache(str(tmp_path / "cache.db"), clock=self.clock)
+        await cache.set("live", httpx.Response(200, content=b"live"), ttl=60.0)
+        await cache.set("final", httpx.Response(200, content=b"final"), ttl=None)
+
+        self.clock.now += 59.0
+        assert await cache.get("live") is not None
+
+        self.clock.now += 1.0
+        assert await cache.get("live") is None
+        assert await cache.get("final") is not None
+        assert cache.size == len(b"final")
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, tmp_path):
+        cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=10, clock=self.clock)
+        await cache.set("a", httpx.Response(200, content=b"aaaa"), ttl=None)
+        self.clock.now += 1.0
+        await cache.set("b", httpx.Response(200, content=b"bbbb"), ttl=None)
+        self.clock.now += 1.0
+        await cache.get("a")
+        self.clock.now += 1.0
+        await cache.set("c", httpx.Response(200, content=b"cccc"), ttl=None)
+
+        assert await cache.get("a") is not None
+        assert await cache.get("b") is None
+        assert await cache.get("c") is not None
+        assert cache.size == 8
+        cache.close()
@@ -0,0 +1,74 @@
+"""
+Test cases for ClientPool
+"""
+import sys
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from court_pipeline.proxy.pool import ClientPool
+
+
+class TestClientPool:
+
+    def test_initialization(self):
+        pool = ClientPool(max_connections=50, max_keepalive_connections=10, keepalive_expiry=15.0)
+
+        assert pool.is_open is False
+        assert pool.limits.max_connections == 50
+        assert pool.limits.max_keepalive_connections == 10
+        assert pool.limits.keepalive_expiry == 15.0
+
+    def test_get_client_requires_open_pool(self):
+        pool = ClientPool()
+        with pytest.raises(RuntimeError):
+            pool.get_client("https://api.test.com")
+
+    @pytest.mark.asyncio
+    async def test_get_client_reuses_client_per_base_url(self):
+        async with ClientPool() as pool:
+            client1 = pool.get_client("https://api.test.com")
+            client2 = pool.get_client("https://api.test.com")
+            client3 = pool.get_client("https://other.test.com")
+
+            assert isinstance(client1, httpx.AsyncClient)
+            assert client1 is client2
+            assert client1 is not client3
+            assert client1.base_url == "https://api.test.com"
+
+    @pytest.mark.asyncio
+    async def test_counts_requests(self):
+        async with ClientPool() as pool:
+            client = pool.get_client("https://api.test.com")
+            with patch.object(
+                httpx.AsyncHTTPTransport,
+                'handle_async_request',
+                new_callable=AsyncMock,
+                return_value=httpx.Response(200),
+            ):
+                await client.get("/a")
+                await pool.get_client("https://other.test.com").get("/b")
+
+        assert pool.requests == 2
+
+    @pytest.mark.asyncio
+    async def test_close_releases_clients(self):
+        pool = ClientPool()
+        await pool.open()
+        client = pool.get_client("https://api.test.com")
+
+        await pool.close()
+
+        assert pool.is_open is False
+        assert client.is_closed is True
+        with pytest.raises(RuntimeError):
+            pool.get_client("https://api.test.com")
+
+    @pytest.mark.asyncio
+    async def test_open_http2_without_h2_package(self):
+        pool = ClientPool(http2=True)
+        with patch.dict(sys.modules, {"h2": None}):
+            with pytest.raises(ImportError):
+                await pool.open()
+        assert pool.is_open is False
@@ -0,0 +1,106 @@
+"""
+Test cases for AdaptiveRateLimiter
+"""
+from unittest.mock import patch
+
+import pytest
+
+from court_pipeline.proxy.rate_limiter import AdaptiveRateLimiter, is_throttled
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestIsThrottled:
+
+    def test_status_codes(self):
+        assert is_throttled(429) is True
+        assert is_throttled(500) is True
+        assert is_throttled(503) is True
+        assert is_throttled(200) is False
+        assert is_throttled(404) is False
+
+
+class TestAdaptiveRateLimiter:
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            AdaptiveRateLimiter(rate=0)
+        with pytest.raises(ValueError):
+            AdaptiveRateLimiter(burst=0)
+        with pytest.raises(ValueError):
+            AdaptiveRateLimiter(decrease_factor=1.0)
+
+    def test_default_max_rate(self):
+        limiter = AdaptiveRateLimiter(rate=4.0, increase=100.0)
+        for _ in range(10):
+            limiter.on_success()
+        assert limiter.rate == 8.0
+
+    @pytest.mark.asyncio
+    async def test_acquire_burst_without_waiting(self):
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(rate=2.0, burst=3, clock=clock)
+
+        with patch('court_pipeline.proxy.rate_limiter.asyncio.sleep') as mock_sleep:
+            for _ in range(3):
+                await limiter.acquire()
+            mock_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_refill(self):
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(rate=2.0, burst=1, clock=clock)
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+            clock.now += delay
+
+        await limiter.acquire()
+        with patch('court_pipeline.proxy.rate_limiter.asyncio.sleep', side_effect=sleep):
+            await limiter.acquire()
+
+        assert delays == [0.5]
+
+    def test_on_success_ramps_up_additively(self):
+        limiter = AdaptiveRateLimiter(rate=2.0, max_rate=10.0, increase=1.0)
+
+        limiter.on_success()
+
+        assert limiter.rate == 2.5
+
+    def test_on_throttle_backs_off_multiplicatively(self):
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(rate=8.0, min_rate=1.0, clock=clock)
+
+        limiter.on_throttle()
+        assert limiter.rate == 4.0
+
+        clock.now += 2.0
+        limiter.on_throttle()
+        clock.now += 2.0
+        limiter.on_throttle()
+        clock.now += 2.0
+        limiter.on_throttle()
+
+        assert limiter.rate == 1.0
+        assert limiter.throttle_count == 4
+
+    def test_on_throttle_respects_cooldown(self):
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(rate=8.0, cooldown=1.0, clock=clock)
+
+        assert limiter.on_throttle() is True
+        assert limiter.on_throttle() is False
+        clock.now += 0.5
+        assert limiter.on_throttle() is False
+
+        assert limiter.rate == 4.0
+        assert limiter.throttle_count == 1
@@ -0,0 +1,69 @@
+"""
+Test cases for RetryPolicy and RetryBudget
+"""
+import httpx
+import pytest
+
+from court_pipeline.proxy.retry import RetryBudget, RetryPolicy
+
+
+class TestRetryBudget:
+
+    def test_min_retries(self):
+        budget = RetryBudget(ratio=0.0, min_retries=2)
+
+        assert budget.try_withdraw() is True
+        assert budget.try_withdraw() is True
+        assert budget.try_withdraw() is False
+        assert budget.retries == 2
+
+    def test_ratio_of_requests(self):
+        budget = RetryBudget(ratio=0.5, min_retries=0)
+        for _ in range(4):
+            budget.record_request()
+
+        assert [budget.try_withdraw() for _ in range(3)] == [True, True, False]
+
+
+class TestRetryPolicy:
+
+    def test_invalid_max_attempts(self):
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_is_retryable_response(self):
+        policy = RetryPolicy()
+
+        assert policy.is_retryable_response(httpx.Response(429)) is True
+        assert policy.is_retryable_response(httpx.Response(502)) is True
+        assert policy.is_retryable_response(httpx.Response(404)) is False
+        assert policy.is_retryable_response(httpx.Response(200)) is False
+
+    def test_is_retryable_exception(self):
+        policy = RetryPolicy()
+
+        assert policy.is_retryable_exception(httpx.ReadTimeout("timed out")) is True
+        assert policy.is_retryable_exception(httpx.ConnectError("refused")) is True
+        assert policy.is_retryable_exception(ValueError("bad")) is False
+
+    def test_can_retry_respects_max_attempts(self):
+        policy = RetryPolicy(max_attempts=3)
+
+        assert policy.can_retry(1) is True
+        assert policy.can_retry(2) is True
+        assert policy.can_retry(3) is False
+
+    def test_backoff_full_jitter(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=3.0, rng=lambda: 0.5)
+
+        assert policy.backoff(1) == 0.25
+        assert policy.backoff(2) == 0.5
+        assert policy.backoff(3) == 1.0
+        assert policy.backoff(10) == 1.5
+
+    def test_backoff_honors_retry_after(self):
+        policy = RetryPolicy(max_delay=10.0, rng=lambda: 0.0)
+
+        assert policy.backoff(1, httpx.Response(429, headers={"Retry-After": "4"})) == 4.0
+        assert policy.backoff(1, httpx.Response(429, headers={"Retry-After": "60"})) == 10.0
+        assert policy.backoff(1, httpx.Response(503)) == 0.0
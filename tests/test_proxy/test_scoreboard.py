@@ -6,7 +6,10 @@ import json
 import pytest
 from unittest.mock import AsyncMock, patch
 
+import httpx
+
 from court_pipeline.proxy.scoreboard import ScoreboardProxy
+from court_pipeline.utils.scoreboard import game_date_today
 
 
 with open("tests/fixtures/2025-11-23.json") as f:
@@ -42,6 +45,29 @@ class TestScoreboardProxy:
         )
         assert actual == expected
 
+    def test_cache_ttl_of_past_date_with_final_games(self):
+        response = httpx.Response(200, json=scoreboard_data)
+        assert self.proxy.cache_ttl(response, game_date=datetime.date(2025, 11, 23)) is None
+
+    def test_cache_ttl_of_today(self):
+        response = httpx.Response(200, json=scoreboard_data)
+        assert self.proxy.cache_ttl(response, game_date=game_date_today()) == 60.0
+
+    @patch('court_pipeline.proxy.scoreboard.game_date_today', return_value=datetime.date(2025, 11, 23))
+    def test_cache_ttl_of_today_in_eastern_time(self, mock_game_date_today):
+        # the host may already be on the next day, the games of the date can still be replayed or corrected
+        response = httpx.Response(200, json=scoreboard_data)
+        assert self.proxy.cache_ttl(response, game_date=datetime.date(2025, 11, 23)) == 60.0
+
+    def test_cache_ttl_of_past_date_with_unfinished_games(self):
+        response = httpx.Response(200, json={"scoreboard": {"games": [{"gameStatus": 2}]}})
+        assert self.proxy.cache_ttl(response, game_date=datetime.date(2025, 11, 23)) == 60.0
+
+    @pytest.mark.parametrize('payload', [[], None, {"scoreboard": []}, {"scoreboard": {"games": [None]}}])
+    def test_cache_ttl_of_other_json(self, payload):
+        response = httpx.Response(200, content=json.dumps(payload).encode('utf-8'))
+        assert self.proxy.cache_ttl(response, game_date=datetime.date(2025, 11, 23)) == 60.0
+
     def test_build_http_params_with_invalid_keyword(self):
         with pytest.raises(TypeError):
             self.proxy.build_http_params(game_id="0022400001")
@@ -0,0 +1,49 @@
+"""
+Test cases for RequestTrace
+"""
+from unittest.mock import patch
+
+import pytest
+
+from court_pipeline.metrics.registry import Metrics
+from court_pipeline.proxy.trace import RequestTrace
+
+
+class TestRequestTrace:
+
+    @pytest.mark.asyncio
+    async def test_times_request_phases(self):
+        metrics = Metrics()
+        trace = RequestTrace(metrics, 'scoreboardv3')
+        clock = iter([0.0, 0.010, 0.010, 0.030, 0.030, 0.031, 0.031, 0.120, 0.120, 0.200])
+
+        with patch('court_pipeline.proxy.trace.time.perf_counter', side_effect=lambda: next(clock)):
+            for step in (
+                'connection.connect_tcp',
+                'connection.start_tls',
+                'http11.send_request_headers',
+                'http11.receive_response_headers',
+                'http11.receive_response_body',
+            ):
+                await trace(f'{step}.started', {})
+                await trace(f'{step}.complete', {'return_value': None})
+
+        timers = metrics.snapshot().timers
+        endpoint = (('endpoint', 'scoreboardv3'),)
+        assert timers[('http.connect.seconds', endpoint)].total == pytest.approx(0.010)
+        assert timers[('http.tls.seconds', endpoint)].total == pytest.approx(0.020)
+        assert timers[('http.ttfb.seconds', endpoint)].total == pytest.approx(0.120 - 0.030)
+        assert timers[('http.download.seconds', endpoint)].total == pytest.approx(0.080)
+
+    @pytest.mark.asyncio
+    async def test_ignores_failed_and_unknown_steps(self):
+        metrics = Metrics()
+        trace = RequestTrace(metrics, 'scoreboardv3')
+
+        await trace('connection.connect_tcp.started', {})
+        await trace('connection.connect_tcp.failed', {'exception': OSError()})
+        await trace('http11.response_closed.started', {})
+        await trace('http11.response_closed.complete', {})
+        await trace('http11.receive_response_headers.complete', {})
+
+        assert metrics.snapshot().timers == {}
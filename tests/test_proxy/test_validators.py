@@ -0,0 +1,56 @@
+"""
+Test cases for ValidatorStore
+"""
+import pytest
+
+import httpx
+
+from court_pipeline.proxy.validators import ValidatorStore, Validators
+
+
+class TestValidators:
+
+    def test_from_response(self):
+        response = httpx.Response(200, headers={"ETag": '"abc"', "Last-Modified": "Sat, 01 Nov 2025 00:00:00 GMT"})
+
+        validators = Validators.from_response(response)
+
+        assert validators == Validators(etag='"abc"', last_modified="Sat, 01 Nov 2025 00:00:00 GMT")
+        assert validators.request_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Sat, 01 Nov 2025 00:00:00 GMT",
+        }
+
+    def test_from_response_without_validators(self):
+        assert Validators.from_response(httpx.Response(200)) is None
+        assert Validators(etag='W/"abc"').request_headers() == {"If-None-Match": 'W/"abc"'}
+
+
+class TestValidatorStore:
+
+    @pytest.mark.asyncio
+    async def test_set_get_delete(self, tmp_path):
+        store = ValidatorStore(str(tmp_path / "nested" / "validators.db"))
+        key = store.build_key("scoreboardv3", {"GameDate": "2025-11-23", "LeagueID": "00"})
+
+        assert await store.get(key) is None
+        await store.set(key, Validators(etag='"v1"'))
+        await store.set(key, Validators(etag='"v2"'))
+
+        assert await store.get(key) == Validators(etag='"v2"')
+        assert len(store) == 1
+
+        await store.delete(key)
+        assert await store.get(key) is None
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_persists_between_runs(self, tmp_path):
+        path = str(tmp_path / "validators.db")
+        store = ValidatorStore(path)
+        await store.set("key", Validators(last_modified="Sat, 01 Nov 2025 00:00:00 GMT"))
+        store.close()
+
+        store = ValidatorStore(path)
+        assert await store.get("key") == Validators(last_modified="Sat, 01 Nov 2025 00:00:00 GMT")
+        store.close()
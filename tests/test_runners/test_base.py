@@ -0,0 +1,563 @@
+"""
+Test cases for BaseRunner
+"""
+import asyncio
+import collections
+import datetime
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from court_pipeline.metrics.registry import Metrics
+from court_pipeline.metrics.sinks import SummarySink
+from court_pipeline.proxy.exceptions import InvalidResponseError, NotModifiedError
+from court_pipeline.proxy.pool import ClientPool
+from court_pipeline.runners.base import BaseRunner, RunReport, TaskResult, _aiter, merge_tasks
+from court_pipeline.runners.dead_letter import DeadLetterStore
+from court_pipeline.runners.journal import Journal
+from court_pipeline.runners.pipeline import StageConfig
+
+
+class MockExtractor:
+
+    def __init__(self):
+        self.storage = None
+        self.stored = []
+        self.flushed = False
+        self.store_outcomes = collections.Counter()
+        self.remembered = []
+        self.unarchived = []
+        self.flush_error = None
+
+    def configure_storage(self, max_workers=None, max_in_flight=None, codec=None, packed=None, dedup=None):
+        self.storage = (max_workers, max_in_flight)
+        self.codec = codec
+        self.packed = packed
+        self.dedup = dedup
+
+    def on_archived(self, object_name, callback):
+        if not self.packed:
+            return False
+        self.unarchived.append(callback)
+        return True
+
+    async def flush_archives(self):
+        self.flushed = True
+        if self.flush_error is not None:
+            raise self.flush_error
+        for callback in self.unarchived:
+            await callback()
+        self.unarchived = []
+
+    def close_storage(self):
+        self.storage = None
+
+    async def is_stored(self, key):
+        return key.startswith("stored")
+
+    def is_recent(self, refresh_window, key):
+        return key.endswith("recent")
+
+    async def fetch(self, key):
+        if key.startswith("bad"):
+            raise ValueError(f"bad {key}")
+        if key.startswith("missing"):
+            raise InvalidResponseError("unexpected status 404", httpx.Response(404, content=b"not found"))
+        if key.startswith("unmodified"):
+            raise NotModifiedError("not modified", httpx.Response(304))
+        return SimpleNamespace(content=key.encode("utf-8"))
+
+    def object_name(self, key):
+        return f"/{key}.json"
+
+    async def store_object(self, data, content_type, object_name):
+        if self.dedup and (data, content_type, object_name) in self.stored:
+            self.store_outcomes['unchanged'] += 1
+            return
+        self.stored.append((data, content_type, object_name))
+        self.store_outcomes['changed'] += 1
+
+    async def remember_validators(self, response, key):
+        self.remembered.append(key)
+
+    async def remember_validators_once_stored(self, response, key):
+        if not self.on_archived(self.object_name(key), lambda: self.remember_validators(response, key)):
+            await self.remember_validators(response, key)
+
+    def count_store(self, outcome):
+        self.store_outcomes[outcome] += 1
+
+
+class MockRunner(BaseRunner):
+
+    def __init__(self, *args, fail_keys=(), missing_keys=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_keys = set(fail_keys)
+        self.missing_keys = set(missing_keys)
+        self.executed = []
+        self.running = 0
+        self.max_running = 0
+        self.pools = []
+        self.extractors = []
+
+    def create_extractor(self):
+        return MockExtractor()
+
+    def task_key(self, key):
+        return key
+
+    def task_priority(self, key):
+        return 0 if key.startswith("live") else 1
+
+    async def run_task(self, key):
+        assert self.extractor.storage == (self.concurrency, self.concurrency)
+        self.executed.append(key)
+        self.pools.append(self.pool)
+        self.extractors.append(self.extractor)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.001)
+        self.running -= 1
+        if key in self.fail_keys:
+            raise ValueError(f"bad {key}")
+        if key in self.missing_keys:
+            raise InvalidResponseError("unexpected status 404", httpx.Response(404, content=b"not found"))
+
+
+class TestRunReport:
+
+    def test_succeeded_and_failed(self):
+        report = RunReport(results=[
+            TaskResult(key="a", succeeded=True),
+            TaskResult(key="b", succeeded=False, error="ValueError: bad b"),
+        ])
+
+        assert [result.key for result in report.succeeded] == ["a"]
+        assert [result.key for result in report.failed] == ["b"]
+
+
+class TestBaseRunner:
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            MockRunner(concurrency=0)
+
+    def test_abstract_methods(self):
+        with pytest.raises(TypeError):
+            BaseRunner()
+
+    @pytest.mark.asyncio
+    async def test_run_reports_each_task(self):
+        runner = MockRunner(concurrency=4, fail_keys={"k3"})
+
+        report = await runner.run({"key": f"k{i}"} for i in range(10))
+
+        assert len(report.results) == 10
+        assert len(report.succeeded) == 9
+        assert [result.key for result in report.failed] == ["k3"]
+        assert report.failed[0].error == "ValueError: bad k3"
+
+    @pytest.mark.asyncio
+    async def test_run_fails_task_with_bad_params(self):
+        runner = MockRunner(concurrency=1)
+
+        report = await runner.run([{"key": "k1"}, {"other": "k2"}, {"key": "k3"}])
+
+        assert sorted(result.key for result in report.succeeded) == ["k1", "k3"]
+        assert [result.key for result in report.failed] == ["{'other': 'k2'}"]
+        assert report.failed[0].error.startswith("TypeError")
+
+    @pytest.mark.asyncio
+    async def test_run_records_metrics(self):
+        sink = SummarySink()
+        runner = MockRunner(concurrency=2, fail_keys={"k1"}, metrics=Metrics([sink]))
+
+        await runner.run({"key": f"k{i}"} for i in range(4))
+
+        counters = sink.snapshot.counters
+        assert counters[("tasks", (("outcome", "succeeded"),))] == 3
+        assert counters[("tasks", (("outcome", "failed"),))] == 1
+        assert ("queue.depth", (("stage", "tasks"),)) in sink.snapshot.gauges
+
+    @pytest.mark.asyncio
+    async def test_run_bounds_concurrency(self):
+        runner = MockRunner(concurrency=3)
+
+        await runner.run({"key": f"k{i}"} for i in range(20))
+
+        assert runner.max_running == 3
+
+    @pytest.mark.asyncio
+    async def test_run_shares_one_extractor(self):
+        runner = MockRunner(concurrency=4)
+
+        await runner.run({"key": f"k{i}"} for i in range(10))
+
+        assert len(set(map(id, runner.extractors))) == 1
+        assert runner.extractors[0].storage is None
+        with pytest.raises(RuntimeError):
+            runner.extractor
+
+    @pytest.mark.asyncio
+    async def test_run_opens_pool_when_omitted(self):
+        runner = MockRunner(concurrency=2)
+
+        await runner.run({"key": f"k{i}"} for i in range(3))
+
+        assert all(isinstance(pool, ClientPool) for pool in runner.pools)
+        assert runner.pools[0].is_open is False
+        assert runner.pool is None
+
+    @pytest.mark.asyncio
+    async def test_run_uses_given_pool(self):
+        async with ClientPool() as pool:
+            runner = MockRunner(concurrency=2, pool=pool)
+
+            await runner.run({"key": f"k{i}"} for i in range(3))
+
+            assert runner.pools == [pool] * 3
+            assert pool.is_open is True
+
+    @pytest.mark.asyncio
+    async def test_run_incremental_skips_stored_tasks(self):
+        runner = MockRunner(concurrency=2, incremental=True)
+        keys = ["stored-1", "new-1", "stored-2-recent"]
+
+        report = await runner.run({"key": key} for key in keys)
+
+        assert sorted(result.key for result in report.skipped) == ["stored-1", "stored-2-recent"]
+        assert len(report.succeeded) == 3
+        assert len(runner.extractors) == 1
+
+    @pytest.mark.asyncio
+    async def test_run_incremental_refreshes_recent_tasks(self):
+        runner = MockRunner(concurrency=2, incremental=True, refresh_window=datetime.timedelta(days=3))
+        keys = ["stored-1", "new-1", "stored-2-recent"]
+
+        report = await runner.run({"key": key} for key in keys)
+
+        assert [result.key for result in report.skipped] == ["stored-1"]
+
+    @pytest.mark.asyncio
+    async def test_run_without_incremental_runs_every_task(self):
+        runner = MockRunner(concurrency=2)
+
+        report = await runner.run({"key": key} for key in ["stored-1", "new-1"])
+
+        assert report.skipped == []
+        assert len(runner.extractors) == 2
+
+    def test_unknown_stage(self):
+        with pytest.raises(ValueError):
+            MockRunner(stages={"download": StageConfig()})
+
+    def test_stages_with_prioritized(self):
+        with pytest.raises(ValueError):
+            MockRunner(stages={}, prioritized=True)
+
+    @pytest.mark.parametrize("prioritized, expected", [
+        (False, ["b1", "b2", "b3", "live-1", "b4"]),
+        (True, ["b1", "b2", "live-1", "b3", "b4"]),
+    ])
+    @pytest.mark.asyncio
+    async def test_run_prioritized_takes_urgent_tasks_first(self, prioritized, expected):
+        runner = MockRunner(concurrency=2, prioritized=prioritized)
+        gate = asyncio.Event()
+
+        async def tasks():
+            yield {"key": "b1"}
+            yield {"key": "b2"}
+            yield {"key": "b3"}
+            yield {"key": "live-1"}
+            # both workers are busy and the queue is full, release them once b4 waits for a slot
+            asyncio.get_running_loop().call_soon(gate.set)
+            yield {"key": "b4"}
+
+        async def run_task(key):
+            runner.executed.append(key)
+            await gate.wait()
+
+        runner.run_task = run_task
+        await runner.run(tasks())
+
+        assert runner.executed == expected
+
+    @pytest.mark.asyncio
+    async def test_run_sources_side_by_side(self):
+        runner = MockRunner(concurrency=1, prioritized=True)
+        started = asyncio.Event()
+
+        async def live_tasks():
+            await started.wait()
+            yield {"key": "live-1"}
+
+        async def run_task(key):
+            started.set()
+            runner.executed.append(key)
+            await asyncio.sleep(0.001)
+
+        runner.run_task = run_task
+        report = await runner.run(({"key": f"b{i}"} for i in range(20)), live_tasks())
+
+        assert len(report.succeeded) == 21
+        # queued behind at most the backfill tasks already buffered
+        assert runner.executed.index("live-1") <= 4
+
+    @pytest.mark.asyncio
+    async def test_merge_tasks_fails_with_source(self):
+        async def failing():
+            yield {"key": "a"}
+            raise RuntimeError("source failed")
+
+        with pytest.raises(RuntimeError):
+            [params async for params in merge_tasks([{"key": "b"}], failing())]
+
+    @pytest.mark.asyncio
+    async def test_merge_tasks_yields_every_source(self):
+        merged = [params async for params in merge_tasks([{"key": "a"}, {"key": "b"}], _aiter([{"key": "c"}]))]
+
+        assert sorted(params["key"] for params in merged) == ["a", "b", "c"]
+
+    def test_stages_with_streaming(self):
+        with pytest.raises(ValueError):
+            MockRunner(stages={}, streaming=True)
+
+    @pytest.mark.asyncio
+    async def test_run_pipelined(self):
+        runner = MockRunner(
+            concurrency=2,
+            stages={"fetch": StageConfig(workers=4, queue_size=4), "store": StageConfig(workers=3)},
+        )
+        extractors = []
+        create_extractor = runner.create_extractor
+
+        def track_extractor():
+            extractor = create_extractor()
+            extractors.append(extractor)
+            return extractor
+
+        runner.create_extractor = track_extractor
+
+        report = await runner.run({"key": key} for key in ["k1", "bad-1", "k2"])
+
+        assert sorted(result.key for result in report.succeeded) == ["k1", "k2"]
+        assert [result.key for result in report.failed] == ["bad-1"]
+        assert [stats.name for stats in report.stages] == ["fetch", "transform", "store"]
+        assert [stats.workers for stats in report.stages] == [4, 2, 3]
+        assert sorted(extractors[0].stored) == [
+            (b"k1", "application/json", "/k1.json"),
+            (b"k2", "application/json", "/k2.json"),
+        ]
+        assert runner.extractors == []
+
+    @pytest.mark.asyncio
+    async def test_run_packed_flushes_archives(self):
+        runner = MockRunner(concurrency=2, packed=True)
+        extractors = []
+        create_extractor = runner.create_extractor
+
+        def track_extractor():
+            extractor = create_extractor()
+            extractors.append(extractor)
+            return extractor
+
+        runner.create_extractor = track_extractor
+
+        report = await runner.run({"key": key} for key in ["k1", "bad-1"])
+
+        assert extractors[0].packed is True
+        assert extractors[0].flushed is True
+        assert extractors[0].storage is None
+        assert sorted(result.key for result in report.succeeded) == ["bad-1", "k1"]
+
+    @pytest.mark.parametrize("stages", [None, {}])
+    @pytest.mark.asyncio
+    async def test_run_packed_journals_tasks_once_archived(self, tmp_path, stages):
+        journal = Journal(str(tmp_path / "journal.db"), job="mock")
+        runner = MockRunner(concurrency=2, packed=True, stages=stages, journal=journal)
+        recorded = []
+        record = journal.record
+
+        def track_record(result):
+            # nothing is journaled before the archives are flushed
+            assert runner._extractor is None
+            recorded.append(result.key)
+            record(result)
+
+        journal.record = track_record
+
+        report = await runner.run({"key": key} for key in ["k1", "k2"])
+
+        assert sorted(recorded) == ["k1", "k2"]
+        assert sorted(result.key for result in report.succeeded) == ["k1", "k2"]
+        assert journal.completed_keys() == {"k1", "k2"}
+        journal.close()
+
+    @pytest.mark.parametrize("stages", [None, {}])
+    @pytest.mark.asyncio
+    async def test_run_packed_fails_tasks_of_parts_not_uploaded(self, tmp_path, stages):
+        journal = Journal(str(tmp_path / "journal.db"), job="mock")
+        runner = MockRunner(concurrency=2, packed=True, stages=stages, journal=journal)
+        create_extractor = runner.create_extractor
+
+        def failing_extractor():
+            extractor = create_extractor()
+            extractor.flush_error = RuntimeError("upload failed")
+            return extractor
+
+        runner.create_extractor = failing_extractor
+
+        report = await runner.run({"key": key} for key in ["k1", "k2"])
+
+        assert report.succeeded == []
+        assert sorted(result.key for result in report.failed) == ["k1", "k2"]
+        assert report.failed[0].error == "archive part not uploaded, RuntimeError: upload failed"
+        assert journal.completed_keys() == set()
+        journal.close()
+
+    @pytest.mark.asyncio
+    async def test_run_reports_unchanged_objects(self):
+        runner = MockRunner(concurrency=1, stages={}, dedup=True)
+
+        report = await runner.run({"key": key} for key in ["k1", "k2", "k1"])
+
+        assert report.objects_changed == 2
+        assert report.objects_unchanged == 1
+
+    @pytest.mark.asyncio
+    async def test_run_pipelined_skips_not_modified_tasks(self):
+        runner = MockRunner(concurrency=1, stages={})
+        extractor = MockExtractor()
+        runner.create_extractor = lambda: extractor
+
+        report = await runner.run({"key": key} for key in ["unmodified-1", "k1"])
+
+        assert [result.key for result in report.skipped] == ["unmodified-1"]
+        assert report.failed == []
+        assert report.objects_changed == 1
+        assert report.objects_unchanged == 1
+        assert extractor.remembered == ["k1"]
+
+    @pytest.mark.asyncio
+    async def test_run_pipelined_skips_stored_tasks(self):
+        runner = MockRunner(concurrency=2, incremental=True, stages={})
+
+        report = await runner.run({"key": key} for key in ["stored-1", "new-1"])
+
+        assert [result.key for result in report.skipped] == ["stored-1"]
+        assert [stats.processed for stats in report.stages] == [2, 1, 1]
+
+    @pytest.mark.asyncio
+    async def test_run_resumes_from_journal(self, tmp_path):
+        path = str(tmp_path / "journal.db")
+        keys = [f"k{i}" for i in range(5)]
+
+        journal = Journal(path, job="mock")
+        report = await MockRunner(concurrency=2, fail_keys={"k1", "k3"}, journal=journal).run(
+            {"key": key} for key in keys
+        )
+        journal.close()
+        assert len(report.failed) == 2
+
+        journal = Journal(path, job="mock")
+        runner = MockRunner(concurrency=2, journal=journal)
+        report = await runner.run({"key": key} for key in keys)
+
+        assert sorted(result.key for result in report.skipped) == ["k0", "k2", "k4"]
+        assert len(runner.extractors) == 2
+        assert journal.completed_keys() == set(keys)
+        assert journal.get("k1").attempts == 2
+        journal.close()
+
+    @pytest.mark.asyncio
+    async def test_run_pipelined_records_journal(self, tmp_path):
+        journal = Journal(str(tmp_path / "journal.db"), job="mock")
+        runner = MockRunner(concurrency=2, stages={}, journal=journal)
+
+        await runner.run({"key": key} for key in ["k1", "bad-1"])
+
+        assert journal.completed_keys() == {"k1"}
+        assert [entry.key for entry in journal.failed_entries()] == ["bad-1"]
+        journal.close()
+
+    @pytest.mark.asyncio
+    async def test_run_dead_letters_permanent_failures(self, tmp_path):
+        dead_letters = DeadLetterStore(str(tmp_path / "dead_letters.jsonl"))
+        runner = MockRunner(concurrency=2, fail_keys={"k1"}, missing_keys={"k2"}, dead_letters=dead_letters)
+
+        report = await runner.run({"key": key} for key in ["k0", "k1", "k2"])
+
+        assert sorted(result.key for result in report.failed) == ["k1", "k2"]
+        letters = dead_letters.load()
+        assert list(letters) == ["k2"]
+        assert letters["k2"].params == {"key": "k2"}
+        assert letters["k2"].status_code == 404
+        assert letters["k2"].body == "not found"
+
+        runner = MockRunner(concurrency=2, dead_letters=dead_letters)
+        report = await runner.run({"key": key} for key in ["k0", "k2"])
+
+        assert len(runner.extractors) == 1
+        assert report.failed[0].key == "k2"
+        assert report.failed[0].error.startswith("dead-lettered: ")
+
+    @pytest.mark.asyncio
+    async def test_replay_dead_letters(self, tmp_path):
+        dead_letters = DeadLetterStore(str(tmp_path / "dead_letters.jsonl"))
+        await MockRunner(concurrency=2, missing_keys={"k1", "k2"}, dead_letters=dead_letters).run(
+            {"key": key} for key in ["k0", "k1", "k2"]
+        )
+
+        runner = MockRunner(concurrency=2, missing_keys={"k2"}, dead_letters=dead_letters)
+        report = await runner.replay()
+
+        assert len(runner.extractors) == 2
+        assert [result.key for result in report.succeeded] == ["k1"]
+        assert list(dead_letters.load()) == ["k2"]
+
+    @pytest.mark.asyncio
+    async def test_replay_without_dead_letter_store(self):
+        with pytest.raises(RuntimeError):
+            await MockRunner().replay()
+
+    @pytest.mark.asyncio
+    async def test_run_pipelined_dead_letters_permanent_failures(self, tmp_path):
+        dead_letters = DeadLetterStore(str(tmp_path / "dead_letters.jsonl"))
+        runner = MockRunner(concurrency=2, stages={}, dead_letters=dead_letters)
+
+        await runner.run({"key": key} for key in ["k0", "bad-1", "missing-1"])
+
+        assert list(dead_letters.load()) == ["missing-1"]
+
+
+class TestRunReportThroughput:
+
+    def test_throughput(self):
+        report = RunReport(
+            results=[
+                TaskResult(key="a", succeeded=True),
+                TaskResult(key="b", succeeded=True, skipped=True),
+                TaskResult(key="c", succeeded=False, error="dead-lettered: InvalidResponseError: 404"),
+                TaskResult(key="d", succeeded=False, error="ValueError: bad"),
+            ],
+            elapsed=2.0,
+            bytes_fetched=3 * 1024 * 1024,
+            requests=5,
+        )
+
+        assert [result.key for result in report.fetched] == ["a", "d"]
+        assert report.tasks_per_second == 1.0
+        assert report.requests_per_second == 2.5
+        assert report.megabytes_per_second == 1.5
+
+    def test_merge(self):
+        merged = RunReport.merge([
+            RunReport(results=[TaskResult(key="a", succeeded=True)], elapsed=1.0, bytes_fetched=10, requests=2),
+            RunReport(results=[TaskResult(key="b", succeeded=True)], elapsed=3.0, bytes_fetched=5, requests=1),
+        ])
+
+        assert [result.key for result in merged.results] == ["a", "b"]
+        assert merged.elapsed == 3.0
+        assert merged.bytes_fetched == 15
+        assert merged.requests == 3
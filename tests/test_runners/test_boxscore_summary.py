@@ -0,0 +1,200 @@
+"""
+Test cases for BoxscoreSummaryRunner
+"""
+import datetime
+from unittest.mock import AsyncMock, PropertyMock, patch
+
+import pytest
+
+from court_pipeline.extractors.boxscore_summary_extractor import BoxscoreSummaryExtractor
+from court_pipeline.proxy.pool import ClientPool
+from court_pipeline.proxy.rate_limiter import AdaptiveRateLimiter
+from court_pipeline.proxy.retry import RetryPolicy
+from court_pipeline.runners.boxscore_summary import BoxscoreSummaryRunner
+from court_pipeline.runners.shard import Shard
+
+
+class TestBoxscoreSummaryRunner:
+
+    def test_iter_tasks(self):
+        tasks = list(BoxscoreSummaryRunner.iter_tasks(
+            league_id="00",
+            season_years=[2023, 2024],
+            game_type_ids=[2, 4],
+            max_game_seq_id=2,
+        ))
+
+        assert tasks == [
+            {"game_id": "0022300001"},
+            {"game_id": "0022300002"},
+            {"game_id": "0042300001"},
+            {"game_id": "0042300002"},
+            {"game_id": "0022400001"},
+            {"game_id": "0022400002"},
+            {"game_id": "0042400001"},
+            {"game_id": "0042400002"},
+        ]
+
+    def test_iter_tasks_defaults_to_regular_season(self):
+        tasks = list(BoxscoreSummaryRunner.iter_tasks(league_id="00", season_years=[2024]))
+
+        assert len(tasks) == 1230
+        assert tasks[0] == {"game_id": "0022400001"}
+        assert tasks[-1] == {"game_id": "0022401230"}
+
+    @pytest.mark.asyncio
+    async def test_create_extractor_uses_runner_pool(self):
+        rate_limiter = AdaptiveRateLimiter()
+        retry_policy = RetryPolicy()
+        async with ClientPool() as pool:
+            runner = BoxscoreSummaryRunner(pool=pool, rate_limiter=rate_limiter, retry_policy=retry_policy)
+            extractor = runner.create_extractor()
+
+        assert isinstance(extractor, BoxscoreSummaryExtractor)
+        assert extractor.pool is pool
+        assert extractor.rate_limiter is rate_limiter
+        assert extractor.retry_policy is retry_policy
+
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_backfill_reports_per_game(self, mock_extract):
+        async def extract(game_id):
+            if game_id == "0022400002":
+                raise RuntimeError("upstream error")
+
+        mock_extract.side_effect = extract
+        runner = BoxscoreSummaryRunner(concurrency=2)
+
+        report = await runner.backfill(league_id="00", season_years=[2024], max_game_seq_id=3)
+
+        assert mock_extract.await_count == 3
+        assert sorted(result.key for result in report.succeeded) == ["0022400001", "0022400003"]
+        assert [result.key for result in report.failed] == ["0022400002"]
+
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract_streaming', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_backfill_streaming(self, mock_extract, mock_extract_streaming):
+        runner = BoxscoreSummaryRunner(concurrency=2, streaming=True)
+
+        report = await runner.backfill(league_id="00", season_years=[2024], max_game_seq_id=2)
+
+        assert len(report.succeeded) == 2
+        mock_extract.assert_not_awaited()
+        assert mock_extract_streaming.await_count == 2
+
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.discover_game_ids', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_discover_extracts_games_of_scoreboards(self, mock_extract, mock_discover_game_ids):
+        games = {
+            datetime.date(2025, 11, 22): ["0022500261", "0022500262"],
+            datetime.date(2025, 11, 23): [],
+            datetime.date(2025, 11, 24): ["0022500276"],
+        }
+
+        async def discover_game_ids(game_date, league_id, use_stored):
+            if game_date == datetime.date(2025, 11, 25):
+                raise RuntimeError("upstream error")
+            return games[game_date]
+
+        mock_discover_game_ids.side_effect = discover_game_ids
+        runner = BoxscoreSummaryRunner(concurrency=2)
+
+        report = await runner.discover(
+            datetime.date(2025, 11, 22),
+            datetime.date(2025, 11, 25),
+            lookahead=2,
+        )
+
+        assert sorted(result.key for result in report.succeeded) == [
+            "0022500261", "0022500262", "0022500276",
+        ]
+        assert [result.key for result in report.failed] == ["scoreboard/00/2025-11-25"]
+        assert mock_discover_game_ids.await_count == 4
+        assert mock_extract.await_count == 3
+
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.unarchived_object_names',
+           new_callable=PropertyMock, return_value=["00/2025/11/22.json"])
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.flush_archives', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.discover_game_ids', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_discover_fails_scoreboards_not_archived(
+        self,
+        mock_extract,
+        mock_discover_game_ids,
+        mock_flush_archives,
+        mock_unarchived_object_names,
+    ):
+        mock_discover_game_ids.return_value = ["0022500261"]
+        mock_flush_archives.side_effect = RuntimeError("upload failed")
+        runner = BoxscoreSummaryRunner(concurrency=2, packed=True)
+
+        report = await runner.discover(datetime.date(2025, 11, 22), datetime.date(2025, 11, 22))
+
+        assert [result.key for result in report.succeeded] == ["0022500261"]
+        assert [result.key for result in report.failed] == ["scoreboard/00/2025/11/22.json"]
+        assert "upload failed" in report.failed[0].error
+
+    @pytest.mark.asyncio
+    async def test_discover_rejects_non_positive_lookahead(self):
+        runner = BoxscoreSummaryRunner(concurrency=2)
+
+        with pytest.raises(ValueError):
+            await runner.discover(datetime.date(2025, 11, 22), datetime.date(2025, 11, 23), lookahead=0)
+
+    @patch('court_pipeline.runners.boxscore_summary.season_year_of', return_value=2025)
+    def test_task_priority(self, mock_season_year_of):
+        runner = BoxscoreSummaryRunner()
+
+        priorities = [
+            runner.task_priority(game_id)
+            for game_id in ["0042500101", "0022500001", "0042400101", "0022400001", "0024600001"]
+        ]
+
+        assert priorities == sorted(priorities)
+        assert priorities[0] == 0
+        assert len(set(priorities)) == 5
+
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_task_priority_parsed_once_per_season_and_run(self, mock_extract):
+        runner = BoxscoreSummaryRunner(concurrency=2, prioritized=True)
+
+        with patch('court_pipeline.runners.boxscore_summary.season_year_of', return_value=2024) as mock_season_year_of:
+            await runner.backfill(league_id="00", season_years=[2023, 2024], max_game_seq_id=5)
+        assert mock_season_year_of.call_count == 2
+        assert runner.task_priority("0022400003") == 1
+
+        with patch('court_pipeline.runners.boxscore_summary.season_year_of', return_value=2025):
+            await runner.backfill(league_id="00", season_years=[2024], max_game_seq_id=1)
+        assert runner.task_priority("0022400003") == 3
+
+    def test_shard_tasks_by_season(self):
+        runner = BoxscoreSummaryRunner()
+        tasks = list(BoxscoreSummaryRunner.iter_tasks("00", [2022, 2023, 2024], max_game_seq_id=2))
+
+        shard_tasks = list(runner.shard_tasks(tasks, Shard(index=1, count=2), partition="season"))
+
+        assert shard_tasks == [{"game_id": "0022300001"}, {"game_id": "0022300002"}]
+
+    def test_shard_tasks_unknown_partition(self):
+        with pytest.raises(ValueError):
+            list(BoxscoreSummaryRunner().shard_tasks([], Shard(), partition="team"))
+
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.discover_game_ids', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_discover_dates_of_shard(self, mock_extract, mock_discover_game_ids):
+        mock_discover_game_ids.return_value = []
+        runner = BoxscoreSummaryRunner(concurrency=2)
+
+        await runner.discover(
+            datetime.date(2025, 11, 21),
+            datetime.date(2025, 11, 25),
+            shard=Shard(index=0, count=2),
+        )
+
+        discovered = sorted(call.args[0] for call in mock_discover_game_ids.await_args_list)
+        assert discovered == [datetime.date(2025, 11, 21), datetime.date(2025, 11, 23), datetime.date(2025, 11, 25)]
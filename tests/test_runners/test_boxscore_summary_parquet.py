@@ -0,0 +1,69 @@
+"""
+Test cases for BoxscoreSummaryParquetRunner
+"""
+import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from court_pipeline.materializers.base import MaterializeResult
+from court_pipeline.runners.boxscore_summary_parquet import BoxscoreSummaryParquetRunner
+from court_pipeline.runners.shard import Shard
+
+
+class TestBoxscoreSummaryParquetRunner:
+
+    def test_iter_tasks(self):
+        tasks = list(BoxscoreSummaryParquetRunner.iter_tasks("00", [2023, 2024]))
+
+        assert tasks == [
+            {"league_id": "00", "season_year": 2023},
+            {"league_id": "00", "season_year": 2024},
+        ]
+
+    def test_task_key(self):
+        runner = BoxscoreSummaryParquetRunner()
+        assert runner.task_key("00", 2024) == "00/2024"
+
+    def test_shard_tasks_by_season(self):
+        runner = BoxscoreSummaryParquetRunner()
+        tasks = BoxscoreSummaryParquetRunner.iter_tasks("00", range(2020, 2024))
+
+        shard_tasks = list(runner.shard_tasks(tasks, Shard(index=0, count=2), partition="season"))
+
+        assert [task["season_year"] for task in shard_tasks] == [2020, 2022]
+
+    @patch(
+        'court_pipeline.runners.boxscore_summary_parquet.BoxscoreSummaryMaterializer.materialize_season',
+        new_callable=AsyncMock,
+    )
+    @pytest.mark.asyncio
+    async def test_materialize(self, mock_materialize_season):
+        mock_materialize_season.return_value = MaterializeResult(objects=2, bytes_read=1024)
+        runner = BoxscoreSummaryParquetRunner(concurrency=2, batch_size=64)
+
+        report = await runner.materialize("00", [2023, 2024])
+
+        assert sorted(result.key for result in report.succeeded) == ["00/2023", "00/2024"]
+        assert report.bytes_fetched == 2048
+        assert sorted(call.args for call in mock_materialize_season.await_args_list) == [("00", 2023), ("00", 2024)]
+
+    @patch(
+        'court_pipeline.runners.boxscore_summary_parquet.BoxscoreSummaryMaterializer.is_stored',
+        new_callable=AsyncMock,
+    )
+    @patch(
+        'court_pipeline.runners.boxscore_summary_parquet.BoxscoreSummaryMaterializer.materialize_season',
+        new_callable=AsyncMock,
+    )
+    @pytest.mark.asyncio
+    async def test_materialize_incremental_refreshes_current_season(self, mock_materialize_season, mock_is_stored):
+        mock_materialize_season.return_value = MaterializeResult()
+        mock_is_stored.return_value = True
+        current_season = datetime.date.today().year
+        runner = BoxscoreSummaryParquetRunner(incremental=True, refresh_window=datetime.timedelta(days=7))
+
+        report = await runner.materialize("00", [2010, current_season])
+
+        assert [result.key for result in report.skipped] == ["00/2010"]
+        assert [call.args for call in mock_materialize_season.await_args_list] == [("00", current_season)]
@@ -0,0 +1,88 @@
+"""
+Test cases for DeadLetterStore
+"""
+import threading
+
+import httpx
+
+from court_pipeline.proxy.exceptions import InvalidResponseError
+from court_pipeline.runners.dead_letter import MAX_BODY_LENGTH, DeadLetter, DeadLetterStore
+
+
+class TestDeadLetter:
+
+    def test_from_invalid_response_error(self):
+        error = InvalidResponseError("unexpected status 404", httpx.Response(404, content=b"x" * 5000))
+
+        letter = DeadLetter.from_error("0022400001", {"game_id": "0022400001"}, error, failed_at=1.0)
+
+        assert letter.status_code == 404
+        assert letter.body == "x" * MAX_BODY_LENGTH
+        assert letter.error == "InvalidResponseError: unexpected status 404"
+
+    def test_from_other_error(self):
+        letter = DeadLetter.from_error("0022400001", {"game_id": "0022400001"}, ValueError("bad"), failed_at=1.0)
+
+        assert letter.status_code is None
+        assert letter.body is None
+
+
+class TestDeadLetterStore:
+
+    def test_add_and_load(self, tmp_path):
+        store = DeadLetterStore(str(tmp_path / "dead_letters" / "boxscore_summary.jsonl"), clock=lambda: 100.0)
+        store.add("0022400001", {"game_id": "0022400001"}, ValueError("bad"))
+        store.add("0022400002", {"game_id": "0022400002"}, ValueError("bad"))
+        store.add("0022400001", {"game_id": "0022400001"}, ValueError("worse"))
+
+        letters = DeadLetterStore(store.path).load()
+
+        assert sorted(letters) == ["0022400001", "0022400002"]
+        assert letters["0022400001"] == DeadLetter(
+            key="0022400001",
+            params={"game_id": "0022400001"},
+            error="ValueError: worse",
+            failed_at=100.0,
+        )
+
+    def test_load_missing_file(self, tmp_path):
+        assert DeadLetterStore(str(tmp_path / "missing" / "dead_letters.jsonl")).load() == {}
+        assert list(tmp_path.iterdir()) == []
+
+    def test_add_creates_directory(self, tmp_path):
+        store = DeadLetterStore(str(tmp_path / "var" / "dead_letters.jsonl"))
+        store.add("0022400001", {"game_id": "0022400001"}, ValueError("bad"))
+
+        assert list(store.load()) == ["0022400001"]
+
+    def test_remove(self, tmp_path):
+        store = DeadLetterStore(str(tmp_path / "dead_letters.jsonl"))
+        store.add("0022400001", {"game_id": "0022400001"}, ValueError("bad"))
+        store.add("0022400002", {"game_id": "0022400002"}, ValueError("bad"))
+
+        store.remove(["0022400001"])
+
+        assert list(store.load()) == ["0022400002"]
+
+    def test_remove_keeps_letters_added_meanwhile(self, tmp_path):
+        store = DeadLetterStore(str(tmp_path / "dead_letters.jsonl"))
+        store.add("0022400001", {"game_id": "0022400001"}, ValueError("bad"))
+        adding = threading.Thread(
+            target=store.add,
+            args=("0022400002", {"game_id": "0022400002"}, ValueError("bad")),
+        )
+        load = store._load
+
+        def load_then_add():
+            letters = load()
+            # blocks on the lock until the rewrite is done
+            adding.start()
+            adding.join(timeout=0.1)
+            return letters
+
+        store._load = load_then_add
+        store.remove(["0022400001"])
+        adding.join()
+        store._load = load
+
+        assert list(store.load()) == ["0022400002"]
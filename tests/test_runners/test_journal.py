@@ -0,0 +1,66 @@
+"""
+Test cases for Journal
+"""
+from court_pipeline.runners.journal import FAILED, SUCCEEDED, Journal, JournalEntry
+from court_pipeline.runners.report import TaskResult
+
+
+class TestJournal:
+
+    def test_record_and_resume(self, tmp_path):
+        path = str(tmp_path / "journal.db")
+        journal = Journal(path, job="boxscore_summary")
+        journal.record(TaskResult(key="0022400001", succeeded=True))
+        journal.record(TaskResult(key="0022400002", succeeded=False, error="ValueError: bad"))
+        journal.close()
+
+        journal = Journal(path, job="boxscore_summary")
+        assert journal.completed_keys() == {"0022400001"}
+        assert journal.failed_entries() == [JournalEntry("0022400002", FAILED, 1, "ValueError: bad")]
+        journal.close()
+
+    def test_attempts_accumulate(self, tmp_path):
+        journal = Journal(str(tmp_path / "journal.db"), job="scoreboard")
+        journal.record(TaskResult(key="00/2025-11-23", succeeded=False, error="ValueError: bad"))
+        journal.record(TaskResult(key="00/2025-11-23", succeeded=False, error="ValueError: worse"))
+        journal.flush()
+        journal.record(TaskResult(key="00/2025-11-23", succeeded=True))
+
+        assert journal.get("00/2025-11-23") == JournalEntry("00/2025-11-23", SUCCEEDED, 3, None)
+        assert journal.get("00/2025-11-24") is None
+        journal.close()
+
+    def test_skips_are_not_attempts(self, tmp_path):
+        journal = Journal(str(tmp_path / "journal.db"), job="boxscore_summary")
+        journal.record(TaskResult(key="0022400001", succeeded=True, skipped=True))
+        journal.record(TaskResult(key="0022400002", succeeded=False, error="ValueError: bad"))
+        journal.record(TaskResult(key="0022400002", succeeded=True, skipped=True))
+
+        assert journal.get("0022400001") == JournalEntry("0022400001", SUCCEEDED, 0, None)
+        assert journal.get("0022400002") == JournalEntry("0022400002", SUCCEEDED, 1, None)
+        journal.close()
+
+    def test_jobs_are_separate(self, tmp_path):
+        path = str(tmp_path / "journal.db")
+        boxscore_journal = Journal(path, job="boxscore_summary")
+        scoreboard_journal = Journal(path, job="scoreboard")
+        boxscore_journal.record(TaskResult(key="0022400001", succeeded=True))
+        boxscore_journal.flush()
+
+        assert scoreboard_journal.completed_keys() == set()
+        boxscore_journal.close()
+        scoreboard_journal.close()
+
+    def test_writes_in_batches(self, tmp_path):
+        path = str(tmp_path / "journal.db")
+        journal = Journal(path, job="boxscore_summary", batch_size=2, flush_interval=3600.0)
+        reader = Journal(path, job="boxscore_summary")
+
+        journal.record(TaskResult(key="0022400001", succeeded=True))
+        assert reader.completed_keys() == set()
+
+        journal.record(TaskResult(key="0022400002", succeeded=True))
+        journal._executor.submit(lambda: None).result()
+        assert reader.completed_keys() == {"0022400001", "0022400002"}
+        journal.close()
+        reader.close()
@@ -0,0 +1,200 @@
+"""
+Test cases for LiveBoxscoreSummaryRunner
+"""
+import datetime
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from court_pipeline.proxy.cache import ResponseCache
+from court_pipeline.runners.dead_letter import DeadLetterStore
+from court_pipeline.runners.journal import Journal
+from court_pipeline.runners.live import (
+    LIVE_PRIORITY,
+    MAX_POLL_FAILURES,
+    LiveBoxscoreSummaryRunner,
+    changed_game_ids,
+    next_poll_delay,
+)
+from court_pipeline.utils.scoreboard import GameState
+
+
+NOW = datetime.datetime(2025, 11, 23, 23, 0, tzinfo=datetime.timezone.utc)
+
+
+def scoreboard(*games):
+    return json.dumps({"scoreboard": {"games": [
+        {
+            "gameId": game_id,
+            "gameStatus": status,
+            "gameTimeUTC": "2025-11-23T18:00:00Z",
+            "homeTeam": {"score": home_score},
+            "awayTeam": {"score": away_score},
+        }
+        for game_id, status, home_score, away_score in games
+    ]}}).encode("utf-8")
+
+
+class TestChangedGameIds:
+
+    def test_first_poll_yields_started_games(self):
+        states = [
+            GameState("0022500001", 3, 100, 90),
+            GameState("0022500002", 2, 10, 8),
+            GameState("0022500003", 1, 0, 0),
+        ]
+
+        assert changed_game_ids({}, states) == ["0022500001", "0022500002"]
+
+    def test_yields_games_whose_status_or_score_changed(self):
+        previous = {
+            "0022500001": GameState("0022500001", 2, 100, 90),
+            "0022500002": GameState("0022500002", 2, 10, 8),
+            "0022500003": GameState("0022500003", 2, 50, 50),
+        }
+        states = [
+            GameState("0022500001", 3, 100, 90),
+            GameState("0022500002", 2, 10, 8),
+            GameState("0022500003", 2, 50, 53),
+        ]
+
+        assert changed_game_ids(previous, states) == ["0022500001", "0022500003"]
+
+
+class TestNextPollDelay:
+
+    def test_live_games_are_polled_fast(self):
+        states = [GameState("0022500001", 2, 10, 8), GameState("0022500002", 1)]
+
+        assert next_poll_delay(states, NOW, live_interval=10.0, idle_interval=600.0) == 10.0
+
+    def test_scheduled_games_wait_for_tip_off(self):
+        tip_off = NOW + datetime.timedelta(minutes=2)
+        states = [GameState("0022500001", 1, game_time_utc=tip_off)]
+
+        assert next_poll_delay(states, NOW, live_interval=10.0, idle_interval=600.0) == 120.0
+        assert next_poll_delay(states, tip_off, live_interval=10.0, idle_interval=600.0) == 10.0
+        assert next_poll_delay(states, NOW, live_interval=10.0, idle_interval=60.0) == 60.0
+        assert next_poll_delay([GameState("0022500001", 1)], NOW, 10.0, 600.0) == 600.0
+
+    def test_stops_once_every_game_is_final(self):
+        assert next_poll_delay([GameState("0022500001", 3, 100, 90)], NOW) is None
+        assert next_poll_delay([], NOW) is None
+
+
+class TestLiveBoxscoreSummaryRunner:
+
+    def test_rejects_cache(self, tmp_path):
+        cache = ResponseCache(str(tmp_path / "cache.db"))
+        with pytest.raises(ValueError):
+            LiveBoxscoreSummaryRunner(cache=cache)
+        cache.close()
+
+    def test_rejects_journal_dead_letters_and_incremental(self, tmp_path):
+        journal = Journal(str(tmp_path / "journal.db"), job="live")
+        with pytest.raises(ValueError):
+            LiveBoxscoreSummaryRunner(journal=journal)
+        journal.close()
+        with pytest.raises(ValueError):
+            LiveBoxscoreSummaryRunner(dead_letters=DeadLetterStore(str(tmp_path / "dead_letters.jsonl")))
+        with pytest.raises(ValueError):
+            LiveBoxscoreSummaryRunner(incremental=True)
+
+    def test_rejects_intervals(self):
+        with pytest.raises(ValueError):
+            LiveBoxscoreSummaryRunner(live_interval=0.0)
+        with pytest.raises(ValueError):
+            LiveBoxscoreSummaryRunner(live_interval=60.0, idle_interval=30.0)
+
+    @patch('court_pipeline.runners.live.asyncio.sleep', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.refresh', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_poll_refreshes_changed_games_until_final(self, mock_extract, mock_refresh, mock_sleep):
+        mock_refresh.side_effect = [
+            scoreboard(("0022500001", 2, 10, 8), ("0022500002", 1, 0, 0)),
+            None,
+            scoreboard(("0022500001", 2, 12, 8), ("0022500002", 2, 0, 2)),
+            scoreboard(("0022500001", 3, 12, 8), ("0022500002", 2, 0, 2)),
+            scoreboard(("0022500001", 3, 12, 8), ("0022500002", 3, 0, 2)),
+        ]
+        runner = LiveBoxscoreSummaryRunner(concurrency=1, live_interval=20.0)
+
+        report = await runner.poll(datetime.date(2025, 11, 23))
+
+        assert [call.args[0] for call in mock_extract.await_args_list] == [
+            "0022500001", "0022500001", "0022500002", "0022500001", "0022500002",
+        ]
+        assert mock_refresh.await_count == 5
+        assert [call.args[0] for call in mock_sleep.await_args_list] == [20.0] * 4
+        assert report.failed == []
+
+    @patch('court_pipeline.runners.live.asyncio.sleep', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.load_not_modified', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.refresh', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_poll_reads_stored_scoreboard_not_modified(
+        self,
+        mock_extract,
+        mock_refresh,
+        mock_load_not_modified,
+        mock_sleep,
+    ):
+        mock_refresh.return_value = None
+        mock_load_not_modified.return_value = scoreboard(("0022500001", 3, 100, 90))
+        runner = LiveBoxscoreSummaryRunner(concurrency=1)
+
+        await runner.poll(datetime.date(2025, 11, 23))
+
+        mock_load_not_modified.assert_awaited_once_with(datetime.date(2025, 11, 23), "00")
+        assert [call.args[0] for call in mock_extract.await_args_list] == ["0022500001"]
+        mock_sleep.assert_not_awaited()
+
+    @patch('court_pipeline.runners.live.asyncio.sleep', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.refresh', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_poll_gives_up_after_consecutive_failures(self, mock_extract, mock_refresh, mock_sleep):
+        mock_refresh.side_effect = RuntimeError("upstream error")
+        runner = LiveBoxscoreSummaryRunner(concurrency=1)
+
+        report = await runner.poll(datetime.date(2025, 11, 23))
+
+        assert mock_refresh.await_count == MAX_POLL_FAILURES
+        assert [result.key for result in report.failed] == ["scoreboard/00/2025-11-23"]
+        mock_extract.assert_not_awaited()
+
+    @patch('court_pipeline.runners.live.asyncio.sleep', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.refresh', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_poll_stops_after_max_polls(self, mock_extract, mock_refresh, mock_sleep):
+        mock_refresh.return_value = scoreboard(("0022500001", 2, 10, 8))
+        runner = LiveBoxscoreSummaryRunner(concurrency=1)
+
+        await runner.poll(datetime.date(2025, 11, 23), max_polls=3)
+
+        assert mock_refresh.await_count == 3
+        assert mock_extract.await_count == 1
+        assert mock_sleep.await_count == 2
+
+    @patch('court_pipeline.runners.live.asyncio.sleep', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.ScoreboardExtractor.refresh', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.boxscore_summary.BoxscoreSummaryExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_poll_with_backfill(self, mock_extract, mock_refresh, mock_sleep):
+        mock_refresh.return_value = scoreboard(("0022500001", 3, 100, 90))
+        runner = LiveBoxscoreSummaryRunner(concurrency=2, prioritized=True)
+
+        report = await runner.poll(
+            datetime.date(2025, 11, 23),
+            backfill=LiveBoxscoreSummaryRunner.iter_tasks("00", [1946], max_game_seq_id=3),
+        )
+
+        assert sorted(result.key for result in report.succeeded) == [
+            "0022500001", "0024600001", "0024600002", "0024600003",
+        ]
+        assert runner.task_priority("0022500001") == LIVE_PRIORITY
+        assert runner.task_priority("0024600001") > LIVE_PRIORITY
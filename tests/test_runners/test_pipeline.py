@@ -0,0 +1,147 @@
+"""
+Test cases for Pipeline
+"""
+import asyncio
+
+import pytest
+
+from court_pipeline.metrics.registry import Metrics
+from court_pipeline.runners.pipeline import SKIPPED, Pipeline, Stage, StageConfig
+
+
+class TestStageConfig:
+
+    def test_invalid_workers(self):
+        with pytest.raises(ValueError):
+            StageConfig(workers=0)
+
+    def test_invalid_queue_size(self):
+        with pytest.raises(ValueError):
+            StageConfig(queue_size=0)
+
+
+class TestPipeline:
+
+    def test_requires_stages(self):
+        with pytest.raises(ValueError):
+            Pipeline([], key=str)
+
+    @pytest.mark.asyncio
+    async def test_run_passes_outputs_along_stages(self):
+        stored = []
+
+        async def double(value):
+            return value * 2
+
+        async def store(value):
+            stored.append(value)
+
+        pipeline = Pipeline(
+            [
+                Stage(name="double", handler=double, config=StageConfig(workers=2)),
+                Stage(name="store", handler=store, config=StageConfig(workers=3)),
+            ],
+            key=str,
+        )
+
+        report = await pipeline.run(range(10))
+
+        assert sorted(stored) == [value * 2 for value in range(10)]
+        assert sorted(result.key for result in report.succeeded) == [str(value) for value in range(10)]
+        assert [stats.processed for stats in report.stages] == [10, 10]
+
+    @pytest.mark.asyncio
+    async def test_run_fails_and_skips_single_items(self):
+        async def check(value):
+            if value == 3:
+                raise ValueError("bad 3")
+            if value == 5:
+                return SKIPPED
+            return value
+
+        async def store(value):
+            pass
+
+        pipeline = Pipeline(
+            [
+                Stage(name="check", handler=check, config=StageConfig()),
+                Stage(name="store", handler=store, config=StageConfig()),
+            ],
+            key=str,
+        )
+
+        report = await pipeline.run(range(8))
+
+        assert [result.key for result in report.failed] == ["3"]
+        assert report.failed[0].error == "ValueError: bad 3"
+        assert [result.key for result in report.skipped] == ["5"]
+        assert len(report.succeeded) == 7
+        assert report.stages[0].failed == 1
+        assert report.stages[1].processed == 6
+
+    @pytest.mark.asyncio
+    async def test_run_bounds_workers_per_stage(self):
+        running = {"fetch": 0, "store": 0}
+        max_running = {"fetch": 0, "store": 0}
+
+        def handler(name):
+            async def handle(value):
+                running[name] += 1
+                max_running[name] = max(max_running[name], running[name])
+                await asyncio.sleep(0.001)
+                running[name] -= 1
+                return value
+            return handle
+
+        pipeline = Pipeline(
+            [
+                Stage(name="fetch", handler=handler("fetch"), config=StageConfig(workers=4, queue_size=2)),
+                Stage(name="store", handler=handler("store"), config=StageConfig(workers=2, queue_size=2)),
+            ],
+            key=str,
+        )
+
+        report = await pipeline.run(range(30))
+
+        assert len(report.succeeded) == 30
+        assert max_running == {"fetch": 4, "store": 2}
+
+    @pytest.mark.asyncio
+    async def test_run_consumes_async_iterable(self):
+        async def items():
+            for value in range(3):
+                yield value
+
+        async def identity(value):
+            return value
+
+        pipeline = Pipeline([Stage(name="identity", handler=identity, config=StageConfig())], key=str)
+
+        report = await pipeline.run(items())
+
+        assert sorted(result.key for result in report.succeeded) == ["0", "1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_run_records_stage_metrics(self):
+        async def identity(value):
+            return value
+
+        metrics = Metrics()
+        pipeline = Pipeline(
+            [
+                Stage(name="fetch", handler=identity, config=StageConfig(queue_size=4)),
+                Stage(name="store", handler=identity, config=StageConfig()),
+            ],
+            key=str,
+            metrics=metrics,
+        )
+
+        await pipeline.run(range(5))
+
+        snapshot = metrics.snapshot()
+        assert snapshot.timers[("stage.seconds", (("stage", "fetch"),))].count == 5
+        assert snapshot.timers[("stage.seconds", (("stage", "store"),))].count == 5
+        assert set(snapshot.gauges) == {
+            ("queue.depth", (("stage", "fetch"),)),
+            ("queue.depth", (("stage", "store"),)),
+        }
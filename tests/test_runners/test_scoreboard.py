@@ -0,0 +1,70 @@
+"""
+Test cases for ScoreboardRunner
+"""
+import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from court_pipeline.runners.scoreboard import ScoreboardRunner
+from court_pipeline.runners.shard import Shard
+
+
+class TestScoreboardRunner:
+
+    def test_iter_tasks(self):
+        tasks = list(ScoreboardRunner.iter_tasks(
+            datetime.date(2025, 2, 27),
+            datetime.date(2025, 3, 1),
+            league_id="10",
+        ))
+
+        assert tasks == [
+            {"game_date": datetime.date(2025, 2, 27), "league_id": "10"},
+            {"game_date": datetime.date(2025, 2, 28), "league_id": "10"},
+            {"game_date": datetime.date(2025, 3, 1), "league_id": "10"},
+        ]
+
+    def test_task_key(self):
+        runner = ScoreboardRunner()
+        assert runner.task_key(datetime.date(2025, 11, 23)) == "00/2025-11-23"
+
+    def test_task_priority(self):
+        runner = ScoreboardRunner()
+        today = runner.run_date
+
+        assert runner.task_priority(today) == 0
+        assert runner.task_priority(today + datetime.timedelta(days=1)) == 0
+        assert runner.task_priority(today - datetime.timedelta(days=3)) == 3
+
+    def test_shard_tasks_by_season(self):
+        runner = ScoreboardRunner()
+        tasks = ScoreboardRunner.iter_tasks(datetime.date(2025, 6, 29), datetime.date(2025, 7, 2))
+
+        shard_tasks = list(runner.shard_tasks(tasks, Shard(index=1, count=2), partition="season"))
+
+        assert [task["game_date"] for task in shard_tasks] == [datetime.date(2025, 7, 1), datetime.date(2025, 7, 2)]
+
+    def test_dump_and_load_params(self):
+        runner = ScoreboardRunner()
+        params = {"game_date": datetime.date(2025, 11, 23), "league_id": "10"}
+
+        data = runner.dump_params(**params)
+
+        assert data == {"game_date": "2025-11-23", "league_id": "10"}
+        assert runner.load_params(data) == params
+
+    @patch('court_pipeline.runners.scoreboard.ScoreboardExtractor.is_stored', new_callable=AsyncMock)
+    @patch('court_pipeline.runners.scoreboard.ScoreboardExtractor.extract', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_backfill_incremental(self, mock_extract, mock_is_stored):
+        async def is_stored(game_date, league_id):
+            return game_date.day == 2
+
+        mock_is_stored.side_effect = is_stored
+        runner = ScoreboardRunner(concurrency=2, incremental=True)
+
+        report = await runner.backfill(datetime.date(2025, 1, 1), datetime.date(2025, 1, 3))
+
+        assert [result.key for result in report.skipped] == ["00/2025-01-02"]
+        assert sorted(call.args[0].day for call in mock_extract.await_args_list) == [1, 3]
@@ -0,0 +1,63 @@
+"""
+Test cases for Shard and run_shards
+"""
+import pytest
+
+from court_pipeline.runners.report import RunReport, TaskResult
+from court_pipeline.runners.shard import Shard, run_shards
+
+
+async def run_numbers(args, shard):
+    numbers = shard.take(range(args["stop"]), lambda number: number)
+    return RunReport(results=[TaskResult(key=str(number), succeeded=True) for number in numbers])
+
+
+class TestShard:
+
+    def test_invalid_shard(self):
+        with pytest.raises(ValueError):
+            Shard(index=2, count=2)
+        with pytest.raises(ValueError):
+            Shard(index=0, count=0)
+
+    def test_from_env(self, monkeypatch):
+        assert Shard.from_env() == Shard(0, 1)
+
+        monkeypatch.setenv("SHARD_INDEX", "2")
+        monkeypatch.setenv("SHARD_COUNT", "3")
+        assert Shard.from_env() == Shard(2, 3)
+
+    def test_split_keeps_shards_disjoint(self):
+        nodes = [Shard(index, 2) for index in range(2)]
+        processes = [shard for node in nodes for shard in node.split(3)]
+
+        assert processes[3:] == [Shard(3, 6), Shard(4, 6), Shard(5, 6)]
+        owners = [[shard for shard in processes if shard.owns(value)] for value in range(12)]
+        assert all(len(owner) == 1 for owner in owners)
+
+    def test_owns_hashes_strings(self):
+        shards = [Shard(index, 4) for index in range(4)]
+        keys = [f"00224{seq:05d}" for seq in range(1, 201)]
+
+        shares = [[key for key in keys if shard.owns(key)] for shard in shards]
+
+        assert sum(len(share) for share in shares) == 200
+        assert all(share for share in shares)
+
+    def test_take_every(self):
+        shares = [list(Shard(index, 3).take_every(range(10))) for index in range(3)]
+
+        assert shares == [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]]
+
+
+class TestRunShards:
+
+    def test_run_single_shard_in_process(self):
+        report = run_shards(run_numbers, {"stop": 4}, [Shard()])
+
+        assert [result.key for result in report.results] == ["0", "1", "2", "3"]
+
+    def test_run_shards_in_processes(self):
+        report = run_shards(run_numbers, {"stop": 10}, Shard().split(2))
+
+        assert sorted(int(result.key) for result in report.results) == list(range(10))
@@ -0,0 +1,203 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from court_pipeline.s3.archive import (
+    ArchivePacker,
+    ArchivePart,
+    index_name_of,
+    is_archive_name,
+    is_index_name,
+    new_archive_name,
+    pack_entry,
+    parse_index,
+    unpack_entry,
+)
+from court_pipeline.s3.codecs import GzipCodec, IdentityCodec
+
+
+class TestArchiveEntries:
+
+    def test_pack_entry_is_one_line(self):
+        entry = pack_entry(b'{\n  "a": 1\n}', IdentityCodec())
+
+        assert entry.count(b'\n') == 1
+        assert entry.endswith(b'\n')
+        assert json.loads(unpack_entry(entry, IdentityCodec())) == {"a": 1}
+
+    def test_compressed_entries_concatenate(self):
+        codec = GzipCodec()
+        entries = [pack_entry(b'{"a": 1}', codec), pack_entry(b'{"b": 2}', codec)]
+
+        assert unpack_entry(entries[1], codec) == b'{"b": 2}'
+        assert gzip.decompress(b''.join(entries)).splitlines() == [b'{"a": 1}', b'{"b": 2}']
+
+    def test_archive_names(self):
+        archive_name = new_archive_name('/00/2024/', GzipCodec())
+
+        assert archive_name.startswith('/00/2024/_archive/')
+        assert archive_name.endswith('.ndjson.gz')
+        assert is_archive_name(archive_name)
+        assert not is_archive_name('/00/2024/0022400001.json')
+        assert is_index_name(index_name_of(archive_name))
+        assert not is_index_name(archive_name)
+
+    def test_index_round_trip(self):
+        part = ArchivePart('/00/2024/_archive/1.ndjson')
+        part.append('/00/2024/a.json', b'{"a": 1}\n')
+        part.append('/00/2024/b.json', b'{"b": 2}\n')
+
+        entries = parse_index(part.index())
+
+        assert entries == part.archive_entries()
+        assert entries['00/2024/b.json'].offset == 9
+        assert entries['00/2024/b.json'].length == 9
+        assert entries['00/2024/b.json'].archive_name == '/00/2024/_archive/1.ndjson'
+
+
+class TestArchivePacker:
+
+    @pytest.mark.asyncio
+    async def test_upload_full_parts(self):
+        uploaded = []
+
+        async def upload(part):
+            uploaded.append(part)
+
+        packer = ArchivePacker(upload, IdentityCodec(), part_size=20)
+        for name in 'abc':
+            await packer.add('/00/2024/', f'/00/2024/{name}.json', b'{"x": 1}')
+
+        assert [sorted(part.entries) for part in uploaded] == [['00/2024/a.json', '00/2024/b.json', '00/2024/c.json']]
+        assert packer.buffered == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_uploads_open_parts(self):
+        uploaded = []
+
+        async def upload(part):
+            uploaded.append(part)
+
+        packer = ArchivePacker(upload, IdentityCodec())
+        await packer.add('/00/2023/', '/00/2023/a.json', b'{}')
+        await packer.add('/00/2024/', '/00/2024/b.json', b'{}')
+
+        assert uploaded == []
+        assert packer.buffered == 2
+
+        await packer.flush()
+
+        assert len(uploaded) == 2
+        assert packer.buffered == 0
+
+    @pytest.mark.asyncio
+    async def test_open_parts_are_bounded(self):
+        uploaded = []
+
+        async def upload(part):
+            uploaded.append(part)
+
+        packer = ArchivePacker(upload, IdentityCodec(), max_open_parts=2)
+        for season_year in (2022, 2023, 2024):
+            await packer.add(f'/00/{season_year}/', f'/00/{season_year}/a.json', b'{}')
+
+        assert [part.archive_name.split('/')[2] for part in uploaded] == ['2022']
+        assert packer.buffered == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_parts_are_kept_for_flush(self):
+        uploaded = []
+        failures = [RuntimeError("upload failed")]
+
+        async def upload(part):
+            if failures:
+                raise failures.pop()
+            uploaded.append(part)
+
+        packer = ArchivePacker(upload, IdentityCodec(), part_size=1)
+        await packer.add('/00/2024/', '/00/2024/a.json', b'{}')
+
+        assert uploaded == []
+        assert packer.buffered == 1
+
+        await packer.flush()
+
+        assert [sorted(part.entries) for part in uploaded] == [['00/2024/a.json']]
+        assert packer.buffered == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_raises_and_keeps_failed_parts(self):
+        async def upload(part):
+            raise RuntimeError("upload failed")
+
+        packer = ArchivePacker(upload, IdentityCodec())
+        await packer.add('/00/2023/', '/00/2023/a.json', b'{}')
+        await packer.add('/00/2024/', '/00/2024/b.json', b'{}')
+
+        with pytest.raises(RuntimeError):
+            await packer.flush()
+        assert packer.buffered == 2
+        assert sorted(packer.buffered_object_names) == ['00/2023/a.json', '00/2024/b.json']
+
+    @pytest.mark.asyncio
+    async def test_callbacks_run_once_uploaded(self):
+        failures = [RuntimeError("upload failed")]
+        acknowledged = []
+
+        async def upload(part):
+            if failures:
+                raise failures.pop()
+
+        async def acknowledge():
+            acknowledged.append('a')
+
+        packer = ArchivePacker(upload, IdentityCodec())
+        await packer.add('/00/2024/', '/00/2024/a.json', b'{}')
+
+        assert packer.on_uploaded('/00/2024/a.json', acknowledge) is True
+        assert packer.on_uploaded('/00/2024/b.json', acknowledge) is False
+        with pytest.raises(RuntimeError):
+            await packer.flush()
+        assert acknowledged == []
+
+        await packer.flush()
+
+        assert acknowledged == ['a']
+        assert packer.on_uploaded('/00/2024/a.json', acknowledge) is False
+
+    @pytest.mark.asyncio
+    async def test_flush_waits_for_parts_being_uploaded(self):
+        uploading = asyncio.Event()
+        release = asyncio.Event()
+        uploaded = []
+        acknowledged = []
+
+        async def upload(part):
+            uploading.set()
+            await release.wait()
+            uploaded.append(part.archive_name)
+
+        async def acknowledge():
+            acknowledged.append('a')
+
+        packer = ArchivePacker(upload, IdentityCodec(), part_size=1)
+        add = asyncio.ensure_future(packer.add('/00/2024/', '/00/2024/a.json', b'{}'))
+        await uploading.wait()
+        assert packer.on_uploaded('/00/2024/a.json', acknowledge) is True
+        assert packer.buffered == 1
+
+        flush = asyncio.ensure_future(packer.flush())
+        await asyncio.sleep(0)
+        assert not flush.done()
+        release.set()
+        await asyncio.gather(add, flush)
+
+        assert len(uploaded) == 1
+        assert acknowledged == ['a']
+        assert packer.buffered == 0
+
+    def test_invalid_part_size(self):
+        with pytest.raises(ValueError):
+            ArchivePacker(None, IdentityCodec(), part_size=0)
@@ -1,8 +1,20 @@
+import asyncio
+import gzip
+import hashlib
+import io
 import os
+import threading
+import time
+
+import httpx
 import pytest
-from unittest.mock import Mock, patch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import ANY, Mock, patch
 
+from benchmarks.fake_s3 import InMemoryS3Client
+from court_pipeline.metrics.registry import Metrics
 from court_pipeline.s3.base import S3MixIn
+from court_pipeline.s3.codecs import GzipCodec
 
 
 class SampleS3MixIn(S3MixIn):
@@ -11,9 +23,8 @@ class SampleS3MixIn(S3MixIn):
     def bucket_name(self) -> str:
         return "test-bucket"
 
-    @property
-    def object_name(self) -> str:
-        return "test-object.json"
+    def object_name(self, name: str) -> str:
+        return f"/prefix/{name}.json"
 
 
 class TestS3MixIn:
@@ -41,7 +52,8 @@ class TestS3MixIn:
             endpoint='test-endpoint:9000',
             access_key='test-key',
             secret_key='test-secret',
-            secure=True
+            secure=True,
+            http_client=ANY,
         )
 
     @patch.dict(os.environ, {}, clear=True)
@@ -58,7 +70,8 @@ class TestS3MixIn:
             endpoint='localhost:9000',
             access_key='minioadmin',
             secret_key='minioadmin',
-            secure=False
+            secure=False,
+            http_client=ANY,
         )
 
     @patch('court_pipeline.s3.base.Minio')
@@ -132,11 +145,442 @@ class TestS3MixIn:
         data = b'{"version": "1.0.0"}'
         content_type = "application/json"
 
-        await mixin.store_object(data, content_type)
+        await mixin.store_object(data, content_type, mixin.object_name("test-object"))
 
         mock_client.put_object.assert_called_once()
         call_args = mock_client.put_object.call_args
 
         assert call_args[1]['bucket_name'] == "test-bucket"
-        assert call_args[1]['object_name'] == "test-object.json"
+        assert call_args[1]['object_name'] == "/prefix/test-object.json"
         assert call_args[1]['content_type'] == content_type
+
+    def test_object_prefix(self):
+        mixin = SampleS3MixIn()
+        assert mixin.object_prefix("test-object") == "/prefix/"
+
+    @patch('court_pipeline.s3.base.Minio')
+    @pytest.mark.asyncio
+    async def test_list_object_names(self, mock_minio):
+        mock_client = Mock()
+        mock_client.list_objects.return_value = [
+            Mock(object_name="prefix/a.json"),
+            Mock(object_name="prefix/b.json"),
+        ]
+        mock_minio.return_value = mock_client
+
+        mixin = SampleS3MixIn()
+        names = await mixin.list_object_names("/prefix/")
+
+        assert names == {"prefix/a.json", "prefix/b.json"}
+        mock_client.list_objects.assert_called_once_with("test-bucket", prefix="/prefix/", recursive=True)
+
+    @patch('court_pipeline.s3.base.Minio')
+    @pytest.mark.asyncio
+    async def test_is_stored_lists_prefix_once(self, mock_minio):
+        mock_client = Mock()
+        mock_client.list_objects.return_value = [Mock(object_name="prefix/a.json")]
+        mock_minio.return_value = mock_client
+
+        mixin = SampleS3MixIn()
+
+        assert await mixin.is_stored("a") is True
+        assert await mixin.is_stored("b") is False
+        mock_client.list_objects.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_is_stored_finds_objects_stored_since_listed(self):
+        client = InMemoryS3Client()
+        mixin = SampleS3MixIn()
+        mixin._s3_client = client
+
+        assert await mixin.is_stored("a") is False
+        await mixin.store_object(b'{}', "application/json", mixin.object_name("a"))
+
+        async def chunks():
+            yield b'{}'
+
+        await mixin.store_stream(chunks(), "application/json", mixin.object_name("b"))
+
+        assert await mixin.is_stored("a") is True
+        assert await mixin.is_stored("b") is True
+        mixin.close_storage()
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch('court_pipeline.s3.base.Minio')
+    def test_s3_client_pool_matches_max_workers(self, mock_minio):
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(max_workers=48)
+
+        mixin.s3_client
+
+        http_client = mock_minio.call_args[1]['http_client']
+        assert http_client.connection_pool_kw['maxsize'] == 48
+
+    @patch.dict(os.environ, {'S3_MAX_WORKERS': '8'}, clear=True)
+    def test_storage_sizes_from_env(self):
+        mixin = SampleS3MixIn()
+
+        assert mixin.s3_max_workers == 8
+        assert mixin.s3_max_in_flight == 16
+
+    def test_configure_storage(self):
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(max_workers=4, max_in_flight=6)
+
+        assert mixin.s3_max_workers == 4
+        assert mixin.s3_max_in_flight == 6
+        assert isinstance(mixin.s3_executor, ThreadPoolExecutor)
+        assert mixin.s3_executor._max_workers == 4
+        with pytest.raises(RuntimeError):
+            mixin.configure_storage(max_workers=8)
+
+        mixin.close_storage()
+        assert getattr(mixin, '_s3_executor') is None
+
+    @patch('court_pipeline.s3.base.Minio')
+    @pytest.mark.asyncio
+    async def test_store_object_bounds_in_flight_uploads(self, mock_minio):
+        lock = threading.Lock()
+        state = {"running": 0, "max_running": 0}
+
+        def put_object(**kwargs):
+            with lock:
+                state["running"] += 1
+                state["max_running"] = max(state["max_running"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+
+        mock_client = Mock()
+        mock_client.put_object.side_effect = put_object
+        mock_minio.return_value = mock_client
+
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(max_workers=8, max_in_flight=2)
+        await asyncio.gather(*[
+            mixin.store_object(b"{}", "application/json", mixin.object_name(f"object-{i}"))
+            for i in range(6)
+        ])
+        mixin.close_storage()
+
+        assert mock_client.put_object.call_count == 6
+        assert state["max_running"] == 2
+
+    @patch.dict(os.environ, {'S3_CODEC': 'gzip'})
+    def test_codec_from_env(self):
+        mixin = SampleS3MixIn()
+        assert isinstance(mixin.codec, GzipCodec)
+
+    @patch('court_pipeline.s3.base.Minio')
+    @pytest.mark.asyncio
+    async def test_store_object_compressed(self, mock_minio):
+        mock_client = Mock()
+        mock_minio.return_value = mock_client
+
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(codec="gzip")
+        data = b'{"version": "1.0.0"}'
+
+        await mixin.store_object(data, "application/json", "/prefix/test-object.json.gz")
+
+        call_args = mock_client.put_object.call_args[1]
+        assert call_args['object_name'] == "/prefix/test-object.json.gz"
+        assert call_args['content_type'] == "application/json"
+        assert call_args['metadata'] == {'Content-Encoding': 'gzip'}
+        assert gzip.decompress(call_args['data'].read()) == data
+
+    @patch('court_pipeline.s3.base.Minio')
+    @pytest.mark.asyncio
+    async def test_store_object_records_metrics(self, mock_minio):
+        mock_minio.return_value = Mock()
+        metrics = Metrics()
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(codec="gzip", metrics=metrics)
+        data = b'{"version": "1.0.0"}'
+
+        await mixin.store_object(data, "application/json", "/prefix/test-object.json.gz")
+
+        bucket = (('bucket', 'test-bucket'),)
+        snapshot = metrics.snapshot()
+        assert mixin.metrics is metrics
+        assert snapshot.counters[('s3.bytes_out', bucket)] == len(gzip.compress(data))
+        assert snapshot.timers[('s3.upload.seconds', bucket)].count == 1
+        assert snapshot.timers[('s3.upload_wait.seconds', bucket)].count == 1
+
+    @patch('court_pipeline.s3.base.Minio')
+    @pytest.mark.asyncio
+    async def test_store_object_uncompressed_has_no_metadata(self, mock_minio):
+        mock_client = Mock()
+        mock_minio.return_value = mock_client
+
+        mixin = SampleS3MixIn()
+        await mixin.store_object(b'{}', "application/json", "/prefix/test-object.json")
+
+        assert mock_client.put_object.call_args[1]['metadata'] is None
+
+    @patch('court_pipeline.s3.base.Minio')
+    @pytest.mark.asyncio
+    async def test_load_object_decompresses_by_suffix(self, mock_minio):
+        data = b'{"version": "1.0.0"}'
+        mock_response = Mock()
+        mock_response.read.return_value = gzip.compress(data)
+        mock_client = Mock()
+        mock_client.get_object.return_value = mock_response
+        mock_minio.return_value = mock_client
+
+        mixin = SampleS3MixIn()
+        loaded = await mixin.load_object("/prefix/test-object.json.gz")
+
+        assert loaded == data
+        mock_client.get_object.assert_called_once_with("test-bucket", "/prefix/test-object.json.gz")
+        mock_response.read.assert_called_once_with(decode_content=False)
+        mock_response.release_conn.assert_called_once()
+
+    @patch('court_pipeline.s3.base.Minio')
+    @pytest.mark.asyncio
+    async def test_store_stream(self, mock_minio):
+        uploaded = {}
+
+        def put_object(**kwargs):
+            uploaded.update(kwargs)
+            uploaded['content'] = kwargs['data'].read()
+
+        mock_client = Mock()
+        mock_client.put_object.side_effect = put_object
+        mock_minio.return_value = mock_client
+
+        async def chunks():
+            for i in range(5):
+                yield b'{"chunk": %d}' % i
+
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(codec="gzip")
+        await mixin.store_stream(chunks(), "application/json", "/prefix/stream.json.gz", max_buffered_chunks=2)
+        mixin.close_storage()
+
+        assert uploaded['object_name'] == "/prefix/stream.json.gz"
+        assert uploaded['length'] == -1
+        assert uploaded['part_size'] == 5 * 1024 * 1024
+        assert uploaded['metadata'] == {'Content-Encoding': 'gzip'}
+        assert gzip.decompress(uploaded['content']) == b''.join(b'{"chunk": %d}' % i for i in range(5))
+
+    @patch('court_pipeline.s3.base.Minio')
+    @pytest.mark.asyncio
+    async def test_store_stream_producer_failure(self, mock_minio):
+        def put_object(**kwargs):
+            while kwargs['data'].read(1024):
+                pass
+
+        mock_client = Mock()
+        mock_client.put_object.side_effect = put_object
+        mock_minio.return_value = mock_client
+
+        async def chunks():
+            yield b'{"partial": '
+            raise httpx.ReadError("connection reset")
+
+        mixin = SampleS3MixIn()
+        with pytest.raises(httpx.ReadError):
+            await mixin.store_stream(chunks(), "application/json", "/prefix/stream.json")
+        mixin.close_storage()
+
+    @patch('court_pipeline.s3.base.Minio')
+    @pytest.mark.asyncio
+    async def test_store_stream_upload_failure(self, mock_minio):
+        mock_client = Mock()
+        mock_client.put_object.side_effect = ValueError("access denied")
+        mock_minio.return_value = mock_client
+
+        async def chunks():
+            while True:
+                yield b'{}'
+
+        mixin = SampleS3MixIn()
+        with pytest.raises(ValueError):
+            await mixin.store_stream(chunks(), "application/json", "/prefix/stream.json", max_buffered_chunks=1)
+        mixin.close_storage()
+
+
+class TestPackedStorage:
+
+    @pytest.mark.asyncio
+    async def test_store_packed_objects(self):
+        client = InMemoryS3Client(keep_data=True)
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(codec='gzip', packed=True)
+        mixin._s3_client = client
+
+        await mixin.store_object(b'{"a": 1}', "application/json", mixin.object_name('a'))
+        await mixin.store_object(b'{\n"b": 2\n}', "application/json", mixin.object_name('b'))
+        assert client.uploads == 0
+
+        await mixin.flush_archives()
+        archive_names = client.object_names('test-bucket')
+        assert len(archive_names) == 2
+        assert all(name.startswith('/prefix/_archive/') for name in archive_names)
+        assert any(name.endswith('.ndjson.gz') for name in archive_names)
+
+        assert await mixin.is_stored('a')
+        reader = SampleS3MixIn()
+        reader._s3_client = client
+        assert await reader.list_object_names('/prefix/') == {'prefix/a.json', 'prefix/b.json'}
+        assert await reader.load_object('/prefix/b.json') == b'{ "b": 2 }'
+        assert await reader.is_stored('a')
+        assert not await reader.is_stored('c')
+        mixin.close_storage()
+        reader.close_storage()
+
+    @pytest.mark.asyncio
+    async def test_packed_objects_are_read_with_ranged_requests(self):
+        client = InMemoryS3Client(keep_data=True)
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(packed=True)
+        mixin._s3_client = client
+        for name in 'abc':
+            await mixin.store_object(f'{{"name": "{name}"}}'.encode(), "application/json", f"/prefix/{name}.json")
+        await mixin.flush_archives()
+
+        with patch.object(client, 'get_object', wraps=client.get_object) as get_object:
+            assert await mixin.load_object('/prefix/b.json') == b'{"name": "b"}'
+
+        entry = mixin.archive_entries['prefix/b.json']
+        get_object.assert_called_once_with('test-bucket', entry.archive_name, offset=entry.offset, length=entry.length)
+        mixin.close_storage()
+
+    @pytest.mark.asyncio
+    async def test_later_archive_parts_take_precedence(self):
+        client = InMemoryS3Client(keep_data=True)
+        for content in (b'{"v": 1}', b'{"v": 2}'):
+            writer = SampleS3MixIn()
+            writer.configure_storage(packed=True)
+            writer._s3_client = client
+            await writer.store_object(content, "application/json", "/prefix/a.json")
+            await writer.flush_archives()
+            writer.close_storage()
+
+        reader = SampleS3MixIn()
+        reader._s3_client = client
+        await reader.list_object_names('/prefix/')
+        assert await reader.load_object('/prefix/a.json') == b'{"v": 2}'
+        reader.close_storage()
+
+    @pytest.mark.asyncio
+    async def test_on_archived_waits_for_part_upload(self):
+        client = InMemoryS3Client(keep_data=True)
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(packed=True)
+        mixin._s3_client = client
+        archived = []
+
+        async def acknowledge():
+            archived.append(await mixin.load_object('/prefix/a.json'))
+
+        assert mixin.on_archived('/prefix/a.json', acknowledge) is False
+        await mixin.store_object(b'{"a": 1}', "application/json", "/prefix/a.json")
+        assert mixin.on_archived('/prefix/a.json', acknowledge) is True
+        assert archived == []
+
+        await mixin.flush_archives()
+
+        assert archived == [b'{"a": 1}']
+        mixin.close_storage()
+
+    @pytest.mark.asyncio
+    async def test_store_stream_packed(self):
+        client = InMemoryS3Client(keep_data=True)
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(packed=True, archive_part_size=1)
+        mixin._s3_client = client
+
+        async def chunks():
+            yield b'{"a"'
+            yield b': 1}'
+
+        await mixin.store_stream(chunks(), "application/json", "/prefix/a.json")
+
+        assert client.uploads == 2
+        assert await mixin.load_object('/prefix/a.json') == b'{"a": 1}'
+        mixin.close_storage()
+
+
+class TestDedupStorage:
+
+    def build_mixin(self, client, **options):
+        mixin = SampleS3MixIn()
+        mixin.configure_storage(dedup=True, **options)
+        mixin._s3_client = client
+        return mixin
+
+    @pytest.mark.asyncio
+    async def test_unchanged_payload_is_not_uploaded(self):
+        client = InMemoryS3Client(keep_data=True)
+        for content in (b'{"a": 1}', b'{"a": 1}', b'{"a": 2}'):
+            mixin = self.build_mixin(client, codec='gzip')
+            await mixin.store_object(content, "application/json", "/prefix/a.json.gz")
+            mixin.close_storage()
+
+        assert client.uploads == 2
+        assert await mixin.load_object("/prefix/a.json.gz") == b'{"a": 2}'
+
+    @pytest.mark.asyncio
+    async def test_payload_stored_in_the_run_is_not_uploaded_again(self):
+        client = InMemoryS3Client(keep_data=True)
+        mixin = self.build_mixin(client)
+
+        for content in (b'{"a": 1}', b'{"a": 1}', b'{"a": 2}'):
+            await mixin.store_object(content, "application/json", "/prefix/a.json")
+
+        assert client.uploads == 2
+        assert mixin.store_outcomes == {'changed': 2, 'unchanged': 1}
+        mixin.close_storage()
+
+    @pytest.mark.asyncio
+    async def test_store_outcomes(self):
+        client = InMemoryS3Client(keep_data=True)
+        client.put_object('test-bucket', '/prefix/a.json', io.BytesIO(b'{"a": 1}'), 8)
+        metrics = Metrics()
+        mixin = self.build_mixin(client, metrics=metrics)
+
+        await mixin.store_object(b'{"a": 1}', "application/json", "/prefix/a.json")
+        await mixin.store_object(b'{"b": 1}', "application/json", "/prefix/b.json")
+
+        assert mixin.store_outcomes == {'changed': 1, 'unchanged': 1}
+        assert metrics.snapshot().counters[
+            ('s3.objects', (('bucket', 'test-bucket'), ('outcome', 'unchanged')))
+        ] == 1
+        mixin.close_storage()
+
+    @pytest.mark.asyncio
+    async def test_multipart_object_is_compared_by_metadata(self):
+        client = InMemoryS3Client(keep_data=True)
+        content = b'{"a": 1}'
+        client.put_object(
+            'test-bucket', '/prefix/a.json', io.BytesIO(content), -1, part_size=4,
+            metadata={'x-amz-meta-content-sha256': hashlib.sha256(content).hexdigest()},
+        )
+        client.put_object('test-bucket', '/prefix/b.json', io.BytesIO(content), -1, part_size=4)
+        mixin = self.build_mixin(client)
+
+        with patch.object(client, 'stat_object', wraps=client.stat_object) as stat_object:
+            await mixin.store_object(content, "application/json", "/prefix/a.json")
+            await mixin.store_object(content, "application/json", "/prefix/b.json")
+
+        assert stat_object.call_count == 2
+        assert mixin.store_outcomes == {'changed': 1, 'unchanged': 1}
+        assert client.stat_object('test-bucket', '/prefix/b.json').metadata == {
+            'x-amz-meta-content-sha256': hashlib.sha256(content).hexdigest(),
+        }
+        mixin.close_storage()
+
+    @pytest.mark.asyncio
+    async def test_prefix_is_listed_once(self):
+        client = InMemoryS3Client(keep_data=True)
+        mixin = self.build_mixin(client)
+
+        with patch.object(client, 'list_objects', wraps=client.list_objects) as list_objects:
+            for name in 'abc':
+                await mixin.store_object(b'{}', "application/json", f"/prefix/{name}.json")
+
+        list_objects.assert_called_once()
+        assert client.uploads == 3
+        mixin.close_storage()
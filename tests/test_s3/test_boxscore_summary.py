@@ -7,10 +7,15 @@ class TestBoxscoreSummaryS3MixIn:
         mixin = BoxscoreSummaryS3MixIn()
         assert mixin.bucket_name == "boxscoresummary"
 
-    def test_object_name_property(self):
+    def test_object_name(self):
         mixin = BoxscoreSummaryS3MixIn()
-        mixin._game_id = "0022400001"
 
-        object_name = mixin.object_name
+        object_name = mixin.object_name("0022400001")
         expected = "/00/2024/0022400001.json"
         assert object_name == expected
+
+    def test_object_name_with_codec_suffix(self):
+        mixin = BoxscoreSummaryS3MixIn()
+        mixin.configure_storage(codec="gzip")
+
+        assert mixin.object_name("0022400001") == "/00/2024/0022400001.json.gz"
@@ -0,0 +1,66 @@
+import gzip
+
+import pytest
+
+from court_pipeline.s3 import codecs
+from court_pipeline.s3.codecs import (
+    GzipCodec,
+    IdentityCodec,
+    ZstdCodec,
+    codec_for_object_name,
+    get_codec,
+)
+
+
+PAYLOAD = b'{"boxScoreSummary": {"gameId": "0022400001"}}' * 20
+
+
+class TestCodecs:
+
+    def test_identity_codec(self):
+        codec = IdentityCodec()
+
+        assert codec.suffix == ""
+        assert codec.content_encoding is None
+        assert codec.compress(PAYLOAD) == PAYLOAD
+        assert codec.decompress(PAYLOAD) == PAYLOAD
+
+    def test_gzip_codec_round_trip(self):
+        codec = GzipCodec()
+        compressed = codec.compress(PAYLOAD)
+
+        assert codec.suffix == ".gz"
+        assert codec.content_encoding == "gzip"
+        assert len(compressed) < len(PAYLOAD)
+        assert gzip.decompress(compressed) == PAYLOAD
+        assert codec.decompress(compressed) == PAYLOAD
+
+    def test_gzip_codec_is_deterministic(self):
+        assert GzipCodec().compress(PAYLOAD) == GzipCodec().compress(PAYLOAD)
+
+    def test_zstd_codec_round_trip(self):
+        if codecs.zstd is None:
+            pytest.skip("zstd is not available")
+        codec = ZstdCodec()
+        compressed = codec.compress(PAYLOAD)
+
+        assert codec.suffix == ".zst"
+        assert len(compressed) < len(PAYLOAD)
+        assert codec.decompress(compressed) == PAYLOAD
+
+    def test_zstd_codec_unavailable(self, monkeypatch):
+        monkeypatch.setattr(codecs, "zstd", None)
+        with pytest.raises(ImportError):
+            ZstdCodec()
+
+    def test_get_codec(self):
+        assert isinstance(get_codec("identity"), IdentityCodec)
+        assert isinstance(get_codec("gzip"), GzipCodec)
+        with pytest.raises(ValueError):
+            get_codec("brotli")
+
+    def test_codec_for_object_name(self):
+        assert isinstance(codec_for_object_name("/00/2024/0022400001.json"), IdentityCodec)
+        assert isinstance(codec_for_object_name("/00/2024/0022400001.json.gz"), GzipCodec)
+        if codecs.zstd is not None:
+            assert isinstance(codec_for_object_name("/00/2024/0022400001.json.zst"), ZstdCodec)
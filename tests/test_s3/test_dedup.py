@@ -0,0 +1,41 @@
+import hashlib
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from court_pipeline.s3.dedup import (
+    CONTENT_SHA256_METADATA,
+    content_sha256,
+    is_md5_etag,
+    is_unchanged,
+    normalize_etag,
+)
+
+
+class TestDedup:
+
+    def test_normalize_etag(self):
+        assert normalize_etag('"D41D8CD98F00B204E9800998ECF8427E"') == 'd41d8cd98f00b204e9800998ecf8427e'
+        assert normalize_etag(None) is None
+
+    def test_is_md5_etag(self):
+        assert is_md5_etag(hashlib.md5(b'{}').hexdigest())
+        assert not is_md5_etag(hashlib.md5(b'{}').hexdigest() + '-3')
+
+    def test_is_unchanged_by_etag(self):
+        client = Mock()
+        etag = hashlib.md5(b'stored').hexdigest()
+
+        assert is_unchanged(client, 'bucket', 'a.json', etag, b'payload', b'stored')
+        assert not is_unchanged(client, 'bucket', 'a.json', etag, b'payload', b'other')
+        assert not is_unchanged(client, 'bucket', 'a.json', None, b'payload', b'stored')
+        client.stat_object.assert_not_called()
+
+    def test_is_unchanged_by_metadata(self):
+        client = Mock()
+        client.stat_object.return_value = SimpleNamespace(
+            metadata={CONTENT_SHA256_METADATA: content_sha256(b'payload')},
+        )
+
+        assert is_unchanged(client, 'bucket', 'a.json', 'abc-2', b'payload', b'stored')
+        assert not is_unchanged(client, 'bucket', 'a.json', 'abc-2', b'other', b'stored')
+        client.stat_object.assert_called_with('bucket', 'a.json')
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from court_pipeline.s3.index import ObjectIndex, normalize_object_name
+
+
+class TestObjectIndex:
+
+    def test_normalize_object_name(self):
+        assert normalize_object_name("/00/2024/0022400001.json") == "00/2024/0022400001.json"
+        assert normalize_object_name("00/2024/0022400001.json") == "00/2024/0022400001.json"
+
+    @pytest.mark.asyncio
+    async def test_contains(self):
+        async def list_object_names(prefix):
+            return {"00/2024/0022400001.json"}
+
+        index = ObjectIndex(list_object_names)
+
+        assert await index.contains("/00/2024/0022400001.json", "/00/2024/") is True
+        assert await index.contains("/00/2024/0022400002.json", "/00/2024/") is False
+
+    @pytest.mark.asyncio
+    async def test_lists_each_prefix_once(self):
+        calls = []
+
+        async def list_object_names(prefix):
+            calls.append(prefix)
+            await asyncio.sleep(0.001)
+            return set()
+
+        index = ObjectIndex(list_object_names)
+        await asyncio.gather(*[
+            index.contains(f"/00/2024/002240000{i}.json", "/00/2024/")
+            for i in range(5)
+        ])
+        await index.contains("/00/2023/0022300001.json", "/00/2023/")
+
+        assert calls == ["/00/2024/", "/00/2023/"]
+
+    @pytest.mark.asyncio
+    async def test_add(self):
+        async def list_object_names(prefix):
+            return set()
+
+        index = ObjectIndex(list_object_names)
+        index.add("/00/2024/0022400001.json", "/00/2024/")
+        await index.load("/00/2024/")
+        index.add("/00/2024/0022400001.json", "/00/2024/")
+
+        assert await index.contains("/00/2024/0022400001.json", "/00/2024/") is True
+
+    @pytest.mark.asyncio
+    async def test_add_during_listing(self):
+        listing = asyncio.Event()
+
+        async def list_object_names(prefix):
+            await listing.wait()
+            return set()
+
+        index = ObjectIndex(list_object_names)
+        lookup = asyncio.ensure_future(index.contains("/00/2024/0022400001.json", "/00/2024/"))
+        await asyncio.sleep(0)
+        index.add("/00/2024/0022400001.json", "/00/2024/")
+        listing.set()
+
+        assert await lookup is True
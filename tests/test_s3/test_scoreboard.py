@@ -9,11 +9,15 @@ class TestScoreboardS3MixIn:
         mixin = ScoreboardS3MixIn()
         assert mixin.bucket_name == "scoreboard"
 
-    def test_object_name_property(self):
+    def test_object_name(self):
         mixin = ScoreboardS3MixIn()
-        mixin._game_date = datetime.date(2025, 11, 26)
-        mixin._league_id = "00"
 
-        object_name = mixin.object_name
+        object_name = mixin.object_name(datetime.date(2025, 11, 26), "00")
         expected = "/00/2025/11/26.json"
         assert object_name == expected
+
+    def test_object_name_with_codec_suffix(self):
+        mixin = ScoreboardS3MixIn()
+        mixin.configure_storage(codec="gzip")
+
+        assert mixin.object_name(datetime.date(2025, 11, 26)) == "/00/2025/11/26.json.gz"
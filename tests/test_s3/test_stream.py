@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from court_pipeline.s3.stream import ChunkReader
+
+
+class TestChunkReader:
+
+    @pytest.mark.asyncio
+    async def test_read_in_thread(self):
+        reader = ChunkReader(asyncio.get_running_loop(), max_chunks=2)
+        consumer = asyncio.ensure_future(asyncio.to_thread(reader.read))
+
+        for chunk in [b"ab", b"", b"cd", b"ef"]:
+            await reader.feed(chunk)
+        reader.close()
+
+        assert await consumer == b"abcdef"
+
+    @pytest.mark.asyncio
+    async def test_read_size(self):
+        reader = ChunkReader(asyncio.get_running_loop(), max_chunks=4)
+        await reader.feed(b"abcdef")
+        reader.close()
+
+        assert reader.read(4) == b"abcd"
+        assert reader.read(4) == b"ef"
+        assert reader.read(4) == b""
+        assert reader.read(0) == b""
+
+    @pytest.mark.asyncio
+    async def test_feed_waits_for_buffer_space(self):
+        reader = ChunkReader(asyncio.get_running_loop(), max_chunks=1)
+        await reader.feed(b"a")
+
+        blocked = asyncio.ensure_future(reader.feed(b"b"))
+        await asyncio.sleep(0.01)
+        assert blocked.done() is False
+
+        assert await asyncio.to_thread(reader.read, 1) == b"a"
+        await asyncio.wait_for(blocked, 1)
+
+    @pytest.mark.asyncio
+    async def test_feed_stops_when_consumer_fails(self):
+        loop = asyncio.get_running_loop()
+        reader = ChunkReader(loop, max_chunks=1)
+        consumer = loop.create_future()
+        await reader.feed(b"a", consumer)
+
+        feeding = asyncio.ensure_future(reader.feed(b"b", consumer))
+        consumer.set_exception(ValueError("upload failed"))
+
+        with pytest.raises(ValueError):
+            await feeding
+
+    @pytest.mark.asyncio
+    async def test_read_raises_producer_error(self):
+        reader = ChunkReader(asyncio.get_running_loop())
+        await reader.feed(b"a")
+        reader.close(RuntimeError("download failed"))
+
+        assert reader.read(1) == b"a"
+        with pytest.raises(IOError):
+            reader.read(1)
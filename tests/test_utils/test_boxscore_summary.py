@@ -0,0 +1,83 @@
+"""
+Test cases for boxscore summary flattening
+"""
+import datetime
+import json
+
+import pytest
+
+from court_pipeline.utils.boxscore_summary import flatten_boxscore_summary, snake_case
+
+
+with open("tests/fixtures/0022400001.json") as f:
+    boxscore_summary_content = f.read()
+
+
+class TestSnakeCase:
+
+    def test_snake_case(self):
+        assert snake_case('fieldGoalsPercentage') == 'field_goals_percentage'
+        assert snake_case('points') == 'points'
+
+
+class TestFlattenBoxscoreSummary:
+
+    def test_flatten_tables(self):
+        tables = flatten_boxscore_summary(boxscore_summary_content.encode('utf-8'))
+
+        assert sorted(tables) == ['games', 'line_scores', 'officials', 'teams']
+        assert len(tables['games']) == 1
+        assert len(tables['teams']) == 2
+        assert len(tables['line_scores']) == 8
+        assert len(tables['officials']) == 3
+
+    def test_flatten_game(self):
+        game = flatten_boxscore_summary(boxscore_summary_content)['games'][0]
+
+        assert game['game_id'] == '0022400001'
+        assert game['league_id'] == '00'
+        assert game['season_year'] == 2024
+        assert game['game_type_id'] == 2
+        assert game['home_score'] == 116
+        assert game['away_score'] == 117
+        assert game['attendance'] == 19156
+        assert game['sellout'] is True
+        assert game['game_time_utc'] == datetime.datetime(2024, 11, 13, tzinfo=datetime.timezone.utc)
+
+    def test_flatten_teams(self):
+        home, away = flatten_boxscore_summary(boxscore_summary_content)['teams']
+
+        assert home['is_home'] is True
+        assert home['team_tricode'] == 'BOS'
+        assert away['team_tricode'] == 'ATL'
+        assert home['field_goals_percentage'] == pytest.approx(0.507)
+        assert all(row['game_id'] == '0022400001' for row in (home, away))
+
+    def test_flatten_line_scores_add_up(self):
+        tables = flatten_boxscore_summary(boxscore_summary_content)
+        for team in tables['teams']:
+            periods = [row for row in tables['line_scores'] if row['team_id'] == team['team_id']]
+            assert [row['period'] for row in periods] == [1, 2, 3, 4]
+            assert sum(row['score'] for row in periods) == team['score']
+
+    def test_flatten_game_without_teams(self):
+        content = json.dumps({"boxScoreSummary": {"gameId": "0022400002", "gameStatus": 1}})
+        tables = flatten_boxscore_summary(content)
+
+        assert tables['games'][0]['game_status'] == 1
+        assert tables['games'][0]['home_score'] is None
+        assert tables['teams'] == []
+        assert tables['officials'] == []
+
+    def test_flatten_other_payload(self):
+        with pytest.raises(ValueError):
+            flatten_boxscore_summary(json.dumps({"scoreboard": {"games": []}}))
+
+    @pytest.mark.parametrize("summary", [
+        ["0022400002"],
+        {"gameId": "0022400002", "gameTimeUTC": 1732406400},
+        {"gameId": "0022400002", "homeTeam": ["teamId"]},
+    ])
+    def test_flatten_summary_of_another_shape(self, summary):
+        with pytest.raises(ValueError):
+            flatten_boxscore_summary(json.dumps({"boxScoreSummary": summary}))
@@ -1,6 +1,14 @@
+import array
+
 import pytest
 
-from court_pipeline.utils.game_id import GameId
+from court_pipeline.utils.game_id import (
+    GameId,
+    generate_game_id_columns,
+    generate_game_ids,
+    iter_game_ids,
+    parse_game_id_columns,
+)
 
 
 class TestGameId:
@@ -83,3 +91,134 @@ class TestGameId:
         game_id = "0022400001"
         game_id_obj = GameId("0022400001")
         assert game_id_obj.season_year == 2024
+
+    def test_season_year_single_digit_suffix(self):
+        game_id_obj = GameId("0020500001")
+        assert game_id_obj.season_year == 2005
+
+    def test_from_parts(self):
+        game_id_obj = GameId.from_parts("00", 2, 2024, 1)
+        assert game_id_obj.value == "0022400001"
+        assert game_id_obj.season_year == 2024
+
+    def test_from_parts_invalid_season_year(self):
+        with pytest.raises(ValueError):
+            GameId.from_parts("00", 2, 1945, 1)
+        with pytest.raises(ValueError):
+            GameId.from_parts("00", 2, 2046, 1)
+
+    def test_iter_game_ids(self):
+        game_ids = [game_id.value for game_id in iter_game_ids("00", 1999, 4, stop=3)]
+        assert game_ids == ["0049900001", "0049900002", "0049900003"]
+
+    def test_from_parts_matches_parsing(self):
+        game_id_obj = GameId.from_parts("10", 4, 1999, 123)
+        parsed = GameId(game_id_obj.value)
+
+        assert parsed == game_id_obj
+        assert hash(parsed) == hash(game_id_obj)
+        assert (parsed.league_id, parsed.game_type_id, parsed.season_id, parsed.season_year, parsed.game_seq_id) == (
+            game_id_obj.league_id,
+            game_id_obj.game_type_id,
+            game_id_obj.season_id,
+            game_id_obj.season_year,
+            game_id_obj.game_seq_id,
+        )
+
+    def test_from_parts_invalid_parts(self):
+        with pytest.raises(ValueError):
+            GameId.from_parts("0", 2, 2024, 1)
+        with pytest.raises(ValueError):
+            GameId.from_parts("00", 10, 2024, 1)
+        with pytest.raises(ValueError):
+            GameId.from_parts("00", 2, 2024, 100000)
+
+    def test_init_non_ascii_digits(self):
+        with pytest.raises(ValueError):
+            GameId("00224000²1")
+
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            GameId("0022400001").extra = 1
+
+
+class TestGameIdColumns:
+
+    def test_generate_game_ids(self):
+        game_ids = generate_game_ids(["00", "10"], [2, 4], [1999, 2024], stop=2)
+
+        assert len(game_ids) == 16
+        assert game_ids[:4] == ["0029900001", "0029900002", "0022400001", "0022400002"]
+        assert game_ids[-1] == "1042400002"
+
+    def test_generate_game_ids_invalid_season_year(self):
+        with pytest.raises(ValueError):
+            generate_game_ids(["00"], [2], [2046], stop=1)
+
+    def test_generate_game_id_columns(self):
+        columns = generate_game_id_columns(["00"], [2, 4], [2024], stop=3, start=2)
+
+        assert len(columns) == 4
+        assert columns.value == ["0022400002", "0022400003", "0042400002", "0042400003"]
+        assert columns.league_id == ["00"] * 4
+        assert columns.game_type_id == [2, 2, 4, 4]
+        assert columns.season_year == [2024] * 4
+        assert list(columns.game_seq_id) == [2, 3, 2, 3]
+
+    def test_parse_game_id_columns(self):
+        columns = parse_game_id_columns(["0022400001", "1040501230", "0024600007"])
+
+        assert columns.league_id == ["00", "10", "00"]
+        assert columns.game_type_id == [2, 4, 2]
+        assert columns.season_year == [2024, 2005, 1946]
+        assert columns.game_seq_id == [1, 1230, 7]
+
+    def test_parse_game_id_columns_array_backend(self):
+        columns = parse_game_id_columns(["0022400001", "1040501230"], backend="array")
+
+        assert isinstance(columns.season_year, array.array)
+        assert list(columns.season_year) == [2024, 2005]
+        assert list(columns.game_seq_id) == [1, 1230]
+
+    def test_parse_game_id_columns_invalid_value(self):
+        with pytest.raises(ValueError):
+            parse_game_id_columns(["0022400001", "002240001"])
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            parse_game_id_columns(["0022400001"], backend="arrow")
+
+    def test_parse_game_id_columns_numpy_backend(self):
+        np = pytest.importorskip("numpy")
+        values = generate_game_ids(["00", "10"], [2, 4], [1999, 2024], stop=50)
+
+        columns = parse_game_id_columns(values, backend="numpy")
+        expected = parse_game_id_columns(values)
+
+        assert isinstance(columns.season_year, np.ndarray)
+        assert columns.value.tolist() == expected.value
+        assert columns.league_id.tolist() == expected.league_id
+        assert columns.game_type_id.tolist() == expected.game_type_id
+        assert columns.season_year.tolist() == expected.season_year
+        assert columns.game_seq_id.tolist() == expected.game_seq_id
+
+    def test_parse_game_id_columns_numpy_backend_invalid_value(self):
+        pytest.importorskip("numpy")
+        with pytest.raises(ValueError):
+            parse_game_id_columns(["0022400001", "00224000A1"], backend="numpy")
+        with pytest.raises(ValueError):
+            parse_game_id_columns(["0022400001", "002240001"], backend="numpy")
+
+    @pytest.mark.parametrize("backend", ["list", "numpy"])
+    def test_parse_game_id_columns_rejects_non_str(self, backend):
+        if backend == "numpy":
+            pytest.importorskip("numpy")
+        with pytest.raises(ValueError):
+            parse_game_id_columns(["0022400001", 22400002], backend=backend)
+
+    def test_generate_game_id_columns_numpy_backend(self):
+        pytest.importorskip("numpy")
+        columns = generate_game_id_columns(["00"], [2], [2024], stop=3, backend="numpy")
+
+        assert columns.value.tolist() == ["0022400001", "0022400002", "0022400003"]
+        assert columns.game_seq_id.tolist() == [1, 2, 3]
@@ -0,0 +1,75 @@
+"""
+Test cases for scoreboard payload parsing
+"""
+import datetime
+import json
+from unittest.mock import patch
+
+import pytest
+
+from court_pipeline.utils.scoreboard import GameState, game_date_today, parse_game_ids, parse_game_states
+
+
+with open("tests/fixtures/2025-11-23.json") as f:
+    scoreboard_content = f.read()
+
+
+class TestParseGameIds:
+
+    def test_parse_game_ids(self):
+        game_ids = parse_game_ids(scoreboard_content.encode('utf-8'))
+
+        assert len(game_ids) == 8
+        assert game_ids[0] == "0022500275"
+
+    def test_parse_game_ids_without_games(self):
+        content = json.dumps({"scoreboard": {"gameDate": "2025-07-01", "games": []}})
+        assert parse_game_ids(content) == []
+
+    def test_parse_game_ids_of_other_payload(self):
+        with pytest.raises(ValueError):
+            parse_game_ids(json.dumps({"boxScoreSummary": {}}))
+
+    def test_parse_game_ids_with_malformed_game_id(self):
+        content = json.dumps({"scoreboard": {"games": [{"gameId": "22500275"}]}})
+        with pytest.raises(ValueError):
+            parse_game_ids(content)
+
+
+class TestParseGameStates:
+
+    def test_parse_game_states(self):
+        states = parse_game_states(scoreboard_content)
+
+        assert len(states) == 8
+        assert states[0] == GameState(
+            game_id="0022500275",
+            game_status=3,
+            home_score=117,
+            away_score=127,
+            game_time_utc=datetime.datetime(2025, 11, 23, 18, 0, tzinfo=datetime.timezone.utc),
+        )
+
+    def test_parse_game_states_of_scheduled_game(self):
+        content = json.dumps({"scoreboard": {"games": [{
+            "gameId": "0022500300",
+            "gameStatus": 1,
+            "gameTimeUTC": "",
+            "homeTeam": {"score": 0},
+            "awayTeam": {},
+        }]}})
+
+        state, = parse_game_states(content)
+
+        assert state.progress == (1, 0, None)
+        assert state.game_time_utc is None
+
+
+class TestGameDateToday:
+
+    def test_game_date_today_is_eastern(self):
+        # 01:00 UTC is still the previous evening in New York
+        now = datetime.datetime(2025, 11, 24, 1, 0, tzinfo=datetime.timezone.utc)
+        with patch('court_pipeline.utils.scoreboard.datetime.datetime') as mock_datetime:
+            mock_datetime.now.side_effect = lambda tz: now.astimezone(tz)
+            assert game_date_today() == datetime.date(2025, 11, 23)